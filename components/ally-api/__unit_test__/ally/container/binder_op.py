@@ -17,6 +17,7 @@ if True:
 # --------------------------------------------------------------------
 
 from ally.api.config import model, service, call
+from ally.api.type import List
 from ally.container.binder_op import validateAutoId, validateMaxLength, \
     validateManaged, bindValidations, validateRequired
 from ally.container.impl.proxy import proxyWrapFor
@@ -46,6 +47,11 @@ class IServiceEntity:
         '''
         '''
 
+    @call
+    def insertAll(self, entities:List(Entity)) -> str:
+        '''
+        '''
+
 class DummyServiceEntity(IServiceEntity):
 
     def update(self, entity):
@@ -58,6 +64,11 @@ class DummyServiceEntity(IServiceEntity):
         '''
         return 'inserted'
 
+    def insertAll(self, entities):
+        '''
+        '''
+        return 'inserted all'
+
     def _hidden(self):
         return 'Hidden'
 
@@ -116,6 +127,24 @@ class TestBinderOp(unittest.TestCase):
 
         self.assertRaises(AttributeError, getattr, proxySrv, '_hidden')
 
+    def testValidationList(self):
+        Entity._ally_listeners = {}
+
+        validateAutoId(Entity.Id)
+        validateRequired(Entity.Required)
+
+        proxySrv = proxyWrapFor(DummyServiceEntity())
+        bindValidations(proxySrv)
+        assert isinstance(proxySrv, IServiceEntity)
+
+        valid, invalid = Entity(), Entity()
+        valid.Required = 'Provided a value'
+        self.assertEqual(proxySrv.insertAll([valid, valid]), 'inserted all')
+        try: proxySrv.insertAll([valid, invalid, invalid])
+        except InputError as e:
+            self.assertEqual([(ref.index, ref.property) for ref in e.message], [(1, 'Required'), (2, 'Required')])
+        else: self.fail('No validation errors')
+
 # --------------------------------------------------------------------
 
 if __name__ == '__main__': unittest.main()
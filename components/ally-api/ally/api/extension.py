@@ -18,27 +18,50 @@ from collections import Iterable
 class IterPart(Iterable):
     '''
     Provides a wrapping for iterable objects that represent a part of a bigger collection. Basically beside the actual
-    items this class objects also contain a total count of the big item collection that this iterable is part of.
+    items this class objects also contain a total count of the big item collection that this iterable is part of. The
+    total can be absent if the collection is not counted or approximate if the counting was stopped, in which case
+    the presence of items after this part is provided.
     '''
     total = int
     offset = int
     limit = int
+    continuation = str
+    approximate = bool
+    hasMore = bool
 
-    def __init__(self, wrapped, total, offset=None, limit=None):
+    def __init__(self, wrapped, total, offset=None, limit=None, continuation=None, approximate=False, hasMore=None):
         '''
         Construct the partial iterable.
         
         @param wrapped: Iterable
             The iterable that provides the actual data.
+        @param total: integer|None
+            The total count of the collection, None if the collection is not counted.
+        @param continuation: string|None
+            The opaque token used for fetching the items that follow this part, None if there are no following items
+            or the part is not fetched by keys.
+        @param approximate: boolean
+            Flag indicating that the total is only the count until the counting was stopped, so the collection has at
+            least total items.
+        @param hasMore: boolean|None
+            Flag indicating that there are items after this part, None if not known or it can be deduced from the total.
         '''
         assert isinstance(wrapped, Iterable), 'Invalid iterable %s' % wrapped
+        assert total is None or isinstance(total, int), 'Invalid total %s' % total
+        assert continuation is None or isinstance(continuation, str), 'Invalid continuation %s' % continuation
+        assert isinstance(approximate, bool), 'Invalid approximate flag %s' % approximate
+        assert hasMore is None or isinstance(hasMore, bool), 'Invalid has more flag %s' % hasMore
 
         self.wrapped = wrapped
         self.total = total
+        self.continuation = continuation
+        # Only the flags that are set are provided, the absent flags are not rendered.
+        self.approximate = approximate or None
+        self.hasMore = hasMore
         if offset is None: self.offset = 0
         else: self.offset = offset
         if limit is None: self.limit = total
-        elif limit > total: self.limit = total
+        elif total is not None and limit > total: self.limit = total
         else: self.limit = limit
 
     def __iter__(self): return self.wrapped.__iter__()
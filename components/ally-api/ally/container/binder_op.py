@@ -17,7 +17,7 @@ from ..exception import InputError, Ref
 from ..internationalization import _
 from .impl.binder import bindListener, callListeners, registerProxyBinder, \
     bindBeforeListener, indexBefore, INDEX_DEFAULT, BindableSupport
-from ally.api.type import Input
+from ally.api.type import Input, List
 from collections import Sized
 from functools import partial
 from inspect import isclass
@@ -43,6 +43,8 @@ EVENT_MODEL_INSERT = 'model_insert'
 # Listener key used for the model insert
 EVENT_MODEL_UPDATE = 'model_update'
 # Listener key used for the model update
+EVENT_MODEL_VALIDATED = 'model_validated'
+# Listener key used after the model insert or update validation, the listeners are called even if the validation fails
 
 EVENT_PROP_INSERT = 'insert:%s'
 # Listener key used for the property insert
@@ -162,12 +164,15 @@ def bindValidations(proxy, mappings=None):
             for k, inp in enumerate(call.inputs):
                 assert isinstance(inp, Input)
                 typ = inp.type
+                # The models provided as a list are validated one by one.
+                isList = isinstance(typ, List)
+                if isList: typ = typ.itemType
                 if isinstance(typ, TypeModel):
                     if typ.clazz in mappings:
                         typ = typeFor(mappings[typ.clazz])
                         assert isinstance(typ, TypeModel), 'Invalid model mapping class %s' % mappings[typ.clazz]
                     if isinstance(typ.clazz, BindableSupport):
-                        positions[k] = typ
+                        positions[k] = List(typ) if isList else typ
             if positions:
                 bindBeforeListener(getattr(proxy, call.name),
                                    partial(onCallValidateModel, call.method == INSERT, positions))
@@ -274,9 +279,9 @@ def onCallValidateModel(onInsert, positions, args, keyargs):
     
     @param onInsert: boolean
         Flag indicating that the validation should be performed for insert if True, False for update.
-    @param positions: dictionary{integer:TypeModel}
+    @param positions: dictionary{integer:TypeModel|List}
         As a key the indexes in the arguments (args) where to find the model(s) entity(s) to perform validations on and
-        as a value the TypeModel for that position.
+        as a value the TypeModel for that position, or the List of TypeModel if a list of entities is provided.
     @param args: arguments
         The arguments of the call invocation.
     @param keyargs: key arguments
@@ -290,8 +295,34 @@ def onCallValidateModel(onInsert, positions, args, keyargs):
         typ = positions.get(k)
         if typ is None: continue
 
-        assert isinstance(typ, TypeModel), 'Invalid model type %s for index %s' % (typ, k)
-        assert typ.isValid(obj), 'Invalid object %s for %s' % (obj, typ)
+        if isinstance(typ, List):
+            assert typ.isValid(obj), 'Invalid objects %s for %s' % (obj, typ)
+            for index, item in enumerate(obj):
+                itemErrors = []
+                validateObject(onInsert, typ.itemType, item, itemErrors)
+                # The errors are associated with the position of the entity in the list.
+                for ref in itemErrors: ref.index = index
+                errors.extend(itemErrors)
+        else: validateObject(onInsert, typ, obj, errors)
+
+    if errors: raise InputError(*errors)
+
+def validateObject(onInsert, typ, obj, errors):
+    '''
+    Process the validation for a model entity.
+    
+    @param onInsert: boolean
+        Flag indicating that the validation should be performed for insert if True, False for update.
+    @param typ: TypeModel
+        The model type of the entity.
+    @param obj: object
+        The entity to validate.
+    @param errors: list[Ref]
+        The list of errors.
+    '''
+    assert isinstance(typ, TypeModel), 'Invalid model type %s' % typ
+    assert typ.isValid(obj), 'Invalid object %s for %s' % (obj, typ)
+    try:
         if onInsert:
             if callListeners(typ.clazz, EVENT_MODEL_INSERT, obj, errors):
                 for prop in typ.container.properties:
@@ -300,5 +331,4 @@ def onCallValidateModel(onInsert, positions, args, keyargs):
             if callListeners(typ.clazz, EVENT_MODEL_UPDATE, obj, errors):
                 for prop in typ.container.properties:
                     callListeners(typ.clazz, EVENT_PROP_UPDATE % prop, prop, obj, errors)
-
-    if errors: raise InputError(*errors)
+    finally: callListeners(typ.clazz, EVENT_MODEL_VALIDATED, obj, errors)
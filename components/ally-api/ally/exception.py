@@ -55,6 +55,7 @@ class InputError(Exception):
             mes = '('
             if msg.model:
                 mes += msg.model
+                if msg.index is not None: mes += '[%s]' % msg.index
                 if msg.property: mes += '.' + msg.property
                 mes += '='
             mes += '\'' + msg.message + '\')'
@@ -68,7 +69,7 @@ class Ref:
     Maps a reference for an exception message.
     '''
 
-    def __init__(self, message, model=None, property=None, ref=None):
+    def __init__(self, message, model=None, property=None, ref=None, index=None):
         '''
         Provides a wrapping of the message which will be used as a key.
         
@@ -80,10 +81,13 @@ class Ref:
             The property associated with the message.
         @param ref: TypeModelProperty|TypeModel|None 
             The property type associated with the message.
+        @param index: integer|None
+            The position of the model the message is associated with, used whenever a list of models is provided.
         '''
         assert isinstance(message, str), 'Invalid message %s' % message
         assert not model or isinstance(model, Model), 'Invalid model %s' % model
         assert not property or isinstance(property, str), 'Invalid property %s' % property
+        assert index is None or isinstance(index, int), 'Invalid index %s' % index
         if ref:
             typ = typeFor(ref)
             if isinstance(typ, TypeModelProperty):
@@ -99,3 +103,4 @@ class Ref:
             self.model = model.name if model else None
             self.property = property
         self.message = message
+        self.index = index
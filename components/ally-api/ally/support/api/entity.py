@@ -10,7 +10,7 @@ General specifications for the entities API that poses an integer Id identifier.
 '''
 
 from ally.api.config import model, query, service, call, LIMIT_DEFAULT
-from ally.api.type import Iter
+from ally.api.type import Iter, List
 
 # --------------------------------------------------------------------
 
@@ -55,7 +55,8 @@ class IEntityFindService:
     '''
 
     @call
-    def getAll(self, offset:int=None, limit:int=LIMIT_DEFAULT, detailed:bool=True) -> Iter(Entity):
+    def getAll(self, offset:int=None, limit:int=LIMIT_DEFAULT, detailed:bool=True, \
+               continuation:str=None) -> Iter(Entity):
         '''
         Provides the entities.
         
@@ -65,13 +66,17 @@ class IEntityFindService:
             The limit of entities to retrieve.
         @param detailed: boolean
             If true will present the total count, limit and offset for the partially returned collection.
+        @param continuation: string
+            The continuation provided by a previous detailed collection, if the service supports it the entities that
+            follow that collection are retrieved instead of using the offset.
         '''
 
 @service
 class IEntityQueryService:
 
     @call
-    def getAll(self, offset:int=None, limit:int=LIMIT_DEFAULT, detailed:bool=True, q:QEntity=None) -> Iter(Entity):
+    def getAll(self, offset:int=None, limit:int=LIMIT_DEFAULT, detailed:bool=True, q:QEntity=None,
+               continuation:str=None) -> Iter(Entity):
         '''
         Provides the entities searched by the provided query.
         
@@ -83,6 +88,9 @@ class IEntityQueryService:
             If true will present the total count, limit and offset for the partially returned collection.
         @param q: QEntity
             The query to search by.
+        @param continuation: string
+            The continuation provided by a previous detailed collection, if the service supports it the entities that
+            follow that collection are retrieved instead of using the offset.
         '''
 
 @service
@@ -123,6 +131,45 @@ class IEntityCRUDService:
         @return: True if the delete is successful, false otherwise.
         '''
 
+@service
+class IEntityBulkService:
+    '''
+    Provides the entity bulk services, the entities of a call are processed in a single transaction.
+    '''
+
+    @call(webName='Bulk')
+    def insertAll(self, entities:List(Entity)) -> List(Entity.Id):
+        '''
+        Insert the entities, also the entities will have automatically assigned the Id to them.
+        
+        @param entities: list[Entity]
+            The entities to be inserted.
+        
+        @return: The ids of the inserted entities, in the order of the entities.
+        @raise InputError: If any of the entities is not valid, the errors are provided for the entity position.
+        '''
+
+    @call(webName='Bulk')
+    def updateAll(self, entities:List(Entity)):
+        '''
+        Update the entities.
+        
+        @param entities: list[Entity]
+            The entities to be updated.
+        @raise InputError: If any of the entities is not valid, the errors are provided for the entity position.
+        '''
+
+    @call(webName='Bulk')
+    def deleteAll(self, ids:List(Entity.Id)=None) -> bool:
+        '''
+        Delete the entities for the provided ids.
+        
+        @param ids: list[integer]
+            The ids of the entities to be deleted.
+            
+        @return: True if all the entities have been deleted, false otherwise.
+        '''
+
 @service
 class IEntityGetCRUDService(IEntityGetService, IEntityCRUDService):
     '''
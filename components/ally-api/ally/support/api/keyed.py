@@ -10,7 +10,7 @@ General specifications for the entities API that poses a string Key identifier.
 '''
 
 from ally.api.config import model, query, service, call
-from ally.api.type import Iter
+from ally.api.type import Iter, List
 
 # --------------------------------------------------------------------
 
@@ -119,6 +119,45 @@ class IEntityCRUDService:
         @return: True if the delete is successful, false otherwise.
         '''
 
+@service
+class IEntityBulkService:
+    '''
+    Provides the entity bulk services, the entities of a call are processed in a single transaction.
+    '''
+
+    @call(webName='Bulk')
+    def insertAll(self, entities:List(Entity)) -> List(Entity.Key):
+        '''
+        Insert the entities.
+        
+        @param entities: list[Entity]
+            The entities to be inserted.
+        
+        @return: The keys of the inserted entities, in the order of the entities.
+        @raise InputError: If any of the entities is not valid, the errors are provided for the entity position.
+        '''
+
+    @call(webName='Bulk')
+    def updateAll(self, entities:List(Entity)):
+        '''
+        Update the entities.
+        
+        @param entities: list[Entity]
+            The entities to be updated.
+        @raise InputError: If any of the entities is not valid, the errors are provided for the entity position.
+        '''
+
+    @call(webName='Bulk')
+    def deleteAll(self, keys:List(Entity.Key)=None) -> bool:
+        '''
+        Delete the entities for the provided keys.
+        
+        @param keys: list[string]
+            The keys of the entities to be deleted.
+            
+        @return: True if all the entities have been deleted, false otherwise.
+        '''
+
 @service
 class IEntityGetCRUDService(IEntityGetService, IEntityCRUDService):
     '''
@@ -17,6 +17,13 @@ from inspect import isclass
 from ally.api.criteria import AsBoolean, AsLike, AsEqual, AsOrdered
 from itertools import chain
 from collections import Sized
+from datetime import datetime
+from threading import local
+
+# --------------------------------------------------------------------
+
+_validators = local()
+# The validators set by the service calls executed in the current thread.
 
 # --------------------------------------------------------------------
 
@@ -207,3 +214,31 @@ def likeAsRegex(like, caseInsensitive=True):
     if caseInsensitive: likeRegex = re.compile(likeRegex, re.IGNORECASE)
     else: likeRegex = re.compile(likeRegex)
     return likeRegex
+
+# --------------------------------------------------------------------
+
+def setValidators(lastModified=None, eTag=None):
+    '''
+    Sets the validators for the value returned by the service call that is executed in the current thread, the
+    validators are used by the HTTP processing to provide the Last-Modified and ETag headers and to respond to the
+    conditional requests, if an entity tag is provided then no entity tag is computed from the rendered content.
+    
+    @param lastModified: datetime|None
+        The UTC date when the returned value was last modified.
+    @param eTag: string|None
+        The entity tag of the returned value, without the quotes, it needs to change whenever the value changes.
+    '''
+    assert lastModified is None or isinstance(lastModified, datetime), 'Invalid last modified %s' % lastModified
+    assert eTag is None or isinstance(eTag, str), 'Invalid entity tag %s' % eTag
+    _validators.lastModified, _validators.eTag = lastModified, eTag
+
+def popValidators():
+    '''
+    Provides and removes the validators set in the current thread, @see: setValidators.
+    
+    @return: tuple(datetime|None, string|None)
+        The last modified date and the entity tag.
+    '''
+    lastModified, eTag = getattr(_validators, 'lastModified', None), getattr(_validators, 'eTag', None)
+    _validators.lastModified = _validators.eTag = None
+    return lastModified, eTag
@@ -0,0 +1,11 @@
+'''
+Created on Apr 10, 2013
+
+@package: ally benchmark
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the benchmark harness that measures the throughput and latency of the processing pipeline, run with:
+    python3 -m ally.benchmark.run --help
+'''
@@ -0,0 +1,244 @@
+'''
+Created on Apr 10, 2013
+
+@package: ally benchmark
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the benchmark scenarios, clients and measurements.
+'''
+
+from ally.design.processor.execution import Processing
+from ally.http.spec.server import RequestHTTP, RequestContentHTTP, ResponseHTTP, \
+    ResponseContentHTTP, HTTP
+from ally.support.util_io import IInputStream
+from ally.support.util_timing import clock
+from http.client import HTTPConnection
+from io import BytesIO
+from threading import Thread
+from urllib.parse import urlparse, parse_qsl
+
+# --------------------------------------------------------------------
+
+class Scenario:
+    '''
+    The benchmark scenario, a request that is repeatedly made.
+    '''
+    __slots__ = ('name', 'method', 'uri', 'headers', 'body', 'statuses')
+
+    def __init__(self, name, method, uri, headers=None, body=None, statuses=(200,)):
+        '''
+        Construct the scenario.
+
+        @param name: string
+            The scenario name.
+        @param method: string
+            The HTTP method of the request.
+        @param uri: string
+            The request URI, including the parameters, without the leading slash.
+        @param headers: dictionary{string: string}|None
+            The request headers.
+        @param body: bytes|None
+            The request content.
+        @param statuses: tuple(integer)
+            The expected response statuses, any other status is counted as a failure.
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        assert isinstance(method, str), 'Invalid method %s' % method
+        assert isinstance(uri, str), 'Invalid URI %s' % uri
+        assert headers is None or isinstance(headers, dict), 'Invalid headers %s' % headers
+        assert body is None or isinstance(body, bytes), 'Invalid body %s' % body
+        assert isinstance(statuses, tuple), 'Invalid statuses %s' % statuses
+        self.name = name
+        self.method = method
+        self.uri = uri
+        self.headers = headers or {}
+        self.body = body
+        self.statuses = statuses
+
+# --------------------------------------------------------------------
+
+class ClientProcessing:
+    '''
+    The client that executes the requests directly on a processing, without any server.
+    '''
+
+    def __init__(self, processing):
+        '''
+        Construct the client.
+
+        @param processing: Processing
+            The server processing to execute the requests on.
+        '''
+        assert isinstance(processing, Processing), 'Invalid processing %s' % processing
+        self.processing = processing
+
+    def request(self, scenario):
+        '''
+        Executes the scenario request.
+
+        @param scenario: Scenario
+            The scenario to execute.
+        @return: integer
+            The response status.
+        '''
+        assert isinstance(scenario, Scenario), 'Invalid scenario %s' % scenario
+        proc = self.processing
+        request, requestCnt = proc.newContext('request'), proc.newContext('requestCnt')
+        assert isinstance(request, RequestHTTP), 'Invalid request %s' % request
+        assert isinstance(requestCnt, RequestContentHTTP), 'Invalid request content %s' % requestCnt
+
+        url = urlparse(scenario.uri)
+        request.scheme, request.method = HTTP, scenario.method
+        request.headers = dict(scenario.headers)
+        request.uri = url.path
+        request.parameters = parse_qsl(url.query, True, False)
+        if scenario.body is not None:
+            request.headers['Content-Length'] = str(len(scenario.body))
+            requestCnt.source = BytesIO(scenario.body)
+
+        chain = proc.newChain()
+        try:
+            chain.process(**proc.fillIn(request=request, requestCnt=requestCnt, response=proc.newContext('response'),
+                                        responseCnt=proc.newContext('responseCnt'))).doAll()
+            response, responseCnt = chain.arg.response, chain.arg.responseCnt
+            assert isinstance(response, ResponseHTTP), 'Invalid response %s' % response
+            assert isinstance(responseCnt, ResponseContentHTTP), 'Invalid response content %s' % responseCnt
+
+            # The content is consumed since the rendering is made while the content is read.
+            if ResponseContentHTTP.source in responseCnt and responseCnt.source is not None:
+                if isinstance(responseCnt.source, IInputStream): responseCnt.source.read()
+                else:
+                    for _bytes in responseCnt.source: pass
+            return response.status
+        finally: proc.release(chain)
+
+    def close(self):
+        '''
+        Closes the client.
+        '''
+
+class ClientHTTP:
+    '''
+    The client that executes the requests over a HTTP connection, the connection is persistent if the server allows it.
+    '''
+
+    def __init__(self, host, port):
+        '''
+        Construct the client.
+
+        @param host: string
+            The server host.
+        @param port: integer
+            The server port.
+        '''
+        assert isinstance(host, str), 'Invalid host %s' % host
+        assert isinstance(port, int), 'Invalid port %s' % port
+        self.connection = HTTPConnection(host, port)
+
+    def request(self, scenario):
+        '''
+        Executes the scenario request.
+
+        @param scenario: Scenario
+            The scenario to execute.
+        @return: integer
+            The response status.
+        '''
+        assert isinstance(scenario, Scenario), 'Invalid scenario %s' % scenario
+        try:
+            self.connection.request(scenario.method, '/' + scenario.uri, scenario.body, scenario.headers)
+            response = self.connection.getresponse()
+            response.read()
+        except:
+            self.connection.close()  # The connection is reopened by the next request.
+            raise
+        if response.will_close: self.connection.close()
+        return response.status
+
+    def close(self):
+        '''
+        Closes the client.
+        '''
+        self.connection.close()
+
+# --------------------------------------------------------------------
+
+def measure(clients, scenario, requests, warmup=0):
+    '''
+    Measures the scenario, the requests are divided between the clients and each client runs in his own thread.
+
+    @param clients: list[ClientProcessing|ClientHTTP]
+        The clients to measure with.
+    @param scenario: Scenario
+        The scenario to measure.
+    @param requests: integer
+        The number of measured requests.
+    @param warmup: integer
+        The number of requests made before measuring, the warm up requests are made by the first client.
+    @return: dictionary{string: object}
+        The measurements, contains the requests per second, the failures count and the latency percentiles in milliseconds.
+    '''
+    assert isinstance(clients, list) and clients, 'Invalid clients %s' % clients
+    assert isinstance(requests, int) and requests > 0, 'Invalid requests %s' % requests
+    assert isinstance(warmup, int) and warmup >= 0, 'Invalid warm up %s' % warmup
+
+    for _k in range(warmup): clients[0].request(scenario)
+
+    latencies, failures = [], []
+    def run(client, count):
+        failed = 0
+        for _k in range(count):
+            start = clock()
+            try: status = client.request(scenario)
+            except Exception: status = None
+            latencies.append(clock() - start)
+            if status not in scenario.statuses: failed += 1
+        failures.append(failed)
+
+    start = clock()
+    if len(clients) == 1: run(clients[0], requests)
+    else:
+        threads = []
+        for index, client in enumerate(clients):
+            count = requests // len(clients) + (1 if index < requests % len(clients) else 0)
+            thread = Thread(target=run, args=(client, count))
+            thread.start()
+            threads.append(thread)
+        for thread in threads: thread.join()
+    elapsed = clock() - start
+
+    return statistics(latencies, sum(failures), elapsed)
+
+def statistics(latencies, failures, elapsed):
+    '''
+    Provides the statistics for the measured latencies.
+
+    @param latencies: list[float]
+        The requests latencies in seconds.
+    @param failures: integer
+        The number of failed requests.
+    @param elapsed: float
+        The total time in seconds.
+    @return: dictionary{string: object}
+        The statistics.
+    '''
+    assert isinstance(latencies, list) and latencies, 'Invalid latencies %s' % latencies
+    latencies = sorted(latencies)
+    count = len(latencies)
+    # The nearest rank percentile.
+    rank = lambda percent: latencies[max(0, -(-count * percent // 100) - 1)] * 1000
+    return {
+            'requests': count,
+            'failures': failures,
+            'rps': round(count / elapsed, 1),
+            'latency_ms': {
+                           'min': round(latencies[0] * 1000, 3),
+                           'mean': round(sum(latencies) * 1000 / count, 3),
+                           'p50': round(rank(50), 3),
+                           'p90': round(rank(90), 3),
+                           'p99': round(rank(99), 3),
+                           'max': round(latencies[-1] * 1000, 3),
+                           },
+            }
@@ -0,0 +1,224 @@
+'''
+Created on Apr 10, 2013
+
+@package: ally benchmark
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Runs the benchmarks, the framework setups are assembled with the synthetic in memory services and the scenarios are
+measured in process and through the basic and asyncore servers over loopback. The results are provided as JSON and can
+be compared with the results of a previous run.
+'''
+
+# Required in order to register the package extender whenever the benchmark is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from .measure import Scenario, ClientProcessing, ClientHTTP, measure
+from .sample.impl import AuthorService, ArticleService, populate
+from ally.container import aop, context
+from ally.http.spec.server import RequestHTTP, RequestContentHTTP, ResponseHTTP, \
+    ResponseContentHTTP
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+
+# --------------------------------------------------------------------
+
+log = logging.getLogger(__name__)
+
+SETUPS = ('__setup__.ally', '__setup__.ally.**', '__setup__.ally_api', '__setup__.ally_api.**', '__setup__.ally_core',
+          '__setup__.ally_core.**', '__setup__.ally_core_http', '__setup__.ally_core_http.**', '__setup__.ally_http',
+          '__setup__.ally_http.**', '__setup__.ally_http_asyncore_server', '__setup__.ally_http_asyncore_server.**')
+# The setup modules that compose the benchmarked application, the package modules are not matched by the '**' patterns
+# so they are provided explicitly.
+
+TARGET_PROCESSING = 'processing'
+# The target that executes the requests directly on the server processing.
+TARGET_BASIC = 'basic'
+# The target that executes the requests through the basic server.
+TARGET_ASYNCORE = 'asyncore'
+# The target that executes the requests through the asyncore server.
+TARGETS = (TARGET_PROCESSING, TARGET_BASIC, TARGET_ASYNCORE)
+# The available targets.
+SERVER_TYPES = {TARGET_PROCESSING: 'none', TARGET_BASIC: 'basic', TARGET_ASYNCORE: 'asyncore'}
+# The server type configured for each target, for the processing target no server is started.
+
+# --------------------------------------------------------------------
+
+def scenarios():
+    '''
+    Provides the benchmark scenarios.
+
+    @return: list[Scenario]
+        The scenarios to measure.
+    '''
+    headers = {'Accept': 'application/json'}
+    article = {'Author': '1', 'Title': 'The inserted article', 'Content': 'The inserted article content', 'Views': '0'}
+    invalid = {'Author': '1', 'Content': 'The article content without a title'}
+    return [
+            Scenario('get_collection', 'GET', 'resources/Benchmark/Article?limit=50', headers),
+            Scenario('get_collection_query', 'GET', 'resources/Benchmark/Article?limit=50&desc=views&title=Article%25',
+                     headers),
+            Scenario('get_entity', 'GET', 'resources/Benchmark/Article/1', headers),
+            Scenario('insert', 'POST', 'resources/Benchmark/Article', dict(headers, **{'Content-Type': 'application/json'}),
+                     json.dumps(article).encode(), (201,)),
+            Scenario('error_unknown_id', 'GET', 'resources/Benchmark/Article/0', headers, statuses=(400,)),
+            Scenario('error_invalid_path', 'GET', 'resources/Benchmark/Unknown', headers, statuses=(404,)),
+            Scenario('error_invalid_insert', 'POST', 'resources/Benchmark/Article',
+                     dict(headers, **{'Content-Type': 'application/json'}), json.dumps(invalid).encode(), (400,)),
+            ]
+
+def benchmark(clients, options):
+    '''
+    Measures all the scenarios with the provided clients.
+
+    @param clients: list[ClientProcessing|ClientHTTP]
+        The clients to measure with.
+    @param options: Namespace
+        The parsed options.
+    @return: dictionary{string: dictionary}
+        The measurements indexed by scenario name.
+    '''
+    results = {}
+    try:
+        for scenario in scenarios():
+            assert isinstance(scenario, Scenario)
+            results[scenario.name] = result = measure(clients, scenario, options.requests, options.warmup)
+            if result['failures']: log.warning('Scenario \'%s\' has %s failed requests', scenario.name, result['failures'])
+    finally:
+        for client in clients: client.close()
+    return results
+
+def compare(results, previous):
+    '''
+    Compares the results with the results of a previous run.
+
+    @param results: dictionary{string: dictionary}
+        The current results.
+    @param previous: dictionary{string: dictionary}
+        The previous results.
+    @return: dictionary{string: dictionary}
+        The relative changes in percents for the requests per second and the latency percentiles, indexed by target and
+        scenario, only the targets and scenarios that are found in both results are compared.
+    '''
+    change = lambda current, before: round((current - before) * 100 / before, 1) if before else None
+    comparison = {}
+    for target, scenariosResults in results['targets'].items():
+        for name, result in scenariosResults.items():
+            try: before = previous['targets'][target][name]
+            except KeyError: continue
+            comparison.setdefault(target, {})[name] = {
+                'rps': change(result['rps'], before['rps']),
+                'p50': change(result['latency_ms']['p50'], before['latency_ms']['p50']),
+                'p99': change(result['latency_ms']['p99'], before['latency_ms']['p99']),
+                }
+    return comparison
+
+# --------------------------------------------------------------------
+
+def run(options):
+    '''
+    Runs the benchmarks.
+
+    @param options: Namespace
+        The parsed options.
+    @return: dictionary{string: object}
+        The benchmark results.
+    '''
+    results = {'python': platform.python_version(), 'requests': options.requests, 'concurrency': options.concurrency,
+               'targets': {}}
+    for target in TARGETS:
+        if target not in options.targets: continue
+        log.info('Benchmarking the %s target', target)
+
+        # Each target is assembled in his own context since the server assemblies depend on the server type, the
+        # servers are started by the setups.
+        config = {'server_type': SERVER_TYPES[target], 'server_host': options.host, 'server_port': options.port,
+                  'server_pool_size': options.poolSize}
+        context.open(aop.modulesIn(*SETUPS), config=config)
+        try:
+            from __setup__.ally_core.resources import services
+
+            authorService, articleService = AuthorService(), ArticleService()
+            populate(authorService, articleService, options.authors, options.articles)
+            services().extend((authorService, articleService))
+            context.processStart()
+
+            if target == TARGET_PROCESSING:
+                from __setup__.ally_http.server import assemblyServer
+                processing = assemblyServer().create(request=RequestHTTP, requestCnt=RequestContentHTTP,
+                                                     response=ResponseHTTP, responseCnt=ResponseContentHTTP)
+                processing.pooling(options.poolSize)
+                results['targets'][target] = benchmark([ClientProcessing(processing)], options)
+
+            elif target == TARGET_BASIC:
+                from __setup__.ally_http.server import serverBasic
+                server = serverBasic()
+                try:
+                    clients = [ClientHTTP(options.host, options.port) for _k in range(options.concurrency)]
+                    results['targets'][target] = benchmark(clients, options)
+                finally:
+                    server.shutdown()
+                    server.server_close()
+
+            elif target == TARGET_ASYNCORE:
+                from __setup__.ally_http_asyncore_server.server import serverAsyncore
+                server = serverAsyncore()
+                try:
+                    clients = [ClientHTTP(options.host, options.port) for _k in range(options.concurrency)]
+                    results['targets'][target] = benchmark(clients, options)
+                finally:
+                    # The server loop stops once all the dispatchers are closed.
+                    for dispatcher in list(server.map.values()): dispatcher.close()
+        finally: context.deactivate()
+
+    return results
+
+def main(args=None):
+    '''
+    Parses the arguments and runs the benchmarks.
+
+    @param args: list[string]|None
+        The arguments, if None the system arguments are used.
+    '''
+    parser = argparse.ArgumentParser(description='The ally framework benchmarks.')
+    parser.add_argument('--targets', nargs='+', choices=TARGETS, default=list(TARGETS),
+                        help='The targets to benchmark')
+    parser.add_argument('--requests', type=int, default=1000, help='The number of measured requests for each scenario')
+    parser.add_argument('--warmup', type=int, default=100, help='The number of requests made before measuring')
+    parser.add_argument('--concurrency', type=int, default=1, help='The number of concurrent clients for the servers')
+    parser.add_argument('--authors', type=int, default=50, help='The number of synthetic authors')
+    parser.add_argument('--articles', type=int, default=1000, help='The number of synthetic articles')
+    parser.add_argument('--pool-size', dest='poolSize', type=int, default=0, help='The contexts pool size')
+    parser.add_argument('--host', default='127.0.0.1', help='The loopback host used by the servers')
+    parser.add_argument('--port', type=int, default=18080, help='The port used by the servers')
+    parser.add_argument('--output', help='The file to write the JSON results to, by default the results are printed')
+    parser.add_argument('--compare', help='The JSON results file of a previous run to compare with')
+    options = parser.parse_args(args)
+
+    logging.basicConfig(format='%(levelname)-8s %(message)s')
+    logging.getLogger().setLevel(logging.WARN)
+    log.setLevel(logging.INFO)
+
+    start = time.time()
+    results = run(options)
+    results['duration'] = round(time.time() - start, 1)
+    if options.compare:
+        with open(options.compare) as f: results['comparison'] = compare(results, json.load(f))
+
+    if options.output:
+        with open(options.output, 'w') as f: json.dump(results, f, indent=4, sort_keys=True)
+        log.info('Results written to \'%s\'', options.output)
+    else: json.dump(results, sys.stdout, indent=4, sort_keys=True)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': main()
@@ -0,0 +1,10 @@
+'''
+Created on Apr 10, 2013
+
+@package: ally benchmark
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the synthetic in memory services used by the benchmarks.
+'''
@@ -0,0 +1,65 @@
+'''
+Created on Apr 10, 2013
+
+@package: ally benchmark
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+API specifications for the synthetic benchmark models and services.
+'''
+
+from ally.api.config import model, service, query
+from ally.api.criteria import AsLikeOrdered, AsRangeOrdered
+from ally.support.api.entity import Entity, QEntity, IEntityService, \
+    IEntityNQService
+from functools import partial
+
+# --------------------------------------------------------------------
+
+DOMAIN = 'Benchmark/'
+modelBenchmark = partial(model, domain=DOMAIN)
+
+# --------------------------------------------------------------------
+
+@modelBenchmark
+class Author(Entity):
+    '''
+    The author model.
+    '''
+    Name = str
+    EMail = str
+
+@modelBenchmark
+class Article(Entity):
+    '''
+    The article model, references the author.
+    '''
+    Author = Author
+    Title = str
+    Content = str
+    Views = int
+
+# --------------------------------------------------------------------
+
+@query(Article)
+class QArticle(QEntity):
+    '''
+    The article query.
+    '''
+    title = AsLikeOrdered
+    views = AsRangeOrdered
+
+# --------------------------------------------------------------------
+
+@service((Entity, Author))
+class IAuthorService(IEntityNQService):
+    '''
+    The authors service.
+    '''
+
+@service((Entity, Article), (QEntity, QArticle))
+class IArticleService(IEntityService):
+    '''
+    The articles service.
+    '''
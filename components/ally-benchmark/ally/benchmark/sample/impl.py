@@ -0,0 +1,148 @@
+'''
+Created on Apr 10, 2013
+
+@package: ally benchmark
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the in memory implementations for the synthetic benchmark services.
+'''
+
+from .api import IAuthorService, IArticleService, Author, Article, QArticle
+from ally.api.extension import IterPart
+from ally.api.type import typeFor
+from ally.exception import InputError, Ref
+from ally.internationalization import _
+from ally.support.api.util_service import trimIter, processQuery, copy
+from collections import OrderedDict
+from threading import Lock
+
+# --------------------------------------------------------------------
+
+class EntityServiceMemory:
+    '''
+    Generic in memory implementation for @see: IEntityService, the entities are kept in insertion order.
+    '''
+
+    def __init__(self, Entity, QEntity=None):
+        '''
+        Construct the in memory entity service.
+        
+        @param Entity: class
+            The entity model class.
+        @param QEntity: class|None
+            The entity query class.
+        '''
+        self.Entity = Entity
+        self.QEntity = QEntity
+        self.mandatory = [name for name, prop in typeFor(Entity).container.properties.items()
+                          if name != 'Id' and prop.isOf(str)]
+        self._entities = OrderedDict()
+        self._lock = Lock()
+        self._nextId = 1
+
+    def getById(self, id):
+        '''
+        @see: IEntityGetService.getById
+        '''
+        entity = self._entities.get(id)
+        if entity is None: raise InputError(Ref(_('Unknown id'), ref=self.Entity.Id))
+        return entity
+
+    def getAll(self, offset=None, limit=None, detailed=False, q=None, continuation=None):
+        '''
+        @see: IEntityQueryService.getAll
+        
+        The entities are always paged by offset so the continuation is ignored.
+        '''
+        entities = self._entities.values()
+        if q is not None:
+            assert isinstance(q, self.QEntity), 'Invalid query %s' % q
+            entities = processQuery(entities, q, self.Entity)
+        total = len(entities)
+        entities = trimIter(iter(entities), total, offset, limit)
+        if detailed: return IterPart(entities, total, offset, limit)
+        return entities
+
+    def insert(self, entity):
+        '''
+        @see: IEntityCRUDService.insert
+        '''
+        assert isinstance(entity, self.Entity), 'Invalid entity %s, expected %s' % (entity, self.Entity)
+        for name in self.mandatory:
+            if getattr(entity, name) is None: raise InputError(Ref(_('Mandatory value is missing'),
+                                                                   ref=getattr(self.Entity, name)))
+        with self._lock:
+            entity.Id, self._nextId = self._nextId, self._nextId + 1
+            self._entities[entity.Id] = copy(entity, self.Entity())
+        return entity.Id
+
+    def update(self, entity):
+        '''
+        @see: IEntityCRUDService.update
+        '''
+        assert isinstance(entity, self.Entity), 'Invalid entity %s, expected %s' % (entity, self.Entity)
+        copy(entity, self.getById(entity.Id))
+
+    def delete(self, id):
+        '''
+        @see: IEntityCRUDService.delete
+        '''
+        with self._lock: return self._entities.pop(id, None) is not None
+
+# --------------------------------------------------------------------
+
+class AuthorService(EntityServiceMemory, IAuthorService):
+    '''
+    Implementation for @see: IAuthorService.
+    '''
+
+    def __init__(self):
+        EntityServiceMemory.__init__(self, Author)
+
+    def getAll(self, offset=None, limit=None, detailed=False, continuation=None):
+        '''
+        @see: IEntityFindService.getAll
+        '''
+        return EntityServiceMemory.getAll(self, offset, limit, detailed)
+
+class ArticleService(EntityServiceMemory, IArticleService):
+    '''
+    Implementation for @see: IArticleService.
+    '''
+
+    def __init__(self):
+        EntityServiceMemory.__init__(self, Article, QArticle)
+
+# --------------------------------------------------------------------
+
+def populate(authorService, articleService, authors, articles):
+    '''
+    Populates the services with synthetic entities.
+    
+    @param authorService: IAuthorService
+        The author service to populate.
+    @param articleService: IArticleService
+        The article service to populate.
+    @param authors: integer
+        The number of authors to create.
+    @param articles: integer
+        The number of articles to create, the articles are distributed evenly between the authors.
+    '''
+    assert isinstance(authorService, IAuthorService), 'Invalid author service %s' % authorService
+    assert isinstance(articleService, IArticleService), 'Invalid article service %s' % articleService
+    assert isinstance(authors, int) and authors > 0, 'Invalid authors count %s' % authors
+    assert isinstance(articles, int) and articles >= 0, 'Invalid articles count %s' % articles
+
+    for k in range(authors):
+        author = Author()
+        author.Name, author.EMail = 'Author %s' % k, 'author%s@example.com' % k
+        authorService.insert(author)
+    for k in range(articles):
+        article = Article()
+        article.Author = k % authors + 1
+        article.Title = 'Article %s' % k
+        article.Content = 'The content of the article %s. ' % k * 10
+        article.Views = k * 7 % 1000
+        articleService.insert(article)
@@ -0,0 +1,35 @@
+'''
+Created on Apr 10, 2013
+
+@package: ally benchmark
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Setup package.
+'''
+
+# --------------------------------------------------------------------
+
+from setuptools import setup, find_packages
+
+# --------------------------------------------------------------------
+
+setup(
+    name='ally_benchmark',
+    version='1.0',
+    packages=find_packages(),
+    install_requires=['ally_core_http >= 1.0', 'ally_http_asyncore_server >= 1.0'],
+    platforms=['all'],
+    test_suite='test',
+    zip_safe=True,
+
+    # metadata for upload to PyPI
+    author='Gabriel Nistor',
+    author_email='gabriel.nistor@sourcefabric.org',
+    description='Ally framework - Provides the benchmark harness for the framework',
+    long_description='Measures the throughput and latency of the processing pipeline and of the HTTP servers',
+    license='GPL v3',
+    keywords='Ally REST framework benchmark',
+    url='http://www.sourcefabric.org/en/superdesk/', # project home page
+)
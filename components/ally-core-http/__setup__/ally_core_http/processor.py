@@ -16,7 +16,8 @@ from ..ally_core.processor import argumentsBuild, argumentsPrepare, \
 from ..ally_core.resources import resourcesRoot
 from ..ally_http.processor import encoderPath, contentLengthDecode, \
     contentLengthEncode, methodOverride, allowEncode, headerDecodeRequest, \
-    contentTypeRequestDecode, headerEncodeResponse, contentTypeResponseEncode
+    contentTypeRequestDecode, headerEncodeResponse, contentTypeResponseEncode, \
+    validatorsEncode, conditional, contentEncodingEncode, compression_minimum_size
 from ally.container import ioc
 from ally.core.http.impl.processor.encoder import CreateEncoderWithPathHandler
 from ally.core.http.impl.processor.explain_error import ExplainErrorHandler
@@ -176,10 +177,13 @@ def updateAssemblyResources():
                             contentTypeRequestDecode(), contentLengthDecode(), contentLanguageDecode(), acceptDecode(),
                             renderer(), conversion(), createDecoder(), createEncoderWithPath(), parserMultiPart(), content(),
                             parameter(), fetcher(), argumentsBuild(), invoking(), renderEncoder(),
-                            status(), explainError(), contentTypeResponseEncode(),
+                            status(), explainError(), validatorsEncode(), conditional(), contentTypeResponseEncode(),
                             contentLanguageEncode(), contentLengthEncode(), allowEncode())
     
     if allow_method_override(): assemblyResources().add(methodOverride(), before=methodInvoker())
+    # The content is compressed before the validators so the ETag is computed for the encoded content.
+    if compression_minimum_size() is not None:
+        assemblyResources().add(contentEncodingEncode(), before=validatorsEncode())
 
 @ioc.before(assemblyMultiPartPopulate)
 def updateAssemblyMultiPartPopulate():
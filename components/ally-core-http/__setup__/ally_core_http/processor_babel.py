@@ -41,6 +41,14 @@ else:
         '''
         return True
     
+    @ioc.config
+    def babel_cache_size() -> int:
+        '''
+        The maximum number of parsed locales and prepared Babel converters, for the languages and formats used by clients,
+        that are kept for reuse between requests.
+        '''
+        return 100
+    
     # --------------------------------------------------------------------
     
     @ioc.replace(conversion)
@@ -48,6 +56,7 @@ else:
         b = BabelConversionDecodeHandler()
         b.languageDefault = default_language()
         b.normalizer = normalizer()
+        b.cacheSize = babel_cache_size()
         return b
     
     @ioc.entity
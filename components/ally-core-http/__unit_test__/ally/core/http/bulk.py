@@ -0,0 +1,134 @@
+'''
+Created on Mar 25, 2013
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Bulk entity calls testing on the server processing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model, service
+from ally.container import aop, context
+from ally.design.processor.execution import Chain
+from ally.http.spec.server import RequestHTTP, RequestContentHTTP, \
+    ResponseHTTP, ResponseContentHTTP, HTTP
+from ally.support.api.entity import Entity, IEntityBulkService
+from io import BytesIO
+from urllib.parse import urlparse, parse_qsl
+import json
+import unittest
+
+# --------------------------------------------------------------------
+
+SETUPS = ('__setup__.ally', '__setup__.ally.**', '__setup__.ally_api', '__setup__.ally_api.**', '__setup__.ally_core',
+          '__setup__.ally_core.**', '__setup__.ally_core_http', '__setup__.ally_core_http.**', '__setup__.ally_http',
+          '__setup__.ally_http.**')
+# The setup modules used for assembling the server processing.
+
+@model
+class Item(Entity):
+    Name = str
+
+@service((Entity, Item))
+class IItemService(IEntityBulkService):
+    '''
+    The item bulk service.
+    '''
+
+class ItemService(IItemService):
+
+    def __init__(self):
+        self.items, self.nextId = {}, 1
+
+    def insertAll(self, entities):
+        for entity in entities:
+            entity.Id, self.nextId = self.nextId, self.nextId + 1
+            self.items[entity.Id] = entity.Name
+        return [entity.Id for entity in entities]
+
+    def updateAll(self, entities):
+        for entity in entities: self.items[entity.Id] = entity.Name
+
+    def deleteAll(self, ids=None):
+        return all([self.items.pop(id, None) is not None for id in ids or ()])
+
+# --------------------------------------------------------------------
+
+class TestBulk(unittest.TestCase):
+
+    def setUp(self):
+        context.open(aop.modulesIn(*SETUPS), config={'server_type': 'none'})
+        from __setup__.ally_core.resources import services
+        from __setup__.ally_http.server import assemblyServer
+
+        self.service = ItemService()
+        services().append(self.service)
+        context.processStart()
+        self.processing = assemblyServer().create(request=RequestHTTP, requestCnt=RequestContentHTTP,
+                                                  response=ResponseHTTP, responseCnt=ResponseContentHTTP)
+
+    def tearDown(self):
+        context.deactivate()
+
+    def request(self, method, uri, content=None):
+        proc = self.processing
+        request, requestCnt = proc.ctx.request(), proc.ctx.requestCnt()
+
+        url = urlparse(uri)
+        request.scheme, request.method = HTTP, method
+        request.headers = {'Accept': 'application/json'}
+        request.uri = url.path
+        request.parameters = parse_qsl(url.query, True, False)
+        if content is not None:
+            content = json.dumps(content).encode('utf-8')
+            request.headers['Content-Type'] = 'application/json'
+            request.headers['Content-Length'] = str(len(content))
+            requestCnt.source = BytesIO(content)
+
+        chain = Chain(proc)
+        chain.process(**proc.fillIn(request=request, requestCnt=requestCnt, response=proc.ctx.response(),
+                                    responseCnt=proc.ctx.responseCnt())).doAll()
+        response, responseCnt = chain.arg.response, chain.arg.responseCnt
+
+        source = responseCnt.source if ResponseContentHTTP.source in responseCnt else None
+        if source is None: return response.status, None
+        if hasattr(source, 'read'): source = source.read()
+        else: source = b''.join(source)
+        return response.status, json.loads(source.decode('utf-8')) if source else None
+
+    def testBulk(self):
+        status, content = self.request('POST', 'resources/Item/Bulk',
+                                       {'ItemList': [{'Name': 'First'}, {'Name': 'Second'}, {'Name': 'Third'}]})
+        self.assertEqual(201, status)
+        self.assertEqual(['1', '2', '3'], [item['Id'] for item in content['ItemList']])
+        self.assertEqual({1: 'First', 2: 'Second', 3: 'Third'}, self.service.items)
+
+        status, _content = self.request('PUT', 'resources/Item/Bulk',
+                                        {'ItemList': [{'Id': '1', 'Name': 'Changed'}, {'Id': '3', 'Name': 'Other'}]})
+        self.assertEqual(200, status)
+        self.assertEqual({1: 'Changed', 2: 'Second', 3: 'Other'}, self.service.items)
+
+        status, _content = self.request('DELETE', 'resources/Item/Bulk?ids=1&ids=2')
+        self.assertEqual(204, status)
+        self.assertEqual({3: 'Other'}, self.service.items)
+
+    def testInvalid(self):
+        status, content = self.request('PUT', 'resources/Item/Bulk',
+                                       {'ItemList': [{'Id': 'first', 'Name': 'x'}, {'Id': '1'}, {'Id': 'third'}]})
+        self.assertEqual(400, status)
+        # The errors are provided for each invalid item position.
+        self.assertEqual(['0', '2'], [item['index'] for item in content['details']['model']['item']['item']])
+        self.assertEqual({}, self.service.items)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,118 @@
+'''
+Created on Mar 20, 2013
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Model with path encoder testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model
+from ally.api.type import typeFor, List, Reference
+from ally.container import ioc
+from ally.core.http.impl.processor.encoder import CreateEncoderWithPathHandler, \
+    EncodeModel
+from ally.core.http.spec.transform.support_model import DataModel
+from ally.core.impl.processor.encoder import EncodeCollectionBatch
+from ally.core.spec.resources import ConverterPath
+from ally.core.spec.transform.exploit import Resolve
+from ally.core.spec.transform.render import RenderToObject
+from ally.http.spec.server import IEncoderPath
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class Group:
+    Id = int
+    Name = str
+
+@model(id='Id')
+class User:
+    Id = int
+    Name = str
+    Flags = List(str)
+    Group = Group
+    Avatar = Reference
+
+class EncoderPath(IEncoderPath):
+
+    def encode(self, path, **keyargs): return 'http://localhost/%s' % path
+
+    def encodePattern(self, path, **keyargs): return path
+
+# --------------------------------------------------------------------
+
+class TestEncodeModel(unittest.TestCase):
+
+    def setUp(self):
+        self.interpreted = CreateEncoderWithPathHandler()
+        ioc.initialize(self.interpreted)
+        self.compiled = CreateEncoderWithPathHandler()
+        self.compiled.batchSize = 2
+        ioc.initialize(self.compiled)
+
+        self.users = []
+        for k in range(5):
+            user = User()
+            user.Id, user.Name, user.Group = k, 'User %s' % k, k % 2
+            if k % 2: user.Flags = ['flag %s' % k, 'other']
+            else: user.Avatar = 'avatar/%s' % k
+            self.users.append(user)
+
+    def dataModels(self):
+        yield DataModel()
+        yield DataModel(filter={'Id', 'Flags', 'Avatar'})
+        yield DataModel(filter={'Id', 'Group'}, datas={'Group': DataModel()})
+        yield DataModel(datas={'Group': DataModel(filter={'Id'})})
+
+    def encode(self, encoder, value, dataModel):
+        render = RenderToObject()
+        resolve = Resolve(encoder)
+        resolve.request(value=value, render=render, converter=ConverterPath(), converterId=ConverterPath(),
+                        normalizer=ConverterPath(), encoderPath=EncoderPath(), dataModel=dataModel).doAll()
+        return render.obj
+
+    def testCompiled(self):
+        encoder = self.compiled.encoderCompiledFor(typeFor(User))
+        self.assertIsInstance(encoder, EncodeModel)
+        self.assertIsNotNone(encoder.compiled)
+        self.assertIsNotNone(encoder.properties['Group'].compiled)
+        self.assertIsNone(self.interpreted.encoderFor(typeFor(User)).compiled)
+
+        encoder = self.compiled.encoderCompiledFor(typeFor(List(User)))
+        self.assertIsInstance(encoder, EncodeCollectionBatch)
+        self.assertIsInstance(encoder.exploitItem, EncodeModel)
+        self.assertIsNotNone(encoder.exploitItem.compiled)
+
+    def testModel(self):
+        for dataModel in self.dataModels():
+            for user in self.users:
+                interpreted = self.encode(self.interpreted.encoderFor(typeFor(User)), user, dataModel)
+                compiled = self.encode(self.compiled.encoderCompiledFor(typeFor(User)), user, dataModel)
+                self.assertTrue(interpreted)
+                self.assertEqual(interpreted, compiled)
+
+        dataModel = DataModel(filter={'Id', 'Avatar'})
+        self.assertEqual({'Id': '0', 'Avatar': {'href': 'http://localhost/avatar/0'}},
+                         self.encode(self.compiled.encoderCompiledFor(typeFor(User)), self.users[0], dataModel))
+
+    def testCollection(self):
+        for dataModel in self.dataModels():
+            interpreted = self.encode(self.interpreted.encoderFor(typeFor(List(User))), self.users, dataModel)
+            compiled = self.encode(self.compiled.encoderCompiledFor(typeFor(List(User))), self.users, dataModel)
+            self.assertEqual(5, len(interpreted['UserList']))
+            self.assertEqual(interpreted, compiled)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,151 @@
+'''
+Created on Mar 14, 2013
+
+@package: ally core http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Fetcher testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model, service, call, GET
+from ally.api.extension import IterPart
+from ally.api.type import typeFor, Iter, List
+from ally.container import ioc
+from ally.core.http.impl.processor.fetcher import FetcherHandler, \
+    FetcherInvoker, Fetcher
+from ally.core.impl.invoker import InvokerCall, InvokerFunction
+from ally.core.spec.resources import Invoker
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class User:
+    Id = int
+    Name = str
+
+@model(id='Id')
+class Post:
+    Id = int
+    Author = User
+
+@service
+class IUserService:
+
+    @call(fetchBatch='getUsers')
+    def getUser(self, id:User.Id) -> User:
+        '''
+        '''
+
+    @call
+    def getUsers(self, ids:List(User.Id)) -> Iter(User):
+        '''
+        '''
+
+    @call(fetchBatch='getNames')
+    def getNamed(self, id:User.Id) -> User:
+        '''
+        '''
+
+    @call
+    def getNames(self, ids:List(User.Id)) -> Iter(str):
+        '''
+        '''
+
+    @call(fetchBatch='getMissing')
+    def getUnknown(self, id:User.Id) -> User:
+        '''
+        '''
+
+class UserService(IUserService):
+
+    def __init__(self):
+        self.calls = []
+
+    def getUser(self, id):
+        self.calls.append(('getUser', id))
+        return self.userFor(id)
+
+    def getUsers(self, ids):
+        self.calls.append(('getUsers', sorted(ids)))
+        # The user with id 3 is not provided by the batch getter.
+        return [self.userFor(id) for id in ids if id != 3]
+
+    def getNamed(self, id): return self.userFor(id)
+
+    def getNames(self, ids): return ['User %s' % id for id in ids]
+
+    def getUnknown(self, id): return self.userFor(id)
+
+    def userFor(self, id):
+        user = User()
+        user.Id, user.Name = id, 'User %s' % id
+        return user
+
+# --------------------------------------------------------------------
+
+class TestFetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.handler = FetcherHandler()
+        ioc.initialize(self.handler)
+        self.service = UserService()
+
+    def invokerFor(self, name):
+        return InvokerCall(self.service, typeFor(IUserService).service.calls[name])
+
+    def testBatchFor(self):
+        batch = self.handler.batchFor(self.invokerFor('getUser'), typeFor(User))
+        self.assertIsInstance(batch, Invoker)
+        self.assertEqual('getUsers', batch.name)
+
+        self.assertIsNone(self.handler.batchFor(self.invokerFor('getUsers'), typeFor(User)))
+        # The hinted call has to return the fetched models.
+        self.assertIsNone(self.handler.batchFor(self.invokerFor('getNamed'), typeFor(User)))
+        self.assertIsNone(self.handler.batchFor(self.invokerFor('getUnknown'), typeFor(User)))
+
+    def testFetchBatch(self):
+        invoker = self.invokerFor('getUser')
+        fetcherInvoker = FetcherInvoker(InvokerFunction(GET, lambda: None, typeFor(Iter(Post)), [], {}))
+        fetcherInvoker.addFetch(Post.Author, invoker, [None], self.handler.batchFor(invoker, typeFor(User)),
+                                typeFor(User))
+
+        posts = []
+        for k, author in enumerate((1, 2, 1, 3, None)):
+            post = Post()
+            post.Id, post.Author = k, author
+            posts.append(post)
+        fetcher = Fetcher(fetcherInvoker, ())
+        fetcher.result = IterPart(posts, 10)
+
+        names = [fetcher.fetch(Post.Author, post.Author).Name for post in posts if post.Author is not None]
+        self.assertEqual(['User 1', 'User 2', 'User 1', 'User 3'], names)
+        # One batch call for all the authors, the author not provided by the batch getter is fetched by id.
+        self.assertEqual([('getUsers', [1, 2, 3]), ('getUser', 3)], self.service.calls)
+
+    def testFetchNoBatch(self):
+        invoker = self.invokerFor('getUser')
+        fetcherInvoker = FetcherInvoker(InvokerFunction(GET, lambda: None, typeFor(Iter(Post)), [], {}))
+        fetcherInvoker.addFetch(Post.Author, invoker, [None])
+
+        post = Post()
+        post.Id, post.Author = 1, 1
+        fetcher = Fetcher(fetcherInvoker, ())
+        fetcher.result = [post]
+
+        self.assertEqual('User 1', fetcher.fetch(Post.Author, 1).Name)
+        self.assertEqual('User 1', fetcher.fetch(Post.Author, 1).Name)
+        self.assertEqual([('getUser', 1)], self.service.calls)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -17,7 +17,7 @@ from ally.core.http.spec.transform.support_model import DataModel, NO_MODEL_PATH
     IFetcher
 from ally.core.impl.processor import encoder
 from ally.core.impl.processor.encoder import CreateEncoderHandler, EncodeObject, \
-    EncodeCollection
+    EncodeCollection, compilePrimitive
 from ally.core.spec.resources import Path, Normalizer, Invoker
 from ally.core.spec.transform.exploit import handleExploitError
 from ally.core.spec.transform.render import IRender
@@ -290,7 +290,7 @@ class CreateEncoderWithPathHandler(CreateEncoderHandler):
         exploits = cache.get(reference)
         if exploits is None:
             data.fetchReference = reference
-            data.fetchEncode = mencode = self.encoderFor(encode.modelType)
+            data.fetchEncode = mencode = self.encoderCompiledFor(encode.modelType)
             data.fetchData = mdata = self.createDataModel(mencode, data.path, True, False)
             assert isinstance(mdata, DataModel)
             exploits = cache[reference] = self.exploitsFor(mencode, mdata, normalizer)
@@ -314,6 +314,15 @@ class CreateEncoderWithPathHandler(CreateEncoderHandler):
 
     # ----------------------------------------------------------------
 
+    def compileEncoder(self, exploit):
+        '''
+        @see: CreateEncoderHandler.compileEncoder
+        '''
+        if isinstance(exploit, EncodeModel): compileModel(exploit)
+        elif isinstance(exploit, EncodeCollection) and isinstance(exploit.exploitItem, EncodeModel):
+            compileModel(exploit.exploitItem)
+        return super().compileEncoder(exploit)
+
     def encoderItem(self, ofType):
         '''
         @see: EncoderHandler.encoderItem
@@ -360,7 +369,7 @@ class EncodeModel(EncodeObject):
     '''
     Exploit for model encoding.
     '''
-    __slots__ = ('encoder', 'modelType')
+    __slots__ = ('encoder', 'modelType', 'compiled')
 
     def __init__(self, encoder, modelType, getter=None):
         '''
@@ -378,6 +387,7 @@ class EncodeModel(EncodeObject):
 
         self.encoder = encoder
         self.modelType = modelType
+        self.compiled = None
 
     def __call__(self, value, render, normalizer, encoderPath, name=None, dataModel=None, fetcher=None, **data):
         assert isinstance(render, IRender), 'Invalid render %s' % render
@@ -415,11 +425,15 @@ class EncodeModel(EncodeObject):
 
         render.objectStart(normalizer.normalize(name or self.name), attrs)
 
-        for nameProp, encodeProp in self.properties.items():
-            if DataModel.filter in dataModel and nameProp not in dataModel.filter: continue
-            if DataModel.datas in dataModel: data.update(dataModel=dataModel.datas.get(nameProp))
-            try: encodeProp(name=nameProp, **data)
-            except: handleExploitError(encodeProp)
+        if self.compiled is not None:
+            self.compiled(value, data, dataModel.filter if DataModel.filter in dataModel else None,
+                          dataModel.datas if DataModel.datas in dataModel else None)
+        else:
+            for nameProp, encodeProp in self.properties.items():
+                if DataModel.filter in dataModel and nameProp not in dataModel.filter: continue
+                if DataModel.datas in dataModel: data.update(dataModel=dataModel.datas.get(nameProp))
+                try: encodeProp(name=nameProp, **data)
+                except: handleExploitError(encodeProp)
 
         # The accessible paths are already updated when the model path is updated.
         if DataModel.accessible in dataModel:
@@ -519,3 +533,40 @@ class EncodePath:
         attrs = {normalizer.normalize(self.nameRef):encoderPath.encode(value)}
         render.objectStart(name, attrs)
         render.objectEnd()
+
+# --------------------------------------------------------------------
+
+def compileModel(exploit):
+    '''
+    Compiles the properties encoding of the provided model exploit into a python function that is set as the compiled
+    function of the exploit, the model exploits of the properties are also compiled. The primitive properties are
+    rendered directly by the compiled function and any other property exploit is called just like the interpreted
+    model exploit does.
+    
+    @param exploit: EncodeModel
+        The model exploit to compile.
+    '''
+    assert isinstance(exploit, EncodeModel), 'Invalid exploit %s' % exploit
+    if exploit.compiled is not None: return
+
+    namespace = dict(handleExploitError=handleExploitError)
+    code = ['def encode(value, data, filter, datas):',
+            "    render, normalizer = data['render'], data['normalizer']",
+            "    converter, converterId = data.get('converter'), data.get('converterId')"]
+    for k, (nameProp, encodeProp) in enumerate(exploit.properties.items()):
+        namespace['e%s' % k] = encodeProp
+        code.append('    if filter is None or %r in filter:' % nameProp)
+        code.append('        try:')
+
+        lines = compilePrimitive(encodeProp, nameProp, k, namespace, '            ')
+        if lines is None:
+            if isinstance(encodeProp, EncodeModel): compileModel(encodeProp)
+            code.append('            if datas is not None: data.update(dataModel=datas.get(%r))' % nameProp)
+            code.append('            e%s(name=%r, **data)' % (k, nameProp))
+        else: code.extend(lines)
+
+        code.append('        except: handleExploitError(e%s)' % k)
+    if len(code) == 3: code.append('    pass')
+
+    exec(compile('\n'.join(code), '<encoder model %s>' % exploit.name, 'exec'), namespace)
+    exploit.compiled = namespace['encode']
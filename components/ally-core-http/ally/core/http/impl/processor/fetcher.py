@@ -9,10 +9,14 @@ Created on Jul 31, 2012
 Provides the standard headers handling.
 '''
 
-from ally.api.operator.type import TypeModelProperty, TypeModel
-from ally.api.type import Input, typeFor, TypeClass, Type
+from ally.api.config import GET
+from ally.api.extension import IterPart
+from ally.api.operator.container import Call
+from ally.api.operator.type import TypeModelProperty, TypeModel, TypeService
+from ally.api.type import Input, typeFor, TypeClass, Type, List, Iter
 from ally.container.ioc import injected
 from ally.core.http.spec.transform.support_model import DataModel, IFetcher
+from ally.core.impl.invoker import InvokerCall
 from ally.core.spec.resources import Path, Node, Invoker, INodeInvokerListener
 from ally.design.processor.attribute import requires
 from ally.design.processor.context import Context
@@ -52,12 +56,15 @@ class FetcherHandler(HandlerProcessorProceed, INodeInvokerListener):
     Implementation for a handler that provides the fetcher used in getting the filtered models.
     '''
     typeResponse = TypeClass(Response)
+    hintCallFetchBatch = 'fetchBatch'
+    # The get call hint that provides the name of the service call used for fetching the models for a list of ids.
 
     def __init__(self):
         '''
         Construct the encoder.
         '''
         assert isinstance(self.typeResponse, Type), 'Invalid type response %s' % self.typeResponse
+        assert isinstance(self.hintCallFetchBatch, str), 'Invalid fetch batch hint name %s' % self.hintCallFetchBatch
         super().__init__()
 
         self._cache = WeakKeyDictionary()
@@ -123,7 +130,7 @@ class FetcherHandler(HandlerProcessorProceed, INodeInvokerListener):
                                 log.warning('Cannot locate any input main invoker %s input for invoker %s and input %s',
                                             invokerMain, invoker, inp)
                                 break
-                    else: fetcher.addFetch(reference, invoker, indexes)
+                    else: fetcher.addFetch(reference, invoker, indexes, self.batchFor(invoker, modelType), modelType)
 
                 fetcher.inputs.append(Input('$response', self.typeResponse, True, None))
 
@@ -156,6 +163,58 @@ class FetcherHandler(HandlerProcessorProceed, INodeInvokerListener):
 
         return fetch
 
+    def batchFor(self, invoker, modelType):
+        '''
+        Provides the batch getter for the get invoker, the batch getter is the service call hinted by the get call that
+        has the same inputs as the get call but instead of the model id it takes a list of ids and returns an iterable
+        of the found models.
+        
+        @param invoker: Invoker
+            The get invoker to provide the batch getter for.
+        @param modelType: TypeModel
+            The model type provided by the get invoker.
+        @return: Invoker|None
+            The batch getter invoker or None if the get invoker has no valid batch getter.
+        '''
+        assert isinstance(invoker, Invoker), 'Invalid invoker %s' % invoker
+        assert isinstance(modelType, TypeModel), 'Invalid model type %s' % modelType
+        name = invoker.hints.get(self.hintCallFetchBatch)
+        if not name: return
+        assert isinstance(name, str), 'Invalid fetch batch hint %s' % name
+
+        get = invoker
+        while not isinstance(get, InvokerCall):
+            get = getattr(get, 'invoker', None)
+            if get is None:
+                log.warning('Cannot locate the service implementation for the fetch batch \'%s\' of %s', name, invoker)
+                return
+        assert isinstance(get, InvokerCall)
+
+        typeService = typeFor(get.implementation)
+        assert isinstance(typeService, TypeService), 'Invalid service implementation %s' % get.implementation
+        call = typeService.service.calls.get(name)
+        if call is None:
+            log.warning('There is no call \'%s\' in %s for the fetch batch of %s', name, typeService, invoker)
+            return
+        assert isinstance(call, Call)
+
+        valid = call.method == GET and len(call.inputs) == len(get.inputs) and isinstance(call.output, Iter) \
+        and call.output.itemType == modelType
+        if valid:
+            for inp, inpBatch in zip(get.inputs, call.inputs):
+                assert isinstance(inp, Input)
+                assert isinstance(inpBatch, Input)
+                if isinstance(inp.type, TypeModelProperty) and inp.type.parent == modelType:
+                    valid = isinstance(inpBatch.type, List) and inpBatch.type.itemType == inp.type
+                else: valid = inpBatch.type == inp.type
+                if not valid: break
+        if not valid:
+            log.warning('Invalid call %s for the fetch batch of %s, expected a get call with a list of ids instead of '
+                        'the model id that returns an iterable of %s', call, invoker, modelType)
+            return
+
+        return InvokerCall(get.implementation, call)
+
     # ----------------------------------------------------------------
 
     def onInvokerChange(self, node, old, new):
@@ -200,7 +259,7 @@ class FetcherInvoker(Invoker):
 
         return len(self.inputs) - 1
 
-    def addFetch(self, reference, invoker, indexes):
+    def addFetch(self, reference, invoker, indexes, batch=None, modelType=None):
         '''
         Add a new reference entry in the fetcher.
         
@@ -211,12 +270,18 @@ class FetcherInvoker(Invoker):
         @param indexes: list[integer]
             The indexes in the invoker arguments to be used for the invoker at fetching, basically all the indexes of
             the arguments (beside of the model id one which is None in the indexes) to be used for call the invoker.
+        @param batch: Invoker|None
+            The batch getter that provides the models for a list of ids, invoked with the same arguments as the invoker.
+        @param modelType: TypeModel|None
+            The model type fetched, required if a batch getter is provided.
         '''
         assert isinstance(invoker, Invoker), 'Invalid invoker %s' % invoker
         assert isinstance(indexes, list), 'Invalid indexes list %s' % indexes
+        assert batch is None or isinstance(batch, Invoker), 'Invalid batch getter %s' % batch
+        assert batch is None or isinstance(modelType, TypeModel), 'Invalid model type %s' % modelType
 
         self.references[reference] = len(self.invokers)
-        self.invokers.append((invoker, indexes))
+        self.invokers.append((invoker, indexes, batch, modelType))
 
     def invoke(self, *args):
         '''
@@ -224,14 +289,16 @@ class FetcherInvoker(Invoker):
         '''
         response = args[-1]
         assert isinstance(response, Response), 'Invalid response %s' % response
-        response.encoderData.update(fetcher=Fetcher(self, args))
-        return self.invoker.invoke(*args[:len(self.invoker.inputs)])
+        fetcher = Fetcher(self, args)
+        response.encoderData.update(fetcher=fetcher)
+        fetcher.result = self.invoker.invoke(*args[:len(self.invoker.inputs)])
+        return fetcher.result
 
 class Fetcher(IFetcher):
     '''
     The fetcher implementation.
     '''
-    __slots__ = ('fetcher', 'args', '_cache')
+    __slots__ = ('fetcher', 'args', 'result', '_cache')
 
     def __init__(self, fetcher, args):
         '''
@@ -242,6 +309,7 @@ class Fetcher(IFetcher):
 
         self.fetcher = fetcher
         self.args = args
+        self.result = None
 
         self._cache = {}
 
@@ -250,7 +318,17 @@ class Fetcher(IFetcher):
         @see: IFetcher.fetch
         '''
         value, values = self, self._cache.get(reference)
-        if values is None: values = self._cache[reference] = {}
+        if values is None:
+            values = self._cache[reference] = {}
+            fetcher = self.fetcher
+            assert isinstance(fetcher, FetcherInvoker)
+            
+            index = fetcher.references.get(reference)
+            if index is not None:
+                invoker, indexes, batch, modelType = fetcher.invokers[index]
+                if batch is not None:
+                    values.update(self.fetchBatch(reference, batch, indexes, modelType))
+                    value = values.get(valueId, value)
         else: value = values.get(valueId, value)
         if value is self:
             fetcher = self.fetcher
@@ -259,7 +337,7 @@ class Fetcher(IFetcher):
             index = fetcher.references.get(reference)
             if index is None: value = None
             else:
-                invoker, indexes = fetcher.invokers[index]
+                invoker, indexes, _batch, _modelType = fetcher.invokers[index]
                 assert isinstance(invoker, Invoker)
 
                 value = invoker.invoke(*(valueId if k is None else self.args[k] for k in indexes))
@@ -267,3 +345,41 @@ class Fetcher(IFetcher):
 
         return value
 
+    def fetchBatch(self, reference, batch, indexes, modelType):
+        '''
+        Fetches with one batch call all the models for the reference values found in the invoker result, only the result
+        models that are directly in the result collection are used, the other models are fetched one by one.
+        
+        @param reference: Reference
+            The reference of the models to fetch.
+        @param batch: Invoker
+            The batch getter.
+        @param indexes: list[integer]
+            The indexes in the invoker arguments to be used for the batch getter.
+        @param modelType: TypeModel
+            The model type fetched.
+        @return: dictionary{object, object}
+            The fetched models indexed by the model id.
+        '''
+        assert isinstance(batch, Invoker), 'Invalid batch getter %s' % batch
+        assert isinstance(modelType, TypeModel), 'Invalid model type %s' % modelType
+        typeReference = typeFor(reference)
+        if not isinstance(typeReference, TypeModelProperty): return ()
+        assert isinstance(typeReference, TypeModelProperty)
+        
+        items = self.result.wrapped if isinstance(self.result, IterPart) else self.result
+        # Only collections that can be iterated again are used since the result still needs to be encoded.
+        if not isinstance(items, (list, tuple)): return ()
+        
+        clazz, name = typeReference.parent.clazz, typeReference.property
+        ids = set()
+        for item in items:
+            if isinstance(item, clazz):
+                valueId = getattr(item, name)
+                if valueId is not None: ids.add(valueId)
+        if len(ids) < 2: return ()
+        
+        ids, nameId = list(ids), modelType.container.propertyId
+        models = batch.invoke(*(ids if k is None else self.args[k] for k in indexes))
+        return ((getattr(model, nameId), model) for model in models)
+
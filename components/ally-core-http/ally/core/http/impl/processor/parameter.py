@@ -11,7 +11,8 @@ Provides the parameters handler.
 
 from ally.api.criteria import AsOrdered
 from ally.api.operator.container import Criteria, Query
-from ally.api.operator.type import TypeQuery, TypeCriteriaEntry, TypeCriteria
+from ally.api.operator.type import TypeQuery, TypeCriteriaEntry, TypeCriteria, \
+    TypeModelProperty
 from ally.api.type import Input, Type, Iter, typeFor
 from ally.container.ioc import injected
 from ally.core.http.spec.codes import PARAMETER_ILLEGAL
@@ -396,7 +397,7 @@ class ParameterHandler(HandlerProcessorProceed, INodeInvokerListener):
             typeInp = inp.type
             assert isinstance(typeInp, Type)
 
-            if typeInp.isPrimitive:
+            if typeInp.isPrimitive or isPropertyList(typeInp):
                 if isinstance(typeInp, Iter):
                     assert isinstance(typeInp, Iter)
 
@@ -671,7 +672,7 @@ class ParameterHandler(HandlerProcessorProceed, INodeInvokerListener):
             typeInp = inp.type
             assert isinstance(typeInp, Type)
 
-            if typeInp.isPrimitive:
+            if typeInp.isPrimitive or isPropertyList(typeInp):
                 children[inp.name] = self.encodePrimitive(typeInp, getterOnDict(inp.name))
 
             elif isinstance(typeInp, TypeQuery):
@@ -713,3 +714,20 @@ class ParameterHandler(HandlerProcessorProceed, INodeInvokerListener):
             return target
 
         return exploit
+
+# --------------------------------------------------------------------
+
+def isPropertyList(typeInp):
+    '''
+    Checks if the type is a list of model properties with primitive values, like a list of ids, this lists are provided
+    as parameters just like the primitive lists.
+    
+    @param typeInp: Type
+        The type to check.
+    @return: boolean
+        True if the type is a list of primitive model properties, False otherwise.
+    '''
+    assert isinstance(typeInp, Type), 'Invalid type %s' % typeInp
+    if not isinstance(typeInp, Iter): return False
+    assert isinstance(typeInp, Iter)
+    return isinstance(typeInp.itemType, TypeModelProperty) and typeInp.itemType.type.isPrimitive
@@ -21,6 +21,7 @@ from ally.design.processor.context import Context
 from ally.design.processor.handler import HandlerProcessorProceed
 from ally.http.spec.server import IDecoderHeader, IEncoderHeader
 from ally.internationalization import _
+from ally.support.util import CacheLRU
 from babel import numbers as bn, dates as bd
 from babel.core import Locale
 from datetime import datetime
@@ -121,6 +122,8 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
                DateTime:'short'
                }
     # The default formats.
+    cacheSize = 100
+    # The maximum number of parsed locales and prepared converters to cache.
 
     def __init__(self):
         assert isinstance(self.normalizer, Normalizer), 'Invalid normalizer %s' % self.normalizer
@@ -129,8 +132,13 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
         assert isinstance(self.formatContentNameX, str), 'Invalid name content format %s' % self.formatContentNameX
         assert isinstance(self.formats, dict), 'Invalid formats %s' % self.formats
         assert isinstance(self.defaults, dict), 'Invalid defaults %s' % self.defaults
+        assert isinstance(self.cacheSize, int) and self.cacheSize > 0, 'Invalid cache size %s' % self.cacheSize
         super().__init__()
 
+        self._localeDefault = Locale.parse(self.languageDefault)
+        self._locales = CacheLRU(self.cacheSize)
+        self._converters = CacheLRU(self.cacheSize)
+
     def process(self, request:RequestDecode, response:ResponseDecode, **keyargs):
         '''
         @see: HandlerProcessorProceed.process
@@ -149,14 +157,14 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
 
         locale = None
         if RequestDecode.language in request and request.language is not None:
-            try: locale = Locale.parse(request.language, sep='-')
-            except: assert log.debug('Invalid request content language %s', request.language) or True
+            locale = self.localeFor(request.language)
+            if locale is None: assert log.debug('Invalid request content language %s', request.language) or True
 
         if locale is None:
             if RequestDecode.language in request: request.language = self.languageDefault
-            locale = Locale.parse(self.languageDefault)
+            locale = self._localeDefault
 
-        try: formats = self.processFormats(locale, formats)
+        try: request.converter = self.converterFor(locale, formats)
         except FormatError as e:
             assert isinstance(e, FormatError)
             if response.isSuccess is False: return  # Skip in case the response is in error
@@ -165,7 +173,6 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
             response.errorMessage = 'Bad request content formatting, %s' % e.message
             return
 
-        request.converter = ConverterBabel(locale, formats)
         request.normalizer = self.normalizer
 
         formats = {}
@@ -175,21 +182,21 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
 
         locale = None
         if response.language:
-            try: locale = Locale.parse(response.language, sep='-')
-            except: assert log.debug('Invalid response content language %s', response.language) or True
+            locale = self.localeFor(response.language)
+            if locale is None: assert log.debug('Invalid response content language %s', response.language) or True
 
         if locale is None:
             if RequestDecode.accLanguages in request and request.accLanguages is not None:
                 for lang in request.accLanguages:
-                    try: locale = Locale.parse(lang, sep='-')
-                    except:
+                    locale = self.localeFor(lang)
+                    if locale is None:
                         assert log.debug('Invalid accepted content language %s', lang) or True
                         continue
                     assert log.debug('Accepted language %s for response', locale) or True
                     break
 
             if locale is None:
-                locale = Locale.parse(self.languageDefault)
+                locale = self._localeDefault
                 if RequestDecode.accLanguages in request:
                     if request.accLanguages is not None:
                         request.accLanguages.insert(0, self.languageDefault)
@@ -205,7 +212,7 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
             if RequestDecode.argumentsOfType in request and request.argumentsOfType is not None:
                 request.argumentsOfType[TypeLocale] = response.language
 
-        try: formats = self.processFormats(locale, formats)
+        try: response.converter = self.converterFor(locale, formats)
         except FormatError as e:
             assert isinstance(e, FormatError)
             if response.isSuccess is False: return  # Skip in case the response is in error
@@ -214,11 +221,50 @@ class BabelConversionDecodeHandler(HandlerProcessorProceed):
             response.errorMessage = 'Bad content formatting for response, %s' % e.message
             return
 
-        response.converter = ConverterBabel(locale, formats)
         response.normalizer = self.normalizer
 
     # ----------------------------------------------------------------
 
+    def localeFor(self, language):
+        '''
+        Provides the locale for the language, the parsed locales are cached.
+        
+        @param language: string
+            The language to provide the locale for.
+        @return: Locale|None
+            The locale for the language or None if the language is not valid.
+        '''
+        assert isinstance(language, str), 'Invalid language %s' % language
+
+        locale = self._locales.get(language)
+        if locale is None:
+            try: locale = Locale.parse(language, sep='-')
+            except: locale = False
+            self._locales.set(language, locale)
+        return locale or None
+
+    def converterFor(self, locale, formats):
+        '''
+        Provides the converter for the locale and formats, the prepared converters are cached, the converters that fail
+        the formats processing are not cached.
+        
+        @param locale: Locale
+            The locale of the converter.
+        @param formats: dictionary{class, string}
+            The formats specified for the converter.
+        @return: ConverterBabel
+            The converter.
+        '''
+        assert isinstance(locale, Locale), 'Invalid locale %s' % locale
+        assert isinstance(formats, dict), 'Invalid formats %s' % formats
+
+        key = (str(locale), frozenset(formats.items()))
+        converter = self._converters.get(key)
+        if converter is None:
+            converter = ConverterBabel(locale, self.processFormats(locale, formats))
+            self._converters.set(key, converter)
+        return converter
+
     def processFormats(self, locale, formats):
         '''
         Process the formats to a complete list of formats that will be used by conversion.
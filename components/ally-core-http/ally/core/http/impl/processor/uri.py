@@ -17,7 +17,7 @@ from ally.design.processor.attribute import requires, defines, optional
 from ally.design.processor.context import Context
 from ally.design.processor.handler import HandlerProcessorProceed
 from ally.http.spec.codes import PATH_FOUND, PATH_NOT_FOUND
-from ally.support.core.util_resources import findPath
+from ally.support.core.util_resources import IndexPaths
 from urllib.parse import unquote
 import logging
 from ally.core.impl.node import NodeProperty
@@ -100,6 +100,8 @@ class URIHandler(HandlerProcessorProceed):
         assert isinstance(self.resourcesRoot, Node), 'Invalid resources node %s' % self.resourcesRoot
         assert isinstance(self.converterPath, ConverterPath), 'Invalid ConverterPath object %s' % self.converterPath
         super().__init__()
+        
+        self._index = IndexPaths(self.resourcesRoot, self.converterPath)
 
     def process(self, request:Request, response:Response, responseCnt:ResponseContent, **keyargs):
         '''
@@ -126,7 +128,7 @@ class URIHandler(HandlerProcessorProceed):
         paths = [unquote(p) for p in paths if p]
 
         if request.extension: responseCnt.type = request.extension
-        request.path = findPath(self.resourcesRoot, paths, self.converterPath)
+        request.path = self._index.findPath(paths)
         assert isinstance(request.path, Path), 'Invalid path %s' % request.path
         node = request.path.node
         if not node:
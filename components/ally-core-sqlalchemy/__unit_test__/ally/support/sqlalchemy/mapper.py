@@ -18,8 +18,13 @@ if True:
 
 from ally.api.config import model
 from ally.api.type import typeFor
+from ally.container.binder_op import onCallValidateModel
+from ally.exception import InputError
 from ally.support.sqlalchemy.mapper import mapperSimple, validate, \
-    DeclarativeMetaModel
+    DeclarativeMetaModel, mapperModel
+from ally.support.sqlalchemy import mapper
+from ally.support.sqlalchemy.session import beginWith, endCurrent, rollback
+from sqlalchemy import event
 from sqlalchemy.dialects.mysql.base import INTEGER
 from sqlalchemy.engine import create_engine
 from sqlalchemy.ext.declarative import declarative_base
@@ -28,6 +33,7 @@ from sqlalchemy.orm.session import sessionmaker
 from sqlalchemy.schema import Table, Column, MetaData, ForeignKey
 from sqlalchemy.sql.expression import case
 from sqlalchemy.types import String
+from threading import Thread
 import unittest
 
 # --------------------------------------------------------------------
@@ -124,12 +130,30 @@ UserWithParent = mapperSimple(UserWithParent, tableUserParent, inherits=UserMapp
 
 # --------------------------------------------------------------------
 
+tableMember = Table('member', meta,
+                    Column('id', INTEGER(unsigned=True), primary_key=True, key='Id'),
+                    Column('name', String(20), nullable=False, unique=True, key='Name'),
+                    Column('fk_parent_id', INTEGER(unsigned=True), ForeignKey(tableParent.c.Id), key='Parent'))
+
+@model(id='Id')
+class Member:
+    '''
+    A model with an unique property and a foreign key.
+    '''
+    Id = int
+    Name = str
+    Parent = Parent
+
+Member = mapperModel(Member, tableMember)
+
+# --------------------------------------------------------------------
+
 class TestMapping(unittest.TestCase):
 
     def setUp(self):
-        engine = create_engine('sqlite:///:memory:')
-        self.sessionCreate = sessionmaker(bind=engine)
-        meta.create_all(engine)
+        self.engine = create_engine('sqlite:///:memory:')
+        self.sessionCreate = sessionmaker(bind=self.engine)
+        meta.create_all(self.engine)
 
     def testSuccesSimpleMapping(self):
         self.assertTrue(typeFor(UserMapped.Id).isOf(int))
@@ -209,6 +233,75 @@ class TestMapping(unittest.TestCase):
         self.assertEqual(user.Parent, 1)
         session.close()
 
+    def testValidationSingleQuery(self):
+        session = self.sessionCreate()
+        session.execute(tableParent.insert().values(Id=1, Name='Parent'))
+        member = Member()
+        member.Name = 'Existing'
+        session.add(member)
+        session.commit()
+        session.close()
+
+        statements = []
+        def onExecute(conn, cursor, statement, *args): statements.append(statement)
+        event.listen(self.engine, 'before_cursor_execute', onExecute)
+        beginWith(self.sessionCreate)
+        try:
+            member = Member()
+            member.Name = 'Existing'
+            member.Parent = 2
+            try: onCallValidateModel(True, {0: typeFor(Member)}, (member,), {})
+            except InputError as e: errors = {(ref.property, ref.message) for ref in e.message}
+            else: self.fail('No validation errors')
+            self.assertEqual(errors, {('Name', 'Already an entry with this value'), ('Parent', 'Unknown foreign id')})
+            self.assertEqual(len(statements), 1)
+
+            del statements[:]
+            member.Name = 'New'
+            member.Parent = 1
+            onCallValidateModel(True, {0: typeFor(Member)}, (member,), {})
+            self.assertEqual(len(statements), 1)
+
+            del statements[:]
+            member.Id = 1
+            member.Name = 'Existing'
+            onCallValidateModel(False, {0: typeFor(Member)}, (member,), {})
+            self.assertEqual(len(statements), 1)
+        finally: endCurrent(rollback)
+
+    def testValidationResultsCleared(self):
+        session = self.sessionCreate()
+        session.execute(tableParent.insert().values(Id=1, Name='Parent'))
+        session.commit()
+        session.close()
+
+        beginWith(self.sessionCreate)
+        try:
+            member = Member()
+            # The name is too long so the name unique check result is not consumed by the property validation.
+            member.Name = 'A name that is too long'
+            member.Parent = 2
+            try: onCallValidateModel(True, {0: typeFor(Member)}, (member,), {})
+            except InputError as e: errors = {(ref.property, ref.message) for ref in e.message}
+            else: self.fail('No validation errors')
+            self.assertEqual({'Name', 'Parent'}, {prop for prop, _message in errors})
+            self.assertEqual({}, mapper._constraints.results)
+
+            members = []
+            for name in ('First', 'Second'):
+                members.append(Member())
+                members[-1].Name, members[-1].Parent = name, 1
+            onCallValidateModel(True, {0: typeFor(Member), 1: typeFor(Member)}, members, {})
+            self.assertEqual({}, mapper._constraints.results)
+        finally: endCurrent(rollback)
+
+        # The results are kept for each thread.
+        results = []
+        thread = Thread(target=lambda: results.append(getattr(mapper._constraints, 'results', None)))
+        thread.start()
+        thread.join()
+        self.assertEqual([None], results)
+
 # --------------------------------------------------------------------
 
 if __name__ == '__main__':
@@ -0,0 +1,250 @@
+'''
+Created on Apr 15, 2013
+
+@package: ally core sql alchemy
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides unit testing for the sql alchemy query building.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from .samples.api.article_type import ArticleType as ArticleTypeModel
+from .samples.meta import meta
+from .samples.meta.article_type import ArticleType
+from ally.api.config import query
+from ally.api.criteria import AsRangeOrdered, AsLikeOrdered
+from ally.exception import InputError
+from ally.support.sqlalchemy.util_service import buildQuery, buildLimits, \
+    orderingFor, continuationFor, afterFor, countOf, updateAll, valuesIn, deleteIn, \
+    insertAll
+from sqlalchemy import event
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm import mapper, relationship
+from sqlalchemy.orm.session import sessionmaker
+from sqlalchemy.schema import MetaData, Table, Column, ForeignKey
+from sqlalchemy.types import Integer, String
+import unittest
+
+# --------------------------------------------------------------------
+
+@query(ArticleTypeModel)
+class QArticleTypeRange:
+    '''
+    Provides the query with range and like criteria.
+    '''
+    id = AsRangeOrdered
+    name = AsLikeOrdered
+
+metaDelete = MetaData()
+
+class Animal:
+    def __init__(self, Name): self.Name = Name
+
+class Dog(Animal):
+    def __init__(self, Name, Breed): self.Name, self.Breed = Name, Breed
+
+class Owner:
+    def __init__(self, Name, pets=()): self.Name, self.pets = Name, list(pets)
+
+class Pet:
+    def __init__(self, Name): self.Name = Name
+
+tableAnimal = Table('animal', metaDelete,
+                    Column('id', Integer, primary_key=True, key='Id'),
+                    Column('name', String(255), nullable=False, key='Name'))
+tableDog = Table('dog', metaDelete,
+                 Column('fk_animal_id', ForeignKey(tableAnimal.c.Id), primary_key=True, key='Id'),
+                 Column('breed', String(255), key='Breed'))
+tableOwner = Table('owner', metaDelete,
+                   Column('id', Integer, primary_key=True, key='Id'),
+                   Column('name', String(255), nullable=False, key='Name'))
+tablePet = Table('pet', metaDelete,
+                 Column('id', Integer, primary_key=True, key='Id'),
+                 Column('fk_owner_id', ForeignKey(tableOwner.c.Id), nullable=False, key='Owner'),
+                 Column('name', String(255), nullable=False, key='Name'))
+
+mapper(Animal, tableAnimal)
+mapper(Dog, tableDog, inherits=Animal, properties={'Id': [tableAnimal.c.Id, tableDog.c.Id]})
+mapper(Owner, tableOwner, properties={'pets': relationship(Pet, cascade='all, delete-orphan')})
+mapper(Pet, tablePet)
+
+# --------------------------------------------------------------------
+
+class TestBuildQuery(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine('sqlite:///:memory:')
+        meta.create_all(self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+        for name in ('Type C', 'Type A', 'Type B', 'Type D'): self.session.add(ArticleType(Name=name))
+        self.session.flush()
+
+    def tearDown(self):
+        self.session.close()
+
+    def ids(self, q, **keyargs):
+        return [e.Id for e in buildQuery(self.session.query(ArticleType), q, ArticleType, **keyargs).all()]
+
+    def testFilter(self):
+        q = QArticleTypeRange()
+        q.id.start = 2
+        q.id.end = 3
+        self.assertEqual(sorted(self.ids(q)), [2, 3])
+
+        q = QArticleTypeRange()
+        q.id.since = 1
+        q.id.end = 3
+        q.name.like = '%A'
+        self.assertEqual(self.ids(q), [2])
+        # The same query is built again from the cached mappings.
+        self.assertEqual(self.ids(q), [2])
+
+    def testOrderPriority(self):
+        q = QArticleTypeRange()
+        q.name.orderAsc()
+        q.name.priority = 1
+        q.id.orderDesc()
+        q.id.priority = 2
+        self.assertEqual(self.ids(q), [2, 3, 1, 4])
+
+        q = QArticleTypeRange()
+        q.name.orderAsc()
+        q.id.orderDesc()
+        q.id.priority = 1
+        self.assertEqual(self.ids(q), [4, 3, 2, 1])
+
+    def testOnlyExclude(self):
+        q = QArticleTypeRange()
+        q.id.start = 2
+        q.name.like = 'Type C'
+        self.assertEqual(self.ids(q), [])
+        self.assertEqual(sorted(self.ids(q, only='id')), [2, 3, 4])
+        self.assertEqual(sorted(self.ids(q, only=QArticleTypeRange.id)), [2, 3, 4])
+        self.assertEqual(self.ids(q, exclude=QArticleTypeRange.id), [1])
+        self.assertEqual(self.ids(q), [])
+
+    def testCount(self):
+        q = QArticleTypeRange()
+        q.name.orderAsc()
+        sql = buildQuery(self.session.query(ArticleType), q, ArticleType)
+        self.assertEqual(countOf(sql), 4)
+        self.assertEqual(countOf(sql, 2), 3)
+        self.assertEqual(countOf(sql, 10), 4)
+
+    def testKeyset(self):
+        q = QArticleTypeRange()
+        q.name.orderDesc()
+        keys = orderingFor(q, ArticleType)
+        self.assertEqual([(name, asc) for name, _column, asc in keys], [('Name', False)])
+
+        sql, ids, continuation = buildQuery(self.session.query(ArticleType), q, ArticleType), [], None
+        while True:
+            after, position = None, None
+            if continuation: position, after = afterFor(keys, continuation)
+            columns = [(column, asc) for _name, column, asc in keys]
+            entities = buildLimits(sql, position, 3, columns, after).all()
+            ids.extend(e.Id for e in entities)
+            if len(entities) < 3: break
+            continuation = continuationFor(keys, entities[-1], len(ids))
+        self.assertEqual(ids, [4, 1, 3, 2])
+        self.assertEqual(afterFor(keys, continuation), (3, ['Type B']))
+
+        q.name.orderAsc()
+        self.assertIsNone(afterFor(orderingFor(q, ArticleType), continuation))
+        self.assertIsNone(afterFor(keys, 'invalid'))
+
+    def testBulk(self):
+        entities = []
+        for id, name in ((1, 'Type E'), (3, 'Type F'), (4, None)):
+            entity = ArticleTypeModel()
+            entity.Id = id
+            if name: entity.Name = name
+            entities.append(entity)
+
+        statements = []
+        def onExecute(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith('UPDATE'): statements.append(executemany)
+        # The listener is used only by the connections created after the session commit.
+        self.session.commit()
+        event.listen(self.engine, 'before_cursor_execute', onExecute)
+
+        self.assertEqual(self.session.query(ArticleType).get(1).Name, 'Type C')
+        updateAll(self.session, ArticleType, entities)
+        self.assertEqual(statements, [True])
+        self.assertEqual([e.Name for e in self.session.query(ArticleType).order_by(ArticleType.Id)],
+                         ['Type E', 'Type A', 'Type F', 'Type D'])
+
+        self.assertEqual(valuesIn(self.session, ArticleType.Id, [1, 2, 5, 6, 2], 2), {1, 2})
+        self.assertEqual(deleteIn(self.session, ArticleType, ArticleType.Id, [1, 2, 5], 2), 2)
+        self.assertEqual([e.Id for e in self.session.query(ArticleType)], [3, 4])
+
+    def testInsertAll(self):
+        def entities(*names):
+            for name in names:
+                entity = ArticleTypeModel()
+                entity.Name = name
+                yield entity
+
+        statements = []
+        def onExecute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.split()[0])
+        # The listener is used only by the connections created after the session commit.
+        self.session.commit()
+        event.listen(self.engine, 'before_cursor_execute', onExecute)
+
+        self.assertEqual([e.Id for e in insertAll(self.session, ArticleType, list(entities('Type E', 'Type F')))],
+                         [5, 6])
+        # The entities are inserted with a single flush and no retry.
+        self.assertEqual(statements, ['SAVEPOINT', 'INSERT', 'INSERT', 'RELEASE'])
+
+        with self.assertRaises(InputError) as ctx:
+            insertAll(self.session, ArticleType, list(entities('Type G', 'Type A', 'Type H')))
+        self.assertEqual([ref.index for ref in ctx.exception.message], [1])
+        self.assertEqual(self.session.query(ArticleType).count(), 6)
+
+class TestDeleteIn(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        metaDelete.create_all(engine)
+        self.session = sessionmaker(bind=engine)()
+
+    def tearDown(self):
+        self.session.close()
+
+    def testInheritance(self):
+        dogs = [Dog('Dog %s' % k, 'Breed %s' % k) for k in range(5)]
+        self.session.add_all(dogs)
+        self.session.add(Animal('Cat'))
+        self.session.flush()
+
+        ids = [dogs[0].Id, dogs[2].Id, dogs[4].Id, 100]
+        self.assertEqual(deleteIn(self.session, Dog, Dog.Id, ids, 2), 3)
+        # The rows are deleted from both the inheriting table and the inherited table.
+        self.assertEqual(sorted(tuple(row) for row in self.session.execute(tableDog.select())),
+                         [(2, 'Breed 1'), (4, 'Breed 3')])
+        self.assertEqual([e.Name for e in self.session.query(Animal).order_by(Animal.Id)], ['Dog 1', 'Dog 3', 'Cat'])
+        self.assertNotIn(dogs[0], self.session)
+        self.assertIsNone(self.session.query(Dog).get(dogs[2].Id))
+
+    def testCascade(self):
+        owners = [Owner('Owner %s' % k, [Pet('Pet %s' % k), Pet('Other %s' % k)]) for k in range(3)]
+        self.session.add_all(owners)
+        self.session.flush()
+
+        self.assertEqual(deleteIn(self.session, Owner, Owner.Name, ['Owner 0', 'Owner 2', 'Missing'], 2), 2)
+        self.assertEqual([e.Name for e in self.session.query(Owner)], ['Owner 1'])
+        # The cascades of the mapping are applied on the deleted entities.
+        self.assertEqual(sorted(e.Name for e in self.session.query(Pet)), ['Other 1', 'Pet 1'])
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
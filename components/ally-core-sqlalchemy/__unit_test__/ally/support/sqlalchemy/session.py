@@ -0,0 +1,198 @@
+'''
+Created on Apr 16, 2013
+
+@package: ally core sql alchemy
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides unit testing for the session routing to the read replicas and for the session policies.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import service, call
+from ally.container.impl.proxy import proxyWrapFor
+from ally.exception import DevelError
+from ally.support.sqlalchemy.session import SessionSupport, SessionRouting, \
+    bindSession, setKeepAlive, endSessions, rollback, POLICY_EXPUNGE, \
+    POLICY_FLUSH, POLICY_READ
+from os.path import join
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm import mapper
+from sqlalchemy.orm.session import sessionmaker
+from sqlalchemy.schema import MetaData, Table, Column
+from sqlalchemy.sql.expression import select
+from sqlalchemy.types import String, Integer
+from tempfile import mkdtemp
+import shutil
+import unittest
+
+# --------------------------------------------------------------------
+
+meta = MetaData()
+tableItem = Table('item', meta,
+                  Column('id', Integer, primary_key=True),
+                  Column('name', String(20)))
+
+class ItemMapped:
+    '''
+    The mapped item.
+    '''
+mapper(ItemMapped, tableItem)
+
+@service
+class IItemService:
+
+    @call
+    def getName(self) -> str:
+        '''
+        '''
+
+    @call
+    def updateName(self, name:str) -> str:
+        '''
+        '''
+
+    @call
+    def getRenamed(self, name:str) -> str:
+        '''
+        '''
+
+    @call
+    def updateItem(self, name:str) -> str:
+        '''
+        '''
+
+class ItemService(SessionSupport, IItemService):
+
+    def getName(self):
+        '''
+        '''
+        return self.session().execute(select([tableItem.c.name])).scalar()
+
+    def updateName(self, name):
+        '''
+        '''
+        self.session().execute(tableItem.update().values(name=name))
+        # The nested read call is made in a transaction that has written.
+        return self.proxy.getName()
+
+    def getRenamed(self, name):
+        '''
+        '''
+        session = self.session()
+        read = session.execute(select([tableItem.c.name])).scalar()
+        session.execute(tableItem.update().values(name=name))
+        return '%s>%s' % (read, self.getName())
+
+    def updateItem(self, name):
+        '''
+        '''
+        # The item is kept referenced since the session identity map is weak referencing.
+        self.item = self.session().query(ItemMapped).get(1)
+        self.item.name = name
+        return self.item.name
+
+# --------------------------------------------------------------------
+
+class TestSession(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = mkdtemp()
+        engines = []
+        for name in ('primary', 'replica1', 'replica2'):
+            engine = create_engine('sqlite:///%s' % join(self.folder, '%s.db' % name))
+            meta.create_all(engine)
+            engine.execute(tableItem.insert().values(id=1, name=name))
+            engines.append(engine)
+        self.engines = engines
+
+        self.service = ItemService()
+        self.service.proxy = proxyWrapFor(self.service)
+        bindSession(self.service.proxy, sessionmaker(bind=engines[0], class_=SessionRouting, replicas=engines[1:]))
+
+    def tearDown(self):
+        for engine in self.engines: engine.dispose()
+        shutil.rmtree(self.folder)
+
+    def nameIn(self, engine):
+        return engine.execute(select([tableItem.c.name])).scalar()
+
+    def testRouting(self):
+        proxy = self.service.proxy
+        assert isinstance(proxy, IItemService)
+
+        self.assertIn(proxy.getName(), ('replica1', 'replica2'))
+        self.assertEqual(proxy.updateName('updated'), 'updated')
+        self.assertEqual(self.nameIn(self.engines[0]), 'updated')
+        self.assertEqual([self.nameIn(engine) for engine in self.engines[1:]], ['replica1', 'replica2'])
+
+    def testStickToPrimary(self):
+        proxy = self.service.proxy
+        assert isinstance(proxy, IItemService)
+
+        read, renamed = proxy.getRenamed('renamed').split('>')
+        self.assertIn(read, ('replica1', 'replica2'))
+        self.assertEqual(renamed, 'renamed')
+        self.assertEqual(self.nameIn(self.engines[0]), 'renamed')
+        # A new transaction can use the replicas again.
+        self.assertIn(proxy.getName(), ('replica1', 'replica2'))
+
+    def testNoReplicas(self):
+        service = ItemService()
+        service.proxy = proxyWrapFor(service)
+        bindSession(service.proxy, sessionmaker(bind=self.engines[0], class_=SessionRouting))
+
+        self.assertEqual(service.proxy.getName(), 'primary')
+
+    def testPolicies(self):
+        states = {}
+        def stateOf(session):
+            states[policy] = (len(session.identity_map), len(session.dirty))
+            session.rollback()
+
+        setKeepAlive(True)
+        try:
+            for policy in (POLICY_EXPUNGE, POLICY_FLUSH):
+                service = ItemService()
+                service.proxy = proxyWrapFor(service)
+                bindSession(service.proxy, sessionmaker(bind=self.engines[0]), policy)
+
+                self.assertEqual(service.proxy.updateItem(policy), policy)
+                endSessions(stateOf)
+
+            service = ItemService()
+            service.proxy = proxyWrapFor(service)
+            bindSession(service.proxy, sessionmaker(bind=self.engines[0]), POLICY_READ)
+            # The calls with the read policy are not allowed to change the entities.
+            self.assertRaises(DevelError, service.proxy.updateItem, POLICY_READ)
+            endSessions(rollback)
+        finally: setKeepAlive(False)
+
+        self.assertEqual(states[POLICY_EXPUNGE], (0, 0))
+        # The flush policy keeps the loaded objects but flushes the changes.
+        self.assertEqual(states[POLICY_FLUSH], (1, 0))
+        self.assertEqual(self.nameIn(self.engines[0]), 'primary')
+
+    def testReadPolicy(self):
+        service = ItemService()
+        service.proxy = proxyWrapFor(service)
+        bindSession(service.proxy, sessionmaker(bind=self.engines[0]), POLICY_FLUSH, POLICY_READ)
+
+        # The GET calls use the read policy so whatever they have written is rolled back.
+        self.assertEqual(service.proxy.getRenamed('renamed'), 'primary>renamed')
+        self.assertEqual(self.nameIn(self.engines[0]), 'primary')
+
+        # The nested read call does not roll back the call that is using it.
+        self.assertEqual(service.proxy.updateName('updated'), 'updated')
+        self.assertEqual(self.nameIn(self.engines[0]), 'updated')
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -29,7 +29,8 @@ class Response(Context):
 
 class TransactionWrappingHandler(HandlerProcessor):
     '''
-    Implementation for a processor that provides the SQLAlchemy session handling.
+    Implementation for a processor that provides the SQLAlchemy session handling, the sessions are kept alive for the
+    entire request and are committed or rolled back only once when the request is finalized.
     '''
 
     def process(self, chain, response:Response, **keyargs):
@@ -51,12 +52,14 @@ class TransactionWrappingHandler(HandlerProcessor):
                 if response.isSuccess is True: endSessions(commit)
                 else: endSessions(rollback)
             else: endSessions(commit) # Commit if there is no success flag
+            setKeepAlive(False)
 
         def onError():
             '''
             Handle the error.
             '''
             endSessions(rollback)
+            setKeepAlive(False)
         
         chain.callBack(onFinalize)
         chain.callBackError(onError)
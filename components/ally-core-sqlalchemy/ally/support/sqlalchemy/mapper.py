@@ -15,7 +15,8 @@ from ally.api.operator.descriptor import ContainerSupport, Reference
 from ally.api.operator.type import TypeModel, TypeModelProperty
 from ally.api.type import typeFor
 from ally.container.binder_op import INDEX_PROP, validateAutoId, \
-    validateRequired, validateMaxLength, validateProperty, validateManaged
+    validateRequired, validateMaxLength, validateProperty, validateManaged, \
+    validateModel, EVENT_MODEL_VALIDATED
 from ally.container.impl.binder import indexAfter
 from ally.exception import Ref
 from ally.internationalization import _
@@ -36,8 +37,10 @@ from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm.mapper import Mapper
 from sqlalchemy.orm.properties import ColumnProperty
 from sqlalchemy.schema import Table, MetaData, Column, ForeignKey
-from sqlalchemy.sql.expression import Executable, ClauseElement, Join
+from sqlalchemy.sql.expression import Executable, ClauseElement, Join, exists, \
+    select
 from sqlalchemy.types import String
+from threading import local
 import logging
 
 # --------------------------------------------------------------------
@@ -47,6 +50,9 @@ log = logging.getLogger(__name__)
 INDEX_PROP_FK = indexAfter('propFk', INDEX_PROP)
 # Index for foreign key properties
 
+_constraints = local()
+# The thread results of the model constraints checks, the results are indexed by the id of the checked entity.
+
 # --------------------------------------------------------------------
 
 class MappingError(Exception):
@@ -225,7 +231,7 @@ def registerValidation(mapped, exclude=None):
     model = typeModel.container
     assert isinstance(model, Model)
 
-    properties = set(model.properties)
+    properties, checks = set(model.properties), []
     for cp in mapper.iterate_properties:
         if not isinstance(cp, ColumnProperty): continue
 
@@ -255,6 +261,7 @@ def registerValidation(mapped, exclude=None):
                     validateMaxLength(propRef, column.type.length)
                 if column.unique:
                     validateProperty(propRef, partial(onPropertyUnique, mapped))
+                    checks.append((prop, None))
                 if column.foreign_keys:
                     for fk in column.foreign_keys:
                         assert isinstance(fk, ForeignKey)
@@ -263,6 +270,12 @@ def registerValidation(mapped, exclude=None):
                             raise MappingError('Invalid foreign column for %s, maybe you are not using the meta class'
                                                % prop)
                         validateProperty(propRef, partial(onPropertyForeignKey, mapped, fkcol), index=INDEX_PROP_FK)
+                        checks.append((prop, fkcol))
+
+    # If there are more unique and foreign key checks they are made in a single query before the properties validation.
+    if len(checks) > 1:
+        validateModel(mapped, partial(onModelConstraints, mapped, checks))
+        validateModel(mapped, onModelConstraintsValidated, EVENT_MODEL_VALIDATED)
 
     for prop in properties:
         if not (exclude and prop in exclude): validateManaged(getattr(mapped, prop))
@@ -311,6 +324,61 @@ def tableFor(mapped):
 
 # --------------------------------------------------------------------
 
+def onModelConstraints(mapped, checks, obj, errors):
+    '''
+    Validation of the sql alchemy unique and foreign key properties of a model in a single query, the results are used
+    by the @see: onPropertyUnique and @see: onPropertyForeignKey validations of the same entity.
+    
+    @param mapped: class
+        The mapped model class.
+    @param checks: list[tuple(string, Column|None)]
+        The property names and foreign columns to be checked, the unique properties have no foreign column.
+    @param obj: object
+        The entity to check for the properties values.
+    @param errors: list[Ref]
+        The list of errors.
+    '''
+    assert isclass(mapped), 'Invalid class %s' % mapped
+    assert isinstance(checks, list), 'Invalid checks %s' % checks
+    assert obj is not None, 'None is not a valid object'
+    assert isinstance(errors, list), 'Invalid errors list %s' % errors
+
+    propId = typeFor(mapped).container.propertyId
+    keys, clauses = [], []
+    for prop, foreignColumn in checks:
+        propRef = getattr(mapped, prop)
+        if propRef not in obj: continue
+        val = getattr(obj, prop)
+        if foreignColumn is None:
+            sql = openSession().query(mapped).filter(propRef == val)
+            if getattr(obj, propId) is not None: sql = sql.filter(getattr(mapped, propId) != getattr(obj, propId))
+            clauses.append(exists(sql.statement))
+        elif val is not None: clauses.append(exists(select([foreignColumn]).where(foreignColumn == val)))
+        else: continue
+        keys.append((prop, foreignColumn))
+
+    if clauses:
+        found = openSession().query(*[clause.label('check_%s' % k) for k, clause in enumerate(clauses)]).one()
+        try: results = _constraints.results
+        except AttributeError: results = _constraints.results = {}
+        # The entity is kept with the results so the id is not reused while the results are available.
+        results[id(obj)] = (obj, dict(zip(keys, found)))
+
+def onModelConstraintsValidated(obj, errors):
+    '''
+    Removes the results of the @see: onModelConstraints check for the entity once the entity validation is finalized,
+    the results might not be consumed if the validation has been stopped.
+    
+    @param obj: object
+        The validated entity.
+    @param errors: list[Ref]
+        The list of errors.
+    '''
+    assert obj is not None, 'None is not a valid object'
+    try: results = _constraints.results
+    except AttributeError: return
+    results.pop(id(obj), None)
+
 def onPropertyUnique(mapped, prop, obj, errors):
     '''
     Validation of a sql alchemy unique property.
@@ -331,12 +399,15 @@ def onPropertyUnique(mapped, prop, obj, errors):
 
     propRef = getattr(mapped, prop)
     if propRef in obj:
-        try:
-            db = openSession().query(mapped).filter(propRef == getattr(obj, prop)).one()
-        except NoResultFound:
-            return
-        propId = typeFor(mapped).container.propertyId
-        if getattr(obj, propId) != getattr(db, propId):
+        found = checkedFor(obj, prop)
+        if found is None:
+            try:
+                db = openSession().query(mapped).filter(propRef == getattr(obj, prop)).one()
+            except NoResultFound:
+                return
+            propId = typeFor(mapped).container.propertyId
+            found = getattr(obj, propId) != getattr(db, propId)
+        if found:
             errors.append(Ref(_('Already an entry with this value'), ref=propRef))
             return False
 
@@ -365,11 +436,33 @@ def onPropertyForeignKey(mapped, foreignColumn, prop, obj, errors):
     if propRef in obj:
         val = getattr(obj, prop)
         if val is not None:
-            count = openSession().query(foreignColumn).filter(foreignColumn == val).count()
-            if count == 0:
+            found = checkedFor(obj, prop, foreignColumn)
+            if found is None: found = openSession().query(foreignColumn).filter(foreignColumn == val).count() > 0
+            if not found:
                 errors.append(Ref(_('Unknown foreign id'), ref=propRef))
                 return False
 
+def checkedFor(obj, prop, foreignColumn=None):
+    '''
+    Provides the result of the check made by @see: onModelConstraints for the entity property, the result is provided
+    only once.
+    
+    @param obj: object
+        The entity that has been checked.
+    @param prop: string
+        The checked property name.
+    @param foreignColumn: Column|None
+        The foreign column checked for the property, None for the unique check.
+    @return: boolean|None
+        True if a matching entry was found, None if the property has not been checked for the entity.
+    '''
+    try: checked, found = _constraints.results[id(obj)]
+    except (AttributeError, KeyError): return
+    if checked is not obj: return
+    
+    result = found.pop((prop, foreignColumn), None)
+    if result is not None: return bool(result)
+
 # --------------------------------------------------------------------
 
 def addLoadListener(mapped, listener):
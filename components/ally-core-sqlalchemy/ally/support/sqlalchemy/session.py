@@ -9,20 +9,37 @@ Created on Jan 5, 2012
 Provides support for SQL alchemy automatic session handling.
 '''
 
+from ally.api.config import GET
+from ally.api.operator.container import Call
+from ally.api.operator.type import TypeService
+from ally.api.type import typeFor
 from ally.container.impl.proxy import IProxyHandler, Execution, \
     registerProxyHandler
 from ally.exception import DevelError
 from collections import deque
 from inspect import isgenerator
+from itertools import chain
 from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.expression import UpdateBase
 from threading import current_thread
 import logging
+import random
 
 # --------------------------------------------------------------------
 
 log = logging.getLogger(__name__)
 
+POLICY_EXPUNGE = 'expunge'
+# The session policy that flushes the session and removes all the loaded objects from it after each call.
+POLICY_FLUSH = 'flush'
+# The session policy that only flushes the session after each call, the loaded objects are kept until the session ends.
+POLICY_READ = 'read'
+# The session policy for calls that only read, the session transaction is rolled back after the call and the call is not
+# allowed to change the session entities.
+POLICIES = (POLICY_EXPUNGE, POLICY_FLUSH, POLICY_READ)
+# The available session policies.
+
 # --------------------------------------------------------------------
 
 class SessionSupport:
@@ -38,6 +55,76 @@ class SessionSupport:
         '''
         return openSession()
 
+class ReplicaEngines(list):
+    '''
+    The list of replica engines, provided as a distinct list class so that the replica engines entities can be
+    recognized by the entities listeners.
+    '''
+
+class SessionRouting(Session):
+    '''
+    Session that routes the reads to replica engines, the session is bound to the primary engine and the replica engines
+    are used only while all the calls that use the thread sessions are read calls (@see: isReading) and the session
+    transaction has not written anything. Once the transaction has written it will stick to the primary engine until
+    is ended. To be used as the class of a session creator, something like:
+        sessionmaker(bind=primaryEngine, class_=SessionRouting, replicas=[replicaEngine1, replicaEngine2])
+    '''
+
+    def __init__(self, replicas=(), **keyargs):
+        '''
+        Construct the routing session.
+
+        @param replicas: list[Engine]|tuple(Engine)
+            The replica engines to route the reads to.
+        @see: Session.__init__
+        '''
+        assert isinstance(replicas, (list, tuple)), 'Invalid replicas %s' % replicas
+        super().__init__(**keyargs)
+        self.replicas = replicas
+        self._ally_replica = None
+        self._ally_written = False
+
+    def get_bind(self, mapper=None, clause=None):
+        '''
+        @see: Session.get_bind
+        '''
+        if self._flushing or isinstance(clause, UpdateBase): self._ally_written = True
+        elif self.replicas and not self._ally_written and isReading():
+            # The same replica is used for the entire transaction in order to have consistent reads.
+            if self._ally_replica is None: self._ally_replica = random.choice(self.replicas)
+            return self._ally_replica
+        return super().get_bind(mapper, clause)
+
+    def commit(self):
+        '''
+        @see: Session.commit
+        '''
+        try: super().commit()
+        finally: self._ally_reset()
+
+    def rollback(self):
+        '''
+        @see: Session.rollback
+        '''
+        try: super().rollback()
+        finally: self._ally_reset()
+
+    def close(self):
+        '''
+        @see: Session.close
+        '''
+        try: super().close()
+        finally: self._ally_reset()
+
+    # ----------------------------------------------------------------
+
+    def _ally_reset(self):
+        '''
+        Resets the routing for a new transaction.
+        '''
+        self._ally_replica = None
+        self._ally_written = False
+
 # --------------------------------------------------------------------
 
 def setKeepAlive(keep):
@@ -52,20 +139,39 @@ def setKeepAlive(keep):
     current_thread()._ally_db_session_alive = keep
     
 
-def beginWith(sessionCreator):
+def beginWith(sessionCreator, read=False):
     '''
     Begins a session (on demand) based on the provided session creator for this thread.
-    
+
     @param sessionCreator: class
         The session creator class.
+    @param read: boolean
+        Flag indicating that the session is begun for a call that only reads.
     '''
     assert issubclass(sessionCreator, Session), 'Invalid session creator %s' % sessionCreator
-    try: creators = current_thread()._ally_db_session_create
-    except AttributeError: creators = current_thread()._ally_db_session_create = deque()
+    assert isinstance(read, bool), 'Invalid read flag %s' % read
+    thread = current_thread()
+    try: creators, reads = thread._ally_db_session_create, thread._ally_db_session_read
+    except AttributeError:
+        creators = thread._ally_db_session_create = deque()
+        reads = thread._ally_db_session_read = deque()
     assert isinstance(creators, deque)
+    assert isinstance(reads, deque)
     creators.append(sessionCreator)
+    reads.append(read)
     assert log.debug('Begin session creator %s', sessionCreator) or True
 
+def isReading():
+    '''
+    Function to check if all the calls that are using the current thread sessions are only reading.
+
+    @return: boolean
+        True if there are calls using the sessions and all of them are read calls, False otherwise.
+    '''
+    try: reads = current_thread()._ally_db_session_read
+    except AttributeError: return False
+    return bool(reads) and all(reads)
+
 def openSession():
     '''
     Function to provide the session on the current thread, this will automatically create a session based on the current 
@@ -114,10 +220,12 @@ def endCurrent(sessionCloser=None):
     assert isinstance(creators, deque)
 
     creator = creators.pop()
+    thread._ally_db_session_read.pop()
     assert log.debug('End session creator %s', creator) or True
     if not creators:
         if not getattr(current_thread(), '_ally_db_session_alive', False): endSessions(sessionCloser)
         del thread._ally_db_session_create
+        del thread._ally_db_session_read
 
 def endSessions(sessionCloser=None):
     '''
@@ -183,18 +291,42 @@ def commitNow():
         commit(session)
         return True
 
+def changesOf(session):
+    '''
+    Provides the entities changed in the session that are not flushed.
+    
+    @param session: Session
+        The session to provide the changes for.
+    @return: frozenset(object)
+        The new, changed and deleted entities.
+    '''
+    assert isinstance(session, Session), 'Invalid session %s' % session
+    return frozenset(chain(session.new, session.dirty, session.deleted))
+
 # --------------------------------------------------------------------
 
-def bindSession(proxy, sessionCreator):
+def bindSession(proxy, sessionCreator, policy=POLICY_EXPUNGE, policyRead=None):
     '''
-    Binds a session creator wrapping for the provided proxy.
+    Binds a session creator wrapping for the provided proxy. If the proxy is for a service then the service calls that
+    are GET calls will be marked as read calls, @see: isReading.
     
     @param proxy: Proxy
         The proxy to wrap with session creator.
     @param sessionCreator: class
         The session creator class that will create the session.
+    @param policy: string
+        The session policy to apply after each proxy call, one of the POLICIES.
+    @param policyRead: string|None
+        The session policy to apply after each read call, one of the POLICIES, if None the policy is used.
     '''
-    registerProxyHandler(SessionBinder(sessionCreator), proxy)
+    reads = set()
+    typ = typeFor(proxy)
+    if isinstance(typ, TypeService):
+        assert isinstance(typ, TypeService)
+        for call in typ.service.calls.values():
+            assert isinstance(call, Call)
+            if call.method == GET: reads.add(call.name)
+    registerProxyHandler(SessionBinder(sessionCreator, reads, policy, policyRead), proxy)
 
 # --------------------------------------------------------------------
 
@@ -202,17 +334,29 @@ class SessionBinder(IProxyHandler):
     '''
     Implementation for @see: IProxyHandler for binding sql alchemy session.
     '''
-    __slots__ = ('sessionCreator',)
+    __slots__ = ('sessionCreator', 'reads', 'policy', 'policyRead')
     
-    def __init__(self, sessionCreator):
+    def __init__(self, sessionCreator, reads=(), policy=POLICY_EXPUNGE, policyRead=None):
         '''
         Binds a session creator wrapping for the provided proxy.
     
         @param sessionCreator: class
             The session creator class that will create the session.
+        @param reads: set(string)|list[string]|tuple(string)
+            The names of the proxy methods that only read.
+        @param policy: string
+            The session policy to apply after each proxy call, one of the POLICIES.
+        @param policyRead: string|None
+            The session policy to apply after each read proxy call, one of the POLICIES, if None the policy is used.
         '''
         assert issubclass(sessionCreator, Session), 'Invalid session creator %s' % sessionCreator
+        assert isinstance(reads, (set, list, tuple)), 'Invalid reads %s' % reads
+        assert policy in POLICIES, 'Invalid policy %s' % policy
+        assert policyRead is None or policyRead in POLICIES, 'Invalid read policy %s' % policyRead
         self.sessionCreator = sessionCreator
+        self.reads = frozenset(reads)
+        self.policy = policy
+        self.policyRead = policy if policyRead is None else policyRead
     
     def handle(self, execution):
         '''
@@ -220,7 +364,12 @@ class SessionBinder(IProxyHandler):
         '''
         assert isinstance(execution, Execution), 'Invalid execution %s' % execution
         
-        beginWith(self.sessionCreator)
+        read = execution.proxyCall.proxyMethod.name in self.reads
+        policy = self.policyRead if read else self.policy
+        beginWith(self.sessionCreator, read)
+        # The changes already in the session belong to the calls that have invoked this call.
+        if policy == POLICY_READ and hasSession(): changes = changesOf(openSession())
+        else: changes = frozenset()
         try: returned = execution.invoke()
         except:
             endCurrent(rollback)
@@ -228,27 +377,36 @@ class SessionBinder(IProxyHandler):
         else:
             if hasSession():
                 session = openSession()
-                session.flush()
-                session.expunge_all()
-                endCurrent(commit)
-            elif isgenerator(returned):
-                # If the returned value is a generator we need to wrap it in order to provide session support when the actual
-                # generator is used
-                return self.wrapGenerator(returned)
+                if policy == POLICY_READ:
+                    # The read calls are never committed, anything they have written is rolled back.
+                    changed = changesOf(session) - changes
+                    endCurrent(rollback)
+                    if changed: raise DevelError('Invalid call \'%s\' with a read session policy, it has changed '
+                                                 'entities' % execution.proxyCall.proxyMethod.name)
+                else:
+                    session.flush()
+                    if policy == POLICY_EXPUNGE: session.expunge_all()
+                    endCurrent(commit)
+            else:
+                endCurrent()
+                # If the returned value is a generator we need to wrap it in order to provide session support when the
+                # actual generator is used
+                if isgenerator(returned): return self.wrapGenerator(returned, read)
             return returned
 
     # ----------------------------------------------------------------
     
-    def wrapGenerator(self, generator):
+    def wrapGenerator(self, generator, read=False):
         '''
         Wraps the generator with the session creator.
         '''
         assert isgenerator(generator), 'Invalid generator %s' % generator
-        beginWith(self.sessionCreator)
+        beginWith(self.sessionCreator, read)
         try:
             for item in generator: yield item
         except:
             endCurrent(rollback)
             raise
         else:
-            endCurrent(commit)
+            policy = self.policyRead if read else self.policy
+            endCurrent(rollback if policy == POLICY_READ else commit)
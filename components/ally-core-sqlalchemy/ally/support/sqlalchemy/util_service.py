@@ -11,43 +11,92 @@ Provides utility methods for SQL alchemy service implementations.
 
 from ally.api.criteria import AsLike, AsOrdered, AsBoolean, AsEqual, AsDate, \
     AsTime, AsDateTime, AsRange
-from ally.api.operator.type import TypeCriteriaEntry
+from ally.api.operator.type import TypeCriteriaEntry, TypeQuery
 from ally.api.type import typeFor
 from ally.exception import InputError, Ref
 from ally.internationalization import _
-from ally.support.api.util_service import namesForQuery, namesForModel
+from ally.support.api.util_service import namesForModel, copy
 from ally.support.sqlalchemy.descriptor import PropertyAttribute
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from collections import OrderedDict
+from datetime import datetime, date, time
+from decimal import Decimal
 from itertools import chain
 from sqlalchemy.exc import IntegrityError, OperationalError
-from sqlalchemy.sql.expression import _Case
+from sqlalchemy.orm import class_mapper
+from sqlalchemy.orm.properties import ColumnProperty, RelationshipProperty
+from sqlalchemy.schema import Column
+from sqlalchemy.sql.expression import _Case, and_, or_, bindparam
+from sqlalchemy.sql.util import sort_tables
+import json
 
 # --------------------------------------------------------------------
 
-def handle(e, entity):
+COUNT_EXACT = 'exact'
+# The count strategy that counts all the elements.
+COUNT_CAPPED = 'capped'
+# The count strategy that stops counting after a number of elements, the total is then approximate.
+COUNT_SKIPPED = 'skipped'
+# The count strategy that does not count the elements, only the presence of more elements is provided.
+COUNT_STRATEGIES = (COUNT_EXACT, COUNT_CAPPED, COUNT_SKIPPED)
+# The available count strategies.
+
+# --------------------------------------------------------------------
+
+def handle(e, entity, index=None):
     '''
     Handles the SQL alchemy exception while inserting or updating.
+    
+    @param index: integer|None
+        The position of the entity that failed, used whenever a list of entities is persisted.
     '''
     if isinstance(e, IntegrityError):
-        raise InputError(Ref(_('Cannot persist, failed unique constraints on entity'), model=typeFor(entity).container))
+        raise InputError(Ref(_('Cannot persist, failed unique constraints on entity'), model=typeFor(entity).container,
+                             index=index))
     if isinstance(e, OperationalError):
-        raise InputError(Ref(_('A foreign key is not valid'), model=typeFor(entity).container))
+        raise InputError(Ref(_('A foreign key is not valid'), model=typeFor(entity).container, index=index))
     raise e
 
 # --------------------------------------------------------------------
 
-def buildLimits(sqlQuery, offset=None, limit=None):
+def buildLimits(sqlQuery, offset=None, limit=None, keys=None, after=None):
     '''
     Builds limiting on the SQL alchemy query.
 
     @param offset: integer|None
-        The offset to fetch elements from.
+        The offset to fetch elements from, not used if the after key values are provided.
     @param limit: integer|None
         The limit of elements to get.
+    @param keys: list[tuple(object, boolean)]|None
+        The columns and ascending flags that order the query, in the order by priority, required by the after key values.
+    @param after: list[object]|None
+        The key values of the last seen element, if provided only the elements that follow the last seen element in the
+        query ordering are fetched instead of skipping the offset elements.
     '''
-    if offset is not None: sqlQuery = sqlQuery.offset(offset)
+    if after is not None:
+        assert isinstance(keys, list) and len(keys) == len(after), 'Invalid keys %s for values %s' % (keys, after)
+        sqlQuery = sqlQuery.filter(_seekFor(keys, after))
+    elif offset is not None: sqlQuery = sqlQuery.offset(offset)
     if limit is not None: sqlQuery = sqlQuery.limit(limit)
     return sqlQuery
 
+def countOf(sqlQuery, cap=None):
+    '''
+    Provides the count of the elements of the SQL alchemy query, the query ordering is not used for counting.
+
+    @param sqlQuery: SQL alchemy
+        The sql alchemy query to count.
+    @param cap: integer|None
+        If provided the counting stops after the cap number of elements, so the count is at most the cap plus one.
+    @return: integer
+        The count of the elements.
+    '''
+    sqlQuery = sqlQuery.order_by(None)
+    if cap is not None:
+        assert isinstance(cap, int) and cap >= 0, 'Invalid cap %s' % cap
+        sqlQuery = sqlQuery.limit(cap + 1)
+    return sqlQuery.count()
+
 def buildQuery(sqlQuery, query, mapped, only=None, exclude=None):
     '''
     Builds the query on the SQL alchemy query.
@@ -68,75 +117,421 @@ def buildQuery(sqlQuery, query, mapped, only=None, exclude=None):
     assert query is not None, 'A query object is required'
     clazz = query.__class__
 
-    columns, ordered, unordered = {}, [], []
-    for name in namesForModel(mapped):
-        cp, name = getattr(mapped, name), name.lower()
-        if name not in columns and isinstance(cp, (PropertyAttribute, _Case)): columns[name] = cp
-    columns = {criteria:columns.get(criteria.lower()) for criteria in namesForQuery(clazz)}
+    mappings = _mappingsOf(clazz, mapped)
 
     if only:
         if not isinstance(only, tuple): only = (only,)
         assert not exclude, 'Cannot have only \'%s\' and exclude \'%s\' criteria at the same time' % (only, exclude)
-        onlyColumns = {}
+        onlyMappings = {}
         for criteria in only:
             if isinstance(criteria, str):
-                column = columns.get(criteria)
-                assert column is not None, 'Invalid only criteria name \'%s\' for query class %s' % (criteria, clazz)
-                onlyColumns[criteria] = column
+                mapping = mappings.get(criteria)
+                assert mapping is not None, 'Invalid only criteria name \'%s\' for query class %s' % (criteria, clazz)
+                onlyMappings[criteria] = mapping
             else:
                 typ = typeFor(criteria)
                 assert isinstance(typ, TypeCriteriaEntry), 'Invalid only criteria %s' % criteria
-                column = columns.get(criteria)
-                assert column is not None, 'Invalid only criteria \'%s\' for query class %s' % (criteria, clazz)
-                onlyColumns[criteria] = column
-        columns = onlyColumns
+                mapping = mappings.get(typ.name)
+                assert mapping is not None, 'Invalid only criteria \'%s\' for query class %s' % (criteria, clazz)
+                onlyMappings[typ.name] = mapping
+        mappings = onlyMappings
     elif exclude:
         if not isinstance(exclude, tuple): exclude = (exclude,)
+        mappings = dict(mappings)
         for criteria in exclude:
             if isinstance(criteria, str):
-                column = columns.pop(criteria, None)
-                assert column is not None, 'Invalid exclude criteria name \'%s\' for query class %s' % (criteria, clazz)
+                mapping = mappings.pop(criteria, None)
+                assert mapping is not None, 'Invalid exclude criteria name \'%s\' for query class %s' % (criteria, clazz)
             else:
                 typ = typeFor(criteria)
                 assert isinstance(typ, TypeCriteriaEntry), 'Invalid exclude criteria %s' % criteria
-                column = columns.pop(typ.name, None)
-                assert column is not None, 'Invalid exclude criteria \'%s\' for query class %s' % (criteria, clazz)
+                mapping = mappings.pop(typ.name, None)
+                assert mapping is not None, 'Invalid exclude criteria \'%s\' for query class %s' % (criteria, clazz)
+
+    for criteria, (descriptor, _prop, column, build, _isOrdered) in mappings.items():
+        if build is not None and descriptor in query: sqlQuery = build(sqlQuery, column, getattr(query, criteria))
+
+    for _prop, column, asc in _orderingIn(query, mappings):
+        if asc: sqlQuery = sqlQuery.order_by(column)
+        else: sqlQuery = sqlQuery.order_by(column.desc())
+
+    return sqlQuery
+
+def orderingFor(query, mapped):
+    '''
+    Provides the ordering of the query as it is build on the SQL alchemy query.
+
+    @param query: query
+        The REST query object to provide the ordering for.
+    @param mapped: class
+        The mapped model class to use the query on.
+    @return: list[tuple(string, object, boolean)]
+        The model property name, the mapped column and the ascending flag, in the order by priority.
+    '''
+    assert query is not None, 'A query object is required'
+    return _orderingIn(query, _mappingsOf(query.__class__, mapped))
+
+def continuationFor(keys, entity, position):
+    '''
+    Provides the continuation token for the elements that follow the provided entity.
+
+    @param keys: list[tuple(string, object, boolean)]
+        The model property name, the mapped column and the ascending flag of the keys that order the query, as provided
+        by @see: orderingFor.
+    @param entity: object
+        The last seen entity.
+    @param position: integer
+        The offset of the element that follows the last seen entity.
+    @return: string
+        The opaque continuation token.
+    '''
+    assert isinstance(keys, list), 'Invalid keys %s' % keys
+    assert isinstance(position, int), 'Invalid position %s' % position
+    data = {'keys': [[name, asc] for name, _column, asc in keys], 'position': position}
+    values = [_encodeKey(getattr(entity, name)) for name, _column, _asc in keys]
+    # If a key can be null or a key value cannot be encoded the continuation uses the position, since the place of the
+    # null values in the ordering depends on the database.
+    if None not in values and all(_isSeekable(column) for _name, column, _asc in keys): data['after'] = values
+    return urlsafe_b64encode(json.dumps(data, separators=(',', ':')).encode()).decode()
+
+def afterFor(keys, continuation):
+    '''
+    Provides the position and key values of the last seen element from a continuation token.
+
+    @param keys: list[tuple(string, object, boolean)]
+        The model property name, the mapped column and the ascending flag of the keys that order the query, as provided
+        by @see: orderingFor.
+    @param continuation: string
+        The continuation token as provided by @see: continuationFor.
+    @return: tuple(integer, list[object]|None)|None
+        The offset of the element that follows the last seen element and the key values of the last seen element, None
+        if the continuation is not valid for the keys.
+    '''
+    assert isinstance(keys, list), 'Invalid keys %s' % keys
+    assert isinstance(continuation, str), 'Invalid continuation %s' % continuation
+    try:
+        data = json.loads(urlsafe_b64decode(continuation.encode()).decode())
+        if data['keys'] != [[name, asc] for name, _column, asc in keys]: return
+        position, after = data['position'], data.get('after')
+        if not isinstance(position, int) or position < 0: return
+        if after is not None:
+            if not isinstance(after, list) or len(after) != len(keys): return
+            after = [_decodeKey(value) for value in after]
+    except (ValueError, TypeError, KeyError): return
+    return position, after
+
+def mappingsFor(clazz, mapped):
+    '''
+    Provides the mappings of the query criteria on the mapped model columns, the criteria that have no column are not
+    mapped. The mappings used by the query building are cached for each query and mapped class.
+
+    @param clazz: class
+        The query class to provide the mappings for.
+    @param mapped: class
+        The mapped model class to map the criteria on.
+    @return: dictionary{string: tuple(object, string, object, callable|None, boolean)}
+        The criteria descriptor, the model property name, the mapped column, the filter builder and the ordering flag
+        indexed by criteria name.
+    '''
+    queryType = typeFor(clazz)
+    assert isinstance(queryType, TypeQuery), 'Invalid query class %s' % clazz
+
+    columns, mappings = {}, {}
+    for prop in namesForModel(mapped):
+        cp, name = getattr(mapped, prop), prop.lower()
+        if name not in columns and isinstance(cp, (PropertyAttribute, _Case)): columns[name] = (prop, cp)
+
+    for criteria, criteriaClass in queryType.query.criterias.items():
+        prop, column = columns.get(criteria.lower(), (None, None))
+        if column is None: continue
+
+        if issubclass(criteriaClass, AsBoolean): build = _filterBoolean
+        elif issubclass(criteriaClass, AsLike): build = _filterLike
+        elif issubclass(criteriaClass, AsEqual): build = _filterEqual
+        elif issubclass(criteriaClass, (AsDate, AsTime, AsDateTime, AsRange)): build = _filterRange
+        else: build = None
+        mappings[criteria] = (getattr(clazz, criteria), prop, column, build, issubclass(criteriaClass, AsOrdered))
+
+    return mappings
+
+def valuesIn(session, column, values, size=None):
+    '''
+    Provides the values that are found in the database for the column.
+
+    @param session: Session
+        The session to use.
+    @param column: object
+        The mapped column to check the values for.
+    @param values: Iterable(object)
+        The values to check.
+    @param size: integer|None
+        The maximum number of values checked in a single statement, if None all the values are checked at once.
+    @return: set(object)
+        The found values.
+    '''
+    found = set()
+    for chunk in _chunksOf(values, size):
+        found.update(value for value, in session.query(column).filter(column.in_(chunk)))
+    return found
+
+def deleteIn(session, mapped, column, values, size=None):
+    '''
+    Deletes the entities of the mapped class that have the values for the column.
+
+    @param session: Session
+        The session to use.
+    @param mapped: class
+        The mapped model class of the entities to delete.
+    @param column: object
+        The mapped column of the values.
+    @param values: Iterable(object)
+        The values of the entities to delete.
+    @param size: integer|None
+        The maximum number of values used in a single statement, if None all the values are used at once.
+    @return: integer
+        The number of deleted entities.
+    '''
+    mapper, count = class_mapper(mapped), 0
+    isCascaded = any(prop.cascade.delete for prop in mapper.iterate_properties if isinstance(prop, RelationshipProperty))
+    if len(mapper.tables) == 1 and not isCascaded:
+        for chunk in _chunksOf(values, size):
+            count += session.query(mapped).filter(column.in_(chunk)).delete(synchronize_session='fetch')
+        return count
+
+    columnsId = {}
+    if not isCascaded and len(mapper.primary_key) == 1:
+        columnsId = {column.table: column for column in mapper.get_property_by_column(mapper.primary_key[0]).columns}
+    if any(table not in columnsId for table in mapper.tables):
+        # If there are cascades or the id is not mapped in all the tables the entities are deleted one by one.
+        for chunk in _chunksOf(values, size):
+            for entityDb in session.query(mapped).filter(column.in_(chunk)):
+                session.delete(entityDb)
+                count += 1
+        session.flush()
+        return count
+
+    # The rows are deleted from each mapped table, the inheriting tables are deleted first.
+    session.flush()
+    tables = list(reversed(sort_tables(mapper.tables)))
+    for chunk in _chunksOf(values, size):
+        ids = [id for id, in session.query(mapped).filter(column.in_(chunk)).values(mapper.primary_key[0])]
+        if not ids: continue
+        for table in tables: deleted = session.execute(table.delete().where(columnsId[table].in_(ids))).rowcount
+        count += deleted
+
+        # The deleted entities are removed from the session.
+        ids = set(ids)
+        for key, entityDb in list(session.identity_map.items()):
+            if isinstance(entityDb, mapped) and key[1][0] in ids: session.expunge(entityDb)
+    return count
+
+def insertAll(session, mapped, entities):
+    '''
+    Inserts the entities of the mapped class, all the entities are flushed at once and only if the flush fails the
+    entities are flushed again one by one in order to find the position of the failing entity.
 
-    for criteria, column in columns.items():
-        if column is None or getattr(clazz, criteria) not in query: continue
+    @param session: Session
+        The session to use.
+    @param mapped: class
+        The mapped model class of the entities to insert.
+    @param entities: list[object]
+        The entities with the values to insert.
+    @return: list[object]
+        The inserted mapped entities, in the same order as the entities.
+    @raise InputError: If an entity cannot be persisted.
+    '''
+    entitiesDb = [copy(entity, mapped()) for entity in entities]
+    session.begin_nested()
+    try:
+        session.add_all(entitiesDb)
+        session.flush(entitiesDb)
+    except (IntegrityError, OperationalError): session.rollback()
+    else:
+        session.commit()
+        return entitiesDb
+
+    # The failed insert is retried for each entity in a savepoint in order to report the failing entity position.
+    entitiesDb = [copy(entity, mapped()) for entity in entities]
+    session.begin_nested()
+    for index, entityDb in enumerate(entitiesDb):
+        session.add(entityDb)
+        try: session.flush((entityDb,))
+        except (IntegrityError, OperationalError) as e:
+            session.rollback()
+            handle(e, mapped, index)
+    session.commit()
+    return entitiesDb
+
+def updateAll(session, mapped, entities):
+    '''
+    Updates the entities of the mapped class, the entities that have the same properties set are updated with a single
+    statement for each mapped table that is executed with the values of all those entities. The entities need to have
+    the model id provided and only the properties set on the entities are updated.
+
+    @param session: Session
+        The session to use.
+    @param mapped: class
+        The mapped model class of the entities to update.
+    @param entities: list[object]
+        The entities with the values to update.
+    '''
+    mapper, model = class_mapper(mapped), typeFor(mapped).container
+    groups, propId = {}, model.propertyId
+    for entity in entities:
+        clazz = entity.__class__
+        names = tuple(prop for prop in model.properties if prop != propId and getattr(clazz, prop) in entity)
+        if names: groups.setdefault(names, []).append(entity)
+    if not groups: return
+
+    columnsId = {column.table: column for column in mapper.get_property(propId).columns}
+    if any(table not in columnsId for table in mapper.tables):
+        # If the id is not mapped in all the tables the entities are updated one by one.
+        for entity in entities:
+            entityDb = session.query(mapped).filter(getattr(mapped, propId) == getattr(entity, propId)).one()
+            copy(entity, entityDb, exclude=(propId,))
+        session.flush()
+        return
+
+    session.flush()
+    for names, group in groups.items():
+        for table in mapper.tables:
+            columns = []
+            for prop in names:
+                cp = mapper.get_property(prop) if mapper.has_property(prop) else None
+                if not isinstance(cp, ColumnProperty): continue
+                columns.extend((prop, column) for column in cp.columns if column.table is table)
+            if not columns: continue
+
+            # The bind names are prefixed since the columns names are reserved for the statement values.
+            sql = table.update().where(columnsId[table] == bindparam('_id'))
+            sql = sql.values({column.key: bindparam('_%s' % column.key) for _prop, column in columns})
+            params = []
+            for entity in group:
+                values = {'_%s' % column.key: getattr(entity, prop) for prop, column in columns}
+                values['_id'] = getattr(entity, propId)
+                params.append(values)
+            session.execute(sql, params)
+
+    # The entities loaded in the session have been changed by the statements.
+    ids = {getattr(entity, propId) for entity in entities}
+    for entityDb in session.identity_map.values():
+        if isinstance(entityDb, mapped) and entityDb.__dict__.get(propId) in ids: session.expire(entityDb)
+
+# --------------------------------------------------------------------
+
+_mappings = {}
+# The criteria mappings indexed by query class and mapped class.
+
+_KEY_FORMATS = {datetime: '%Y-%m-%d %H:%M:%S.%f', date: '%Y-%m-%d', time: '%H:%M:%S.%f'}
+# The formats used for the date and time key values in the continuation tokens.
+
+def _mappingsOf(clazz, mapped):
+    '''
+    Provides the cached criteria mappings for the query class and mapped class.
+    '''
+    key = (clazz, mapped)
+    mappings = _mappings.get(key)
+    if mappings is None: mappings = _mappings[key] = mappingsFor(clazz, mapped)
+    return mappings
+
+def _chunksOf(values, size):
+    '''
+    Provides the distinct values in chunks of at most the provided size.
+    '''
+    values = list(OrderedDict.fromkeys(values))
+    if not size: return (values,) if values else ()
+    return (values[k:k + size] for k in range(0, len(values), size))
+
+def _orderingIn(query, mappings):
+    '''
+    Provides the ordering of the query for the criteria mappings, first the criteria with a priority sorted by priority
+    and then the criteria without a priority.
+    '''
+    ordered, unordered = [], []
+    for criteria, (descriptor, prop, column, _build, isOrdered) in mappings.items():
+        if not isOrdered or descriptor not in query: continue
 
         crt = getattr(query, criteria)
-        if isinstance(crt, AsBoolean):
-            assert isinstance(crt, AsBoolean)
-            if AsBoolean.value in crt:
-                sqlQuery = sqlQuery.filter(column == crt.value)
-        elif isinstance(crt, AsLike):
-            assert isinstance(crt, AsLike)
-            if AsLike.like in crt: sqlQuery = sqlQuery.filter(column.like(crt.like))
-            elif AsLike.ilike in crt: sqlQuery = sqlQuery.filter(column.ilike(crt.ilike))
-        elif isinstance(crt, AsEqual):
-            assert isinstance(crt, AsEqual)
-            if AsEqual.equal in crt:
-                sqlQuery = sqlQuery.filter(column == crt.equal)
-        elif isinstance(crt, (AsDate, AsTime, AsDateTime, AsRange)):
-            if crt.__class__.start in crt: sqlQuery = sqlQuery.filter(column >= crt.start)
-            elif crt.__class__.until in crt: sqlQuery = sqlQuery.filter(column < crt.until)
-            if crt.__class__.end in crt: sqlQuery = sqlQuery.filter(column <= crt.end)
-            elif crt.__class__.since in crt: sqlQuery = sqlQuery.filter(column > crt.since)
-
-        if isinstance(crt, AsOrdered):
-            assert isinstance(crt, AsOrdered)
-            if AsOrdered.ascending in crt:
-                if AsOrdered.priority in crt and crt.priority:
-                    ordered.append((column, crt.ascending, crt.priority))
-                else:
-                    unordered.append((column, crt.ascending, None))
-
-        ordered.sort(key=lambda pack: pack[2])
-        for column, asc, __ in chain(ordered, unordered):
-            if asc: sqlQuery = sqlQuery.order_by(column)
-            else: sqlQuery = sqlQuery.order_by(column.desc())
+        assert isinstance(crt, AsOrdered)
+        if AsOrdered.ascending in crt:
+            if AsOrdered.priority in crt and crt.priority:
+                ordered.append((crt.priority, prop, column, crt.ascending))
+            else:
+                unordered.append((None, prop, column, crt.ascending))
 
+    ordered.sort(key=lambda pack: pack[0])
+    return [(prop, column, asc) for _priority, prop, column, asc in chain(ordered, unordered)]
+
+def _seekFor(keys, values):
+    '''
+    Provides the condition for the elements that follow the key values in the keys ordering.
+    '''
+    conditions = []
+    for k, (column, asc) in enumerate(keys):
+        follows = column > values[k] if asc else column < values[k]
+        conditions.append(and_(*[keys[i][0] == values[i] for i in range(k)] + [follows]))
+    return or_(*conditions)
+
+def _isSeekable(column):
+    '''
+    Checks if the mapped column can be used for seeking, only the mapped columns that cannot be null are seekable.
+    '''
+    columns = getattr(getattr(column, 'property', None), 'columns', None)
+    return bool(columns) and all(isinstance(col, Column) and not col.nullable for col in columns)
+
+def _encodeKey(value):
+    '''
+    Encodes the key value for the continuation token, provides None if the value cannot be encoded.
+    '''
+    if isinstance(value, (bool, int, float, str)): return value
+    for clazz in (datetime, date, time):  # The date time needs to be checked before the date.
+        if isinstance(value, clazz): return {clazz.__name__: value.strftime(_KEY_FORMATS[clazz])}
+    if isinstance(value, Decimal): return {'decimal': str(value)}
+
+def _decodeKey(value):
+    '''
+    Decodes the key value from the continuation token.
+    '''
+    if not isinstance(value, dict): return value
+    (name, text), = value.items()
+    if name == 'decimal': return Decimal(text)
+    if name == 'datetime': return datetime.strptime(text, _KEY_FORMATS[datetime])
+    if name == 'date': return datetime.strptime(text, _KEY_FORMATS[date]).date()
+    if name == 'time': return datetime.strptime(text, _KEY_FORMATS[time]).time()
+    raise ValueError('Invalid key value %s' % value)
+
+def _filterBoolean(sqlQuery, column, crt):
+    '''
+    Builds the filter for a boolean criteria.
+    '''
+    assert isinstance(crt, AsBoolean)
+    if AsBoolean.value in crt: sqlQuery = sqlQuery.filter(column == crt.value)
+    return sqlQuery
+
+def _filterLike(sqlQuery, column, crt):
+    '''
+    Builds the filter for a like criteria.
+    '''
+    assert isinstance(crt, AsLike)
+    if AsLike.like in crt: sqlQuery = sqlQuery.filter(column.like(crt.like))
+    elif AsLike.ilike in crt: sqlQuery = sqlQuery.filter(column.ilike(crt.ilike))
     return sqlQuery
 
+def _filterEqual(sqlQuery, column, crt):
+    '''
+    Builds the filter for an equal criteria.
+    '''
+    assert isinstance(crt, AsEqual)
+    if AsEqual.equal in crt: sqlQuery = sqlQuery.filter(column == crt.equal)
+    return sqlQuery
 
+def _filterRange(sqlQuery, column, crt):
+    '''
+    Builds the filter for a date, time, date time or range criteria.
+    '''
+    clazz = crt.__class__
+    if clazz.start in crt: sqlQuery = sqlQuery.filter(column >= crt.start)
+    elif clazz.until in crt: sqlQuery = sqlQuery.filter(column < crt.until)
+    if clazz.end in crt: sqlQuery = sqlQuery.filter(column <= crt.end)
+    elif clazz.since in crt: sqlQuery = sqlQuery.filter(column > crt.since)
+    return sqlQuery
@@ -10,6 +10,7 @@ Provides the configurations for the processors encoders and decoders.
 '''
 
 from ally.container import ioc
+from ally.core.impl.processor.parser.json import ParseJSONHandler
 from ally.core.impl.processor.parser.text import ParseTextHandler
 from ally.core.impl.processor.parser.xml import ParseXMLHandler
 from ally.core.impl.processor.render.json import RenderJSONHandler
@@ -65,6 +66,14 @@ def content_types_yaml() -> dict:
             'yaml':'text/yaml',
             }
 
+@ioc.config
+def render_json_compact() -> bool:
+    '''
+    Flag indicating that the JSON response content is rendered compact, if False the JSON will be rendered with
+    indentation.
+    '''
+    return True
+
 # --------------------------------------------------------------------
 # Create the renders
 
@@ -86,6 +95,7 @@ def assemblyParsing() -> Assembly:
 def renderJSON() -> Handler:
     b = RenderJSONHandler(); yield b
     b.contentTypes = content_types_json()
+    b.compact = render_json_compact()
 
 # JSON encode by using the text renderer.
 # @ioc.entity
@@ -107,13 +117,8 @@ def renderXML() -> Handler:
 
 @ioc.entity
 def parseJSON() -> Handler:
-    import json
-    def parserJSON(content, charSet): return json.load(codecs.getreader(charSet)(content))
-
-    b = ParseTextHandler(); yield b
+    b = ParseJSONHandler(); yield b
     b.contentTypes = set(content_types_json())
-    b.parser = parserJSON
-    b.parserName = 'json'
 
 @ioc.entity
 def parseXML() -> Handler:
@@ -122,6 +127,11 @@ def parseXML() -> Handler:
 
 # --------------------------------------------------------------------
 
+@ioc.before(renderingAssembly)
+def updateRenderingAssembly():
+    renderingAssembly().add(renderJSON())
+    renderingAssembly().add(renderXML())
+
 @ioc.before(assemblyParsing)
 def updateAssemblyParsing():
     assemblyParsing().add(parseJSON())
@@ -142,9 +152,7 @@ else:
         b.rendererTextObject = rendererYAML
     
     @ioc.before(renderingAssembly)
-    def updateRenderingAssembly():
-        renderingAssembly().add(renderJSON())
-        renderingAssembly().add(renderXML())
+    def updateRenderingAssemblyWithYAML():
         renderingAssembly().add(renderYAML())
 
 
@@ -0,0 +1,86 @@
+'''
+Created on Mar 25, 2013
+
+@package: ally core
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Assemblers testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model, service
+from ally.api.type import List, Iter, typeFor
+from ally.container import ioc
+from ally.core.impl.assembler import AssembleGet, AssembleInsert, \
+    AssembleUpdateModel, AssembleUpdate, AssembleDelete
+from ally.core.impl.node import NodeRoot
+from ally.core.impl.resources_management import ResourcesRegister
+from ally.core.spec.resources import ConverterPath
+from ally.support.api.entity import Entity, IEntityBulkService
+from ally.support.core.util_resources import findPath
+import unittest
+
+# --------------------------------------------------------------------
+
+@model
+class Item(Entity):
+    Name = str
+
+@service((Entity, Item))
+class IItemService(IEntityBulkService):
+    '''
+    The item bulk service.
+    '''
+
+class ItemService(IItemService):
+
+    def insertAll(self, entities): return [entity.Id for entity in entities]
+
+    def updateAll(self, entities): pass
+
+    def deleteAll(self, ids=None): return True
+
+# --------------------------------------------------------------------
+
+class TestAssembleList(unittest.TestCase):
+
+    def setUp(self):
+        assemblers = [AssembleGet(), AssembleInsert(), AssembleUpdateModel(), AssembleUpdate(), AssembleDelete()]
+        for assembler in assemblers: ioc.initialize(assembler)
+
+        self.root = NodeRoot()
+        register = ResourcesRegister()
+        register.root, register.assemblers = self.root, assemblers
+        ioc.initialize(register)
+        register.register(ItemService())
+
+    def testBulk(self):
+        node = findPath(self.root, ['Item', 'Bulk'], ConverterPath()).node
+        self.assertIsNotNone(node)
+
+        # The list of models and the list of ids are not placed in the path, the calls are all on the bulk node.
+        self.assertEqual('insertAll', node.insert.name)
+        self.assertEqual([typeFor(List(Item))], [inp.type for inp in node.insert.inputs])
+        self.assertIsInstance(node.insert.output, Iter)
+        self.assertEqual(typeFor(Item.Id), node.insert.output.itemType)
+
+        self.assertEqual('updateAll', node.update.name)
+        self.assertEqual([typeFor(List(Item))], [inp.type for inp in node.update.inputs])
+
+        self.assertEqual('deleteAll', node.delete.name)
+        self.assertEqual([typeFor(List(Item.Id))], [inp.type for inp in node.delete.inputs])
+
+        self.assertIsNone(node.get)
+        self.assertIsNone(findPath(self.root, ['Item'], ConverterPath()).node.insert)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -90,6 +90,36 @@ class TestModel(unittest.TestCase):
         self.assertRaises(InputError, resolve, path=deque(('ModelKey', 'Name')), value='The name',
                           target=args, **context)
 
+    def testDecodeList(self):
+        transformer = CreateDecoderHandler()
+        ioc.initialize(transformer)
+
+        resolve = transformer.decoderFor('models', List(ModelId))
+        context = dict(converter=ConverterPath(), converterId=ConverterPath(), normalizer=ConverterPath())
+
+        args = {}
+        items = [{'Name': 'First', 'Flags': ['1', '2']}, {'ModelId': {'Name': 'Second', 'ModelKey': 'The key'}}]
+        self.assertTrue(resolve(path=deque(('ModelIdList',)), value=items, target=args, **context))
+        models = args['models']
+        self.assertEqual([(m.Name, m.Flags, m.ModelKey) for m in models],
+                         [('First', ['1', '2'], None), ('Second', None, 'The key')])
+
+        self.assertTrue(resolve(path=deque(), value=[{'Name': 'Third'}], target=args, **context))
+        self.assertEqual([m.Name for m in args['models']], ['First', 'Second', 'Third'])
+
+        self.assertFalse(resolve(path=deque(('Unknown',)), value=items, target={}, **context))
+        self.assertFalse(resolve(path=deque(), value=[{'Unknown': 'value'}], target={}, **context))
+        try: resolve(path=deque(), value=[{'Name': 'First'}, {'Id': 'not an id'}], target={}, **context)
+        except InputError as e: self.assertEqual([(ref.index, ref.property) for ref in e.message], [(1, 'Id')])
+        else: self.fail('No decoding errors')
+
+        # The errors are reported for all the items not only for the first failing one.
+        items = [{'Id': 'first'}, {'Name': 'Valid'}, {'Id': 'third'}, {'ModelId': {'Id': 'fourth'}}]
+        try: resolve(path=deque(), value=items, target={}, **context)
+        except InputError as e:
+            self.assertEqual([(ref.index, ref.property) for ref in e.message], [(0, 'Id'), (2, 'Id'), (3, 'Id')])
+        else: self.fail('No decoding errors')
+
 # --------------------------------------------------------------------
 
 if __name__ == '__main__': unittest.main()
@@ -19,7 +19,8 @@ if True:
 from ally.api.config import model
 from ally.api.type import typeFor, List
 from ally.container import ioc
-from ally.core.impl.processor.encoder import CreateEncoderHandler
+from ally.core.impl.processor.encoder import CreateEncoderHandler, \
+    EncodeCollectionBatch
 from ally.core.spec.transform.exploit import Resolve
 from ally.core.spec.transform.render import RenderToObject
 from ally.core.spec.resources import ConverterPath
@@ -106,6 +107,50 @@ class TestModel(unittest.TestCase):
         resolve.do()
         self.assertFalse(resolve.has())
 
+    def testEncodeCompiled(self):
+        transformer = CreateEncoderHandler()
+        transformer.batchSize = 2
+        ioc.initialize(transformer)
+
+        render = RenderToObject()
+        context = dict(render=render, converter=ConverterPath(), converterId=ConverterPath(), normalizer=ConverterPath())
+
+        model = ModelId()
+        model.Id = 12
+        model.ModelKey = 'The key'
+        model.Flags = ['1', '2', '3']
+
+        resolve = Resolve(transformer.encoderCompiledFor(typeFor(ModelId)))
+        render.obj = None
+        resolve.request(value=model, **context).doAll()
+        self.assertEqual({'ModelKey': {'Key': 'The key'}, 'Flags': {'Flags': ['1', '2', '3']}, 'Id': '12'}, render.obj)
+
+        resolve = Resolve(transformer.encoderCompiledFor(typeFor(List(ModelId))))
+        render.obj = None
+        resolve.request(value=[model, model, model], **context)
+        resolve.do()
+        self.assertEqual({'ModelIdList': []}, render.obj)
+        resolve.do()
+        self.assertEqual(2, len(render.obj['ModelIdList']))
+        resolve.do()
+        self.assertEqual(3, len(render.obj['ModelIdList']))
+        resolve.do()
+        self.assertFalse(resolve.has())
+        self.assertEqual({'ModelKey': {'Key': 'The key'}, 'Flags': {'Flags': ['1', '2', '3']}, 'Id': '12'},
+                         render.obj['ModelIdList'][2])
+
+    def testEncodeBatchResolve(self):
+        resolves = []
+        def encodeItem(value, render, resolve, **data):
+            resolves.append(resolve)
+            render.value('Item', value)
+
+        resolve = Resolve(EncodeCollectionBatch('Items', encodeItem, batchSize=2))
+        render = RenderToObject()
+        resolve.request(value=['1', '2', '3'], render=render, converter=ConverterPath(),
+                        normalizer=ConverterPath()).doAll()
+        self.assertEqual({'Items': ['1', '2', '3']}, render.obj)
+        self.assertEqual([resolve] * 3, resolves)
 
 # --------------------------------------------------------------------
 
@@ -0,0 +1,101 @@
+'''
+Created on Mar 15, 2013
+
+@package: ally core
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Invoking testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import GET, model
+from ally.api.type import Input, typeFor
+from ally.core.impl.invoker import InvokerFunction
+from ally.core.impl.processor.invoking import InvokingHandler, Response
+from ally.core.spec.resources import Invoker
+from ally.core.spec.transform.render import RenderToObject, renderObject
+from ally.design.processor.attribute import defines
+from ally.design.processor.context import Context, create
+from ally.design.processor.spec import Resolvers
+from ally.exception import InputError, Ref
+from ally.support.api.util_service import setValidators, popValidators
+from datetime import datetime
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class Item:
+    Id = int
+    Name = str
+
+class Request(Context):
+    '''
+    The request context.
+    '''
+    # ---------------------------------------------------------------- Defined
+    invoker = defines(Invoker)
+    arguments = defines(dict)
+
+ctx = create(Resolvers(contexts=dict(Request=Request, Response=Response)))
+Request, Response = ctx['Request'], ctx['Response']
+
+# --------------------------------------------------------------------
+
+class TestInvoking(unittest.TestCase):
+
+    def invoke(self, function):
+        request, response = Request(), Response()
+        request.invoker = InvokerFunction(GET, function, typeFor(str), [Input('name', typeFor(str))], {})
+        request.arguments = dict(name='item')
+        InvokingHandler().process(request, response)
+        return response
+
+    def testValidators(self):
+        def getItem(name):
+            setValidators(datetime(2013, 3, 1, 10), 'tag-%s' % name)
+            return name
+
+        response = self.invoke(getItem)
+        self.assertEqual('item', response.obj)
+        self.assertEqual(datetime(2013, 3, 1, 10), response.lastModified)
+        self.assertEqual('"tag-item"', response.eTag)
+        # The validators are consumed by the invoking.
+        self.assertEqual((None, None), popValidators())
+
+    def testNoValidators(self):
+        setValidators(eTag='left by a previous call')
+
+        response = self.invoke(lambda name: name)
+        self.assertEqual('item', response.obj)
+        self.assertIsNone(response.lastModified)
+        self.assertIsNone(response.eTag)
+
+    def testInputErrorIndexed(self):
+        def insertItems(name):
+            raise InputError(Ref('Invalid name', ref=Item.Name, index=0), Ref('Unknown id', ref=Item.Id, index=2),
+                             Ref('Invalid item', ref=Item, index=2), Ref('Invalid items', ref=Item),
+                             Ref('Cannot insert'))
+
+        response = self.invoke(insertItems)
+        self.assertFalse(response.isSuccess)
+        render = RenderToObject()
+        renderObject(response.errorDetails, render)
+        # The errors of the models provided in a list are rendered as items with the position of the model.
+        self.assertEqual({'error': {'error': ['Cannot insert']},
+                          'Item': {'error': {'error': ['Invalid items']}},
+                          'item': {'item': [{'index': '0', 'Name': 'Invalid name'},
+                                            {'index': '2', 'error': {'error': ['Invalid item']}, 'Id': 'Unknown id'}]}},
+                         render.obj)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,106 @@
+'''
+Created on Mar 22, 2013
+
+@package: ally core
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+JSON incremental parser testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model
+from ally.container import ioc
+from ally.core.impl.processor.parser.json import ParseJSONHandler, tokenize, \
+    VALUE
+from ally.core.spec.transform.render import RenderToObject, renderObject
+from ally.exception import InputError, Ref
+from io import BytesIO
+import unittest
+
+# --------------------------------------------------------------------
+
+CONTENT = '{"a": -35000000000.0, "b": [1, 2.5e-3, "x"], "c": {"d": "text \\u0103 \\"quoted\\"", "e": true, ' \
+          '"f": false, "g": null}, "h": 12, "i": 1E+20, "ă": "€"}'
+# The content that contains each token kind.
+
+@model(id='Id')
+class Item:
+    Id = int
+    Name = str
+
+def tokensFor(content, bufferSize, charSet='utf-8'):
+    return list(tokenize(BytesIO(content.encode(charSet)), charSet, bufferSize))
+
+# --------------------------------------------------------------------
+
+class TestParseJSON(unittest.TestCase):
+
+    def testTokenize(self):
+        expected = [('{', None), (VALUE, 'a'), (':', None), (VALUE, -35000000000.0), (',', None), (VALUE, 'b'),
+                    (':', None), (VALUE, [1, 2.5e-3, 'x']), (',', None), (VALUE, 'c'), (':', None), ('{', None),
+                    (VALUE, 'd'), (':', None), (VALUE, 'text ă "quoted"'), (',', None), (VALUE, 'e'), (':', None),
+                    (VALUE, True), (',', None), (VALUE, 'f'), (':', None), (VALUE, False), (',', None), (VALUE, 'g'),
+                    (':', None), (VALUE, None), ('}', None), (',', None), (VALUE, 'h'), (':', None), (VALUE, 12),
+                    (',', None), (VALUE, 'i'), (':', None), (VALUE, 1E+20), (',', None), (VALUE, 'ă'),
+                    (':', None), (VALUE, '€'), ('}', None)]
+        # Each buffer size splits the tokens at other positions, so each token kind is split at each of its characters.
+        for bufferSize in range(1, len(CONTENT.encode('utf-8')) + 2):
+            self.assertEqual(expected, tokensFor(CONTENT, bufferSize), 'Failed for buffer size %s' % bufferSize)
+
+    def testNumbers(self):
+        for text, number in (('-35000000000.0', -35000000000.0), ('12', 12), ('-0', 0), ('1.5e+10', 1.5e+10),
+                             ('2E-3', 2E-3), ('0.25', 0.25)):
+            for content in (text, '[%s]' % text, '{"a": %s}' % text, '{"a":%s }' % text):
+                for bufferSize in range(1, len(content) + 2):
+                    tokens = [value for kind, value in tokensFor(content, bufferSize) if kind == VALUE]
+                    if content.startswith('{'): tokens = tokens[1:]
+                    elif content.startswith('['): tokens = tokens[0]
+                    self.assertEqual([number], tokens, 'Failed for %r with buffer size %s' % (content, bufferSize))
+
+    def testInvalid(self):
+        for content in ('{"a": 1.}', '{"a": "text}', '{"a": tru}', '{"a": -}', '{"a": [1, }', '{"a": 1e}'):
+            for bufferSize in (1, 3, 4096):
+                self.assertRaises(ValueError, tokensFor, content, bufferSize)
+
+    def testParse(self):
+        for bufferSize in (1, 7, 19, 4096):
+            handler = ParseJSONHandler()
+            handler.bufferSize = bufferSize
+            handler.contentTypes = {'json'}
+            ioc.initialize(handler)
+
+            values = []
+            def decoder(path, value): return values.append(('/'.join(path), value)) or True
+            self.assertIsNone(handler.parse(decoder, {}, BytesIO(CONTENT.encode('utf-8')), 'utf-8'))
+            self.assertEqual([('b', [1, 2.5e-3, 'x']), ('c/d', 'text ă "quoted"'), ('c/g', None),
+                              ('ă', '€')], values)
+
+            for content in (b'{"a": 1} 2', b'{"a" 1}', b'{"a": 1,}', b'{"a": -35000000000.}'):
+                self.assertEqual('Bad json content', handler.parse(decoder, {}, BytesIO(content), 'utf-8'))
+            self.assertEqual('Invalid path \'a\' in object',
+                             handler.parse(lambda path, value: False, {}, BytesIO(b'{"a": "x"}'), 'utf-8'))
+
+    def testInputErrorIndexed(self):
+        handler = ParseJSONHandler()
+        handler.contentTypes = {'json'}
+        ioc.initialize(handler)
+
+        error = InputError(Ref('Invalid id', ref=Item.Id, index=1), Ref('Invalid name', ref=Item.Name),
+                           Ref('Invalid name', ref=Item.Name, index=3))
+        render = RenderToObject()
+        renderObject(handler.processInputError(error), render)
+        self.assertEqual({'Item': {'Name': 'Invalid name'},
+                          'item': {'item': [{'index': '1', 'Id': 'Invalid id'}, {'index': '3', 'Name': 'Invalid name'}]}},
+                         render.obj)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,150 @@
+'''
+Created on Mar 19, 2013
+
+@package: ally core
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+JSON renderers testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import ioc
+from ally.core.impl.processor.render.json import RenderJSON, RenderJSONBuffered, \
+    RenderJSONHandler
+from codecs import getwriter
+from io import BytesIO
+import json
+import unittest
+
+# --------------------------------------------------------------------
+
+def renderTo(render, count=3):
+    render.objectStart('Root')
+    render.value('Name', 'The "name" ă€')
+    render.collectionStart('Items', {'total': str(count)})
+    for k in range(count):
+        render.objectStart('Item', {'href': 'Item/%s' % k})
+        render.value('Id', str(k))
+        render.collectionStart('Flags')
+        render.value('Flag', 'first')
+        render.value('Flag', 'second')
+        render.collectionEnd()
+        render.objectStart('Parent')
+        render.value('Id', 'parent')
+        render.objectEnd()
+        render.objectEnd()
+    render.collectionEnd()
+    render.objectEnd()
+
+def renderJSON(count=3, charSet='utf-8'):
+    output = BytesIO()
+    renderTo(RenderJSON(getwriter(charSet)(output, 'backslashreplace')), count)
+    return output.getvalue()
+
+def renderJSONBuffered(count=3, charSet='utf-8', bufferSize=4096, indentation=None, output=None):
+    if output is None: output = BytesIO()
+    renderTo(RenderJSONBuffered(output, charSet, 'backslashreplace', bufferSize, indentation), count)
+    return output.getvalue()
+
+class OutputCounter(BytesIO):
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+# --------------------------------------------------------------------
+
+class TestRenderJSON(unittest.TestCase):
+
+    def testCompact(self):
+        for count in (0, 1, 3, 100):
+            for bufferSize in (1, 10, 4096):
+                self.assertEqual(renderJSON(count), renderJSONBuffered(count, bufferSize=bufferSize))
+        self.assertEqual(renderJSON(charSet='ascii'), renderJSONBuffered(charSet='ascii'))
+        self.assertEqual(renderJSON(charSet='iso-8859-2'), renderJSONBuffered(charSet='iso-8859-2'))
+
+    def testStatefulCharSet(self):
+        # The byte order mark is written only once for the chunks encoded in a stateful char set.
+        for bufferSize in (1, 10, 4096):
+            content = renderJSONBuffered(3, charSet='utf-16', bufferSize=bufferSize)
+            self.assertEqual(renderJSON(3, charSet='utf-16'), content)
+            self.assertNotIn('\ufeff', content.decode('utf-16'))
+
+    def testIndented(self):
+        for count in (0, 1, 3, 100):
+            for bufferSize in (1, 4096):
+                indented = renderJSONBuffered(count, bufferSize=bufferSize, indentation='  ')
+                self.assertEqual(json.loads(renderJSON(count).decode('utf-8')), json.loads(indented.decode('utf-8')))
+
+        output = BytesIO()
+        render = RenderJSONBuffered(output, 'utf-8', indentation='  ')
+        render.objectStart('Root')
+        render.value('Name', 'x')
+        render.collectionStart('Items', {'total': '1'})
+        render.objectStart('Item')
+        render.value('Id', '1')
+        render.objectEnd()
+        render.collectionEnd()
+        render.objectEnd()
+        self.assertEqual('{\n  "Name": "x",\n  "Items": {\n    "total": "1",\n    "Items": [\n      {\n'
+                         '        "Id": "1"\n      }\n    ]\n  }\n}', output.getvalue().decode('utf-8'))
+
+    def testEmptyFollowedBySibling(self):
+        for indentation in (None, '  '):
+            output = BytesIO()
+            render = RenderJSONBuffered(output, 'utf-8', indentation=indentation)
+            render.objectStart('Root')
+            render.objectStart('Empty')
+            render.objectEnd()
+            render.collectionStart('Items')
+            render.collectionEnd()
+            render.value('Name', 'x')
+            render.objectEnd()
+            self.assertEqual({'Empty': {}, 'Items': {'Items': []}, 'Name': 'x'},
+                             json.loads(output.getvalue().decode('utf-8')))
+
+    def testBuffering(self):
+        output = OutputCounter()
+        renderJSONBuffered(3, output=output)
+        # The content fits in the buffer so is written once the root object is closed.
+        self.assertEqual(1, output.writes)
+
+        output = OutputCounter()
+        content = renderJSONBuffered(100, bufferSize=1024, output=output)
+        self.assertTrue(1 < output.writes <= len(content) // 1024 + 1)
+
+        output = BytesIO()
+        render = RenderJSONBuffered(output, 'utf-8')
+        render.objectStart('Root')
+        render.value('Name', 'x')
+        self.assertEqual(b'', output.getvalue())
+        render.objectEnd()
+        self.assertEqual(b'{"Name":"x"}', output.getvalue())
+
+    def testHandler(self):
+        handler = RenderJSONHandler()
+        handler.contentTypes = {'json': None}
+        ioc.initialize(handler)
+        self.assertIsInstance(handler.renderFactory('utf-8', BytesIO()), RenderJSONBuffered)
+
+        handler = RenderJSONHandler()
+        handler.contentTypes = {'json': None}
+        handler.buffered = False
+        ioc.initialize(handler)
+        self.assertIsInstance(handler.renderFactory('utf-8', BytesIO()), RenderJSON)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
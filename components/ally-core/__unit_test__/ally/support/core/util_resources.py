@@ -0,0 +1,67 @@
+'''
+Created on Mar 14, 2013
+
+@package: ally core
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Resources utilities testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.api.config import model
+from ally.api.type import Input, typeFor
+from ally.core.impl.node import NodeRoot, NodePath, NodeProperty
+from ally.core.spec.resources import ConverterPath
+from ally.support.core.util_resources import findPath, IndexPaths
+import unittest
+
+# --------------------------------------------------------------------
+
+@model(id='Id')
+class ModelId:
+    Id = int
+    
+@model(id='Name')
+class ModelName:
+    Name = str
+
+# --------------------------------------------------------------------
+
+class TestIndexPaths(unittest.TestCase):
+
+    def testFindPath(self):
+        root, converterPath = NodeRoot(), ConverterPath()
+        index = IndexPaths(root, converterPath)
+        
+        models = NodePath(root, True, 'Model')
+        NodePath(models, False, 'Other')
+        byId = NodeProperty(models, Input('id', typeFor(ModelId.Id)))
+        byName = NodeProperty(models, Input('name', typeFor(ModelName.Name)))
+        NodePath(byId, False, 'Item')
+        self.assertEqual(str(index.findPath(['Model', '12', 'Item'])), str(findPath(root, ['Model', '12', 'Item'],
+                                                                                   converterPath)))
+        
+        # The index needs to be compiled again for the new node.
+        NodePath(byName, False, 'Item')
+        
+        for paths in ([], ['Model'], ['Model', 'Other'], ['Model', '12'], ['Model', '12', 'Item'], ['Model', 'Name'],
+                      ['Model', 'Name', 'Item'], ['Model', 'Name', 'Missing'], ['Missing'], ['Model', 'Other', 'Item']):
+            expected, path = findPath(root, paths, converterPath), index.findPath(paths)
+            self.assertEqual(expected.node, path.node)
+            self.assertEqual([type(match) for match in expected.matches], [type(match) for match in path.matches])
+            self.assertEqual(str(expected), str(path))
+            
+        self.assertTrue(index.findPath(['Model', 'Name', 'Item']).node.parent is byName)
+        self.assertTrue(index.findPath(['Model', '12', 'Item']).node.parent is byId)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -12,7 +12,7 @@ Provides the call assemblers used in constructing the resources node.
 from ally.api.config import GET, DELETE, INSERT, UPDATE
 from ally.api.operator.container import Model
 from ally.api.operator.type import TypeService, TypeModel, TypeModelProperty
-from ally.api.type import Iter, typeFor, Input
+from ally.api.type import Iter, typeFor, Input, List
 from ally.container.ioc import injected
 from ally.core.impl.invoker import InvokerRestructuring
 from ally.core.impl.node import NodePath, NodeProperty, NodeRoot
@@ -191,6 +191,25 @@ class AssembleBase(IAssembler):
                 if typ.container == model: return True
         return False
 
+    def typesFor(self, inputs):
+        '''
+        Provides the types used for constructing the node path for the provided inputs, the model properties inputs are
+        used as they are and for the models, also for the models provided as a list, the model type is used.
+        
+        @param inputs: list[Input]|tuple(Input)
+            The inputs to provide the types for.
+        @return: list[Input|TypeModel]
+            The types for the inputs.
+        '''
+        assert isinstance(inputs, (list, tuple)), 'Invalid inputs %s' % inputs
+        types = []
+        for inp in inputs:
+            assert isinstance(inp, Input), 'Invalid input %s' % inp
+            if isinstance(inp.type, TypeModelProperty): types.append(inp)
+            elif isinstance(inp.type, TypeModel): types.append(inp.type)
+            elif isinstance(inp.type, List) and isinstance(inp.type.itemType, TypeModel): types.append(inp.type.itemType)
+        return types
+
     # ----------------------------------------------------------------
 
     def obtainNodePath(self, root, name, isGroup=False):
@@ -359,6 +378,21 @@ class AssembleGet(AssembleOneByOne):
     Node tree.
     '''
 
+    hintCallFetchBatch = 'fetchBatch'
+
+    def __init__(self):
+        '''
+        Construct the get assembler.
+        '''
+        assert isinstance(self.hintCallFetchBatch, str), \
+        'Invalid hint name for call fetch batch %s' % self.hintCallFetchBatch
+        super().__init__()
+
+        self.callHints[self.hintCallFetchBatch] = '(string) The name of the service get call that provides the '\
+        'models for a list of ids, it has the same inputs as the get call but instead of the model id it takes a list '\
+        'of ids and returns an iterable of the found models. Used in fetching the referenced models of a collection '\
+        'with one call.'
+
     def assembleInvoker(self, root, invoker):
         '''
         @see: AssembleOneByOne.assembleInvoker
@@ -437,7 +471,7 @@ class AssembleDelete(AssembleOneByOne):
     Method signature needs to be flagged with DELETE and look like:
     boolean
     %
-    ([...AnyEntity.Property], [AnyEntity.Id])
+    ([...AnyEntity.Property], [AnyEntity.Id]|[List(AnyEntity.Id)])
     The last property needs to target the actual entity that is being deleted.
     !!!Attention the order of the mandatory arguments is crucial since based on that the call is placed in the REST
     Node tree.
@@ -457,6 +491,11 @@ class AssembleDelete(AssembleOneByOne):
             return False
 
         types = [inp for inp in invoker.inputs[:invoker.mandatory] if isinstance(inp.type, TypeModelProperty)]
+        for inp in invoker.inputs:
+            # The model properties provided as a list are not part of the path, the delete is placed on the model.
+            if isinstance(inp.type, List) and isinstance(inp.type.itemType, TypeModelProperty):
+                model = inp.type.itemType.container
+                if not self.isModelIn(model, types): types.append(model)
         if not types:
             log.info('Cannot extract any path types for %s', invoker)
             return False
@@ -476,9 +515,9 @@ class AssembleInsert(AssembleOneByOne):
     '''
     Resolving the INSERT method invokers.
     Method signature needs to be flagged with INSERT and look like:
-    TheEntity|TheEnity.Property (usually the unique id property)
+    TheEntity|TheEnity.Property (usually the unique id property)|List(TheEntity)|List(TheEnity.Property)
     %
-    ([...AnyEntity.Property], [TheEntity])
+    ([...AnyEntity.Property], [TheEntity|List(TheEntity)])
     !!!Attention the order of the mandatory arguments is crucial since based on that the call is placed in the REST
     Node tree.
     '''
@@ -493,6 +532,8 @@ class AssembleInsert(AssembleOneByOne):
         if invoker.method != INSERT: return False
 
         typ = invoker.output
+        # The insert of a list of models provides a list with the inserted models or ids.
+        if isinstance(typ, Iter): typ = typ.itemType
         if isinstance(typ, (TypeModel, TypeModelProperty)):
             model = typ.container
         else:
@@ -500,8 +541,7 @@ class AssembleInsert(AssembleOneByOne):
             return False
         assert isinstance(model, Model)
 
-        types = [inp if isinstance(inp.type, TypeModelProperty) else inp.type
-                 for inp in invoker.inputs[:invoker.mandatory] if isinstance(inp.type, (TypeModelProperty, TypeModel))]
+        types = self.typesFor(invoker.inputs[:invoker.mandatory])
 
         models = [typ.container for typ in types if isinstance(typ, TypeModel)]
         if len(models) > 1:
@@ -527,7 +567,7 @@ class AssembleUpdate(AssembleOneByOne):
     Method signature needs to be flagged with UPDATE and look like:
     boolean
     %
-    ([...AnyEntity.Property], [TheEntity])
+    ([...AnyEntity.Property], [TheEntity|List(TheEntity)])
     !!!Attention the order of the mandatory arguments is crucial since based on that the call is placed in the REST
     Node tree.
     '''
@@ -541,8 +581,7 @@ class AssembleUpdate(AssembleOneByOne):
 
         if invoker.method != UPDATE: return False
 
-        types = [inp if isinstance(inp.type, TypeModelProperty) else inp.type
-                 for inp in invoker.inputs[:invoker.mandatory] if isinstance(inp.type, (TypeModelProperty, TypeModel))]
+        types = self.typesFor(invoker.inputs[:invoker.mandatory])
 
         models = [typ.container for typ in types if isinstance(typ, TypeModel)]
         if len(models) > 1:
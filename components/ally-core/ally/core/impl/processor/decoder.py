@@ -68,7 +68,11 @@ class CreateDecoderHandler(HandlerProcessorProceed):
     Implementation for a handler that creates the decoders for the request content.
     '''
 
+    nameList = '%sList'
+    # The name to use for the list of models, the model name will be used in the formating.
+
     def __init__(self):
+        assert isinstance(self.nameList, str), 'Invalid name list %s' % self.nameList
         super().__init__()
 
         self._cache = WeakKeyDictionary()
@@ -89,7 +93,7 @@ class CreateDecoderHandler(HandlerProcessorProceed):
         for inp in request.invoker.inputs:
             assert isinstance(inp, Input)
 
-            if isinstance(inp.type, TypeModel):
+            if isinstance(inp.type, TypeModel) or isinstance(inp.type, List) and isinstance(inp.type.itemType, TypeModel):
                 request.decoder = self.decoderFor(inp.name, inp.type)
                 if request.decoder is not None:
                     request.decoderData = dict(target=request.arguments, converterId=request.converterId,
@@ -119,6 +123,9 @@ class CreateDecoderHandler(HandlerProcessorProceed):
             if isinstance(ofType, TypeModel):
                 assert isinstance(ofType, TypeModel)
                 decoder = self.decoderModel(ofType, obtainOnDict(argumentKey, ofType.clazz))
+            elif isinstance(ofType, List) and isinstance(ofType.itemType, TypeModel):
+                assert isinstance(ofType, List)
+                decoder = self.decoderModelList(ofType.itemType, obtainOnDict(argumentKey, list))
             else:
                 assert log.debug('Cannot decode object type \'%s\'', ofType) or True
                 return None
@@ -152,6 +159,21 @@ class CreateDecoderHandler(HandlerProcessorProceed):
 
         return exploit
 
+    def decoderModelList(self, ofType, obtain):
+        '''
+        Create a decode exploit for a list of models.
+        
+        @param ofType: TypeModel
+            The type model of the list items to decode.
+        @param obtain: callable(object) -> list
+            The obtain function to get the list of models from the target object.
+        @return: callable(**data)
+            The exploit that provides the models list decoding.
+        '''
+        assert isinstance(ofType, TypeModel), 'Invalid type model %s' % ofType
+
+        return DecodeObjectList(self.nameList % ofType.container.name, ofType.clazz, self.decoderModel(ofType), obtain)
+
     def decoderPrimitive(self, propertyName, typeValue):
         '''
         Create a decode exploit for a primitive property also decodes primitive value list.
@@ -324,6 +346,76 @@ class DecodeObject:
         except InputError: raise
         except: handleExploitError(decodeProp)
 
+class DecodeObjectList:
+    '''
+    Exploit for objects list decoding, the list is provided as a value containing the objects as dictionaries.
+    '''
+    __slots__ = ('name', 'clazz', 'decoder', 'obtain')
+
+    def __init__(self, name, clazz, decoder, obtain):
+        '''
+        Create a decode exploit for a list of models.
+        
+        @param name: string
+            The name of the models list to decode.
+        @param clazz: class
+            The class of the models to create for the list items.
+        @param decoder: DecodeObject
+            The decode exploit used for the properties of each item.
+        @param obtain: callable(object) -> list
+            The obtain function to get the list of models from the target object.
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        assert isinstance(clazz, type), 'Invalid class %s' % clazz
+        assert isinstance(decoder, DecodeObject), 'Invalid decode object %s' % decoder
+        assert callable(obtain), 'Invalid obtain %s' % obtain
+
+        self.name = name
+        self.clazz = clazz
+        self.decoder = decoder
+        self.obtain = obtain
+
+    def __call__(self, path, target, value, normalizer, **data):
+        assert isinstance(path, deque), 'Invalid path %s' % path
+        assert isinstance(normalizer, Normalizer), 'Invalid normalizer %s' % normalizer
+
+        if path and (len(path) > 1 or normalizer.normalize(self.name) != path[0]): return False
+        if not isinstance(value, list): return False
+
+        target, errors = self.obtain(target), []
+        for index, item in enumerate(value):
+            if not isinstance(item, dict): return False
+            obj = self.clazz()
+            try:
+                for itemPath, itemValue in self.valuesOf(item):
+                    if not self.decoder(path=itemPath, target=obj, value=itemValue, normalizer=normalizer, **data):
+                        return False
+            except InputError as e:
+                # The errors are associated with the position of the item in the list and reported for all the items.
+                for ref in e.message: ref.index = index
+                errors.extend(e.message)
+                continue
+            target.append(obj)
+        if errors: raise InputError(*errors)
+        return True
+
+    def valuesOf(self, item, path=()):
+        '''
+        Provides the values of the item as they are provided by the parsing of an object, the nested objects are
+        provided property by property.
+        
+        @param item: dictionary{string, object}
+            The item to provide the values for.
+        @param path: tuple(string)
+            The path of the item.
+        @return: Iterator(tuple(deque(string), object))
+            The iterator that yields the path and value.
+        '''
+        for key, value in item.items():
+            if isinstance(value, dict):
+                for entry in self.valuesOf(value, path + (key,)): yield entry
+            elif value is None or isinstance(value, (str, list)): yield deque(path + (key,)), value
+
 class DecodePrimitive:
     '''
     Exploit for primitive decoding.
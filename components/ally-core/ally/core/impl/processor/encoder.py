@@ -73,6 +73,11 @@ class CreateEncoderHandler(HandlerProcessorProceed):
     # The name to use for rendering the values in a list of values.
     typeOrders = [Boolean, Integer, Number, Percentage, String, Time, Date, DateTime, Iter]
     # The order in which 
+    compile = True
+    # Flag indicating that the encoders should be compiled into python functions, the exploits that cannot be compiled
+    # are used as they are.
+    batchSize = 100
+    # The number of collection items to be encoded in one resolve step by the compiled collection encoders.
 
     def __init__(self):
         '''
@@ -81,10 +86,13 @@ class CreateEncoderHandler(HandlerProcessorProceed):
         assert isinstance(self.nameList, str), 'Invalid name list %s' % self.nameList
         assert isinstance(self.nameValue, str), 'Invalid name value %s' % self.nameValue
         assert isinstance(self.typeOrders, list), 'Invalid type orders %s' % self.typeOrders
+        assert isinstance(self.compile, bool), 'Invalid compile flag %s' % self.compile
+        assert isinstance(self.batchSize, int) and self.batchSize > 0, 'Invalid batch size %s' % self.batchSize
         super().__init__()
 
         self._typeOrders = [typeFor(typ) for typ in self.typeOrders]
         self._cache = WeakKeyDictionary()
+        self._cacheCompiled = WeakKeyDictionary()
 
     def process(self, request:Request, response:Response, **keyargs):
         '''
@@ -99,7 +107,7 @@ class CreateEncoderHandler(HandlerProcessorProceed):
         if response.encoder: return  # There is already an encoder no need to create another one
         assert isinstance(request.invoker, Invoker), 'Invalid request invoker %s' % request.invoker
 
-        response.encoder = self.encoderFor(request.invoker.output)
+        response.encoder = self.encoderCompiledFor(request.invoker.output)
         if response.encoder is None: raise DevelError('Cannot encode response object \'%s\'' % request.invoker.output)
 
         response.encoderData = dict(converterId=response.converterId, converter=response.converter,
@@ -145,6 +153,40 @@ class CreateEncoderHandler(HandlerProcessorProceed):
 
         return encoder
 
+    def encoderCompiledFor(self, ofType):
+        '''
+        Provides the compiled encode exploit for the provided type, if compiling is disabled or the exploit cannot be
+        compiled the exploit from 'encoderFor' is provided.
+        
+        @param ofType: Type
+            The type to provide the compiled encoding exploit for.
+        @return: callable(**data)
+            The exploit that provides the encoding.
+        '''
+        assert isinstance(ofType, Type), 'Invalid type %s' % ofType
+
+        encoder = self._cacheCompiled.get(ofType)
+        if encoder is None:
+            encoder = self.encoderFor(ofType)
+            if encoder is not None and self.compile:
+                assert log.debug('Compiling encoder for type \'%s\'', ofType) or True
+                encoder = self.compileEncoder(encoder)
+            self._cacheCompiled[ofType] = encoder
+
+        return encoder
+
+    def compileEncoder(self, exploit):
+        '''
+        Compiles the provided encode exploit.
+        @see: compileExploit
+        
+        @param exploit: callable(**data)
+            The exploit to compile.
+        @return: callable(**data)
+            The compiled exploit or the same exploit if it cannot be compiled.
+        '''
+        return compileExploit(exploit, self.batchSize)
+
     def encoderItem(self, ofType):
         '''
         Creates the item encoder for the collection.
@@ -383,6 +425,76 @@ class EncodeCollection:
 
         render.collectionEnd()
 
+class EncodeCollectionBatch(EncodeCollection):
+    '''
+    Exploit for collection encoding that encodes the items in batches, the items of a batch are encoded directly in one
+    resolve step instead of queuing each item in the resolve. The resolve is passed to the item exploit, but since the
+    exploits queued in the resolve are processed only after the whole batch the item exploit needs to render the item
+    entirely in the call.
+    '''
+    __slots__ = ('batchSize',)
+
+    def __init__(self, name, exploitItem, getter=None, batchSize=100):
+        '''
+        Create a encode exploit for a collection.
+        @see: EncodeCollection.__init__
+        
+        @param batchSize: integer
+            The number of items to encode in one resolve step.
+        '''
+        assert isinstance(batchSize, int) and batchSize > 0, 'Invalid batch size %s' % batchSize
+        super().__init__(name, exploitItem, getter)
+
+        self.batchSize = batchSize
+
+    def __call__(self, value, normalizer, converter, render, resolve, name=None, **data):
+        assert isinstance(normalizer, Normalizer), 'Invalid normalizer %s' % normalizer
+        assert isinstance(converter, Converter), 'Invalid converter %s' % converter
+        assert isinstance(render, IRender), 'Invalid render %s' % render
+        assert isinstance(resolve, IResolve), 'Invalid resolve %s' % resolve
+
+        if self.getter: value = self.getter(value)
+        if value is None: return
+        assert isinstance(value, Iterable), 'Invalid value %s' % value
+
+        typeValue = typeFor(value)
+        if typeValue and isinstance(typeValue, TypeExtension):
+            assert isinstance(typeValue, TypeExtension)
+            assert isinstance(typeValue.container, Container)
+            attrs = {}
+            for prop, propType in typeValue.container.properties.items():
+                propValue = getattr(value, prop)
+                if propValue is not None: attrs[normalizer.normalize(prop)] = converter.asString(propValue, propType)
+        else: attrs = None
+
+        data.update(normalizer=normalizer, converter=converter, render=render, resolve=resolve)
+
+        render.collectionStart(normalizer.normalize(name or self.name), attrs)
+        resolve.queueBatch(self.encodeItems, (dict(data, items=items) for items in self.batches(value)))
+        resolve.queue(self.finalize, render=render)
+
+    def encodeItems(self, items, **data):
+        '''
+        Encodes the batch items.
+        '''
+        exploit = self.exploitItem
+        for item in items:
+            data['value'] = item
+            try: exploit(**data)
+            except: handleExploitError(exploit)
+
+    def batches(self, value):
+        '''
+        Iterates the provided value in batches of items, the collection is iterated only as the batches are required.
+        '''
+        items = []
+        for item in value:
+            items.append(item)
+            if len(items) == self.batchSize:
+                yield items
+                items = []
+        if items: yield items
+
 class EncodePrimitive:
     '''
     Exploit for primitive encoding.
@@ -465,3 +577,126 @@ class EncodeId(EncodePrimitive):
         if self.getter: value = self.getter(value)
         if value is None: return
         render.value(name, converterId.asString(value, self.typeValue))
+
+# --------------------------------------------------------------------
+
+def compileExploit(exploit, batchSize=100):
+    '''
+    Compiles the provided encode exploit. The object exploits are compiled into python functions that make the same render
+    calls as the interpreted exploits and the collection exploits are converted to batch collection exploits. Only the
+    exploits defined in this module are compiled, any other exploit is used as it is.
+    
+    @param exploit: callable(**data)
+        The exploit to compile.
+    @param batchSize: integer
+        The batch size to use for the collection exploits.
+    @return: callable(**data)
+        The compiled exploit or the same exploit if it cannot be compiled.
+    '''
+    assert callable(exploit), 'Invalid exploit %s' % exploit
+
+    if type(exploit) is EncodeObject:
+        compiled = compileObject(exploit)
+        if compiled is not None: return compiled
+
+    elif type(exploit) is EncodeCollection:
+        assert isinstance(exploit, EncodeCollection)
+        if type(exploit.exploitItem) is EncodeObject: compiled = compileObject(exploit.exploitItem)
+        else: compiled = None
+        # The object exploits do not use the resolve so they can be used for batch encoding.
+        if compiled is not None or isinstance(exploit.exploitItem, EncodeObject):
+            return EncodeCollectionBatch(exploit.name, compiled or exploit.exploitItem, exploit.getter, batchSize)
+
+    return exploit
+
+def compileObject(exploit):
+    '''
+    Compiles the provided object exploit into a python function.
+    
+    @param exploit: EncodeObject
+        The object exploit to compile.
+    @return: function|None
+        The compiled function that has the same signature as the exploit, None if the exploit contains properties exploits
+        that cannot be compiled.
+    '''
+    assert isinstance(exploit, EncodeObject), 'Invalid exploit %s' % exploit
+
+    namespace = dict(handleExploitError=handleExploitError)
+    code = ['def encode(value, render, normalizer, converter=None, converterId=None, name=None, **data):']
+    if exploit.getter:
+        namespace['getter'] = exploit.getter
+        code.append('    value = getter(value)')
+    code.append('    if value is None: return')
+    code.append('    render.objectStart(normalizer.normalize(name or %r))' % exploit.name)
+
+    for k, (nameProp, encodeProp) in enumerate(exploit.properties.items()):
+        namespace['e%s' % k] = encodeProp
+        code.append('    try:')
+
+        if type(encodeProp) is EncodeObject:
+            namespace['f%s' % k] = compiled = compileObject(encodeProp)
+            if compiled is None: return
+            code.append('        f%s(value, render, normalizer, converter, converterId, %r)' % (k, nameProp))
+        else:
+            lines = compilePrimitive(encodeProp, nameProp, k, namespace, '        ')
+            if lines is None: return
+            code.extend(lines)
+
+        code.append('    except: handleExploitError(e%s)' % k)
+
+    code.append('    render.objectEnd()')
+
+    exec(compile('\n'.join(code), '<encoder %s>' % exploit.name, 'exec'), namespace)
+    return namespace['encode']
+
+def compilePrimitive(exploit, name, index, namespace, indent):
+    '''
+    Provides the python code that makes the same render calls as the provided primitive exploit, the code uses the
+    'value', 'render', 'normalizer', 'converter' and 'converterId' variables.
+    
+    @param exploit: EncodePrimitive
+        The primitive exploit to compile.
+    @param name: string
+        The name of the encoded property.
+    @param index: integer
+        The index used for naming the exploit objects placed in the namespace.
+    @param namespace: dictionary{string, object}
+        The namespace in which to place the objects used by the code.
+    @param indent: string
+        The indentation of the code.
+    @return: list[string]|None
+        The code lines, None if the exploit is not a primitive exploit that can be compiled.
+    '''
+    assert isinstance(name, str), 'Invalid name %s' % name
+    assert isinstance(namespace, dict), 'Invalid namespace %s' % namespace
+    assert isinstance(indent, str), 'Invalid indent %s' % indent
+
+    if type(exploit) not in (EncodePrimitive, EncodeId, EncodePrimitiveCollection): return
+    assert isinstance(exploit, EncodePrimitive)
+
+    code = []
+    namespace['t%s' % index] = exploit.typeValue
+    if type(exploit) is EncodePrimitiveCollection: getter = exploit.getterCollection
+    else: getter = exploit.getter
+    if getter:
+        namespace['g%s' % index] = getter
+        code.append('v = g%s(value)' % index)
+    else: code.append('v = value')
+    code.append('if v is not None:')
+
+    if type(exploit) is EncodeId:
+        code.append('    render.value(%r, converterId.asString(v, t%s))' % (name, index))
+    elif type(exploit) is EncodePrimitive:
+        code.append("    assert t%s.isValid(v), 'Invalid value %%r for type %%s' %% (v, t%s)" % (index, index))
+        code.append('    render.value(normalizer.normalize(%r), converter.asString(v, t%s))' % (name, index))
+    else:
+        assert isinstance(exploit, EncodePrimitiveCollection)
+        code.append('    render.collectionStart(%r)' % name)
+        code.append('    for item in v:')
+        code.append('        if item is None: continue')
+        code.append("        assert t%s.isValid(item), 'Invalid value %%r for type %%s' %% (item, t%s)" % (index, index))
+        code.append('        render.value(normalizer.normalize(%r), converter.asString(item, t%s))'
+                    % (exploit.nameValue, index))
+        code.append('    render.collectionEnd()')
+
+    return [indent + line for line in code]
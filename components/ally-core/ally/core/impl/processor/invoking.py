@@ -20,12 +20,19 @@ from ally.design.processor.attribute import requires, defines
 from ally.design.processor.context import Context
 from ally.design.processor.handler import HandlerProcessorProceed
 from ally.exception import DevelError, InputError, Ref
+from ally.support import util_timing
+from ally.support.api.util_service import popValidators
+from ally.support.util_timing import clock
+from datetime import datetime
 import logging
 
 # --------------------------------------------------------------------
 
 log = logging.getLogger(__name__)
 
+TIMING_INVOKER = 'Invokers'
+# The timing group for the resources invokers.
+
 # --------------------------------------------------------------------
 
 class Request(Context):
@@ -48,6 +55,14 @@ class Response(Context):
     @rtype: object
     The response object.
     ''')
+    lastModified = defines(datetime, doc='''
+    @rtype: datetime
+    The UTC date when the response object was last modified, as set by the invoked service.
+    ''')
+    eTag = defines(str, doc='''
+    @rtype: string
+    The quoted entity tag of the response object, as set by the invoked service.
+    ''')
 
 # --------------------------------------------------------------------
 
@@ -97,11 +112,20 @@ class InvokingHandler(HandlerProcessorProceed):
             else:
                 raise DevelError('No value for mandatory input \'%s\' for invoker \'%s\'' % (inp.name, request.invoker.name))
         try:
-            value = request.invoker.invoke(*arguments)
+            popValidators()  # Clear any validators left by previous calls
+            timings = util_timing.timings
+            if timings is None: value = request.invoker.invoke(*arguments)
+            else:
+                start = clock()
+                try: value = request.invoker.invoke(*arguments)
+                finally: timings.record(TIMING_INVOKER, request.invoker, clock() - start)
             assert log.debug('Successful on calling invoker \'%s\' with values %s', request.invoker,
                              tuple(arguments)) or True
 
             callBack(request.invoker, value, response)
+            lastModified, eTag = popValidators()
+            if lastModified is not None: response.lastModified = lastModified
+            if eTag is not None: response.eTag = '"%s"' % eTag
         except InputError as e:
             assert isinstance(e, InputError)
             response.code, response.isSuccess = INPUT_ERROR
@@ -122,27 +146,32 @@ class InvokingHandler(HandlerProcessorProceed):
             assert isinstance(msg, Ref)
             if not msg.model:
                 messages.append(Value('message', msg.message))
-            elif not msg.property:
-                messagesModel = models.get(msg.model)
-                if not messagesModel: messagesModel = models[msg.model] = []
+                continue
+            # The messages for models provided in a list are grouped also by the model position.
+            key = (msg.model, msg.index)
+            if not msg.property:
+                messagesModel = models.get(key)
+                if not messagesModel: messagesModel = models[key] = []
                 messagesModel.append(Value('message', msg.message))
-                if msg.model not in names: names.append(msg.model)
             else:
-                propertiesModel = properties.get(msg.model)
-                if not propertiesModel: propertiesModel = properties[msg.model] = []
+                propertiesModel = properties.get(key)
+                if not propertiesModel: propertiesModel = properties[key] = []
                 propertiesModel.append(Value(msg.property, msg.message))
-                if msg.model not in names: names.append(msg.model)
+            if key not in names: names.append(key)
 
-        errors = []
+        errors, items = [], []
         if messages: errors.append(List('error', *messages))
-        for name in names:
-            messagesModel, propertiesModel = models.get(name), properties.get(name)
+        for key in names:
+            messagesModel, propertiesModel = models.get(key), properties.get(key)
 
             props = []
             if messagesModel: props.append(List('error', *messagesModel))
             if propertiesModel: props.extend(propertiesModel)
 
-            errors.append(Object(name, *props))
+            name, index = key
+            if index is None: errors.append(Object(name, *props))
+            else: items.append(Object(name, *props, attributes={'index': str(index)}))
+        if items: errors.append(List('item', *items))
 
         return Object('model', *errors)
 
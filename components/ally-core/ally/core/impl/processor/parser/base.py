@@ -120,27 +120,32 @@ class ParseBaseHandler(HandlerProcessor):
             assert isinstance(msg, Ref)
             if not msg.model:
                 messages.append(Value('message', msg.message))
-            elif not msg.property:
-                messagesModel = models.get(msg.model)
-                if not messagesModel: messagesModel = models[msg.model] = deque()
+                continue
+            # The messages for models provided in a list are grouped also by the model position.
+            key = (msg.model, msg.index)
+            if not msg.property:
+                messagesModel = models.get(key)
+                if not messagesModel: messagesModel = models[key] = deque()
                 messagesModel.append(Value('message', msg.message))
-                if msg.model not in names: names.append(msg.model)
             else:
-                propertiesModel = properties.get(msg.model)
-                if not propertiesModel: propertiesModel = properties[msg.model] = deque()
+                propertiesModel = properties.get(key)
+                if not propertiesModel: propertiesModel = properties[key] = deque()
                 propertiesModel.append(Value(msg.property, msg.message))
-                if msg.model not in names: names.append(msg.model)
+            if key not in names: names.append(key)
 
-        errors = deque()
+        errors, items = deque(), deque()
         if messages: errors.append(List('error', *messages))
-        for name in names:
-            messagesModel, propertiesModel = models.get(name), properties.get(name)
+        for key in names:
+            messagesModel, propertiesModel = models.get(key), properties.get(key)
 
             props = deque()
             if messagesModel: props.append(List('error', *messagesModel))
             if propertiesModel: props.extend(propertiesModel)
 
-            errors.append(Object(name, *props))
+            name, index = key
+            if index is None: errors.append(Object(name, *props))
+            else: items.append(Object(name, *props, attributes={'index': str(index)}))
+        if items: errors.append(List('item', *items))
 
         return Object('model', *errors)
 
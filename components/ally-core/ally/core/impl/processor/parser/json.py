@@ -0,0 +1,161 @@
+'''
+Created on Mar 22, 2013
+
+@package: ally core
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the JSON parser processor handler, the JSON content is parsed incrementally while is read from the request
+content stream.
+'''
+
+from .base import ParseBaseHandler
+from ally.container.ioc import injected
+from ally.support.util_io import IInputStream
+from codecs import getincrementaldecoder
+from collections import deque
+from json.decoder import JSONDecoder
+import re
+
+# --------------------------------------------------------------------
+
+VALUE = '0'
+# The token kind for the values, the values are strings, numbers, booleans, null and arrays.
+STRUCTURAL = frozenset('{}:,')
+# The structural characters of the JSON objects, each one is a token kind.
+END = (None, None)
+# The token provided when there are no more tokens.
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+# The white space pattern.
+WHITESPACE_CHARS = frozenset(' \t\n\r')
+# The white space characters.
+NUMBER_CHARS = frozenset('0123456789+-.eE')
+# The characters that can continue a number.
+
+# --------------------------------------------------------------------
+
+@injected
+class ParseJSONHandler(ParseBaseHandler):
+    '''
+    Provides the JSON parsing, the content is parsed incrementally and the values are delivered to the decoder as soon as
+    they are parsed.
+    @see: ParseBaseHandler
+    '''
+
+    bufferSize = 4096
+    # The number of bytes to read at once from the request content stream.
+    parserName = 'json'
+    # The parser name used in the error messages.
+
+    def __init__(self):
+        assert isinstance(self.bufferSize, int) and self.bufferSize > 0, 'Invalid buffer size %s' % self.bufferSize
+        assert isinstance(self.parserName, str), 'Invalid parser name %s' % self.parserName
+        super().__init__()
+
+    def parse(self, decoder, data, source, charSet):
+        '''
+        @see: ParseBaseHandler.parse
+        '''
+        assert callable(decoder), 'Invalid decoder %s' % decoder
+        assert isinstance(data, dict), 'Invalid data %s' % data
+        assert isinstance(source, IInputStream), 'Invalid stream %s' % source
+        assert isinstance(charSet, str), 'Invalid character set %s' % charSet
+
+        tokens = tokenize(source, charSet, self.bufferSize)
+        try:
+            error = self.decode(decoder, data, tokens, next(tokens, END), deque())
+            if error: return error
+            for _token in tokens: raise ValueError('Extra data')
+        except ValueError: return 'Bad %s content' % self.parserName
+
+    def decode(self, decoder, data, tokens, token, path):
+        '''
+        Decodes the value that starts with the provided token, the objects are decoded property by property and the
+        other values are decoded as they are.
+
+        @param decoder: callable
+            The decoder to be used.
+        @param data: dictionary{string, object}
+            The data used for the decoder.
+        @param tokens: Iterator(tuple(string, object))
+            The tokens iterator.
+        @param token: tuple(string, object)
+            The token that starts the value.
+        @param path: deque(string)
+            The path of the value.
+        @return: string|None
+            The error message if the decoding failed, None otherwise.
+        '''
+        kind, value = token
+        if kind == '{':
+            kind, value = next(tokens, END)
+            if kind == '}': return
+            while True:
+                if kind != VALUE or not isinstance(value, str): raise ValueError('Expecting property name')
+                if next(tokens, END)[0] != ':': raise ValueError('Expecting \':\' delimiter')
+
+                path.append(value)
+                error = self.decode(decoder, data, tokens, next(tokens, END), path)
+                if error: return error
+                path.pop()
+
+                kind, value = next(tokens, END)
+                if kind == '}': return
+                if kind != ',': raise ValueError('Expecting \',\' delimiter')
+                kind, value = next(tokens, END)
+
+        if kind != VALUE: raise ValueError('Unexpected \'%s\'' % kind)
+        if value is None or isinstance(value, (str, list)):
+            if not decoder(path=deque(path), value=value, **data): return 'Invalid path \'%s\' in object' % '/'.join(path)
+
+# --------------------------------------------------------------------
+
+def tokenize(source, charSet, bufferSize):
+    '''
+    Provides the JSON tokens read from the source stream, the stream is read in chunks as the tokens are required.
+
+    @param source: IInputStream
+        The byte input stream containing the JSON content.
+    @param charSet: string
+        The character set for the input source stream.
+    @param bufferSize: integer
+        The number of bytes to read at once.
+    @return: Iterator(tuple(string, object))
+        The iterator that yields tuples containing the token kind and the token value, raises ValueError for invalid
+        content.
+    '''
+    assert isinstance(source, IInputStream), 'Invalid stream %s' % source
+    assert isinstance(bufferSize, int) and bufferSize > 0, 'Invalid buffer size %s' % bufferSize
+
+    decode, scan = getincrementaldecoder(charSet)().decode, JSONDecoder().scan_once
+    text, index, isFinal, size = '', 0, False, bufferSize
+    while True:
+        if index < len(text) and text[index] in WHITESPACE_CHARS: index = WHITESPACE.match(text, index).end()
+        if index < len(text):
+            char = text[index]
+            if char in STRUCTURAL:
+                yield char, None
+                index += 1
+                continue
+
+            try: value, end = scan(text, index)
+            except StopIteration:
+                if isFinal: raise ValueError('Expecting value')
+            except ValueError:
+                if isFinal: raise
+            else:
+                # A number is complete only if it is followed by a character that cannot continue it, otherwise the
+                # number might continue in the next chunk.
+                if isFinal or type(value) not in (int, float) or (end < len(text) and text[end] not in NUMBER_CHARS):
+                    yield VALUE, value
+                    index, size = end, bufferSize
+                    continue
+            # The value is not complete, the read size is increased so a large value is not scanned for each chunk.
+            size = max(size, len(text) - index)
+
+        elif isFinal: return
+
+        chunk = source.read(size)
+        isFinal = not chunk
+        text, index = text[index:] + decode(chunk, isFinal), 0
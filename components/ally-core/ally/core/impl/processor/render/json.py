@@ -13,7 +13,7 @@ from .base import RenderBaseHandler
 from ally.container.ioc import injected
 from ally.core.spec.transform.render import IRender
 from ally.support.util_io import IOutputStream
-from codecs import getwriter
+from codecs import getwriter, getincrementalencoder
 from collections import deque
 from json.encoder import encode_basestring
 
@@ -28,9 +28,23 @@ class RenderJSONHandler(RenderBaseHandler):
 
     encodingError = 'backslashreplace'
     # The encoding error resolving.
+    buffered = True
+    # Flag indicating that the JSON is rendered in a memory buffer that is written to the output in encoded blocks.
+    bufferSize = 4096
+    # The number of characters to buffer before encoding and writing them to the output, used for buffered rendering.
+    compact = True
+    # Flag indicating that the JSON is rendered compact, without any indentation, the indented JSON is provided only by
+    # the buffered rendering.
+    indentation = '    '
+    # The indentation used for the JSON that is not rendered compact.
 
     def __init__(self):
         assert isinstance(self.encodingError, str), 'Invalid string %s' % self.encodingError
+        assert isinstance(self.buffered, bool), 'Invalid buffered flag %s' % self.buffered
+        assert isinstance(self.bufferSize, int) and self.bufferSize > 0, 'Invalid buffer size %s' % self.bufferSize
+        assert isinstance(self.compact, bool), 'Invalid compact flag %s' % self.compact
+        assert isinstance(self.indentation, str), 'Invalid indentation %s' % self.indentation
+        assert self.buffered or self.compact, 'The indented JSON is provided only by the buffered rendering'
         super().__init__()
 
     def renderFactory(self, charSet, output):
@@ -40,7 +54,9 @@ class RenderJSONHandler(RenderBaseHandler):
         assert isinstance(charSet, str), 'Invalid char set %s' % charSet
         assert isinstance(output, IOutputStream), 'Invalid content output stream %s' % output
 
-        return RenderJSON(getwriter(charSet)(output, self.encodingError))
+        if not self.buffered: return RenderJSON(getwriter(charSet)(output, self.encodingError))
+        return RenderJSONBuffered(output, charSet, self.encodingError, self.bufferSize,
+                                  None if self.compact else self.indentation)
 
 # --------------------------------------------------------------------
 
@@ -149,3 +165,178 @@ class RenderJSON(IRender):
                 out.write(encode_basestring(attrName))
                 out.write(':')
                 out.write(encode_basestring(attrValue))
+
+class RenderJSONBuffered(IRender):
+    '''
+    Renderer for JSON that places the JSON text in a memory buffer, the buffer is encoded and written to the output
+    whenever it reaches the buffer size and when the JSON is completed.
+    '''
+    __slots__ = ('output', 'encoder', 'bufferSize', 'indentation', 'separator', 'buffer', 'size', 'isObject',
+                 'isFirst', 'depth')
+
+    def __init__(self, output, charSet, encodingError='backslashreplace', bufferSize=4096, indentation=None):
+        '''
+        Construct the buffered JSON renderer.
+        
+        @param output: IOutputStream
+            The output stream to write the encoded JSON to.
+        @param charSet: string
+            The character set used for encoding the JSON.
+        @param encodingError: string
+            The encoding error resolving.
+        @param bufferSize: integer
+            The number of characters to buffer before encoding and writing them to the output.
+        @param indentation: string|None
+            The indentation to use for the JSON, if None the JSON is rendered compact.
+        '''
+        assert isinstance(output, IOutputStream), 'Invalid content output stream %s' % output
+        assert isinstance(charSet, str), 'Invalid char set %s' % charSet
+        assert isinstance(encodingError, str), 'Invalid encoding error %s' % encodingError
+        assert isinstance(bufferSize, int) and bufferSize > 0, 'Invalid buffer size %s' % bufferSize
+        assert indentation is None or isinstance(indentation, str), 'Invalid indentation %s' % indentation
+
+        self.output = output
+        self.encoder = getincrementalencoder(charSet)(encodingError)
+        self.bufferSize = bufferSize
+        self.indentation = indentation
+        self.separator = ':' if indentation is None else ': '
+
+        self.buffer = []
+        self.size = 0
+        self.isObject = deque()
+        self.isFirst = True
+        self.depth = 0
+
+    def value(self, name, value):
+        '''
+        @see: IRender.value
+        '''
+        assert self.isObject, 'No container for value'
+        assert isinstance(name, str), 'Invalid name %s' % name
+        assert isinstance(value, str), 'Invalid value %s' % value
+
+        if self.isFirst:
+            self.isFirst = False
+            chunk = ''
+        else: chunk = ','
+        if self.indentation is not None: chunk += self.newLine()
+
+        if self.isObject[0]: chunk += encode_basestring(name) + self.separator + encode_basestring(value)
+        else: chunk += encode_basestring(value)
+
+        self.buffer.append(chunk)
+        self.size += len(chunk)
+        if self.size >= self.bufferSize: self.flush()
+
+    def objectStart(self, name, attributes=None):
+        '''
+        @see: IRender.objectStart
+        '''
+        self.write(self.openObject(name, attributes))
+        self.isObject.appendleft(True)
+
+    def objectEnd(self):
+        '''
+        @see: IRender.objectEnd
+        '''
+        assert self.isObject, 'No object to end'
+        isObject = self.isObject.popleft()
+        assert isObject, 'No object to end'
+
+        self.depth -= 1
+        if self.indentation is None or self.isFirst: self.write('}')
+        else: self.write(self.newLine() + '}')
+        self.isFirst = False
+
+        if not self.isObject: self.flush(True)
+
+    def collectionStart(self, name, attributes=None):
+        '''
+        @see: IRender.collectionStart
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+
+        chunk = self.openObject(name, attributes)
+        if not self.isFirst: chunk += ','
+        if self.indentation is not None: chunk += self.newLine()
+        self.write(chunk + encode_basestring(name) + self.separator + '[')
+
+        self.depth += 1
+        self.isFirst = True
+        self.isObject.appendleft(False)
+
+    def collectionEnd(self):
+        '''
+        @see: IRender.collectionEnd
+        '''
+        assert self.isObject, 'No collection to end'
+        isObject = self.isObject.popleft()
+        assert not isObject, 'No collection to end'
+
+        self.depth -= 2
+        if self.indentation is None: self.write(']}')
+        elif self.isFirst: self.write(']' + self.newLine() + '}')
+        else: self.write('\n' + self.indentation * (self.depth + 1) + ']' + self.newLine() + '}')
+        self.isFirst = False
+
+        if not self.isObject: self.flush(True)
+
+    # ----------------------------------------------------------------
+
+    def openObject(self, name, attributes=None):
+        '''
+        Provides the text that opens a JSON object.
+        '''
+        assert isinstance(name, str), 'Invalid name %s' % name
+        assert attributes is None or isinstance(attributes, dict), 'Invalid attributes %s' % attributes
+
+        chunks = []
+        if not self.isFirst: chunks.append(',')
+        if self.indentation is not None and self.depth: chunks.append(self.newLine())
+
+        if self.isObject and self.isObject[0]:
+            chunks.append(encode_basestring(name))
+            chunks.append(self.separator)
+
+        chunks.append('{')
+        self.depth += 1
+        self.isFirst = True
+        if attributes:
+            for attrName, attrValue in attributes.items():
+                assert isinstance(attrName, str), 'Invalid attribute name %s' % attrName
+                assert isinstance(attrValue, str), 'Invalid attribute value %s' % attrValue
+
+                if self.isFirst: self.isFirst = False
+                else: chunks.append(',')
+                if self.indentation is not None: chunks.append(self.newLine())
+                chunks.append(encode_basestring(attrName))
+                chunks.append(self.separator)
+                chunks.append(encode_basestring(attrValue))
+
+        return ''.join(chunks)
+
+    def newLine(self):
+        '''
+        Provides the new line with the indentation for the current depth.
+        '''
+        return '\n' + self.indentation * self.depth
+
+    def write(self, chunk):
+        '''
+        Writes the chunk in the buffer, the buffer is flushed if it reached the buffer size.
+        '''
+        self.buffer.append(chunk)
+        self.size += len(chunk)
+        if self.size >= self.bufferSize: self.flush()
+
+    def flush(self, final=False):
+        '''
+        Encodes and writes the buffer content to the output, the encoder state is kept between the flushes.
+        
+        @param final: boolean
+            Flag indicating that the JSON is completed and the encoder needs to be finalized.
+        '''
+        if self.buffer or final:
+            self.output.write(self.encoder.encode(''.join(self.buffer), final))
+            self.buffer = []
+            self.size = 0
@@ -16,7 +16,7 @@ from ally.api.type import typeFor, Input
 from ally.core.impl.invoker import InvokerRestructuring, InvokerCall
 from ally.core.impl.node import NodePath, NodeProperty, MatchProperty
 from ally.core.spec.resources import Match, Node, Path, ConverterPath, \
-    IResourcesRegister, Invoker, PathExtended
+    IResourcesRegister, Invoker, PathExtended, INodeChildListener
 from ally.support.util import immut
 from collections import deque, Iterable
 
@@ -135,6 +135,104 @@ def findPath(node, paths, converterPath):
 
     return Path(matches)
 
+class IndexPaths(INodeChildListener):
+    '''
+    Index used for finding the resource nodes for request paths, the resource node tree is compiled into dictionaries
+    that map the normalized path node names to the child nodes, only the other nodes (like the property nodes) are
+    matched by trying each of them. The index is compiled again the first time is used after a node has been added to
+    the resources tree. The index provides the same paths as @see: findPath.
+    '''
+    
+    def __init__(self, node, converterPath):
+        '''
+        Construct the paths index.
+        
+        @param node: Node
+            The root node to index.
+        @param converterPath: ConverterPath
+            The converter path used in handling the path elements.
+        '''
+        assert isinstance(node, Node), 'Invalid root node %s' % node
+        assert isinstance(converterPath, ConverterPath), 'Invalid converter path %s' % converterPath
+        self.node = node
+        self.converterPath = converterPath
+        
+        self._index = None
+        node.addStructureListener(self)
+        
+    def onChildAdded(self, node, child):
+        '''
+        @see: INodeChildListener.onChildAdded
+        '''
+        self._index = None
+        
+    def findPath(self, paths):
+        '''
+        Finds the resource node for the provided request path.
+        
+        @param paths: deque[string]|Iterable[string]
+            A deque of string path elements identifying a resource to be searched for, this list will be consumed 
+            of every path element that was successfully identified.
+        @return: Path
+            The path leading to the node that provides the resource if the Path has no node it means that the paths
+            have been recognized only to certain point.
+        '''
+        if not isinstance(paths, deque):
+            assert isinstance(paths, Iterable), 'Invalid iterable paths %s' % paths
+            paths = deque(paths)
+        assert isinstance(paths, deque), 'Invalid paths %s' % paths
+        
+        index = self._index
+        if index is None: index = self._index = self._compile(self.node)
+        node, names, others = index
+        
+        if len(paths) == 0: return Path([], node)
+        
+        matches = []
+        found = pushMatch(matches, node.tryMatch(self.converterPath, paths))
+        while found and len(paths) > 0:
+            index = names.get(paths[0])
+            if index is not None:
+                node, names, others = index
+                del paths[0]
+                matches.append(node.newMatch())
+                continue
+            
+            found = False
+            for index in others:
+                if pushMatch(matches, index[0].tryMatch(self.converterPath, paths)):
+                    node, names, others = index
+                    found = True
+                    break
+        
+        if len(paths) == 0: return Path(matches, node)
+        
+        return Path(matches)
+    
+    # ----------------------------------------------------------------
+    
+    def _compile(self, node):
+        '''
+        Compiles the index for the provided node.
+        
+        @param node: Node
+            The node to compile the index for.
+        @return: tuple(Node, dictionary{string: tuple}, list[tuple])
+            The node, the indexes of the path children mapped by the normalized path name and the indexes of the other
+            children in the matching order.
+        '''
+        assert isinstance(node, Node), 'Invalid node %s' % node
+        names, others = {}, []
+        for child in node.children:
+            if isinstance(child, NodePath):
+                assert isinstance(child, NodePath)
+                assert not others, 'The path node %s needs to be matched before the nodes %s' % (child, others)
+                # Only the first path node with a name is matched, just like when searching the children one by one.
+                name = self.converterPath.normalize(child.name)
+                if name not in names: names[name] = self._compile(child)
+            else: others.append(self._compile(child))
+        return node, names, others
+
 def findGetModel(fromPath, typeModel):
     '''
     Finds the path for the first Node that provides a get for the name. The search is made based
@@ -9,7 +9,8 @@ Created on Nov 23, 2011
 Runs the asyncore py web server.
 '''
 
-from ..ally_http import server_type, server_version, server_host, server_port
+from ..ally_http import server_type, server_version, server_host, server_port, \
+    server_pool_size
 from ..ally_http.server import assemblyServer
 from ally.container import ioc
 from ally.http.server import server_asyncore
@@ -22,6 +23,46 @@ SERVER_ASYNCORE = 'asyncore'
 
 # --------------------------------------------------------------------
 
+@ioc.config
+def keep_alive_timeout() -> float:
+    '''The time in seconds that an idle persistent connection is kept open waiting for the next request'''
+    return 15.0
+
+@ioc.config
+def keep_alive_max_requests() -> int:
+    '''
+    The maximum number of requests that are served on a persistent connection before it is closed, provide 1 in order
+    to disable the persistent connections.
+    '''
+    return 100
+
+@ioc.config
+def worker_threads() -> int:
+    '''
+    The number of worker threads that execute the requests processing outside the server loop, provide 0 in order to
+    process the requests in the server loop. Use worker threads if the processing involves blocking operations like
+    database access.
+    '''
+    return 0
+
+@ioc.config
+def worker_queue_size() -> int:
+    '''
+    The maximum number of requests that wait for a worker thread, when the limit is reached the new requests are
+    rejected with 503 Service Unavailable, only used if there are worker threads.
+    '''
+    return 100
+
+@ioc.config
+def worker_reject_retry_after() -> int:
+    '''
+    The seconds placed in the Retry-After header of the requests rejected because the worker threads are saturated,
+    provide None in order not to place the header.
+    '''
+    return None
+
+# --------------------------------------------------------------------
+
 @ioc.replace(server_type)
 def server_type_asyncore():
     '''
@@ -41,6 +82,12 @@ def serverAsyncore():
     b.serverHost = server_host()
     b.serverPort = server_port()
     b.requestHandlerFactory = serverAsyncoreRequestHandler()
+    b.keepAliveTimeout = keep_alive_timeout()
+    b.keepAliveMaxRequests = keep_alive_max_requests()
+    b.workerThreads = worker_threads()
+    b.workerQueueSize = worker_queue_size()
+    b.rejectRetryAfter = worker_reject_retry_after()
+    b.poolSize = server_pool_size()
     b.assembly = assemblyServer()
     return b
 
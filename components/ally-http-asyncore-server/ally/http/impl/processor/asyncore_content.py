@@ -149,7 +149,7 @@ class ReaderInMemory:
                 if self._size > length:
                     dif = self._size - length
                     self._size = length
-                    data = memoryview(data)[:dif]
+                    data = memoryview(data)[:len(data) - dif]
                 self._stream.write(data)
                 if self._size == length: data = b''
             else: self._stream.write(data)
@@ -198,7 +198,7 @@ class ReaderInFile:
                 if self._size > length:
                     dif = self._size - length
                     self._size = length
-                    data = memoryview(data)[:dif]
+                    data = memoryview(data)[:len(data) - dif]
                 self._file.write(data)
                 if self._size == length: data = b''
             else: self._file.write(data)
@@ -18,11 +18,15 @@ from ally.http.spec.server import RequestHTTP, ResponseHTTP, RequestContentHTTP,
 from ally.support.util_io import IInputStream, readGenerator
 from asyncore import dispatcher, loop
 from collections import Callable, deque
+from functools import partial
 from http.server import BaseHTTPRequestHandler
 from io import BytesIO
+from threading import Thread, Condition
 from urllib.parse import urlparse, parse_qsl
 import logging
+import errno
 import socket
+import time
 
 # --------------------------------------------------------------------
 
@@ -32,6 +36,7 @@ log = logging.getLogger(__name__)
 WRITE_BYTES = 1
 WRITE_ITER = 2
 WRITE_CLOSE = 3
+WRITE_NEXT = 4
 
 # --------------------------------------------------------------------
 
@@ -45,6 +50,10 @@ class RequestContentHTTPAsyncore(RequestContentHTTP):
     The content reader callable used for pushing data from the asyncore read. Once the reader is finalized it will
     return a chain that is used for further request processing.
     ''')
+    length = optional(int, doc='''
+    @rtype: integer
+    The content source length in bytes, used in order to know where the next pipelined request starts.
+    ''')
 
 # --------------------------------------------------------------------
 
@@ -61,6 +70,10 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
     # The maximum request size, 100 kilobytes
     requestTerminator = b'\r\n\r\n'
     # Terminator that signals the http request is complete 
+    protocol_version = 'HTTP/1.1'
+    # The protocol version used in responses, HTTP/1.1 is required in order to have persistent connections.
+    noContentStatuses = frozenset((204, 304))
+    # The response statuses that are not allowed to have a body.
 
     def __init__(self, request, address, server):
         '''
@@ -85,15 +98,13 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         self.request_version = 'HTTP/1.1'
         self.requestline = 0
         
-        self._stage = 1
-        self.rfile = BytesIO()
         self._readCarry = None
-        self._reader = None
-
-        self.wfile = BytesIO()
         self._writeq = deque()
+        self._requestsCount = 0
+        self._lastActivity = time.time()
+        self._processed = None
         
-        self._next(1)
+        self._start()
         
     def handle_read(self):
         '''
@@ -104,10 +115,20 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
             log.exception('Exception occurred while reading the content from \'%s\'' % self.connection)
             self.close()
             return
+        self._lastActivity = time.time()
         self.handle_data(data)
     
     def handle_error(self):
         log.exception('A problem occurred in the server')
+        
+    def close(self):
+        '''
+        @see: dispatcher.close
+        
+        Also releases the contexts of the last processed request.
+        '''
+        super().close()
+        self._release()
     
     def end_headers(self):
         '''
@@ -115,7 +136,7 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         '''
         super().end_headers()
         self._writeq.append((WRITE_BYTES, memoryview(self.wfile.getvalue())))
-        self.wfile = None
+        self.wfile = BytesIO()
 
     def log_message(self, format, *args):
         '''
@@ -126,13 +147,42 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         # creates a big delay whenever the request is made from a non localhost client.
         assert log.debug(format, *args) or True
         
+    def idleDeadline(self):
+        '''
+        Provides the time when the connection is considered idle, that is when it waited for a request for longer then the
+        server keep alive timeout.
+        
+        @return: float|None
+            The time in seconds when the connection becomes idle, None if the connection is processing a request.
+        '''
+        if self._stage == 3: return None
+        return self._lastActivity + self.server.keepAliveTimeout
+        
     # ----------------------------------------------------------------
     
+    def _start(self):
+        '''
+        Prepares the handler for a new request on the connection, if there is data already received (pipelined requests)
+        then this data is processed.
+        '''
+        self._release()
+        self.rfile = BytesIO()
+        self.wfile = BytesIO()
+        self._reader = None
+        self._contentRemaining = None
+        self.close_connection = True
+        self._next(1)
+        
+        if self._readCarry is not None:
+            data, self._readCarry = self._readCarry, None
+            self.handle_data(data)
+    
     def _next(self, stage):
         '''
         Proceed to next stage.
         '''
         assert isinstance(stage, int), 'Invalid stage %s' % stage
+        self._stage = stage
         self.readable = getattr(self, '_%s_readable' % stage, None)
         self.handle_data = getattr(self, '_%s_handle_data' % stage, None)
         self.writable = getattr(self, '_%s_writable' % stage, None)
@@ -150,7 +200,8 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         '''
         Handle the data as being part of the request.
         '''
-        if self._readCarry is not None: data = self._readCarry + data
+        if self._readCarry is not None:
+            data, self._readCarry = self._readCarry + data, None
         index = data.find(self.requestTerminator)
         requestTerminatorLen = len(self.requestTerminator)
         
@@ -159,20 +210,29 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
             self.rfile.write(data[:index])
             self.rfile.seek(0)
             self.raw_requestline = self.rfile.readline()
-            self.parse_request()
+            if not self.parse_request():
+                self.rfile = None
+                self._respondError()
+                return
             self.rfile = None
             
             self._process(self.command or '')
             
-            if index < len(data) and self.handle_data: self.handle_data(data[index:])
+            if index < len(data):
+                if self._stage == 2: self.handle_data(data[index:])
+                # The data belongs to the next pipelined request or to the content of a request that is processed
+                # in a worker thread.
+                else: self._readCarry = data[index:]
         else:
             self._readCarry = data[-requestTerminatorLen:]
             self.rfile.write(data[:-requestTerminatorLen])
             
             if self.rfile.tell() > self.maximumRequestSize:
+                self._readCarry = None
                 self.send_response(400, 'Request to long')
+                self.send_header('Connection', 'close')
                 self.end_headers()
-                self.close()
+                self._respondError()
                 
     def _1_writable(self):
         '''
@@ -193,12 +253,20 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         Handle the data as being part of the request.
         '''
         assert self._reader is not None, 'No reader available'
+        if self._contentRemaining is not None:
+            if len(data) > self._contentRemaining:
+                # The data after the content belongs to the next pipelined request.
+                self._readCarry, data = data[self._contentRemaining:], data[:self._contentRemaining]
+            self._contentRemaining -= len(data)
+        
         chain = self._reader(data)
         if chain is not None:
             assert isinstance(chain, Chain), 'Invalid chain %s' % chain
             self._reader = None
             self._next(3)  # Now we proceed to write stage
-            chain.doAll()
+            # The chain is continued even if the worker pool is saturated since the request has already been accepted.
+            if self.server.pool is None: self._proceed(chain)
+            else: self.server.pool.submit(partial(self._proceed, chain), False)
             
     def _2_writable(self):
         '''
@@ -227,7 +295,8 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         assert self._writeq, 'Nothing to write'
         
         what, content = self._writeq[0]
-        assert what in (WRITE_ITER, WRITE_BYTES, WRITE_CLOSE), 'Invalid what %s' % what
+        assert what in (WRITE_ITER, WRITE_BYTES, WRITE_CLOSE, WRITE_NEXT), 'Invalid what %s' % what
+        self._lastActivity = time.time()
         if what == WRITE_ITER:
             try: data = memoryview(next(content))
             except StopIteration:
@@ -237,6 +306,10 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         elif what == WRITE_CLOSE:
             self.close()
             return
+        elif what == WRITE_NEXT:
+            del self._writeq[0]
+            self._start()
+            return
         
         dataLen = len(data)
         try:
@@ -259,10 +332,13 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         proc = self.server.processing
         assert isinstance(proc, Processing), 'Invalid processing %s' % proc
         
-        request, requestCnt = proc.ctx.request(), proc.ctx.requestCnt()
+        request, requestCnt = proc.newContext('request'), proc.newContext('requestCnt')
         assert isinstance(request, RequestHTTP), 'Invalid request %s' % request
         assert isinstance(requestCnt, RequestContentHTTP), 'Invalid request content %s' % requestCnt
         
+        self._requestsCount += 1
+        if self._requestsCount >= self.server.keepAliveMaxRequests: self.close_connection = True
+        
         if RequestHTTP.clientIP in request: request.clientIP = self.client_address[0]
         url = urlparse(self.path)
         request.scheme, request.method = HTTP, method.upper()
@@ -272,42 +348,175 @@ class RequestHandler(dispatcher, BaseHTTPRequestHandler):
         
         requestCnt.source = self.rfile
         
-        chain = Chain(proc)
+        # The chain and the contexts are provided in the server loop since the pooled objects are used only by the loop.
+        chain = proc.newChain()
         chain.process(**proc.fillIn(request=request, requestCnt=requestCnt,
-                                    response=proc.ctx.response(), responseCnt=proc.ctx.responseCnt()))
+                                    response=proc.newContext('response'), responseCnt=proc.newContext('responseCnt')))
         
-        def respond():
-            response, responseCnt = chain.arg.response, chain.arg.responseCnt
-            assert isinstance(response, ResponseHTTP), 'Invalid response %s' % response
-            assert isinstance(responseCnt, ResponseContentHTTP), 'Invalid response content %s' % responseCnt
+        self._next(3)  # Now we proceed to write stage, the response is placed once the chain is finalized
+        if self.server.pool is None: self._execute(chain)
+        elif not self.server.pool.submit(partial(self._execute, chain)):
+            proc.release(chain)
+            self._respondReject()
     
-            if ResponseHTTP.headers in response and response.headers is not None:
-                for name, value in response.headers.items(): self.send_header(name, value)
-    
-            assert isinstance(response.status, int), 'Invalid response status code %s' % response.status
-            if ResponseHTTP.text in response and response.text: text = response.text
-            elif ResponseHTTP.code in response and response.code: text = response.code
-            else: text = None
-            self.send_response(response.status, text)
-            self.end_headers()
+    def _execute(self, chain):
+        '''
+        Executes the chain for the request, this is called either in the server loop or in a worker thread.
+        
+        @param chain: Chain
+            The chain to execute.
+        '''
+        assert isinstance(chain, Chain), 'Invalid chain %s' % chain
+        
+        chain.callBack(partial(self._inLoop, self._respond, chain))
+        self._proceed(chain)
+        
+    def _proceed(self, chain):
+        '''
+        Proceeds with the chain execution until is finalized or a content reader is required, this is called either in
+        the server loop or in a worker thread.
+        
+        @param chain: Chain
+            The chain to proceed with.
+        '''
+        assert isinstance(chain, Chain), 'Invalid chain %s' % chain
+        requestCnt = chain.arg.requestCnt
+        try:
+            while True:
+                if not chain.do(): break
+                if RequestContentHTTPAsyncore.contentReader in requestCnt and requestCnt.contentReader is not None:
+                    self._inLoop(self._read, requestCnt)
+                    break
+        except:
+            log.exception('Exception occurred while processing the request from \'%s\'' % (self.client_address,))
+            self._inLoop(self._fail, chain)
     
-            if ResponseContentHTTP.source in responseCnt and responseCnt.source is not None:
-                if isinstance(responseCnt.source, IInputStream): source = readGenerator(responseCnt.source, self.bufferSize)
-                else: source = responseCnt.source
-                self._writeq.append((WRITE_ITER, iter(source)))
-                
-            self._writeq.append((WRITE_CLOSE, None))
-            
-        chain.callBack(respond)
+    def _inLoop(self, call, *args):
+        '''
+        Executes the call in the server loop, if there is no worker pool then the call is executed right away since
+        the chains are executed in the server loop.
         
-        while True:
-            if not chain.do():
-                self._next(3)  # Now we proceed to write stage
-                break
-            if RequestContentHTTPAsyncore.contentReader in requestCnt and requestCnt.contentReader is not None:
-                self._next(2)  # Now we proceed to read stage
-                self._reader = requestCnt.contentReader
-                break
+        @param call: callable
+            The call to execute in the server loop.
+        @param args: arguments
+            The arguments to execute the call with.
+        '''
+        if self.server.pool is None: call(*args)
+        else: self.server.trigger.call(call, *args)
+        
+    def _read(self, requestCnt):
+        '''
+        Proceed to read the request content, this is executed in the server loop.
+        
+        @param requestCnt: RequestContentHTTPAsyncore
+            The request content that contains the content reader.
+        '''
+        assert isinstance(requestCnt, RequestContentHTTPAsyncore), 'Invalid request content %s' % requestCnt
+        
+        self._next(2)  # Now we proceed to read stage
+        self._reader = requestCnt.contentReader
+        if RequestContentHTTPAsyncore.length in requestCnt and requestCnt.length is not None:
+            self._contentRemaining = requestCnt.length
+        # Without a known length the content is read until the client closes the connection.
+        else: self.close_connection = True
+        
+        if self.server.pool is not None and self._readCarry is not None:
+            # The content data that has been received while the chain was executing in the worker thread.
+            data, self._readCarry = self._readCarry, None
+            self.handle_data(data)
+        
+    def _respond(self, chain):
+        '''
+        Places the response of the finalized chain, this is executed in the server loop.
+        
+        @param chain: Chain
+            The finalized chain to respond for.
+        '''
+        assert isinstance(chain, Chain), 'Invalid chain %s' % chain
+        # The chain is released only after the response is written since the response content might still use it.
+        self._processed = chain
+        requestCnt, response, responseCnt = chain.arg.requestCnt, chain.arg.response, chain.arg.responseCnt
+        assert isinstance(response, ResponseHTTP), 'Invalid response %s' % response
+        assert isinstance(responseCnt, ResponseContentHTTP), 'Invalid response content %s' % responseCnt
+
+        assert isinstance(response.status, int), 'Invalid response status code %s' % response.status
+        if ResponseHTTP.text in response and response.text: text = response.text
+        elif ResponseHTTP.code in response and response.code: text = response.code
+        else: text = None
+        self.send_response(response.status, text)
+        
+        hasLength = False
+        if ResponseHTTP.headers in response and response.headers is not None:
+            for name, value in response.headers.items():
+                if name.lower() == 'content-length': hasLength = True
+                self.send_header(name, value)
+        
+        if response.status in self.noContentStatuses or response.status < 200: source = None
+        elif ResponseContentHTTP.source in responseCnt and responseCnt.source is not None:
+            if isinstance(responseCnt.source, IInputStream): source = readGenerator(responseCnt.source, self.bufferSize)
+            else: source = responseCnt.source
+        else: source = None
+        
+        if self._contentRemaining is None and RequestContentHTTPAsyncore.length in requestCnt and requestCnt.length:
+            self.close_connection = True  # The request content has not been consumed so the connection can't be reused.
+        
+        if not self.close_connection:
+            if source is None:
+                if not hasLength and response.status >= 200 and response.status not in self.noContentStatuses:
+                    self.send_header('Content-Length', '0')
+            elif not hasLength:
+                if self.request_version >= 'HTTP/1.1':
+                    self.send_header('Transfer-Encoding', 'chunked')
+                    source = chunked(source)
+                else: self.close_connection = True
+        
+        if self.close_connection:
+            if self.request_version >= 'HTTP/1.1': self.send_header('Connection', 'close')
+        elif self.request_version < 'HTTP/1.1': self.send_header('Connection', 'keep-alive')
+        self.end_headers()
+
+        if source is not None: self._writeq.append((WRITE_ITER, iter(source)))
+        
+        if self.close_connection: self._writeq.append((WRITE_CLOSE, None))
+        else: self._writeq.append((WRITE_NEXT, None))
+        
+    def _release(self):
+        '''
+        Releases the chain of the last processed request, this is executed in the server loop.
+        '''
+        if self._processed is not None:
+            chain, self._processed = self._processed, None
+            self.server.processing.release(chain)
+        
+    def _fail(self, chain):
+        '''
+        Releases the chain that failed with an exception and closes the connection, this is executed in the server loop.
+        
+        @param chain: Chain
+            The failed chain.
+        '''
+        assert isinstance(chain, Chain), 'Invalid chain %s' % chain
+        self.server.processing.release(chain)
+        self.close()
+        
+    def _respondReject(self):
+        '''
+        Writes the reject response used when the worker pool is saturated and closes the connection.
+        '''
+        self.send_response(self.server.rejectStatus, self.server.rejectText)
+        if self.server.rejectRetryAfter is not None: self.send_header('Retry-After', str(self.server.rejectRetryAfter))
+        self.send_header('Content-Length', '0')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self._respondError()
+        
+    def _respondError(self):
+        '''
+        Writes the error response that has been placed by the request handler and closes the connection.
+        '''
+        if self.wfile.tell(): self._writeq.append((WRITE_BYTES, memoryview(self.wfile.getvalue())))
+        self._writeq.append((WRITE_CLOSE, None))
+        self._next(3)
 
 # --------------------------------------------------------------------
 
@@ -331,6 +540,24 @@ class AsyncServer(dispatcher):
     
     timeout = 10.0
     # The timeout for select loop.
+    keepAliveTimeout = 15.0
+    # The time in seconds that a persistent connection is kept open while waiting for a new request.
+    keepAliveMaxRequests = 100
+    # The maximum number of requests served on a persistent connection, set to 1 in order to disable persistent
+    # connections.
+    workerThreads = 0
+    # The number of worker threads that execute the processing chains, if 0 then the chains are executed in the server
+    # loop.
+    workerQueueSize = 100
+    # The maximum number of requests waiting for a worker thread, the requests above this limit are rejected.
+    rejectStatus = 503
+    # The status used in responding the requests that are rejected because the workers are saturated.
+    rejectText = 'Service Unavailable'
+    # The status text used in responding the rejected requests.
+    rejectRetryAfter = None
+    # The seconds placed in the Retry-After header of the rejected requests, if None the header is not placed.
+    poolSize = 0
+    # The number of context objects and chains kept for reuse between requests, if 0 then no pooling is used.
 
     def __init__(self):
         '''
@@ -342,11 +569,30 @@ class AsyncServer(dispatcher):
         assert callable(self.requestHandlerFactory), 'Invalid request handler factory %s' % self.requestHandlerFactory
         assert isinstance(self.assembly, Assembly), 'Invalid assembly %s' % self.assembly
         assert isinstance(self.timeout, float), 'Invalid timeout %s' % self.timeout
+        assert isinstance(self.keepAliveTimeout, float), 'Invalid keep alive timeout %s' % self.keepAliveTimeout
+        assert isinstance(self.keepAliveMaxRequests, int) and self.keepAliveMaxRequests > 0, \
+        'Invalid keep alive maximum requests %s' % self.keepAliveMaxRequests
+        assert isinstance(self.workerThreads, int) and self.workerThreads >= 0, \
+        'Invalid worker threads %s' % self.workerThreads
+        assert isinstance(self.workerQueueSize, int) and self.workerQueueSize > 0, \
+        'Invalid worker queue size %s' % self.workerQueueSize
+        assert isinstance(self.rejectStatus, int), 'Invalid reject status %s' % self.rejectStatus
+        assert isinstance(self.rejectText, str), 'Invalid reject text %s' % self.rejectText
+        assert self.rejectRetryAfter is None or isinstance(self.rejectRetryAfter, int), \
+        'Invalid reject retry after %s' % self.rejectRetryAfter
+        assert isinstance(self.poolSize, int) and self.poolSize >= 0, 'Invalid pool size %s' % self.poolSize
         self.map = {}
+        self._idleDeadline = 0
         dispatcher.__init__(self, map=self.map)
 
         self.processing = self.assembly.create(request=RequestHTTP, requestCnt=RequestContentHTTPAsyncore,
                                                response=ResponseHTTP, responseCnt=ResponseContentHTTP)
+        self.processing.pooling(self.poolSize)
+        
+        if self.workerThreads:
+            self.trigger = Trigger(self.map)
+            self.pool = WorkerPool(self.workerThreads, self.workerQueueSize)
+        else: self.trigger = self.pool = None
         
         self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
         self.set_reuse_addr()
@@ -365,15 +611,52 @@ class AsyncServer(dispatcher):
         except TypeError:
             log.exception('A EWOULDBLOCK problem occurred while waiting connections')
             return
+        # The response headers and content are sent separately so the Nagle algorithm would delay the content until the
+        # client acknowledges the headers, which on persistent connections waits for the client delayed acknowledge.
+        try: request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (socket.error, AttributeError): pass
         # creates an instance of the handler class to handle the request/response
         # on the incoming connection
         self.requestHandlerFactory(request, address, self)
     
+    def close(self):
+        '''
+        @see: dispatcher.close
+        
+        Also stops the worker threads.
+        '''
+        super().close()
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.trigger.close()
+            
     def serve_forever(self):
         '''
         Loops and servers the connections.
         '''
-        loop(self.timeout, map=self.map)
+        timeout = min(self.timeout, self.keepAliveTimeout)
+        while self.map:
+            loop(timeout, map=self.map, count=1)
+            self.closeIdle()
+            
+    def closeIdle(self):
+        '''
+        Closes the connections that have been idle for longer then the keep alive timeout, the connections are checked
+        only once the earliest idle deadline found on the previous check has passed.
+        '''
+        now = time.time()
+        if now < self._idleDeadline: return
+        # The new connections and the connections that finish processing have the deadline after the next check.
+        self._idleDeadline = now + self.keepAliveTimeout
+        for handler in list(self.map.values()):
+            if not isinstance(handler, RequestHandler): continue
+            assert isinstance(handler, RequestHandler)
+            deadline = handler.idleDeadline()
+            if deadline is None: continue
+            if deadline < now:
+                assert log.debug('Closing idle connection from %s', handler.client_address) or True
+                handler.close()
+            elif deadline < self._idleDeadline: self._idleDeadline = deadline
             
     def serve_limited(self, count):
         '''
@@ -382,8 +665,179 @@ class AsyncServer(dispatcher):
         '''
         loop(self.timeout, True, self.map, count)
 
+class Trigger(dispatcher):
+    '''
+    Dispatcher used by the worker threads in order to execute calls in the server loop, the loop is woken up by writing
+    on a connected socket pair.
+    '''
+    
+    def __init__(self, map):
+        '''
+        Construct the trigger.
+        
+        @param map: dictionary{integer, dispatcher}
+            The map of the server loop.
+        '''
+        assert isinstance(map, dict), 'Invalid map %s' % map
+        self._receiver, self._sender = socketPair()
+        self._sender.setblocking(False)
+        dispatcher.__init__(self, self._receiver, map=map)
+        
+        self._calls = deque()
+        
+    def call(self, call, *args):
+        '''
+        Schedules the call to be executed in the server loop, this method can be used from any thread.
+        
+        @param call: callable
+            The call to execute.
+        @param args: arguments
+            The arguments to execute the call with.
+        '''
+        assert callable(call), 'Invalid call %s' % call
+        self._calls.append((call, args))
+        try: self._sender.send(b'x')
+        except socket.error as e:
+            # If the buffer is full then the loop will anyway wake up.
+            if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK): raise
+        
+    def readable(self):
+        '''
+        @see: dispatcher.readable
+        '''
+        return True
+    
+    def writable(self):
+        '''
+        @see: dispatcher.writable
+        '''
+        return False
+    
+    def handle_read(self):
+        '''
+        @see: dispatcher.handle_read
+        '''
+        try: self.recv(1024)
+        except socket.error: pass
+        while self._calls:
+            call, args = self._calls.popleft()
+            try: call(*args)
+            except: log.exception('Exception occurred while executing call %s in the server loop' % call)
+            
+    def handle_error(self):
+        log.exception('A problem occurred in the server trigger')
+        
+    def close(self):
+        '''
+        @see: dispatcher.close
+        '''
+        super().close()
+        self._sender.close()
+
+class WorkerPool:
+    '''
+    Bounded pool of worker threads that execute the processing chains outside the server loop. The workers only execute
+    the chains, the chains and contexts are taken from the server processing pools and released back in the server loop
+    so the pools are never used by multiple threads.
+    '''
+    
+    def __init__(self, size, queueSize):
+        '''
+        Construct the worker pool.
+        
+        @param size: integer
+            The number of worker threads.
+        @param queueSize: integer
+            The maximum number of tasks waiting for a worker.
+        '''
+        assert isinstance(size, int) and size > 0, 'Invalid size %s' % size
+        assert isinstance(queueSize, int) and queueSize > 0, 'Invalid queue size %s' % queueSize
+        
+        self.queueSize = queueSize
+        self._tasks = deque()
+        self._condition = Condition()
+        self._threads = []
+        for index in range(size):
+            thread = Thread(name='HTTP worker %s' % index, target=self._work)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+            
+    def submit(self, task, bounded=True):
+        '''
+        Submits a task to be executed by a worker.
+        
+        @param task: callable
+            The task to execute, takes no arguments.
+        @param bounded: boolean
+            If True the task is rejected if the queue is full, otherwise the task is queued regardless.
+        @return: boolean
+            True if the task has been queued, False if the task has been rejected.
+        '''
+        assert callable(task), 'Invalid task %s' % task
+        with self._condition:
+            if bounded and len(self._tasks) >= self.queueSize: return False
+            self._tasks.append(task)
+            self._condition.notify()
+        return True
+    
+    def shutdown(self):
+        '''
+        Stops the worker threads after they finish the current tasks, the queued tasks are discarded.
+        '''
+        with self._condition:
+            self._tasks.clear()
+            self._tasks.extend(None for _k in self._threads)
+            self._condition.notify_all()
+        
+    # ----------------------------------------------------------------
+    
+    def _work(self):
+        '''
+        Executes the tasks, this is executed in the worker thread.
+        '''
+        while True:
+            with self._condition:
+                while not self._tasks: self._condition.wait()
+                task = self._tasks.popleft()
+            if task is None: break
+            try: task()
+            except: log.exception('Exception occurred while executing task %s' % task)
+            
 # --------------------------------------------------------------------
 
+def socketPair():
+    '''
+    Provides a pair of connected sockets, if the platform has no socket pair support then a pair of TCP sockets on
+    the loop back interface is used.
+    
+    @return: tuple(socket, socket)
+        The receiving and sending sockets.
+    '''
+    if hasattr(socket, 'socketpair'): return socket.socketpair()
+    
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(1)
+        sender = socket.create_connection(listener.getsockname())
+        receiver, _address = listener.accept()
+    finally: listener.close()
+    return receiver, sender
+
+def chunked(source):
+    '''
+    Generator that provides the chunked transfer encoding for the provided source.
+    
+    @param source: Iterable(bytes)
+        The source to provide the chunks for.
+    @return: generator(bytes)
+        The generator that provides the chunks.
+    '''
+    for data in source:
+        if data: yield b''.join((('%X\r\n' % len(data)).encode('ascii'), data, b'\r\n'))
+    yield b'0\r\n\r\n'
+
 def run(server):
     '''
     Run the asyncore server.
@@ -22,6 +22,8 @@ DESCRIPTION = 'Provides the HTTP communication support'
 
 SERVER_BASIC = 'basic'
 # The basic server name
+SERVER_PREFORK = 'prefork'
+# The pre fork server name
 
 # --------------------------------------------------------------------
 # The default configurations
@@ -31,6 +33,7 @@ def server_type() -> str:
     '''
     The type of the server to use, the options are:
     "basic"- single threaded server, the safest but slowest server to use.
+    "prefork" - forks a number of basic server worker processes that share the listening socket, uses multiple CPUs.
     '''
     return SERVER_BASIC
 
@@ -48,3 +51,11 @@ def server_port() -> int:
 def server_version() -> str:
     '''The server version name'''
     return 'Ally/0.1'
+
+@ioc.config
+def server_pool_size() -> int:
+    '''
+    The number of request context objects and processing chains kept for reuse by the server, the reused objects are
+    reset after each response, provide 0 in order to disable the pooling.
+    '''
+    return 0
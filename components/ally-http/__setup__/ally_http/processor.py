@@ -19,6 +19,10 @@ from ally.http.impl.processor.header import HeaderDecodeRequestHandler, \
 from ally.http.impl.processor.headers.accept import AcceptRequestDecodeHandler, \
     AcceptRequestEncodeHandler
 from ally.http.impl.processor.headers.allow import AllowEncodeHandler
+from ally.http.impl.processor.headers.conditional import \
+    ValidatorsEncodeHandler, ConditionalHandler
+from ally.http.impl.processor.headers.content_encoding import \
+    ContentEncodingEncodeHandler
 from ally.http.impl.processor.headers.content_length import \
     ContentLengthDecodeHandler, ContentLengthEncodeHandler
 from ally.http.impl.processor.headers.content_type import \
@@ -37,6 +41,20 @@ def read_from_params():
     '''If true will also read header values that are provided as query parameters'''
     return True
 
+@ioc.config
+def compression_minimum_size() -> int:
+    '''
+    The minimum size in bytes of the response content that is compressed with gzip or deflate if the client accepts it,
+    the content for which the size is not known in advance is always compressed, provide None in order to disable the
+    compression.
+    '''
+    return 1024
+
+@ioc.config
+def compression_level() -> int:
+    '''The compression level for the response content, 1 is the fastest and 9 is the best compression'''
+    return 6
+
 # --------------------------------------------------------------------
 
 @ioc.entity
@@ -87,6 +105,19 @@ def encoderPath() -> Handler: return EncoderPathHandler()
 @ioc.entity
 def allowEncode() -> Handler: return AllowEncodeHandler()
 
+@ioc.entity
+def contentEncodingEncode() -> Handler:
+    b = ContentEncodingEncodeHandler()
+    b.minimumSize = compression_minimum_size()
+    b.level = compression_level()
+    return b
+
+@ioc.entity
+def validatorsEncode() -> Handler: return ValidatorsEncodeHandler()
+
+@ioc.entity
+def conditional() -> Handler: return ConditionalHandler()
+
 @ioc.entity
 def deliverNotFound() -> Handler:
     b = DeliverCodeHandler()
@@ -9,7 +9,8 @@ Created on Nov 23, 2011
 Runs the basic web server.
 '''
 
-from . import server_type, server_version, server_host, server_port
+from . import server_type, server_version, server_host, server_port, \
+    server_pool_size, SERVER_BASIC
 from .processor import assemblyNotFound
 from ally.container import ioc
 from ally.design.processor.assembly import Assembly
@@ -39,6 +40,7 @@ def serverBasic():
     b.serverHost = server_host()
     b.serverPort = server_port()
     b.requestHandlerFactory = serverBasicRequestHandler()
+    b.poolSize = server_pool_size()
     b.assembly = assemblyServer()
     return b
 
@@ -59,5 +61,5 @@ def updateAssemblyServer():
 
 @ioc.start
 def runServer():
-    if server_type() == 'basic':
+    if server_type() == SERVER_BASIC:
         Thread(name='HTTP server thread', target=server_basic.run, args=(serverBasic(),)).start()
@@ -0,0 +1,54 @@
+'''
+Created on Mar 12, 2013
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Runs the pre fork web server.
+'''
+
+from . import server_type, server_version, server_host, server_port, \
+    server_pool_size, SERVER_PREFORK
+from .server import assemblyServer, serverBasicRequestHandler
+from ally.container import ioc
+from ally.http.server import server_prefork
+from threading import Thread
+
+# --------------------------------------------------------------------
+
+@ioc.config
+def prefork_workers() -> int:
+    '''The number of worker processes used by the pre fork server, if 0 then the number of CPUs is used'''
+    return 0
+
+@ioc.config
+def prefork_reuse_port() -> bool:
+    '''
+    If true and the platform supports it (SO_REUSEPORT) each pre fork worker will have his own listening socket on the
+    server port so the connections are balanced by the kernel, otherwise all workers share one listening socket.
+    '''
+    return True
+
+# --------------------------------------------------------------------
+
+@ioc.entity
+def serverPrefork():
+    b = server_prefork.PreforkServer()
+    b.serverVersion = server_version()
+    b.serverHost = server_host()
+    b.serverPort = server_port()
+    b.requestHandlerFactory = serverBasicRequestHandler()
+    b.workers = prefork_workers()
+    b.reusePort = prefork_reuse_port()
+    b.poolSize = server_pool_size()
+    b.assembly = assemblyServer()
+    return b
+
+# --------------------------------------------------------------------
+
+@ioc.start
+def runServerPrefork():
+    if server_type() == SERVER_PREFORK:
+        Thread(name='HTTP server thread', target=server_prefork.run, args=(serverPrefork(),)).start()
@@ -0,0 +1,10 @@
+'''
+Created on Mar 18, 2013
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Contains the unit tests.
+'''
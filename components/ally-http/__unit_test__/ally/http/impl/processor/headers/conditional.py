@@ -0,0 +1,154 @@
+'''
+Created on Mar 15, 2013
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Validators and conditional requests testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import ioc
+from ally.design.processor.assembly import Assembly
+from ally.design.processor.attribute import defines, requires
+from ally.design.processor.context import Context
+from ally.design.processor.execution import Chain
+from ally.design.processor.handler import HandlerProcessorProceed
+from ally.http.impl.processor.header import HeaderDecodeRequestHandler, \
+    HeaderEncodeResponseHandler
+from ally.http.impl.processor.headers.conditional import \
+    ValidatorsEncodeHandler, ConditionalHandler
+from ally.http.spec.server import HTTP_GET, HTTP_POST
+from collections import Iterable
+from datetime import datetime
+import hashlib
+import unittest
+
+# --------------------------------------------------------------------
+
+CONTENT = b'The content'
+ETAG = '"%s"' % hashlib.sha1(CONTENT).hexdigest()
+
+class Request(Context):
+    headers = defines(dict)
+    parameters = defines(list)
+    method = defines(str)
+    uri = defines(str)
+
+class Response(Context):
+    status = defines(int)
+
+class RequestProvide(Context):
+    uri = requires(str)
+
+class ResponseProvide(Context):
+    code = defines(str)
+    isSuccess = defines(bool)
+    lastModified = defines(datetime)
+    eTag = defines(str)
+
+class ResponseContentProvide(Context):
+    source = defines(Iterable)
+    length = defines(int)
+
+class ProvideContent(HandlerProcessorProceed):
+
+    def process(self, request:RequestProvide, response:ResponseProvide, responseCnt:ResponseContentProvide, **keyargs):
+        response.code, response.isSuccess = 'OK', True
+        response.lastModified = datetime(2013, 3, 1, 10, 0, 0)
+        if request.uri == 'tagged': response.eTag = '"service"'
+        elif request.uri == 'failed': response.isSuccess = False
+        responseCnt.source, responseCnt.length = (CONTENT[:4], CONTENT[4:]), len(CONTENT)
+
+# --------------------------------------------------------------------
+
+class TestConditional(unittest.TestCase):
+
+    def setUp(self):
+        headerDecode = HeaderDecodeRequestHandler()
+        headerDecode.useParameters = False
+        handlers = (headerDecode, HeaderEncodeResponseHandler(), ProvideContent(), ValidatorsEncodeHandler(),
+                    ConditionalHandler())
+        for handler in handlers: ioc.initialize(handler)
+
+        assembly = Assembly('Conditional')
+        assembly.add(*handlers)
+        self.processing = assembly.create(request=Request, response=Response, responseCnt=ResponseContentProvide)
+
+    def process(self, headers, method=HTTP_GET, uri='content'):
+        processing = self.processing
+        request = processing.ctx.request()
+        request.headers, request.method, request.uri = headers, method, uri
+
+        chain = Chain(processing)
+        chain.process(**processing.fillIn(request=request, response=processing.ctx.response(),
+                                          responseCnt=processing.ctx.responseCnt())).doAll()
+        response, responseCnt = chain.arg.response, chain.arg.responseCnt
+        content = None if responseCnt.source is None else b''.join(responseCnt.source)
+        return response.status, response.headers, content
+
+    def testValidators(self):
+        status, headers, content = self.process({})
+        self.assertIsNone(status)
+        self.assertEqual(ETAG, headers.get('ETag'))
+        self.assertEqual('Fri, 01 Mar 2013 10:00:00 GMT', headers.get('Last-Modified'))
+        self.assertEqual(CONTENT, content)
+
+        # The entity tag provided by the service is used as it is.
+        self.assertEqual('"service"', self.process({}, uri='tagged')[1].get('ETag'))
+
+        _status, headers, content = self.process({}, uri='failed')
+        self.assertNotIn('ETag', headers)
+        self.assertNotIn('Last-Modified', headers)
+        self.assertEqual(CONTENT, content)
+
+    def testIfNoneMatch(self):
+        for tags in (ETAG, 'W/%s' % ETAG, '"other", %s' % ETAG, '*'):
+            status, headers, content = self.process({'If-None-Match': tags})
+            self.assertEqual(304, status)
+            self.assertEqual(ETAG, headers.get('ETag'))
+            self.assertIsNone(content)
+
+        self.assertEqual(304, self.process({'If-None-Match': '"service"'}, uri='tagged')[0])
+
+        status, _headers, content = self.process({'If-None-Match': '"other"'})
+        self.assertIsNone(status)
+        self.assertEqual(CONTENT, content)
+
+        # The If-Modified-Since is ignored when the If-None-Match is present.
+        status, _headers, content = self.process({'If-None-Match': '"other"',
+                                                  'If-Modified-Since': 'Fri, 01 Mar 2013 10:00:00 GMT'})
+        self.assertIsNone(status)
+        self.assertEqual(CONTENT, content)
+
+    def testIfModifiedSince(self):
+        for since in ('Fri, 01 Mar 2013 10:00:00 GMT', 'Fri, 01 Mar 2013 11:00:00 GMT', 'Fri, 01 Mar 2013 12:00:00 +0100'):
+            status, _headers, content = self.process({'If-Modified-Since': since})
+            self.assertEqual(304, status)
+            self.assertIsNone(content)
+
+        for since in ('Fri, 01 Mar 2013 09:59:59 GMT', 'Fri, 01 Mar 2013 11:00:00 +0200', 'not a date'):
+            status, _headers, content = self.process({'If-Modified-Since': since})
+            self.assertIsNone(status)
+            self.assertEqual(CONTENT, content)
+
+    def testMethods(self):
+        status, _headers, content = self.process({'If-None-Match': ETAG}, HTTP_POST)
+        self.assertIsNone(status)
+        self.assertEqual(CONTENT, content)
+
+        status, _headers, content = self.process({'If-None-Match': '*'}, uri='failed')
+        self.assertIsNone(status)
+        self.assertEqual(CONTENT, content)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
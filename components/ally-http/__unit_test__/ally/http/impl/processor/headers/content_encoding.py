@@ -0,0 +1,140 @@
+'''
+Created on Mar 18, 2013
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Content encoding testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import ioc
+from ally.design.processor.assembly import Assembly
+from ally.design.processor.attribute import defines, requires
+from ally.design.processor.context import Context
+from ally.design.processor.execution import Chain
+from ally.design.processor.handler import HandlerProcessorProceed
+from ally.http.impl.processor.header import HeaderDecodeRequestHandler, \
+    HeaderEncodeResponseHandler
+from ally.http.impl.processor.headers.content_encoding import \
+    ContentEncodingEncodeHandler
+from collections import Iterable
+from io import BytesIO
+import unittest
+import zlib
+
+# --------------------------------------------------------------------
+
+CONTENT = b'The content to be compressed. ' * 100
+
+class Request(Context):
+    headers = defines(dict)
+    parameters = defines(list)
+    uri = defines(str)
+
+class Response(Context):
+    status = defines(int)
+
+class ResponseContent(Context):
+    source = defines(Iterable)
+    length = defines(int)
+
+class RequestProvide(Context):
+    uri = requires(str)
+
+class ProvideContent(HandlerProcessorProceed):
+
+    def process(self, request:RequestProvide, response:Response, responseCnt:ResponseContent, **keyargs):
+        response.status = 200
+        if request.uri == 'stream': responseCnt.source = BytesIO(CONTENT)
+        elif request.uri == 'generator': responseCnt.source = (CONTENT[k:k + 100] for k in range(0, len(CONTENT), 100))
+        elif request.uri == 'small': responseCnt.source, responseCnt.length = (b'small',), 5
+        else: responseCnt.source, responseCnt.length = (CONTENT[:1000], CONTENT[1000:]), len(CONTENT)
+
+# --------------------------------------------------------------------
+
+class TestContentEncoding(unittest.TestCase):
+
+    def setUp(self):
+        headerDecode = HeaderDecodeRequestHandler()
+        headerDecode.useParameters = False
+        handlers = (headerDecode, HeaderEncodeResponseHandler(), ProvideContent(), ContentEncodingEncodeHandler())
+        for handler in handlers: ioc.initialize(handler)
+
+        assembly = Assembly('Content encoding')
+        assembly.add(*handlers)
+        self.processing = assembly.create(request=Request, response=Response, responseCnt=ResponseContent)
+
+    def process(self, headers, uri='content'):
+        processing = self.processing
+        request = processing.ctx.request()
+        request.headers, request.uri = headers, uri
+
+        chain = Chain(processing)
+        chain.process(**processing.fillIn(request=request, response=processing.ctx.response(),
+                                          responseCnt=processing.ctx.responseCnt())).doAll()
+        responseCnt = chain.arg.responseCnt
+        if isinstance(responseCnt.source, BytesIO): content = responseCnt.source.read()
+        else: content = b''.join(responseCnt.source)
+        return chain.arg.response.headers, content, responseCnt.length
+
+    def testGzip(self):
+        headers, content, length = self.process({'Accept-Encoding': 'gzip'})
+        self.assertEqual('gzip', headers.get('Content-Encoding'))
+        self.assertEqual('Accept-Encoding', headers.get('Vary'))
+        self.assertEqual(len(content), length)
+        self.assertEqual(CONTENT, zlib.decompress(content, 16 + zlib.MAX_WBITS))
+
+        # The gzip output has no time stamp so the same content is always compressed to the same bytes.
+        self.assertEqual(content, self.process({'Accept-Encoding': 'x-gzip'})[1])
+
+    def testDeflate(self):
+        headers, content, length = self.process({'Accept-Encoding': 'deflate'})
+        self.assertEqual('deflate', headers.get('Content-Encoding'))
+        self.assertEqual('Accept-Encoding', headers.get('Vary'))
+        self.assertEqual(len(content), length)
+        self.assertEqual(CONTENT, zlib.decompress(content))
+
+    def testNegotiation(self):
+        self.assertEqual('gzip', self.process({'Accept-Encoding': 'deflate, gzip'})[0].get('Content-Encoding'))
+        self.assertEqual('deflate', self.process({'Accept-Encoding': 'gzip;q=0.5, deflate'})[0].get('Content-Encoding'))
+        self.assertEqual('gzip', self.process({'Accept-Encoding': '*'})[0].get('Content-Encoding'))
+        self.assertEqual('deflate', self.process({'Accept-Encoding': '*, gzip;q=0'})[0].get('Content-Encoding'))
+
+        for accept in ('identity', 'gzip;q=0, deflate;q=0', 'br'):
+            headers, content, length = self.process({'Accept-Encoding': accept})
+            self.assertNotIn('Content-Encoding', headers)
+            self.assertEqual('Accept-Encoding', headers.get('Vary'))
+            self.assertEqual(CONTENT, content)
+            self.assertEqual(len(CONTENT), length)
+
+        headers, content, _length = self.process({})
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertEqual('Accept-Encoding', headers.get('Vary'))
+        self.assertEqual(CONTENT, content)
+
+    def testMinimumSize(self):
+        headers, content, length = self.process({'Accept-Encoding': 'gzip'}, 'small')
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertNotIn('Vary', headers)
+        self.assertEqual((b'small', 5), (content, length))
+
+    def testStreamed(self):
+        for uri in ('stream', 'generator'):
+            headers, content, length = self.process({'Accept-Encoding': 'gzip'}, uri)
+            self.assertEqual('gzip', headers.get('Content-Encoding'))
+            self.assertEqual('Accept-Encoding', headers.get('Vary'))
+            self.assertIsNone(length)
+            self.assertEqual(CONTENT, zlib.decompress(content, 16 + zlib.MAX_WBITS))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
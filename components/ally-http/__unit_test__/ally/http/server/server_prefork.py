@@ -0,0 +1,122 @@
+'''
+Created on Mar 12, 2013
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Pre fork server testing.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import ioc
+from ally.design.processor.assembly import Assembly
+from ally.design.processor.attribute import defines
+from ally.design.processor.context import Context
+from ally.design.processor.handler import HandlerProcessorProceed
+from ally.http.server.server_prefork import PreforkServer, SO_REUSEPORT, run
+from collections import Iterable
+from threading import Thread
+from urllib.request import urlopen
+import os
+import signal
+import time
+import unittest
+
+# --------------------------------------------------------------------
+
+class Response(Context):
+    status = defines(int)
+
+class ResponseContent(Context):
+    source = defines(Iterable)
+
+class ProvidePid(HandlerProcessorProceed):
+
+    def process(self, response:Response, responseCnt:ResponseContent, **keyargs):
+        response.status = 200
+        responseCnt.source = (str(os.getpid()).encode(),)
+
+# --------------------------------------------------------------------
+
+class TestPrefork(unittest.TestCase):
+
+    def createServer(self, reusePort):
+        handler = ProvidePid()
+        ioc.initialize(handler)
+        assembly = Assembly('Prefork')
+        assembly.add(handler)
+
+        server = PreforkServer()
+        server.serverVersion = 'Test'
+        server.serverHost = '127.0.0.1'
+        server.serverPort = 0
+        server.assembly = assembly
+        server.workers = 2
+        server.reusePort = reusePort
+        server.superviseInterval = 0.1
+        ioc.initialize(server)
+        return server
+
+    def pidsFrom(self, server, count):
+        url = 'http://127.0.0.1:%s/pid' % server.serverPort
+        deadline = time.time() + 5
+        while True:
+            try: return [int(urlopen(url, timeout=5).read()) for _k in range(count)]
+            except IOError:
+                if time.time() > deadline: raise
+                time.sleep(0.1)
+
+    def waitFor(self, condition):
+        deadline = time.time() + 5
+        while not condition():
+            self.assertTrue(time.time() < deadline, 'Timeout waiting for %s' % condition)
+            time.sleep(0.05)
+
+    def checkServer(self, server):
+        assert isinstance(server, PreforkServer)
+        thread = Thread(target=run, args=(server,))
+        thread.start()
+        try:
+            self.waitFor(lambda: len(server._processes) == 2)
+            workers = {process.pid for process in server._processes}
+
+            pids = self.pidsFrom(server, 10)
+            self.assertTrue(set(pids).issubset(workers))
+            self.assertNotIn(os.getpid(), pids)
+
+            # A stopped worker is restarted by the supervising loop.
+            stopped = server._processes[0]
+            os.kill(stopped.pid, signal.SIGKILL)
+            self.waitFor(lambda: server._processes[0] is not stopped and server._processes[0].is_alive())
+            self.assertEqual(2, len({process.pid for process in server._processes} - {stopped.pid}))
+            self.assertTrue(set(self.pidsFrom(server, 10)).issubset(process.pid for process in server._processes))
+        finally:
+            processes = list(server._processes)
+            server.server_close()
+            thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        self.assertFalse([process for process in processes if process.is_alive()])
+        self.assertEqual([], server._processes)
+        self.assertRaises(IOError, urlopen, 'http://127.0.0.1:%s/pid' % server.serverPort, timeout=1)
+
+    def testSharedSocket(self):
+        self.checkServer(self.createServer(False))
+
+    @unittest.skipIf(SO_REUSEPORT is None, 'The reuse port socket option is not available')
+    def testReusePort(self):
+        server = self.createServer(True)
+        self.assertTrue(server.reusePort)
+        self.checkServer(server)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -0,0 +1,189 @@
+'''
+Created on Mar 15, 2013
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the validators headers (ETag and Last-Modified) encoding and the conditional requests handling.
+'''
+
+from ally.container.ioc import injected
+from ally.design.processor.attribute import requires, defines, optional
+from ally.design.processor.context import Context
+from ally.design.processor.handler import HandlerProcessorProceed
+from ally.http.spec.codes import NOT_MODIFIED
+from ally.http.spec.server import IEncoderHeader, IDecoderHeader, HTTP_GET
+from ally.support.util_io import IInputStream
+from calendar import timegm
+from collections import Iterable
+from datetime import datetime
+from email.utils import formatdate, parsedate_tz, mktime_tz
+import hashlib
+
+# --------------------------------------------------------------------
+
+class ResponseEncode(Context):
+    '''
+    The response context.
+    '''
+    # ---------------------------------------------------------------- Required
+    encoderHeader = requires(IEncoderHeader)
+    isSuccess = requires(bool)
+    # ---------------------------------------------------------------- Optional
+    lastModified = optional(datetime, doc='''
+    @rtype: datetime
+    The UTC date when the response content was last modified, provided by the service processing.
+    ''')
+    # ---------------------------------------------------------------- Defined
+    eTag = defines(str, doc='''
+    @rtype: string
+    The entity tag of the response content, if already provided by the service processing then is used as it is
+    otherwise is computed from the response content.
+    ''')
+
+class ResponseContentEncode(Context):
+    '''
+    The response content context.
+    '''
+    # ---------------------------------------------------------------- Required
+    length = requires(int)
+    # ---------------------------------------------------------------- Defined
+    source = defines(Iterable)
+
+# --------------------------------------------------------------------
+
+@injected
+class ValidatorsEncodeHandler(HandlerProcessorProceed):
+    '''
+    Implementation for a processor that provides the encoding of the ETag and Last-Modified HTTP response headers.
+    The ETag is the one provided by the service processing or a strong one computed from the response content, the
+    ETag is computed only for content that has a known length and is not an input stream, this way streamed content
+    is not kept in memory.
+    '''
+
+    nameETag = 'ETag'
+    # The ETag header name
+    nameLastModified = 'Last-Modified'
+    # The last modified header name
+    algorithm = 'sha1'
+    # The hash algorithm used for computing the ETag from the content.
+
+    def __init__(self):
+        assert isinstance(self.nameETag, str), 'Invalid ETag name %s' % self.nameETag
+        assert isinstance(self.nameLastModified, str), 'Invalid last modified name %s' % self.nameLastModified
+        assert isinstance(self.algorithm, str), 'Invalid algorithm %s' % self.algorithm
+        super().__init__()
+
+    def process(self, response:ResponseEncode, responseCnt:ResponseContentEncode, **keyargs):
+        '''
+        @see: HandlerProcessorProceed.process
+        
+        Encode the validators headers.
+        '''
+        assert isinstance(response, ResponseEncode), 'Invalid response %s' % response
+        assert isinstance(responseCnt, ResponseContentEncode), 'Invalid response content %s' % responseCnt
+        assert isinstance(response.encoderHeader, IEncoderHeader), \
+        'Invalid response header encoder %s' % response.encoderHeader
+
+        if response.isSuccess is False: return  # Skip in case the response is in error
+
+        if response.eTag is None and responseCnt.length is not None and responseCnt.source is not None \
+        and not isinstance(responseCnt.source, IInputStream):
+            content = b''.join(responseCnt.source)
+            responseCnt.source = (content,)
+            response.eTag = '"%s"' % hashlib.new(self.algorithm, content).hexdigest()
+
+        if response.eTag is not None: response.encoderHeader.encode(self.nameETag, response.eTag)
+        if ResponseEncode.lastModified in response and response.lastModified is not None:
+            assert isinstance(response.lastModified, datetime), 'Invalid last modified %s' % response.lastModified
+            response.encoderHeader.encode(self.nameLastModified,
+                                          formatdate(timegm(response.lastModified.utctimetuple()), usegmt=True))
+
+# --------------------------------------------------------------------
+
+class RequestConditional(Context):
+    '''
+    The request context.
+    '''
+    # ---------------------------------------------------------------- Required
+    method = requires(str)
+    decoderHeader = requires(IDecoderHeader)
+
+class ResponseConditional(Context):
+    '''
+    The response context.
+    '''
+    # ---------------------------------------------------------------- Optional
+    eTag = optional(str)
+    lastModified = optional(datetime)
+    # ---------------------------------------------------------------- Defined
+    code = defines(str)
+    status = defines(int)
+    isSuccess = defines(bool)
+
+class ResponseContentConditional(Context):
+    '''
+    The response content context.
+    '''
+    # ---------------------------------------------------------------- Defined
+    source = defines(Iterable)
+    length = defines(int)
+
+# --------------------------------------------------------------------
+
+@injected
+class ConditionalHandler(HandlerProcessorProceed):
+    '''
+    Implementation for a processor that checks the If-None-Match and If-Modified-Since HTTP request headers against
+    the response validators and if the client has already the content responds with 304 Not Modified and no content.
+    '''
+
+    nameIfNoneMatch = 'If-None-Match'
+    # The if none match header name
+    nameIfModifiedSince = 'If-Modified-Since'
+    # The if modified since header name
+    methods = [HTTP_GET]
+    # The methods for which the conditional requests are handled.
+
+    def __init__(self):
+        assert isinstance(self.nameIfNoneMatch, str), 'Invalid if none match name %s' % self.nameIfNoneMatch
+        assert isinstance(self.nameIfModifiedSince, str), \
+        'Invalid if modified since name %s' % self.nameIfModifiedSince
+        assert isinstance(self.methods, list), 'Invalid methods %s' % self.methods
+        super().__init__()
+
+    def process(self, request:RequestConditional, response:ResponseConditional,
+                responseCnt:ResponseContentConditional, **keyargs):
+        '''
+        @see: HandlerProcessorProceed.process
+        
+        Check the conditional request.
+        '''
+        assert isinstance(request, RequestConditional), 'Invalid request %s' % request
+        assert isinstance(response, ResponseConditional), 'Invalid response %s' % response
+        assert isinstance(responseCnt, ResponseContentConditional), 'Invalid response content %s' % responseCnt
+        assert isinstance(request.decoderHeader, IDecoderHeader), 'Invalid header decoder %s' % request.decoderHeader
+
+        if response.isSuccess is False: return  # Skip in case the response is in error
+        if request.method not in self.methods: return
+        
+        eTag = response.eTag if ResponseConditional.eTag in response else None
+        lastModified = response.lastModified if ResponseConditional.lastModified in response else None
+
+        value = request.decoderHeader.retrieve(self.nameIfNoneMatch)
+        if value:
+            # The If-Modified-Since header is ignored if the If-None-Match header is present.
+            if eTag is None: return
+            tags = set(tag.strip() for tag in value.split(','))
+            if not ('*' in tags or eTag in tags or 'W/%s' % eTag in tags): return
+        else:
+            value = request.decoderHeader.retrieve(self.nameIfModifiedSince)
+            if not value or lastModified is None: return
+            assert isinstance(lastModified, datetime), 'Invalid last modified %s' % lastModified
+            since = parsedate_tz(value)
+            if since is None or timegm(lastModified.utctimetuple()) > mktime_tz(since): return
+
+        response.code, response.status, response.isSuccess = NOT_MODIFIED
+        responseCnt.source = responseCnt.length = None
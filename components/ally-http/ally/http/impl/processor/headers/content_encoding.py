@@ -0,0 +1,179 @@
+'''
+Created on Mar 18, 2013
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the response content compression based on the accept encoding header.
+'''
+
+from ally.container.ioc import injected
+from ally.design.processor.attribute import requires, defines, optional
+from ally.design.processor.context import Context
+from ally.design.processor.handler import HandlerProcessorProceed
+from ally.http.spec.server import IEncoderHeader, IDecoderHeader
+from ally.support.util_io import IInputStream, readGenerator
+from collections import Iterable
+import zlib
+
+# --------------------------------------------------------------------
+
+ENCODING_GZIP = 'gzip'
+# The gzip content encoding.
+ENCODING_DEFLATE = 'deflate'
+# The deflate content encoding.
+
+# The window bits used by zlib for the encodings, the gzip format is produced without a time stamp so the same content
+# is always compressed to the same bytes.
+ENCODING_WBITS = {ENCODING_GZIP: 16 + zlib.MAX_WBITS, ENCODING_DEFLATE: zlib.MAX_WBITS}
+
+# --------------------------------------------------------------------
+
+class Request(Context):
+    '''
+    The request context.
+    '''
+    # ---------------------------------------------------------------- Required
+    decoderHeader = requires(IDecoderHeader)
+
+class Response(Context):
+    '''
+    The response context.
+    '''
+    # ---------------------------------------------------------------- Required
+    encoderHeader = requires(IEncoderHeader)
+    # ---------------------------------------------------------------- Optional
+    status = optional(int)
+
+class ResponseContent(Context):
+    '''
+    The response content context.
+    '''
+    # ---------------------------------------------------------------- Defined
+    source = defines(Iterable, doc='''
+    @rtype: Iterable
+    The compressed response content.
+    ''')
+    length = defines(int, doc='''
+    @rtype: integer
+    The compressed response content length, None if the content is compressed while is delivered.
+    ''')
+
+# --------------------------------------------------------------------
+
+@injected
+class ContentEncodingEncodeHandler(HandlerProcessorProceed):
+    '''
+    Implementation for a processor that compresses the response content with gzip or deflate if the client accepts
+    the encoding and provides the Content-Encoding and Vary HTTP response headers. If the content is already in memory
+    then is compressed right away and the content length is recomputed, otherwise the content is compressed while is
+    delivered and the content length is removed.
+    '''
+
+    nameAcceptEncoding = 'Accept-Encoding'
+    # The accept encoding header name
+    nameContentEncoding = 'Content-Encoding'
+    # The content encoding header name
+    nameVary = 'Vary'
+    # The vary header name
+    encodings = [ENCODING_GZIP, ENCODING_DEFLATE]
+    # The encodings that can be used in the order of preference.
+    minimumSize = 1024
+    # The minimum size in bytes of the content for which the compression is used, the content that has no known length
+    # is always compressed.
+    level = 6
+    # The compression level, 1 is the fastest and 9 is the best compression.
+    bufferSize = 1024 * 10
+    # The buffer size used when reading the input stream contents.
+    skipStatuses = frozenset((204, 206, 304))
+    # The response statuses that are not compressed.
+
+    def __init__(self):
+        assert isinstance(self.nameAcceptEncoding, str), 'Invalid accept encoding name %s' % self.nameAcceptEncoding
+        assert isinstance(self.nameContentEncoding, str), 'Invalid content encoding name %s' % self.nameContentEncoding
+        assert isinstance(self.nameVary, str), 'Invalid vary name %s' % self.nameVary
+        assert isinstance(self.encodings, list), 'Invalid encodings %s' % self.encodings
+        if __debug__:
+            for encoding in self.encodings: assert encoding in ENCODING_WBITS, 'Unknown encoding %s' % encoding
+        assert isinstance(self.minimumSize, int), 'Invalid minimum size %s' % self.minimumSize
+        assert isinstance(self.level, int) and 0 <= self.level <= 9, 'Invalid compression level %s' % self.level
+        assert isinstance(self.bufferSize, int), 'Invalid buffer size %s' % self.bufferSize
+        assert isinstance(self.skipStatuses, frozenset), 'Invalid skip statuses %s' % self.skipStatuses
+        super().__init__()
+
+    def process(self, request:Request, response:Response, responseCnt:ResponseContent, **keyargs):
+        '''
+        @see: HandlerProcessorProceed.process
+        
+        Compress the response content.
+        '''
+        assert isinstance(request, Request), 'Invalid request %s' % request
+        assert isinstance(response, Response), 'Invalid response %s' % response
+        assert isinstance(responseCnt, ResponseContent), 'Invalid response content %s' % responseCnt
+        assert isinstance(request.decoderHeader, IDecoderHeader), 'Invalid header decoder %s' % request.decoderHeader
+        assert isinstance(response.encoderHeader, IEncoderHeader), \
+        'Invalid response header encoder %s' % response.encoderHeader
+
+        if responseCnt.source is None: return  # No content to compress
+        if Response.status in response and response.status in self.skipStatuses: return
+        if responseCnt.length is not None and responseCnt.length < self.minimumSize: return
+
+        # The response content depends on the accept encoding even if the client does not accept compression.
+        response.encoderHeader.encode(self.nameVary, self.nameAcceptEncoding)
+        
+        encoding = self.encodingFor(request.decoderHeader.decode(self.nameAcceptEncoding))
+        if encoding is None: return
+        response.encoderHeader.encode(self.nameContentEncoding, encoding)
+        
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, ENCODING_WBITS[encoding])
+        if isinstance(responseCnt.source, IInputStream):
+            source = readGenerator(responseCnt.source, self.bufferSize)
+        else: source = responseCnt.source
+        
+        if responseCnt.length is not None and not isinstance(responseCnt.source, IInputStream):
+            content = b''.join(compressor.compress(data) for data in source) + compressor.flush()
+            responseCnt.source, responseCnt.length = (content,), len(content)
+        else:
+            responseCnt.source, responseCnt.length = self.compress(compressor, source), None
+
+    def encodingFor(self, accepted):
+        '''
+        Provides the encoding to use for the accepted encodings.
+        
+        @param accepted: list[tuple(string, dictionary{string, string})]|None
+            The accepted encodings as decoded from the header.
+        @return: string|None
+            The encoding to use or None if the content should not be compressed.
+        '''
+        if not accepted: return
+        qualities = {}
+        for value, attributes in accepted:
+            try: quality = float(attributes.get('q') or 1)
+            except ValueError: continue
+            value = value.lower()
+            if value == 'x-gzip': value = ENCODING_GZIP
+            qualities[value] = quality
+        
+        encoding, best = None, 0
+        for name in self.encodings:
+            quality = qualities.get(name, qualities.get('*', 0))
+            if quality > best: encoding, best = name, quality
+        return encoding
+
+    def compress(self, compressor, source):
+        '''
+        Create a generator for compressing the content.
+        
+        @param compressor: zlib.Compress
+            The compressor to use.
+        @param source: Iterable(bytes)
+            The content to compress.
+        @return: generator(bytes)
+            The generator providing the compressed content.
+        '''
+        for data in source:
+            data = compressor.compress(data)
+            if data: yield data
+        yield compressor.flush()
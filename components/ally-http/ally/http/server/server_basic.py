@@ -70,7 +70,7 @@ class RequestHandler(BaseHTTPRequestHandler):
         proc = self.server.processing
         assert isinstance(proc, Processing), 'Invalid processing %s' % proc
         
-        request, requestCnt = proc.ctx.request(), proc.ctx.requestCnt()
+        request, requestCnt = proc.newContext('request'), proc.newContext('requestCnt')
         assert isinstance(request, RequestHTTP), 'Invalid request %s' % request
         assert isinstance(requestCnt, RequestContentHTTP), 'Invalid request content %s' % requestCnt
 
@@ -83,22 +83,34 @@ class RequestHandler(BaseHTTPRequestHandler):
         
         requestCnt.source = self.rfile
 
-        chain = Chain(proc)
-        chain.process(**proc.fillIn(request=request, requestCnt=requestCnt,
-                                    response=proc.ctx.response(), responseCnt=proc.ctx.responseCnt())).doAll()
+        chain = proc.newChain()
+        try:
+            chain.process(**proc.fillIn(request=request, requestCnt=requestCnt, response=proc.newContext('response'),
+                                        responseCnt=proc.newContext('responseCnt'))).doAll()
+            self._respond(chain)
+        # The contexts are released also if the processing failed since nothing uses them anymore.
+        finally: proc.release(chain)
 
+    def _respond(self, chain):
+        '''
+        Writes the response of the finalized chain.
+        
+        @param chain: Chain
+            The finalized chain to respond for.
+        '''
+        assert isinstance(chain, Chain), 'Invalid chain %s' % chain
         response, responseCnt = chain.arg.response, chain.arg.responseCnt
         assert isinstance(response, ResponseHTTP), 'Invalid response %s' % response
         assert isinstance(responseCnt, ResponseContentHTTP), 'Invalid response content %s' % responseCnt
 
-        if ResponseHTTP.headers in response and response.headers is not None:
-            for name, value in response.headers.items(): self.send_header(name, value)
-
         assert isinstance(response.status, int), 'Invalid response status code %s' % response.status
         if ResponseHTTP.text in response and response.text: text = response.text
         elif ResponseHTTP.code in response and response.code: text = response.code
         else: text = None
+        # The status line needs to be sent before the headers since the headers are buffered.
         self.send_response(response.status, text)
+        if ResponseHTTP.headers in response and response.headers is not None:
+            for name, value in response.headers.items(): self.send_header(name, value)
         self.end_headers()
 
         if ResponseContentHTTP.source in responseCnt and responseCnt.source is not None:
@@ -134,6 +146,8 @@ class BasicServer(HTTPServer):
     # and client address.
     assembly = Assembly
     # The assembly used for resolving the requests
+    poolSize = 0
+    # The number of context objects and chains kept for reuse between requests, if 0 then no pooling is used.
     
     def __init__(self):
         '''
@@ -144,10 +158,12 @@ class BasicServer(HTTPServer):
         assert isinstance(self.serverPort, int), 'Invalid server port %s' % self.serverPort
         assert callable(self.requestHandlerFactory), 'Invalid request handler factory %s' % self.requestHandlerFactory
         assert isinstance(self.assembly, Assembly), 'Invalid assembly %s' % self.assembly
+        assert isinstance(self.poolSize, int) and self.poolSize >= 0, 'Invalid pool size %s' % self.poolSize
         super().__init__((self.serverHost, self.serverPort), self.requestHandlerFactory)
 
         self.processing = self.assembly.create(request=RequestHTTP, requestCnt=RequestContentHTTP,
                                                response=ResponseHTTP, responseCnt=ResponseContentHTTP)
+        self.processing.pooling(self.poolSize)
 
 # --------------------------------------------------------------------
 
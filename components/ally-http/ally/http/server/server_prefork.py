@@ -0,0 +1,221 @@
+'''
+Created on Mar 12, 2013
+
+@package: ally http
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the pre fork web server, the server forks a number of worker processes that share the listening socket, each
+worker process is a basic server that serves the requests on one CPU.
+'''
+
+from .server_basic import BasicServer, RequestHandler
+from ally.container.ioc import injected
+from ally.design.processor.assembly import Assembly
+from ally.design.processor.execution import Processing
+from ally.http.spec.server import RequestHTTP, ResponseHTTP, RequestContentHTTP, \
+    ResponseContentHTTP
+from http.server import HTTPServer
+from multiprocessing import Process, cpu_count
+import logging
+import socket
+import time
+
+# --------------------------------------------------------------------
+
+log = logging.getLogger(__name__)
+
+SO_REUSEPORT = getattr(socket, 'SO_REUSEPORT', None)
+# The reuse port socket option, not available on all platforms.
+
+# --------------------------------------------------------------------
+
+class WorkerServer(BasicServer):
+    '''
+    The server that runs in a worker process, is a basic server that uses an already created listening socket and
+    processing.
+    '''
+
+    def __init__(self, sock, processing, serverVersion, requestHandlerFactory):
+        '''
+        Construct the worker server.
+
+        @param sock: socket
+            The listening socket to accept connections from.
+        @param processing: Processing
+            The processing used for resolving the requests.
+        @param serverVersion: string
+            The server version name.
+        @param requestHandlerFactory: callable
+            The factory that provides request handlers.
+        '''
+        assert isinstance(sock, socket.socket), 'Invalid socket %s' % sock
+        assert isinstance(processing, Processing), 'Invalid processing %s' % processing
+        assert isinstance(serverVersion, str), 'Invalid server version %s' % serverVersion
+        HTTPServer.__init__(self, sock.getsockname(), requestHandlerFactory, False)
+        self.socket.close()
+        self.socket = sock
+
+        self.serverVersion = serverVersion
+        self.processing = processing
+
+# --------------------------------------------------------------------
+
+@injected
+class PreforkServer:
+    '''
+    The pre fork server, creates the listening socket and the processing and then forks the worker processes, the
+    workers are supervised and restarted if they stop.
+    '''
+
+    serverVersion = str
+    # The server version name
+    serverHost = str
+    # The server address host
+    serverPort = int
+    # The server port
+    requestHandlerFactory = RequestHandler
+    # The factory that provides request handlers, takes as arguments the server, request socket
+    # and client address.
+    assembly = Assembly
+    # The assembly used for resolving the requests
+    workers = 0
+    # The number of worker processes, if 0 then the number of available CPUs is used.
+    reusePort = True
+    # If true and the platform supports SO_REUSEPORT then each worker will have his own listening socket on the same
+    # port, allowing the kernel to balance the connections, otherwise all workers use the same listening socket.
+    requestQueueSize = 1024
+    # The size of the listening socket queue.
+    superviseInterval = 1.0
+    # The interval in seconds at which the workers are checked and restarted if is the case.
+    poolSize = 0
+    # The number of context objects and chains kept for reuse between requests by each worker, if 0 then no pooling
+    # is used.
+
+    def __init__(self):
+        '''
+        Construct the server.
+        '''
+        assert isinstance(self.serverVersion, str), 'Invalid server version %s' % self.serverVersion
+        assert isinstance(self.serverHost, str), 'Invalid server host %s' % self.serverHost
+        assert isinstance(self.serverPort, int), 'Invalid server port %s' % self.serverPort
+        assert callable(self.requestHandlerFactory), 'Invalid request handler factory %s' % self.requestHandlerFactory
+        assert isinstance(self.assembly, Assembly), 'Invalid assembly %s' % self.assembly
+        assert isinstance(self.workers, int) and self.workers >= 0, 'Invalid workers count %s' % self.workers
+        assert isinstance(self.reusePort, bool), 'Invalid reuse port flag %s' % self.reusePort
+        assert isinstance(self.requestQueueSize, int), 'Invalid request queue size %s' % self.requestQueueSize
+        assert isinstance(self.superviseInterval, float), 'Invalid supervise interval %s' % self.superviseInterval
+        assert isinstance(self.poolSize, int) and self.poolSize >= 0, 'Invalid pool size %s' % self.poolSize
+
+        if self.workers == 0: self.workers = cpu_count()
+        self.reusePort = self.reusePort and SO_REUSEPORT is not None
+
+        self.processing = self.assembly.create(request=RequestHTTP, requestCnt=RequestContentHTTP,
+                                               response=ResponseHTTP, responseCnt=ResponseContentHTTP)
+        # The pools are copied with the processing in each forked worker.
+        self.processing.pooling(self.poolSize)
+
+        # If the port is reused the socket is only bound in order to reserve the port, the workers will have their own
+        # listening sockets.
+        self.socket = self.createSocket(not self.reusePort)
+        # In case the port is 0 the workers need to use the port assigned to the server socket.
+        self.serverPort = self.socket.getsockname()[1]
+        self._processes = []
+        self._running = False
+
+    def createSocket(self, listen=True):
+        '''
+        Creates the server socket.
+
+        @param listen: boolean
+            Flag indicating that the socket should also be placed in listening.
+        @return: socket
+            The created socket.
+        '''
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.reusePort: sock.setsockopt(socket.SOL_SOCKET, SO_REUSEPORT, 1)
+        sock.bind((self.serverHost, self.serverPort))
+        if listen: sock.listen(self.requestQueueSize)
+        return sock
+
+    def serve_forever(self):
+        '''
+        Starts the workers and supervises them.
+        '''
+        self._running = True
+        for index in range(self.workers): self._processes.append(self._start(index))
+
+        while self._running:
+            time.sleep(self.superviseInterval)
+            for index, process in enumerate(self._processes):
+                assert isinstance(process, Process), 'Invalid process %s' % process
+                if self._running and not process.is_alive():
+                    log.error('Worker \'%s\' has stopped with exit code %s, restarting', process.name, process.exitcode)
+                    self._processes[index] = self._start(index)
+
+    def server_close(self):
+        '''
+        Stops the workers and closes the server socket.
+        '''
+        self._running = False
+        for process in self._processes:
+            assert isinstance(process, Process), 'Invalid process %s' % process
+            if process.is_alive(): process.terminate()
+        for process in self._processes: process.join()
+        del self._processes[:]
+        self.socket.close()
+
+    # ----------------------------------------------------------------
+
+    def _start(self, index):
+        '''
+        Starts a new worker process.
+
+        @param index: integer
+            The index of the worker.
+        @return: Process
+            The started worker process.
+        '''
+        process = Process(name='HTTP worker %s' % index, target=self._serve)
+        process.daemon = True
+        process.start()
+        log.info('Started worker \'%s\' with pid %s', process.name, process.pid)
+        return process
+
+    def _serve(self):
+        '''
+        Serves the requests, this is executed in the worker process.
+        '''
+        if self.reusePort:
+            self.socket.close()
+            sock = self.createSocket()
+        else: sock = self.socket
+
+        server = WorkerServer(sock, self.processing, self.serverVersion, self.requestHandlerFactory)
+        try: server.serve_forever()
+        except KeyboardInterrupt: pass
+        finally: server.server_close()
+
+# --------------------------------------------------------------------
+
+def run(server):
+    '''
+    Run the pre fork server.
+
+    @param server: PreforkServer
+        The server to run.
+    '''
+    assert isinstance(server, PreforkServer), 'Invalid server %s' % server
+
+    try:
+        log.info('=' * 50 + ' Started pre fork HTTP server with %s workers...', server.workers)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info('=' * 50 + ' ^C received, shutting down server')
+        server.server_close()
+    except:
+        log.exception('=' * 50 + ' The server has stooped')
+        try: server.server_close()
+        except: pass
@@ -55,6 +55,8 @@ def isSuccess(status):
 PATH_NOT_FOUND = CodeHTTP('Not found', 404, False)  # HTTP code 404 Not Found
 PATH_FOUND = CodeHTTP('OK', 200, True)  # HTTP code 200 OK
 
+NOT_MODIFIED = CodeHTTP('Not modified', 304, True)  # HTTP code 304 Not Modified
+
 METHOD_NOT_AVAILABLE = CodeHTTP('Method not allowed', 405, False)  # HTTP code 405 Method Not Allowed
 
 BAD_REQUEST = CodeHTTP('Bad Request', 400, False)  # HTTP code 400 Bad Request
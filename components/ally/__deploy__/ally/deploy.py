@@ -14,6 +14,7 @@ from __setup__.ally.logging import format, debug_for, info_for, warning_for, log
 from ally.container import ioc, aop, context, support, event
 from ally.container.error import SetupError, ConfigError
 from ally.container.impl.config import load, save
+from ally.support import util_manifest
 import application
 import logging
 import os
@@ -35,6 +36,8 @@ def openSetups():
               'with "-dump" option' % application.options.configurationPath, file=sys.stderr)
         sys.exit(1)
     with open(application.options.configurationPath, 'r') as f: config = load(f)
+    if application.options.manifestPath:
+        util_manifest.enable(application.options.manifestPath, application.options.deferSetups)
 
     context.open(aop.modulesIn('__setup__.ally.**'), config=config)
     
@@ -46,6 +49,10 @@ def openSetups():
     context.deactivate()
     
     context.open(aop.modulesIn('__setup__.**'), config=config)
+
+def saveManifest():
+    ''' Save the modules manifest if there is one used '''
+    if util_manifest.manifest is not None: util_manifest.manifest.save()
     
 # --------------------------------------------------------------------
 
@@ -69,6 +76,7 @@ def deploy():
     try:
         openSetups()
         context.processStart()
+        saveManifest()
         if log_file(): logging.getLogger().addHandler(FileHandler(log_file()))
 
     except SystemExit: raise
@@ -134,6 +142,7 @@ def repair():
         for call, name, _trigger in support.eventsFor(event.REPAIR):
             log.info('Executing repair event call \'%s\'', name)
             call()
+        saveManifest()
             
     except SystemExit: raise
     except (SetupError, ConfigError):
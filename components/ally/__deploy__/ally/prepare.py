@@ -29,6 +29,8 @@ class OptionsCore:
         self._writeConfigurations = False  # Indicates that the configurations should be written
         
         self.configurationPath = 'application.properties'
+        self.manifestPath = None  # The path of the modules manifest, if None the modules are searched on each start
+        self.deferSetups = False  # Flag indicating that the setup modules indexed in the manifest are imported when used
     
     def setStart(self, value):
         '''Setter for the start'''
@@ -79,3 +81,11 @@ def prepareCorePreferences():
     application.parser.add_argument('--ccfg', metavar='file', dest='configurationPath', help='The path of the components '
                                     'properties file to be used in deploying the application, by default is used the '
                                     '"application.properties" in the application module folder')
+    application.parser.add_argument('--manifest', metavar='file', dest='manifestPath', help='The path of the modules '
+                                    'manifest file, the manifest records the modules found in the application '
+                                    'distribution so that unchanged deployments are started without scanning for '
+                                    'modules, by default no manifest is used')
+    application.parser.add_argument('--defer-setups', dest='deferSetups', action='store_true', help='Provide this '
+                                    'option in order to import the setup modules that contain only entities when the '
+                                    'entities are first used, the setup modules are indexed in the modules manifest so '
+                                    'this option requires the manifest')
@@ -0,0 +1,35 @@
+'''
+Created on Apr 8, 2013
+
+@package: ally base
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the timing instrumentation configurations.
+'''
+
+from ally.container import ioc
+from ally.support import util_timing
+
+# --------------------------------------------------------------------
+
+@ioc.config
+def timing_enabled() -> bool:
+    '''
+    If true the wall time of the processors, the processings (assemblies and Routing/Using/Included branches) and the
+    resource invokers is recorded in memory latency histograms, the overhead is a clock read and a histogram update for
+    each processor call.
+    '''
+    return False
+
+@ioc.config
+def timing_bounds() -> list:
+    '''The latency histograms buckets upper bounds in seconds'''
+    return list(util_timing.BOUNDS)
+
+# --------------------------------------------------------------------
+
+@ioc.start
+def enableTiming():
+    if timing_enabled(): util_timing.enable(tuple(sorted(timing_bounds())))
@@ -0,0 +1,138 @@
+'''
+Created on Apr 12, 2013
+
+@package: ally base
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Testing for the deferred setup modules.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.container import context
+from ally.container._impl._aop import AOPModules
+from ally.container._impl._assembly import Assembly
+from ally.support import util_manifest
+from os.path import join
+from tempfile import mkdtemp
+import os
+import shutil
+import sys
+import unittest
+
+# --------------------------------------------------------------------
+
+ENTITIES = '''
+from ally.container import ioc
+
+@ioc.entity
+def value(): return 'deferred'
+'''
+
+LISTENERS = '''
+from ally.container import ioc, support
+
+listened = []
+
+support.listenToEntities(str, listeners=listened.append, all=True)
+
+@ioc.entity
+def other(): return 'indexed'
+'''
+
+STARTS = '''
+from ally.container import ioc
+
+started = []
+
+@ioc.start
+def start(): started.append(True)
+'''
+
+# --------------------------------------------------------------------
+
+class TestDeferred(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = mkdtemp()
+        os.mkdir(join(self.folder, 'deferred_setup'))
+        for name, content in (('__init__', ''), ('entities', ENTITIES), ('listeners', LISTENERS), ('starts', STARTS)):
+            with open(join(self.folder, 'deferred_setup', '%s.py' % name), 'w') as f: f.write(content)
+        sys.path.insert(0, self.folder)
+        util_manifest.enable(join(self.folder, 'manifest.json'), True)
+
+    def tearDown(self):
+        util_manifest.disable()
+        sys.path.remove(self.folder)
+        for name in ('deferred_setup', 'deferred_setup.entities', 'deferred_setup.listeners', 'deferred_setup.starts'):
+            sys.modules.pop(name, None)
+        shutil.rmtree(self.folder)
+
+    def modules(self, *names):
+        names = names or ('deferred_setup.entities', 'deferred_setup.starts')
+        return AOPModules({name: name for name in names})
+
+    def testDeferred(self):
+        # The first open indexes the setup modules that contain only entities.
+        context.open(self.modules())
+        try: self.assertEqual(Assembly.process('deferred_setup.entities.value'), 'deferred')
+        finally: context.deactivate()
+        self.assertIsNotNone(util_manifest.manifest.deferred('deferred_setup.entities'))
+        self.assertIsNone(util_manifest.manifest.deferred('deferred_setup.starts'))
+
+        del sys.modules['deferred_setup.entities']
+        context.open(self.modules())
+        try:
+            self.assertNotIn('deferred_setup.entities', sys.modules)
+            context.processStart()
+            self.assertEqual(sys.modules['deferred_setup.starts'].started, [True])
+            self.assertNotIn('deferred_setup.entities', sys.modules)
+
+            self.assertEqual(Assembly.process('deferred_setup.entities.value'), 'deferred')
+            self.assertIn('deferred_setup.entities', sys.modules)
+        finally: context.deactivate()
+
+    def testIterated(self):
+        context.open(self.modules())
+        context.deactivate()
+        del sys.modules['deferred_setup.entities']
+
+        assembly = context.open(self.modules())
+        try:
+            self.assertNotIn('deferred_setup.entities.value', dict(assembly.calls.indexed()))
+            self.assertIn('deferred_setup.entities.value', list(assembly.calls))
+        finally: context.deactivate()
+
+    def testListened(self):
+        modules = ('deferred_setup.entities', 'deferred_setup.listeners')
+        context.open(self.modules(*modules))
+        context.deactivate()
+        self.assertIsNotNone(util_manifest.manifest.deferred('deferred_setup.entities'))
+        self.assertIsNone(util_manifest.manifest.deferred('deferred_setup.listeners'))
+        del sys.modules['deferred_setup.entities']
+
+        # The entity wide listener does not load the deferred setup module.
+        context.open(self.modules(*modules))
+        try:
+            listened = sys.modules['deferred_setup.listeners'].listened
+            self.assertNotIn('deferred_setup.entities', sys.modules)
+            self.assertEqual(Assembly.process('deferred_setup.listeners.other'), 'indexed')
+            self.assertEqual(['indexed'], listened)
+            self.assertNotIn('deferred_setup.entities', sys.modules)
+
+            # The deferred entities are still listened once the setup module is loaded.
+            self.assertEqual(Assembly.process('deferred_setup.entities.value'), 'deferred')
+            self.assertIn('deferred_setup.entities', sys.modules)
+            self.assertEqual(['indexed', 'deferred'], listened)
+        finally: context.deactivate()
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -17,7 +17,7 @@ if True:
 # --------------------------------------------------------------------
 
 from ally.container.impl.proxy import ProxyFilter, createProxy, ProxyWrapper, \
-    registerProxyHandler
+    registerProxyHandler, IProxyHandler
 import unittest
 
 # --------------------------------------------------------------------
@@ -35,6 +35,16 @@ class B(A):
     def methodB(self):
         return 'B.methodB'
 
+class Record(IProxyHandler):
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def handle(self, execution):
+        self.calls.append(execution.proxyCall.proxyMethod.name)
+        return '%s(%s)' % (self.name, execution.invoke())
+
 # --------------------------------------------------------------------
 
 class TestProxy(unittest.TestCase):
@@ -84,6 +94,23 @@ class TestProxy(unittest.TestCase):
         self.assertTrue(proxy.methodA() == 'A.methodA')
         self.assertTrue(proxy.methodB() == 'B.methodB')
 
+    def testProxyRegisterAfterCall(self):
+        BProxy = createProxy(B)
+
+        proxy = BProxy(ProxyWrapper(B()))
+        assert isinstance(proxy, B)
+        self.assertEqual(proxy.methodA(), 'B.methodA')
+        self.assertEqual(proxy.methodB(), 'B.methodB')
+
+        first, second = Record('first'), Record('second')
+        registerProxyHandler(first, proxy)
+        registerProxyHandler(second, proxy.methodB)
+        self.assertEqual(proxy.methodA(), 'first(B.methodA)')
+        self.assertEqual(proxy.methodB(), 'second(first(B.methodB))')
+        self.assertEqual(proxy.methodB(), 'second(first(B.methodB))')
+        self.assertEqual(first.calls, ['methodA', 'methodB', 'methodB'])
+        self.assertEqual(second.calls, ['methodB', 'methodB'])
+
 # --------------------------------------------------------------------
 
 if __name__ == '__main__': unittest.main()
@@ -18,6 +18,7 @@ if True:
 
 from ally.design.processor.attribute import requires, defines, optional
 from ally.design.processor.context import Context, create
+from ally.design.processor.execution import Processing
 from ally.design.processor.spec import Resolvers
 import unittest
 
@@ -68,6 +69,21 @@ class TestDesign(unittest.TestCase):
         i.p1 = 'astr'
         self.assertEqual(i.p1, 'astr')
         
+    def testPooling(self):
+        proc = Processing([], dict(i=I)).pooling(1)
+        chain = proc.newChain()
+        chain.process(**proc.fillIn())
+        i = chain.arg.i
+        i.p1, i.p2 = 'astr', 'bstr'
+        proc.release(chain)
+        
+        self.assertTrue(I.p1 not in i)
+        self.assertIsNone(i.p2)
+        self.assertIs(proc.newContext('i'), i)
+        self.assertIsNot(proc.newContext('i'), i)
+        self.assertIs(proc.newChain(), chain)
+        self.assertFalse(chain.arg.__dict__)
+        
 # --------------------------------------------------------------------
 
 if __name__ == '__main__': unittest.main()
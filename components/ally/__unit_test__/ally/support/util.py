@@ -0,0 +1,78 @@
+'''
+Created on Mar 26, 2013
+
+@package: ally base
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Testing for the support utilities.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.support.util import CacheLRU
+from threading import Thread
+import unittest
+
+# --------------------------------------------------------------------
+
+class TestCacheLRU(unittest.TestCase):
+
+    def testEviction(self):
+        cache = CacheLRU(3)
+        for key in 'abc': cache.set(key, key.upper())
+        self.assertEqual(3, len(cache))
+
+        # Reading an entry makes it the most recently used one.
+        self.assertEqual('A', cache.get('a'))
+        cache.set('d', 'D')
+        self.assertEqual(3, len(cache))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(['A', 'C', 'D'], [cache.get(key) for key in 'acd'])
+
+        # Setting an existing entry replaces the value and makes it the most recently used one.
+        cache.set('a', 'AA')
+        cache.set('e', 'E')
+        self.assertEqual('missing', cache.get('c', 'missing'))
+        self.assertEqual(['AA', 'D', 'E'], [cache.get(key) for key in 'ade'])
+
+        cache.set('f', 'F')
+        cache.set('g', 'G')
+        self.assertEqual([None, None, 'E', 'F', 'G'], [cache.get(key) for key in 'adefg'])
+
+        cache = CacheLRU(1)
+        cache.set('a', 'A')
+        cache.set('b', 'B')
+        self.assertEqual([None, 'B'], [cache.get(key) for key in 'ab'])
+        self.assertEqual(1, len(cache))
+
+    def testThreads(self):
+        cache, errors = CacheLRU(50), []
+
+        def use(index):
+            try:
+                for k in range(2000):
+                    key = (index + k) % 80
+                    value = cache.get(key)
+                    if value is not None: assert value == key * 2, 'Invalid value %s for key %s' % (value, key)
+                    else: cache.set(key, key * 2)
+                    assert len(cache) <= 50, 'Invalid size %s' % len(cache)
+            except Exception as e: errors.append(e)
+
+        threads = [Thread(target=use, args=(index,)) for index in range(8)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+
+        self.assertEqual([], errors)
+        self.assertEqual(50, len(cache))
+        self.assertEqual(50, len([key for key in range(80) if cache.get(key) is not None]))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
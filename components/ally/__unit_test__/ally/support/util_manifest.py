@@ -0,0 +1,70 @@
+'''
+Created on Apr 11, 2013
+
+@package: ally base
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Testing for the modules manifest.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.support.util_manifest import Manifest
+from os.path import join
+from tempfile import mkdtemp
+import os
+import shutil
+import unittest
+
+# --------------------------------------------------------------------
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder, self.manifestFolder = mkdtemp(), mkdtemp()
+        self.package = join(self.folder, '__setup__')
+        os.mkdir(self.package)
+        os.utime(self.package, (1000, 1000))
+        # The manifest is kept apart since writing it changes the folder that contains it.
+        self.path = join(self.manifestFolder, 'manifest.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+        shutil.rmtree(self.manifestFolder)
+
+    def testPersist(self):
+        manifest = Manifest(self.path)
+        self.assertIsNone(manifest.get('__setup__.**'))
+        manifest.put('__setup__.**', {(False, '__setup__.ally'): [self.package]})
+        manifest.save()
+
+        manifest = Manifest(self.path)
+        self.assertEqual(manifest.get('__setup__.**'), {(False, '__setup__.ally'): [self.package]})
+        # The provided modules can be consumed without altering the manifest.
+        manifest.get('__setup__.**').clear()
+        self.assertEqual(manifest.get('__setup__.**'), {(False, '__setup__.ally'): [self.package]})
+
+    def testInvalidate(self):
+        manifest = Manifest(self.path)
+        manifest.put('__setup__.**', {(False, '__setup__.ally'): [self.package]})
+        manifest.save()
+
+        with open(join(self.package, 'added.py'), 'w'): pass
+        os.utime(self.package, (2000, 2000))
+        manifest = Manifest(self.path)
+        self.assertIsNone(manifest.get('__setup__.**'))
+
+    def testInvalidFile(self):
+        with open(self.path, 'w') as f: f.write('not a manifest')
+        self.assertIsNone(Manifest(self.path).get('__setup__.**'))
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
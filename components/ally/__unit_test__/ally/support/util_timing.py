@@ -0,0 +1,60 @@
+'''
+Created on Apr 8, 2013
+
+@package: ally base
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Testing for the timing histograms and the chain instrumentation.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.design.processor.execution import Processing, Chain, TIMING_PROCESSOR, \
+    TIMING_PROCESSING
+from ally.support import util_timing
+from ally.support.util_timing import Histogram
+import unittest
+
+# --------------------------------------------------------------------
+
+class Handler:
+
+    def process(self, chain, **keyargs):
+        chain.proceed()
+
+# --------------------------------------------------------------------
+
+class TestTiming(unittest.TestCase):
+
+    def testHistogram(self):
+        h = Histogram((0.001, 0.01, 0.1))
+        for elapsed in (0.0005, 0.005, 0.005, 0.05, 0.5): h.add(elapsed)
+        self.assertEqual(h.counts, [1, 2, 1, 1])
+        self.assertEqual(h.count, 5)
+        self.assertEqual(h.maximum, 0.5)
+        self.assertEqual(h.percentile(50), 0.01)
+        self.assertEqual(h.percentile(90), 0.5)
+
+    def testChain(self):
+        handler = Handler()
+        timings = util_timing.enable()
+        try:
+            Chain(Processing([handler.process, handler.process], name='Test')).process().doAll()
+            present = timings.present()
+        finally: util_timing.disable()
+
+        name = '%s.Handler.process' % __name__
+        self.assertEqual(list(present[TIMING_PROCESSOR]), [name])
+        self.assertEqual(present[TIMING_PROCESSOR][name].count, 2)
+        self.assertEqual(present[TIMING_PROCESSING]['Test'].count, 1)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
@@ -15,6 +15,7 @@ from collections import deque
 from inspect import ismodule
 import abc
 import logging
+import sys
 
 # --------------------------------------------------------------------
 
@@ -100,7 +101,7 @@ class Assembly:
         @ivar configurations: dictionary{string:Config}
             A dictionary of the assembly configurations, the key is the configuration name and the value is a
             Config object.
-        @ivar calls: dictionary{string, Callable}
+        @ivar calls: Calls
             A dictionary containing as a key the name of the call to be resolved and as a value the Callable that will
             resolve the name. The Callable will not take any argument.
         @ivar callsOfValue: dictionary{intege:list[Callable]}
@@ -115,7 +116,7 @@ class Assembly:
         self.configExtern = configExtern
         self.configUsed = set()
         self.configurations = {}
-        self.calls = {}
+        self.calls = Calls()
         self.callsOfValue = {}
         self.called = set()
 
@@ -187,6 +188,148 @@ class Assembly:
         self._processing.pop()
         return value
 
+class Calls(dict):
+    '''
+    The assembly calls, besides the indexed calls it contains also the names of the calls from the deferred setup modules.
+    A deferred setup module is loaded whenever one of his calls names is required or when all the calls are iterated.
+    '''
+    
+    def __init__(self):
+        '''
+        Construct the calls.
+        
+        @ivar deferred: dictionary{string, DeferredModule}
+            The deferred setup modules indexed by the names of their calls.
+        @ivar setups: list[Setup]
+            The setups that are assembled again whenever a deferred setup module is loaded.
+        '''
+        super().__init__()
+        self.deferred = {}
+        self.setups = []
+        
+    def assembleOnLoad(self, setup):
+        '''
+        Registers the setup to be assembled again whenever a deferred setup module is loaded, this way the setups that
+        process the calls from other setup modules do not need to load the deferred setup modules.
+        
+        @param setup: Setup
+            The setup to assemble when a deferred setup module is loaded.
+        '''
+        assert isinstance(setup, Setup), 'Invalid setup %s' % setup
+        if setup not in self.setups: self.setups.append(setup)
+        
+    def indexed(self):
+        '''
+        Provides the indexed calls without loading the deferred setup modules.
+        
+        @return: Iterable(tuple(string, Callable))
+            The indexed calls names and calls.
+        '''
+        return super().items()
+    
+    def load(self, name=None):
+        '''
+        Loads the deferred setup module for the name.
+        
+        @param name: string|None
+            The name to load the deferred setup module for, if None then all the deferred setup modules are loaded.
+        @return: boolean
+            True if there is a call for the name after loading, False otherwise.
+        '''
+        if name is None:
+            while self.deferred: self.load(next(iter(self.deferred)))
+            return True
+        
+        deferred = self.deferred.get(name)
+        if deferred is None: return False
+        assert isinstance(deferred, DeferredModule), 'Invalid deferred module %s' % deferred
+        deferred.load()
+        
+        # The module might have been loaded in an other assembly calls in which case the calls are copied.
+        calls = deferred.assembly.calls
+        for nameCall in deferred.names:
+            self.deferred.pop(nameCall, None)
+            if calls is not self and dict.__contains__(calls, nameCall):
+                super().__setitem__(nameCall, dict.__getitem__(calls, nameCall))
+        return super().__contains__(name)
+    
+    def get(self, name, default=None):
+        '''
+        @see: dict.get
+        '''
+        if name in self: return self[name]
+        return default
+    
+    def __missing__(self, name):
+        if not self.load(name): raise KeyError(name)
+        return super().__getitem__(name)
+    
+    def __contains__(self, name):
+        return super().__contains__(name) or self.load(name)
+    
+    def __iter__(self):
+        self.load()
+        return super().__iter__()
+    
+    def keys(self):
+        self.load()
+        return super().keys()
+    
+    def values(self):
+        self.load()
+        return super().values()
+    
+    def items(self):
+        self.load()
+        return super().items()
+
+class DeferredModule:
+    '''
+    The setup module that is imported and indexed into the assembly only when one of his calls is required.
+    '''
+    
+    def __init__(self, assembly, module, names):
+        '''
+        Construct the deferred setup module.
+        
+        @param assembly: Assembly
+            The assembly to load the setup module into.
+        @param module: string
+            The setup module full name.
+        @param names: list[string]
+            The names of the calls provided by the setup module.
+        '''
+        assert isinstance(assembly, Assembly), 'Invalid assembly %s' % assembly
+        assert isinstance(module, str), 'Invalid module %s' % module
+        assert isinstance(names, list), 'Invalid names %s' % names
+        self.assembly = assembly
+        self.module = module
+        self.names = names
+        self.loaded = False
+        
+    def load(self):
+        '''
+        Imports the setup module and indexes his setups into the assembly.
+        '''
+        if self.loaded: return
+        self.loaded = True
+        for name in self.names: self.assembly.calls.deferred.pop(name, None)
+        
+        try: __import__(self.module)
+        except: raise SetupError('Cannot import the deferred setup module %r' % self.module)
+        setups = getattr(sys.modules[self.module], '__ally_setups__', ())
+        assert log.debug('Loaded the deferred setup module %r', self.module) or True
+        
+        for setup in sorted(setups, key=lambda setup: setup.priority_index):
+            assert isinstance(setup, Setup), 'Invalid setup %s' % setup
+            setup.index(self.assembly)
+
+        # The setups from the other setup modules that process calls are also assembled for the loaded calls.
+        setups = list(setups)
+        setups.extend(setup for setup in self.assembly.calls.setups if setup not in setups)
+        for setup in sorted(setups, key=lambda setup: setup.priority_assemble):
+            setup.assemble(self.assembly)
+
 class Context:
     '''
     Provides the context of the setup functions and setup calls.
@@ -197,6 +340,7 @@ class Context:
         Construct the context.
         '''
         self._modules = []
+        self._deferred = {}
 
     def addSetupModule(self, module):
         '''
@@ -212,6 +356,19 @@ class Context:
             self._modules.append(module)
             self._modules.sort(key=lambda module: module.__name__)
 
+    def addDeferredModule(self, module, names):
+        '''
+        Adds a setup module that is imported only when one of his calls is required.
+        
+        @param module: string
+            The setup module full name.
+        @param names: list[string]
+            The names of the calls provided by the setup module.
+        '''
+        assert isinstance(module, str), 'Invalid module %s' % module
+        assert isinstance(names, list), 'Invalid names %s' % names
+        self._deferred[module] = names
+
     def assemble(self, assembly):
         '''
         Assembles into the provided assembly this context.
@@ -223,6 +380,10 @@ class Context:
         '''
         assert isinstance(assembly, Assembly), 'Invalid assembly %s' % assembly
         
+        for module, names in self._deferred.items():
+            deferred = DeferredModule(assembly, module, names)
+            for name in names: assembly.calls.deferred[name] = deferred
+        
         setups = deque()
         for module in self._modules: setups.extend(module.__ally_setups__) 
         
@@ -72,7 +72,9 @@ class SetupEntityWire(Setup):
         @see: Setup.assemble
         '''
         assert isinstance(assembly, Assembly), 'Invalid assembly %s' % assembly
-        for name, call in assembly.calls.items():
+        # Only the indexed calls are wired, the deferred setup modules are wired when loaded.
+        assembly.calls.assembleOnLoad(self)
+        for name, call in assembly.calls.indexed():
             wirings = self._wirings.get(name)
             if wirings is not None and isinstance(call, CallEntity):
                 assert isinstance(call, CallEntity)
@@ -150,7 +152,9 @@ class SetupEntityListen(Setup):
         assert isinstance(assembly, Assembly), 'Invalid assembly %s' % assembly
         if self.group: prefix = self.group + '.'
         else: prefix = None
-        for name, call in assembly.calls.items():
+        # Only the indexed calls are listened, the deferred setup modules are listened when loaded.
+        assembly.calls.assembleOnLoad(self)
+        for name, call in assembly.calls.indexed():
             if isinstance(call, CallEntity):
                 assert isinstance(call, CallEntity)
                 if prefix is None or name.startswith(prefix):
@@ -213,7 +217,9 @@ class SetupEntityProxy(Setup):
         '''
         assert isinstance(assembly, Assembly), 'Invalid assembly %s' % assembly
         prefix = self.group + '.'
-        for name, call in assembly.calls.items():
+        # Only the indexed calls are proxied, the deferred setup modules are proxied when loaded.
+        assembly.calls.assembleOnLoad(self)
+        for name, call in assembly.calls.indexed():
             if name.startswith(prefix) and isinstance(call, CallEntity):
                 assert isinstance(call, CallEntity)
                 if call.marks.count(self) == 0:
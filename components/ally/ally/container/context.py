@@ -9,14 +9,16 @@ Created on Jan 8, 2013
 Provides the IoC deployment operations.
 '''
 
+from ..support import util_manifest
 from ._impl._aop import AOPModules
 from ._impl._assembly import Context, Assembly
-from ._impl._setup import CallStart
+from ._impl._setup import CallStart, SetupEntity
 from .error import SetupError
 from .impl.priority import sortByPriorities
 from inspect import ismodule
 import importlib
 import logging
+import sys
 
 # --------------------------------------------------------------------
 
@@ -51,11 +53,14 @@ def open(*modules, config=None, included=False, active=True):
         if ismodule(module): context.addSetupModule(module)
         elif isinstance(module, AOPModules):
             assert isinstance(module, AOPModules)
-            for m in module.load().asList(): context.addSetupModule(m)
+            addSetupModules(context, module)
         else: raise SetupError('Cannot use module %s' % module)
     
     assembly = Assembly(config or {})
-    if included: assembly.calls.update(Assembly.current().calls)
+    if included:
+        calls = Assembly.current().calls
+        assembly.calls.update(calls.indexed())
+        assembly.calls.deferred.update(calls.deferred)
     assembly = context.assemble(assembly)
     if active: assembly = activate(assembly)
     return assembly
@@ -88,7 +93,8 @@ def processStart(assembly=None):
     if unused: log.info('Unknown configurations: %s', ', '.join(unused))
     
     calls = []
-    for call in assembly.calls.values():
+    # The deferred setup modules contain only entities so there is no need to load them.
+    for _name, call in assembly.calls.indexed():
         if isinstance(call, CallStart):
             assert isinstance(call, CallStart)
             if call.assembly == assembly: calls.append(call)
@@ -120,3 +126,43 @@ def deactivate():
     '''
     assert Assembly.stack, 'No assembly available for deactivation'
     Assembly.stack.pop()
+
+# --------------------------------------------------------------------
+
+def addSetupModules(context, modules):
+    '''
+    Adds to the context the setup modules, if the modules manifest is used for deferring then the indexed setup modules
+    are added as deferred, the setup modules that contain only entities are indexed in the manifest.
+    
+    @param context: Context
+        The context to add the setup modules to.
+    @param modules: AOPModules
+        The setup modules to add.
+    '''
+    assert isinstance(context, Context), 'Invalid context %s' % context
+    assert isinstance(modules, AOPModules), 'Invalid modules %s' % modules
+    manifest = util_manifest.manifest
+    if manifest is None:
+        for module in modules.load().asList(): context.addSetupModule(module)
+        return
+    assert isinstance(manifest, util_manifest.Manifest), 'Invalid manifest %s' % manifest
+    
+    deferred = {}
+    if manifest.defer:
+        for name in modules.asList():
+            if name in sys.modules: continue
+            names = manifest.deferred(name)
+            if names is not None: deferred[name] = names
+    
+    for module in AOPModules({name: name for name in modules.asList() if name not in deferred}).load().asList():
+        context.addSetupModule(module)
+        setups = getattr(module, '__ally_setups__', None)
+        if setups and getattr(module, '__file__', None):
+            if all(type(setup) == SetupEntity for setup in setups):
+                manifest.putDeferred(module.__name__, module.__file__, [setup.name for setup in setups])
+            else: manifest.putDeferred(module.__name__, module.__file__)
+    
+    for name, names in deferred.items():
+        # The deferred module might have been imported by the other setup modules.
+        if name in sys.modules: context.addSetupModule(sys.modules[name])
+        else: context.addDeferredModule(name, names)
@@ -128,6 +128,8 @@ def registerProxyHandler(proxyHandler, proxy):
     if method: proxyHandler = ProxyFilter(proxyHandler, method)
     assert isinstance(proxy, Proxy)
     proxy._proxy_handlers.insert(0, proxyHandler)
+    # The proxy calls need to compile again the handlers.
+    for proxyCall in proxy._proxy_calls.values(): proxyCall._handlers = None
 
 def hasProxyHandler(proxyHandler, proxy):
     '''
@@ -150,7 +152,7 @@ class Execution:
     Provides the container for the execution of the proxied method.
     '''
 
-    __slots__ = ('proxyCall', 'handlers', 'args', 'keyargs')
+    __slots__ = ('proxyCall', 'handlers', 'args', 'keyargs', '_index')
 
     def __init__(self, proxyCall, handlers, args, keyargs):
         '''
@@ -158,16 +160,16 @@ class Execution:
         
         @param proxyCall: ProxyCall
             The proxy call of the execution.
-        @param handlers: deque[IProxyHandler]
-            The proxy handlers to use in the execution.
+        @param handlers: tuple(IProxyHandler)
+            The proxy handlers to use in the execution, the handlers are not altered by the execution so the same
+            handlers can be used by all the executions of the proxy call.
         @param args: list[object]
             The arguments used in the proxied method call.
         @param keyargs: dictionary{string, object}
             The key arguments used in the proxied method call.
         '''
         assert isinstance(proxyCall, ProxyCall), 'Invalid proxy call %s' % proxyCall
-        assert isinstance(handlers, deque), 'Invalid handlers queue %s' % handlers
-        assert handlers, 'Invalid handlers %s, expected at least one handler' % handlers
+        assert isinstance(handlers, tuple), 'Invalid handlers %s' % handlers
         if isinstance(args, tuple): args = list(args)
         assert isinstance(args, list), 'Invalid arguments %s' % args
         assert isinstance(keyargs, dict), 'Invalid key arguments %s' % keyargs
@@ -178,6 +180,7 @@ class Execution:
         self.handlers = handlers
         self.args = args
         self.keyargs = keyargs
+        self._index = 0
 
     def invoke(self):
         '''
@@ -186,10 +189,10 @@ class Execution:
         @return: object
             The invoke result.
         '''
-        try: handler = self.handlers.popleft()
+        try: handler = self.handlers[self._index]
         except IndexError:
-            raise AttributeError('No proxy handler resolves method %r' % self.methodName)
-        assert isinstance(handler, IProxyHandler), 'Invalid handler %s' % handler
+            raise AttributeError('No proxy handler resolves method %r' % self.proxyCall.proxyMethod.name)
+        self._index += 1
         return handler.handle(self)
 
 class ProxyMeta(MetaClassUnextendable, ABCMeta):
@@ -237,12 +240,40 @@ class ProxyCall:
         self.proxyMethod = proxyMethod
 
         self._ally_listeners = {} # This will allow the proxy method to be binded with listeners
+        self._handlers = None  # The compiled handlers, reset whenever a handler is registered to the proxy
+        self._wrapper = None  # The wrapper if is the only compiled handler
 
     def __call__(self, *args, **keyargs):
         '''
         @see: Callable.__call__
         '''
-        return Execution(self, deque(self.proxy._proxy_handlers), args, keyargs).invoke()
+        handlers = self._handlers
+        if handlers is None: handlers = self._compile()
+        # Most of the proxies have only the wrapper so the execution is not required.
+        if self._wrapper is not None: return self._wrapper.call(self.proxyMethod.name, args, keyargs)
+        return Execution(self, handlers, args, keyargs).invoke()
+
+    def _compile(self):
+        '''
+        Compiles the handlers for this call, the filters are resolved based on the method name since the method name does
+        not change for the proxy call.
+        
+        @return: tuple(IProxyHandler)
+            The handlers that are used for this call.
+        '''
+        handlers, name = [], self.proxyMethod.name
+        for handler in self.proxy._proxy_handlers:
+            while type(handler) is ProxyFilter:
+                assert isinstance(handler, ProxyFilter)
+                if name in handler._methodNames: handler = handler._proxyHandler
+                else: handler = None
+            if handler is not None: handlers.append(handler)
+
+        handlers = tuple(handlers)
+        if len(handlers) == 1 and type(handlers[0]) is ProxyWrapper: self._wrapper = handlers[0]
+        else: self._wrapper = None
+        self._handlers = handlers
+        return handlers
 
 class ProxyMethod:
     '''
@@ -272,7 +303,10 @@ class ProxyMethod:
         if proxy is not None:
             assert isinstance(proxy, Proxy), 'Invalid proxy %s' % proxy
             call = proxy._proxy_calls.get(self.name)
-            if not call: call = proxy._proxy_calls[self.name] = update_wrapper(ProxyCall(proxy, self), self)
+            if not call:
+                call = proxy._proxy_calls[self.name] = update_wrapper(ProxyCall(proxy, self), self)
+                # The call is placed in the proxy instance so the next attribute lookups will not use the descriptor.
+                proxy.__dict__[self.name] = call
             return call
         return self
 
@@ -324,11 +358,28 @@ class ProxyWrapper(IProxyHandler):
         '''
         assert isinstance(execution, Execution), 'Invalid execution %s' % execution
         assert isinstance(execution.proxyCall, ProxyCall)
-        method = getattr(self._wrapped, execution.proxyCall.proxyMethod.name, None)
-        if not method:
-            raise AttributeError('The proxy wrapped %s has no method %r' % (self._wrapped, execution.methodName))
+        name = execution.proxyCall.proxyMethod.name
+        method = getattr(self._wrapped, name, None)
+        if not method: raise AttributeError('The proxy wrapped %s has no method %r' % (self._wrapped, name))
         return method(*execution.args, **execution.keyargs)
 
+    def call(self, name, args, keyargs):
+        '''
+        Calls the wrapped method.
+        
+        @param name: string
+            The method name.
+        @param args: list[object]|tuple(object)
+            The arguments used in the method call.
+        @param keyargs: dictionary{string, object}
+            The key arguments used in the method call.
+        @return: object
+            The method call result.
+        '''
+        method = getattr(self._wrapped, name, None)
+        if not method: raise AttributeError('The proxy wrapped %s has no method %r' % (self._wrapped, name))
+        return method(*args, **keyargs)
+
 class ProxyFilter(IProxyHandler):
     '''
     Provides a @see: IProxyHandler implementation that filters the execution based on the method name and delivers the
@@ -357,8 +408,6 @@ class ProxyFilter(IProxyHandler):
         '''
         assert isinstance(execution, Execution), 'Invalid execution %s' % execution
         assert isinstance(execution.proxyCall, ProxyCall)
-        if execution.proxyCall.proxyMethod.name in self._methodNames:
-            assert isinstance(execution.handlers, deque)
-            execution.handlers.appendleft(self._proxyHandler)
+        if execution.proxyCall.proxyMethod.name in self._methodNames: return self._proxyHandler.handle(execution)
         return execution.invoke()
 
@@ -367,7 +367,8 @@ def eventsFor(*triggers, source=None):
     if source is None: source = Assembly.current()
     if isinstance(source, Assembly):
         assembly = source
-        source = source.calls.items()
+        # The deferred setup modules contain only entities so there is no need to load them.
+        source = source.calls.indexed()
     else: assembly = None
     assert isinstance(source, Iterable), 'Invalid source %s' % source
     
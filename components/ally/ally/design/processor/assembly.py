@@ -133,7 +133,7 @@ class Assembly(Container):
         resolvers.solve(sources)
         resolvers.validate()
         resolvers.solve(extensions)
-        processing = Processing(calls, create(resolvers))
+        processing = Processing(calls, create(resolvers), 'Assembly \'%s\'' % self.name)
         reportAss = report.open('Assembly \'%s\'' % self.name)
         reportAss.add(resolvers)
         
@@ -9,6 +9,7 @@ Created on Jun 12, 2012
 Provides the context support.
 '''
 
+from .attribute import Descriptor
 from .spec import IAttribute, IResolver, Resolvers, ContextMetaClass
 from ally.support.util import immut
 
@@ -215,6 +216,30 @@ def groupResolversByContext(resolvers):
         
     return resolversByContext
 
+def resetter(clazz):
+    '''
+    Provides the resetter for the provided object context class, the resetter sets all the attributes values of a context
+    object to None which is the same as the attributes not being set.
+    
+    @param clazz: ContextMetaClass
+        The object context class to provide the resetter for.
+    @return: callable(object)
+        The resetter that takes as an argument the context object to reset.
+    '''
+    assert isinstance(clazz, ContextMetaClass) and issubclass(clazz, Object), 'Invalid object context class %s' % clazz
+
+    setters = []
+    for name in clazz.__slots__:
+        descriptor = clazz.__dict__[name]
+        # The validation is not required for None values so the slot descriptor is used directly.
+        if isinstance(descriptor, Descriptor): descriptor = descriptor.descriptor
+        setters.append(descriptor.__set__)
+
+    def reset(context):
+        assert isinstance(context, clazz), 'Invalid context %s' % context
+        for setter in setters: setter(context, None)
+    return reset
+
 def asData(context, *classes):
     '''
     Provides the data that is represented in the provided context classes.
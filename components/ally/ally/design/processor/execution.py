@@ -9,7 +9,10 @@ Created on Feb 11, 2013
 Contains the classes used in the execution of processors.
 '''
 
+from .context import resetter
 from .spec import ContextMetaClass
+from ally.support import util_timing
+from ally.support.util_timing import clock
 from collections import Iterable, deque
 import logging
 
@@ -17,6 +20,11 @@ import logging
 
 log = logging.getLogger(__name__)
 
+TIMING_PROCESSOR = 'Processors'
+# The timing group for the processors calls.
+TIMING_PROCESSING = 'Processings'
+# The timing group for the named processings, like the assemblies and branches.
+
 # --------------------------------------------------------------------
         
 class Processing:
@@ -25,7 +33,7 @@ class Processing:
     !!! Attention, never ever use a processing in multiple threads, only one thread is allowed to execute 
     a processing at one time.
     '''
-    __slots__ = ('ctx', '_calls')
+    __slots__ = ('ctx', 'name', 'poolSize', '_calls', '_pools', '_resetters', '_chains')
 
     class Ctx:
         '''
@@ -38,7 +46,7 @@ class Processing:
                 assert isinstance(clazz, ContextMetaClass), 'Invalid context class %s for %s' % (clazz, key)
                 object.__setattr__(self, key, clazz)
 
-    def __init__(self, calls, contexts=None):
+    def __init__(self, calls, contexts=None, name=None):
         '''
         Construct the processing.
         
@@ -46,9 +54,13 @@ class Processing:
             The iterable of calls that consists this processing.
         @param contexts: dictionary{string, ContextMetaClass}|None
             The initial contexts to be associated.
+        @param name: string|None
+            The name of the processing, used for timing the chains that execute the processing.
         '''
         assert isinstance(calls, Iterable), 'Invalid calls %s' % calls
+        assert name is None or isinstance(name, str), 'Invalid name %s' % name
         
+        self.name = name
         self._calls = list(calls)
         if __debug__:
             for call in self._calls: assert callable(call), 'Invalid call %s' % call
@@ -61,6 +73,7 @@ class Processing:
                     assert isinstance(key, str), 'Invalid context name %s' % key
                     assert isinstance(clazz, ContextMetaClass), 'Invalid context class %s for %s' % (clazz, key)
             self.ctx.__dict__.update(contexts)
+        self.pooling(0)
         
     contexts = property(lambda self: self.ctx.__dict__.items(), doc='''
     @rtype: Iterable(tuple(string, Context class))
@@ -85,23 +98,99 @@ class Processing:
                 assert isinstance(key, str), 'Invalid context name %s' % key
                 assert isinstance(clazz, ContextMetaClass), 'Invalid context class %s for %s' % (clazz, key)
         self.ctx.__dict__.update(contexts)
+        if self.poolSize: self.pooling(self.poolSize)  # The pooled objects might be for the replaced contexts.
         return self
+
+    def pooling(self, size):
+        '''
+        Sets the pooling for the context objects and chains provided by this processing, the released context objects and
+        chains are reset and reused instead of creating new ones.
+
+        @param size: integer
+            The maximum number of released objects kept for each context and for the chains, if 0 the pooling is disabled
+            and the released objects are left to the garbage collector.
+        @return: this processing
+            This processing for chaining purposes.
+        '''
+        assert isinstance(size, int) and size >= 0, 'Invalid pool size %s' % size
+        self.poolSize = size
+        if size: self._pools, self._resetters, self._chains = {}, {}, []
+        else: self._pools = self._resetters = self._chains = None
+        return self
+
+    def newContext(self, name):
+        '''
+        Provides a context object for the context name, a released context object is reused if available.
+
+        @param name: string
+            The context name to provide the object for.
+        @return: Object
+            The context object.
+        '''
+        clazz = self.ctx.__dict__[name]
+        if self._pools:
+            pool = self._pools.get(name)
+            if pool: return pool.pop()
+        return clazz()
+
+    def newChain(self):
+        '''
+        Provides a chain for this processing, a released chain is reused if available.
+
+        @return: Chain
+            The chain.
+        '''
+        if self._chains: return self._chains.pop().reset(self)
+        return Chain(self)
+
+    def release(self, chain):
+        '''
+        Releases the chain and the context objects that are arguments of the chain, the released objects are reset and
+        kept for reuse if the pooling is enabled. The release needs to be made only after the chain and the contexts are
+        no longer in use, so the objects that are not released are just left to the garbage collector.
+
+        @param chain: Chain
+            The chain to release.
+        '''
+        assert isinstance(chain, Chain), 'Invalid chain %s' % chain
+        if not self.poolSize: return
+        arguments = chain.arg.__dict__
+        if not arguments: return  # The chain is already released.
+
+        for name, value in arguments.items():
+            clazz = self.ctx.__dict__.get(name)
+            if clazz is None or value.__class__ is not clazz: continue
+            pool = self._pools.get(name)
+            if pool is None: pool = self._pools[name] = []
+            if len(pool) >= self.poolSize: continue
+
+            reset = self._resetters.get(name)
+            if reset is None: reset = self._resetters[name] = resetter(clazz)
+            reset(value)
+            pool.append(value)
+
+        chain.reset()
+        if len(self._chains) < self.poolSize: self._chains.append(chain)
     
     def fillIn(self, **keyargs):
         '''
         Updates the provided arguments with the rest of the contexts that this processing has. The fill in process is done
         when a context name is not present in the provided arguments, the value added is being as follows:
             - if the context name start with a capital letter then the class is provided as a value
-            - if the context names starts with a lower case then an instance is created for the class and used as a value.
+            - if the context names starts with a lower case then an instance is created for the class and used as a value,
+            if the pooling is enabled a released instance is reused.
         
         @param keyargs: key arguments
             The key arguments to be filled in.
         @return: dictionary{string: object}
             The fill in key arguments.
         '''
+        pools = self._pools
         for name, clazz in self.contexts:
             if name not in keyargs:
-                if name[:1].lower() == name[:1]: keyargs[name] = clazz()
+                if name[:1].lower() == name[:1]:
+                    pool = pools.get(name) if pools else None
+                    keyargs[name] = pool.pop() if pool else clazz()
                 else: keyargs[name] = clazz
         return keyargs
 
@@ -110,7 +199,7 @@ class Chain:
     A chain that contains a list of processors (callables) that are executed one by one. Each processor will have
     the duty to proceed with the processing if is the case by calling the chain.
     '''
-    __slots__ = ('arg', '_calls', '_callBacks', '_callBacksErrors', '_consumed', '_proceed')
+    __slots__ = ('arg', '_calls', '_callBacks', '_callBacksErrors', '_consumed', '_proceed', '_name', '_started')
 
     class Arg:
         '''
@@ -132,7 +221,9 @@ class Chain:
         '''
         if isinstance(processing, Processing):
             assert isinstance(processing, Processing)
+            self._name = processing.name
             processing = processing.calls
+        else: self._name = None
         assert isinstance(processing, Iterable), 'Invalid processing %s' % processing
         self._calls = deque(processing)
         if __debug__:
@@ -141,6 +232,30 @@ class Chain:
         self._callBacks = deque()
         self._callBacksErrors = deque()
         self._consumed = False
+        self._started = None
+
+    def reset(self, processing=()):
+        '''
+        Resets the chain to the initial state for the provided processing, used in order to reuse the chain.
+
+        @param processing: Processing|Iterable[callable]
+            The processing to be handled by the chain.
+        @return: this chain
+            This chain for chaining purposes.
+        '''
+        if isinstance(processing, Processing):
+            self._name = processing.name
+            processing = processing.calls
+        else: self._name = None
+        assert isinstance(processing, Iterable), 'Invalid processing %s' % processing
+        self._calls.clear()
+        self._calls.extend(processing)
+        self._started = None
+        self.arg.__dict__.clear()
+        self._callBacks.clear()
+        self._callBacksErrors.clear()
+        self._consumed = self._proceed = False
+        return self
 
     def proceed(self):
         '''
@@ -198,8 +313,9 @@ class Chain:
             This chain for chaining purposes.
         '''
         if isinstance(processing, Processing):
-            assert isinstance(processing, Processing)
+            self._timed(processing.name)
             processing = processing.calls
+        else: self._timed(None)
         assert isinstance(processing, Iterable), 'Invalid processing %s' % processing
         self._calls.clear()
         self._calls.extend(processing)
@@ -251,12 +367,18 @@ class Chain:
         call = self._calls.popleft()
         assert log.debug('Processing %s', call) or True
         self._proceed = False
+        timings = util_timing.timings
+        if timings is not None:
+            start = clock()
+            if self._started is None: self._started = start
         try: call(self, **self.arg.__dict__)
         except:
             if self._callBacksErrors:
                 self._proceed = False
                 while self._callBacksErrors: self._callBacksErrors.pop()()
             else: raise
+        finally:
+            if timings is not None: timings.record(TIMING_PROCESSOR, call, clock() - start)
                 
         assert log.debug('Processing finalized \'%s\'', call) or True
         if self._proceed:
@@ -266,6 +388,7 @@ class Chain:
             self._consumed = True
         else:
             self._calls.clear()
+        self._timed(None)
         while self._callBacks: self._callBacks.pop()()
         return False
         
@@ -289,3 +412,19 @@ class Chain:
             the execution of the other processors.
         '''
         return self._consumed
+
+    # ----------------------------------------------------------------
+
+    def _timed(self, name):
+        '''
+        Records the time spent by the chain in the current processing and starts timing for the provided processing name.
+
+        @param name: string|None
+            The name of the processing that the chain continues with, None if the chain is finalized.
+        '''
+        if self._started is not None:
+            timings = util_timing.timings
+            if timings is not None and self._name is not None:
+                timings.record(TIMING_PROCESSING, self._name, clock() - self._started)
+            self._started = None
+        self._name = name
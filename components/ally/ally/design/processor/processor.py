@@ -320,10 +320,10 @@ class Routing(IBranch):
             if self.merged:
                 assert isinstance(extensions, Resolvers), 'Invalid extensions %s' % extensions
                 extensions.merge(rresolvs)
-                return Processing(calls)
+                return Processing(calls, name='Routing \'%s\'' % self.assembly.name)
             
             report.add(rresolvs)
-            return Processing(calls, create(rresolvs))
+            return Processing(calls, create(rresolvs), 'Routing \'%s\'' % self.assembly.name)
         except ResolverError:
             raise AssemblyError('Resolvers problems on Routing for %s\n, with processors %s\n'
                                 ', and extensions %s' % (self.assembly.name, rresolvs, rextens))
@@ -384,7 +384,7 @@ class Using(IBranch):
             uresolvs.validate()
             uresolvs.solve(uextens)
             report.add(uresolvs)
-            return Processing(calls, create(uresolvs))
+            return Processing(calls, create(uresolvs), 'Using \'%s\'' % self.assembly.name)
         except ResolverError:
             raise AssemblyError('Resolvers problems on Using for %s\n, with sources %s\n, with processors %s\n'
                                 ', and extensions %s' % (self.assembly.name, usrcs, uresolvs, uextens))
@@ -454,7 +454,7 @@ class Included(IBranch):
             iresolvs.solve(processor.contexts)
             resolvers.merge(iresolvs)
             extensions.solve(iextens)
-            return Processing(calls, contexts=contexts)
+            return Processing(calls, contexts, 'Included \'%s\'' % self.assembly.name)
         
         except (ResolverError, AssemblyError): raise AssemblyError('Cannot process Included for %s' % self.assembly.name)
     
@@ -9,8 +9,9 @@ Created on Jun 9, 2011
 Provides implementations that provide general behavior or functionality.
 '''
 
-from collections import Iterable, Iterator, namedtuple
+from collections import Iterable, Iterator, namedtuple, OrderedDict
 from inspect import isclass, isfunction
+from threading import Lock
 from weakref import WeakKeyDictionary
 import sys
 
@@ -186,6 +187,59 @@ class immut(dict):
         except AttributeError: self.__hash__value = hash(tuple(p for p in self.items()))
         return self.__hash__value
 
+class CacheLRU:
+    '''
+    Thread safe cache that keeps a limited number of entries, when the limit is exceeded the least recently used entries
+    are discarded.
+    '''
+    __slots__ = ('size', '_entries', '_lock')
+
+    def __init__(self, size):
+        '''
+        Construct the cache.
+        
+        @param size: integer
+            The maximum number of entries to keep.
+        '''
+        assert isinstance(size, int) and size > 0, 'Invalid size %s' % size
+
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        '''
+        Provides the value for the key, the entry is marked as the most recently used.
+        
+        @param key: object
+            The hashable key to provide the value for.
+        @param default: object
+            The value to return if there is no entry for the key.
+        @return: object
+            The cached value or the default.
+        '''
+        with self._lock:
+            try: self._entries.move_to_end(key)
+            except KeyError: return default
+            return self._entries[key]
+
+    def set(self, key, value):
+        '''
+        Sets the value for the key, discarding the least recently used entries if the cache size is exceeded.
+        
+        @param key: object
+            The hashable key to set the value for.
+        @param value: object
+            The value to cache.
+        '''
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size: self._entries.popitem(last=False)
+
+    def __len__(self):
+        with self._lock: return len(self._entries)
+
 def firstOf(coll):
     '''
     Provides the first element from the provided collection.
@@ -0,0 +1,211 @@
+'''
+Created on Apr 11, 2013
+
+@package: ally base
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the on disk manifest of the discovered modules, used in order to skip the importers scanning when the
+deployment has not changed, the manifest also indexes the setup modules that can be imported only when used.
+'''
+
+from os.path import dirname, abspath
+import json
+import logging
+import os
+import sys
+
+# --------------------------------------------------------------------
+
+log = logging.getLogger(__name__)
+
+VERSION = 1
+# The manifest format version, a manifest with a different version is discarded.
+
+manifest = None
+# The manifest used by the modules search, if None then the modules are always searched.
+
+# --------------------------------------------------------------------
+
+class Manifest:
+    '''
+    The manifest of the modules found for search patterns. The entries are validated against the modification times of
+    the python path entries and of the folders that contain the found modules, any file added, removed or renamed in
+    those folders changes their modification time and invalidates the entry.
+    '''
+
+    def __init__(self, path, defer=False):
+        '''
+        Construct the manifest, the entries are loaded from the manifest file if there is one for the same python path.
+
+        @param path: string
+            The path of the manifest file.
+        @param defer: boolean
+            Flag indicating that the indexed setup modules should be imported only when used.
+        '''
+        assert isinstance(path, str), 'Invalid path %s' % path
+        assert isinstance(defer, bool), 'Invalid defer flag %s' % defer
+        self.path = path
+        self.defer = defer
+        self._entries = {}
+        self._deferred = {}
+        self._changed = False
+
+        if not os.path.isfile(path): return
+        try:
+            with open(path, 'r') as f: data = json.load(f)
+        except (IOError, ValueError):
+            log.warning('Invalid modules manifest \'%s\', the modules will be searched', path)
+            return
+        if data.get('version') == VERSION and data.get('sysPath') == sys.path:
+            self._entries, self._deferred = data['entries'], data.get('deferred', {})
+        else: assert log.debug('The modules manifest \'%s\' is for a different python path', path) or True
+
+    def get(self, pattern):
+        '''
+        Provides the modules for the pattern if the entry is still valid.
+
+        @param pattern: string
+            The search pattern.
+        @return: dictionary{tuple(boolean, string), list[string]}|None
+            The modules as provided by the search, None if there is no valid entry for the pattern.
+        '''
+        assert isinstance(pattern, str), 'Invalid pattern %s' % pattern
+        entry = self._entries.get(pattern)
+        if entry is None: return
+
+        for folder, stamp in entry['stamps'].items():
+            if stampFor(folder) != stamp:
+                assert log.debug('Modules manifest entry \'%s\' invalidated by \'%s\'', pattern, folder) or True
+                del self._entries[pattern]
+                self._changed = True
+                return
+        # A new dictionary is provided each time since the search results are consumed by the callers.
+        return {(isPackage, name): list(paths) for isPackage, name, paths in entry['modules']}
+
+    def put(self, pattern, modules):
+        '''
+        Places the modules found for the pattern.
+
+        @param pattern: string
+            The search pattern.
+        @param modules: dictionary{tuple(boolean, string), list[string]}
+            The modules as provided by the search.
+        '''
+        assert isinstance(pattern, str), 'Invalid pattern %s' % pattern
+        assert isinstance(modules, dict), 'Invalid modules %s' % modules
+        roots = {abspath(path or os.curdir) for path in sys.path}
+        folders = set(roots)
+        for paths in modules.values():
+            for path in paths:
+                # The parent folders up to the python path entry are used since a new package changes only the parent,
+                # for a folder that is not in a python path entry only the folder is used.
+                folder, parents = abspath(path), []
+                while folder not in roots:
+                    parents.append(folder)
+                    parent = dirname(folder)
+                    if parent == folder:
+                        del parents[1:]
+                        break
+                    folder = parent
+                folders.update(parents)
+
+        found = [(isPackage, name, list(paths)) for (isPackage, name), paths in modules.items()]
+        self._entries[pattern] = {'modules': found, 'stamps': {folder: stampFor(folder) for folder in folders}}
+        self._changed = True
+
+    def deferred(self, module):
+        '''
+        Provides the names of the setup calls of a module that can be imported only when used.
+
+        @param module: string
+            The setup module full name.
+        @return: list[string]|None
+            The setup calls names, None if the module is not indexed or the module file has changed.
+        '''
+        assert isinstance(module, str), 'Invalid module %s' % module
+        entry = self._deferred.get(module)
+        if entry is None: return
+
+        if stampFor(entry['path']) != entry['stamp']:
+            del self._deferred[module]
+            self._changed = True
+            return
+        return list(entry['names'])
+
+    def putDeferred(self, module, path, names=None):
+        '''
+        Places the setup calls names of a module that can be imported only when used.
+
+        @param module: string
+            The setup module full name.
+        @param path: string
+            The path of the module file.
+        @param names: Iterable(string)|None
+            The setup calls names, if None then the module is removed from the index.
+        '''
+        assert isinstance(module, str), 'Invalid module %s' % module
+        assert isinstance(path, str), 'Invalid path %s' % path
+        if names is None:
+            if self._deferred.pop(module, None) is not None: self._changed = True
+            return
+
+        entry = {'path': path, 'stamp': stampFor(path), 'names': sorted(names)}
+        if self._deferred.get(module) != entry:
+            self._deferred[module] = entry
+            self._changed = True
+
+    def save(self):
+        '''
+        Saves the manifest file if there are any changes.
+        '''
+        if not self._changed: return
+        data = {'version': VERSION, 'sysPath': sys.path, 'entries': self._entries, 'deferred': self._deferred}
+        temporary = '%s.tmp' % self.path
+        try:
+            with open(temporary, 'w') as f: json.dump(data, f)
+            # The file is replaced only when is fully written since the manifest might be used by an other start.
+            if os.path.isfile(self.path): os.remove(self.path)
+            os.rename(temporary, self.path)
+        except (IOError, OSError):
+            log.exception('Cannot save the modules manifest \'%s\'', self.path)
+            return
+        self._changed = False
+
+# --------------------------------------------------------------------
+
+def enable(path, defer=False):
+    '''
+    Enables the modules manifest, the modules search will use the manifest file entries.
+
+    @param path: string
+        The path of the manifest file.
+    @param defer: boolean
+        Flag indicating that the indexed setup modules should be imported only when used.
+    @return: Manifest
+        The manifest used by the modules search.
+    '''
+    global manifest
+    if manifest is None or manifest.path != path: manifest = Manifest(path, defer)
+    else: manifest.defer = defer
+    return manifest
+
+def disable():
+    '''
+    Disables the modules manifest, the entries that have not been saved are discarded.
+    '''
+    global manifest
+    manifest = None
+
+def stampFor(path):
+    '''
+    Provides the stamp for a path.
+
+    @param path: string
+        The path to provide the stamp for.
+    @return: float|None
+        The modification time of the path, None if the path is not available.
+    '''
+    try: return os.stat(path).st_mtime
+    except OSError: return None
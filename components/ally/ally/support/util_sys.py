@@ -9,6 +9,7 @@ Created on Dec 19, 2011
 Provides utility functions for handling system packages/modules/classes.
 '''
 
+from ally.support import util_manifest
 from collections import deque
 from inspect import isclass, ismodule, stack, isfunction, getsourcelines, \
     getsourcefile, ismethod
@@ -218,6 +219,27 @@ def searchPaths(pattern):
         and as a value a list of paths where this package/module is defined.
     '''
     assert isinstance(pattern, str), 'Invalid module pattern %s' % pattern
+    manifest = util_manifest.manifest
+    if manifest is None: return findPaths(pattern)
+    assert isinstance(manifest, util_manifest.Manifest), 'Invalid manifest %s' % manifest
+
+    modules = manifest.get(pattern)
+    if modules is None:
+        modules = findPaths(pattern)
+        manifest.put(pattern, modules)
+    return modules
+
+def findPaths(pattern):
+    '''
+    Finds the modules/packages by scanning the importers, this is the search made by @see: searchPaths when there is no
+    valid modules manifest entry for the pattern.
+    
+    @param pattern: string
+        The pattern as described in @see: searchPaths.
+    @return: dictionary{tuple(boolean, string), list[string]}
+        The modules as described in @see: searchPaths.
+    '''
+    assert isinstance(pattern, str), 'Invalid module pattern %s' % pattern
     modules, importers = {}, None
     k = pattern.rfind('.')
     if k >= 0:
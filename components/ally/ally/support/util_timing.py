@@ -0,0 +1,211 @@
+'''
+Created on Apr 8, 2013
+
+@package: ally base
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the in memory timing histograms used for instrumenting the execution.
+'''
+
+from bisect import bisect_left
+from collections import OrderedDict
+from inspect import ismethod, isfunction
+from threading import Lock
+import time
+
+# --------------------------------------------------------------------
+
+clock = getattr(time, 'perf_counter', time.time)
+# The clock used for measuring the wall time in seconds.
+
+BOUNDS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# The default histogram buckets upper bounds in seconds.
+
+timings = None
+# The timings registry used by the instrumented code, if None then no timing is recorded.
+
+# --------------------------------------------------------------------
+
+class Histogram:
+    '''
+    The latency histogram, counts the recorded times in buckets.
+    '''
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'maximum')
+
+    def __init__(self, bounds):
+        '''
+        Construct the histogram.
+
+        @param bounds: tuple(float)
+            The sorted buckets upper bounds in seconds, an extra bucket is used for the times above the last bound.
+        '''
+        assert isinstance(bounds, tuple) and bounds, 'Invalid bounds %s' % bounds
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = self.maximum = 0.0
+
+    def add(self, elapsed):
+        '''
+        Adds a time to the histogram.
+
+        @param elapsed: float
+            The time in seconds.
+        '''
+        self.counts[bisect_left(self.bounds, elapsed)] += 1
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.maximum: self.maximum = elapsed
+
+    def percentile(self, percent):
+        '''
+        Provides the upper bound of the bucket that contains the percentile.
+
+        @param percent: float
+            The percentile to provide, between 0 and 100.
+        @return: float|None
+            The bucket upper bound in seconds, the maximum recorded time for the last bucket or None if there is nothing
+            recorded.
+        '''
+        if not self.count: return None
+        rank, total = self.count * percent / 100, 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            if total >= rank: return bound
+        return self.maximum
+
+class Timings:
+    '''
+    The registry of timing histograms grouped by the instrumented element kind.
+    '''
+
+    def __init__(self, bounds=BOUNDS):
+        '''
+        Construct the timings.
+
+        @param bounds: tuple(float)
+            The buckets upper bounds used for the histograms.
+        '''
+        assert isinstance(bounds, tuple), 'Invalid bounds %s' % bounds
+        self.bounds = bounds
+        self._histograms = {}
+        self._lock = Lock()
+
+    def record(self, group, key, elapsed):
+        '''
+        Records the time for the key, the key is described only when the timings are presented so any hashable object
+        can be used without overhead.
+
+        @param group: string
+            The group of the key.
+        @param key: object
+            The key to record for, usually the callable that has been timed.
+        @param elapsed: float
+            The time in seconds.
+        '''
+        with self._lock:
+            histogram = self._histograms.get((group, key))
+            if histogram is None: histogram = self._histograms[(group, key)] = Histogram(self.bounds)
+            histogram.add(elapsed)
+
+    def clear(self):
+        '''
+        Clears all the recorded histograms.
+        '''
+        with self._lock: self._histograms.clear()
+
+    def present(self):
+        '''
+        Provides the recorded timings.
+
+        @return: dictionary{string: dictionary{string: Histogram}}
+            The histograms copies indexed by group and then by the key description, the keys are sorted descending by the
+            total recorded time.
+        '''
+        with self._lock: items = [(group, key, copy(histogram)) for (group, key), histogram in self._histograms.items()]
+        items.sort(key=lambda item: item[2].total, reverse=True)
+
+        groups = {}
+        for group, key, histogram in items:
+            histograms = groups.get(group)
+            if histograms is None: histograms = groups[group] = OrderedDict()
+            name = describe(key)
+            if name in histograms: merge(histograms[name], histogram)
+            else: histograms[name] = histogram
+        return groups
+
+# --------------------------------------------------------------------
+
+def enable(bounds=BOUNDS):
+    '''
+    Enables the timing instrumentation, if the timings are already enabled then the recorded histograms are kept.
+
+    @param bounds: tuple(float)
+        The buckets upper bounds used for the histograms.
+    @return: Timings
+        The timings registry used for recording.
+    '''
+    global timings
+    if timings is None: timings = Timings(bounds)
+    return timings
+
+def disable():
+    '''
+    Disables the timing instrumentation and discards the recorded histograms.
+    '''
+    global timings
+    timings = None
+
+def describe(key):
+    '''
+    Provides the description for a timing key, the callables are described by the handler class or function that is
+    wrapped.
+
+    @param key: object
+        The key to describe.
+    @return: string
+        The key description.
+    '''
+    if isinstance(key, str): return key
+    if ismethod(key): return '%s.%s.%s' % (key.__self__.__class__.__module__, key.__self__.__class__.__name__,
+                                           key.__func__.__name__)
+    if isfunction(key):
+        # The processor calls are wrapped in closures so the wrapped method is the one described.
+        for cell in key.__closure__ or ():
+            content = cell.cell_contents
+            if ismethod(content) or isfunction(content): return describe(content)
+        return '%s.%s' % (key.__module__, key.__name__)
+    return str(key)
+
+def copy(histogram):
+    '''
+    Copies the histogram.
+
+    @param histogram: Histogram
+        The histogram to copy.
+    @return: Histogram
+        The histogram copy.
+    '''
+    assert isinstance(histogram, Histogram), 'Invalid histogram %s' % histogram
+    cloned = Histogram(histogram.bounds)
+    merge(cloned, histogram)
+    return cloned
+
+def merge(histogram, other):
+    '''
+    Merges the other histogram into the histogram, the histograms need to have the same bounds.
+
+    @param histogram: Histogram
+        The histogram to merge into.
+    @param other: Histogram
+        The histogram to merge.
+    '''
+    assert isinstance(histogram, Histogram), 'Invalid histogram %s' % histogram
+    assert isinstance(other, Histogram), 'Invalid other histogram %s' % other
+    assert histogram.bounds == other.bounds, 'Incompatible histograms bounds'
+    for index, count in enumerate(other.counts): histogram.counts[index] += count
+    histogram.count += other.count
+    histogram.total += other.total
+    histogram.maximum = max(histogram.maximum, other.maximum)
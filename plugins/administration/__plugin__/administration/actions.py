@@ -17,6 +17,7 @@ from acl.right_action import RightAction
 from admin.introspection.api.component import IComponentService
 from admin.introspection.api.plugin import IPluginService
 from admin.introspection.api.request import IRequestService
+from admin.introspection.api.timing import ITimingService
 from ally.container import ioc, support
 from ally.internationalization import NC_
 from gui.action.api.action import Action
@@ -55,4 +56,4 @@ def rightRequestsInspection() -> RightAction:
 def registerAcl():
     r = rightRequestsInspection()
     r.addActions(menuAction(), modulesAction(), modulesListAction())
-    r.allGet(IComponentService, IPluginService, IRequestService)
+    r.allGet(IComponentService, IPluginService, IRequestService, ITimingService)
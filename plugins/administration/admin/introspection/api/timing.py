@@ -0,0 +1,62 @@
+'''
+Created on Apr 8, 2013
+
+@package: administration introspection
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides the processing timings introspection.
+'''
+
+from admin.api.domain_admin import modelAdmin
+from ally.api.config import service, call, query
+from ally.api.criteria import AsLikeOrdered, AsOrdered
+from ally.api.type import Iter
+
+# --------------------------------------------------------------------
+
+@modelAdmin(id='Id')
+class Timing:
+    '''
+    Provides the latency histogram of a timed element, the times are in milliseconds.
+    '''
+    Id = str
+    Group = str
+    Count = int
+    Total = float
+    Average = float
+    Maximum = float
+    Percentile50 = float
+    Percentile90 = float
+    Percentile99 = float
+    Histogram = str
+
+# --------------------------------------------------------------------
+
+@query(Timing)
+class QTiming:
+    '''
+    Provides the timing query.
+    '''
+    id = AsLikeOrdered
+    group = AsLikeOrdered
+    count = AsOrdered
+    total = AsOrdered
+    average = AsOrdered
+    maximum = AsOrdered
+
+# --------------------------------------------------------------------
+
+@service
+class ITimingService:
+    '''
+    Provides services for the processing timings, the timings are available only if the timing instrumentation is
+    enabled.
+    '''
+
+    @call
+    def getTimings(self, offset:int=None, limit:int=None, q:QTiming=None) -> Iter(Timing):
+        '''
+        Provides the recorded timings, by default sorted descending by the total time.
+        '''
@@ -0,0 +1,76 @@
+'''
+Created on Apr 8, 2013
+
+@package: administration introspection
+@copyright: 2011 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Implementation for the processing timings introspection.
+'''
+
+from ..api.timing import ITimingService, Timing, QTiming
+from ally.api.extension import IterPart
+from ally.container.ioc import injected
+from ally.container.support import setup
+from ally.support import util_timing
+from ally.support.api.util_service import trimIter, processQuery
+from ally.support.util_timing import Histogram
+
+# --------------------------------------------------------------------
+
+@injected
+@setup(ITimingService, name='timingService')
+class TimingService(ITimingService):
+    '''
+    Provides the implementation for @see: ITimingService.
+    '''
+
+    def getTimings(self, offset=None, limit=None, q=None):
+        '''
+        @see: ITimingService.getTimings
+        '''
+        timings = util_timing.timings
+        if timings is None: return IterPart((), 0, offset, limit)
+
+        entities = [self.timingFor(group, name, histogram)
+                    for group, histograms in timings.present().items() for name, histogram in histograms.items()]
+        if q:
+            assert isinstance(q, QTiming), 'Invalid query %s' % q
+            entities = processQuery(entities, q, Timing)
+        else: entities.sort(key=lambda timing: timing.Total, reverse=True)
+
+        return IterPart(trimIter(entities, len(entities), offset, limit), len(entities), offset, limit)
+
+    # ----------------------------------------------------------------
+
+    def timingFor(self, group, name, histogram):
+        '''
+        Create a timing based on the provided histogram.
+        
+        @param group: string
+            The group of the timed element.
+        @param name: string
+            The name of the timed element.
+        @param histogram: Histogram
+            The histogram of the timed element.
+        @return: Timing
+            The timing reflecting the histogram.
+        '''
+        assert isinstance(histogram, Histogram), 'Invalid histogram %s' % histogram
+
+        t = Timing()
+        t.Id = name
+        t.Group = group
+        t.Count = histogram.count
+        t.Total = histogram.total * 1000
+        t.Average = t.Total / histogram.count
+        t.Maximum = histogram.maximum * 1000
+        t.Percentile50 = histogram.percentile(50) * 1000
+        t.Percentile90 = histogram.percentile(90) * 1000
+        t.Percentile99 = histogram.percentile(99) * 1000
+
+        buckets = ['<=%gms: %s' % (bound * 1000, count) for bound, count in zip(histogram.bounds, histogram.counts) if count]
+        if histogram.counts[-1]: buckets.append('>%gms: %s' % (histogram.bounds[-1] * 1000, histogram.counts[-1]))
+        t.Histogram = ', '.join(buckets)
+        return t
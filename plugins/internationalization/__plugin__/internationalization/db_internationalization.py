@@ -16,7 +16,7 @@ from ally.support.sqlalchemy.session import bindSession
 from internationalization.meta.metadata_internationalization import meta
 from sql_alchemy import database_config
 from sql_alchemy.database_config import alchemySessionCreator, metas, \
-    database_url
+    database_url, alchemy_session_policy, alchemy_session_read_policy
 
 # --------------------------------------------------------------------
 
@@ -36,5 +36,6 @@ def updateMetasForInternationalization(): metas().append(meta)
 
 # --------------------------------------------------------------------
 
-def bindInternationalizationSession(proxy): bindSession(proxy, alchemySessionCreator())
+def bindInternationalizationSession(proxy):
+    bindSession(proxy, alchemySessionCreator(), alchemy_session_policy(), alchemy_session_read_policy())
 def bindInternationalizationValidations(proxy): bindValidations(proxy, mappingsOf(meta))
@@ -9,18 +9,48 @@ Created on Jan 21, 2013
 Contains the service setups.
 '''
 
+from ..security import service
+from ..security.db_security import alchemySessionCreator
 from ..security.service import binders
 from .populate import NAME_ROOT
-from ally.container import support, ioc
+from ally.container import support, ioc, app
 from ally.container.bind import intercept
 from ally.container.impl.proxy import IProxyHandler
 from security.api.right import IRightService
 from security.rbac.api.rbac import IRoleService
 from security.rbac.core.impl.proxy_assign import AssignRoleToRigh
+from security.rbac.core.impl.rbac_closure_service import \
+    RbacClosureServiceAlchemy, migrateNestedSets
+from ally.support.sqlalchemy.session import beginWith, openSession, endCurrent, \
+    commit, rollback
 from ally.support.util import ref
 
 # --------------------------------------------------------------------
 
+@ioc.config
+def rbac_closure_table():
+    '''
+    Flag indicating that the roles hierarchy is kept in a closure table instead of nested sets, with a closure table a
+    role assignment changes only the rows of the affected ancestors and descendants. The existing nested sets hierarchy
+    is migrated to the closure table when the tables are created or the distribution changes.
+    '''
+    return False
+
+@ioc.replace(ioc.entityOf('rbacService', service))
+def rbacServiceClosure(original):
+    if rbac_closure_table(): return RbacClosureServiceAlchemy()
+    return original
+
+@app.populate(app.DEVEL, app.CHANGED, priority=app.PRIORITY_FIRST)
+def migrateRolesToClosureTable():
+    if not rbac_closure_table(): return
+    beginWith(alchemySessionCreator())
+    try: migrateNestedSets(openSession())
+    except:
+        endCurrent(rollback)
+        raise
+    else: endCurrent(commit)
+
 @ioc.entity
 def proxyAssignRoleToRigh() -> IProxyHandler:
     b = AssignRoleToRigh()
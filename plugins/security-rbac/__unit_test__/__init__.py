@@ -0,0 +1,10 @@
+'''
+Created on Apr 16, 2013
+
+@package: security - role based access control
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Contains the unit tests.
+'''
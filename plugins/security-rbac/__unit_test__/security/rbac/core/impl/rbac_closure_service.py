@@ -0,0 +1,132 @@
+'''
+Created on Apr 16, 2013
+
+@package: security - role based access control
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Provides unit testing for the rbac closure table service and the nested sets migration.
+'''
+
+# Required in order to register the package extender whenever the unit test is run.
+if True:
+    import package_extender
+    package_extender.PACKAGE_EXTENDER.setForUnitTest(True)
+
+# --------------------------------------------------------------------
+
+from ally.support.sqlalchemy.session import beginWith, endCurrent, rollback, \
+    openSession
+from security.meta.metadata_security import meta
+from security.rbac.core.impl.rbac_closure_service import \
+    RbacClosureServiceAlchemy, migrateNestedSets
+from security.rbac.meta.rbac import RoleMapped
+from security.rbac.meta.rbac_intern import RoleClosure, RoleNode
+from sqlalchemy.engine import create_engine
+from sqlalchemy.orm.session import sessionmaker
+import unittest
+
+# --------------------------------------------------------------------
+
+DIAMOND = [('A', 'A', 1, False), ('A', 'B', 1, True), ('A', 'C', 1, True), ('A', 'D', 2, False), ('A', 'E', 2, False),
+           ('B', 'B', 1, False), ('B', 'D', 1, True), ('B', 'E', 1, False), ('C', 'C', 1, False), ('C', 'D', 1, True),
+           ('C', 'E', 1, False), ('D', 'D', 1, False), ('D', 'E', 1, True), ('E', 'E', 1, False)]
+# The closure rows for the roles hierarchy A->B, A->C, B->D, C->D, D->E.
+
+# --------------------------------------------------------------------
+
+class TestRbacClosure(unittest.TestCase):
+
+    def setUp(self):
+        engine = create_engine('sqlite:///:memory:')
+        meta.create_all(engine)
+        beginWith(sessionmaker(bind=engine))
+        self.session = openSession()
+
+        self.ids = {}
+        for name in 'ABCDE':
+            role = RoleMapped()
+            role.Name = name
+            self.session.add(role)
+            self.session.flush((role,))
+            self.ids[name] = role.Id
+        self.names = {roleId: name for name, roleId in self.ids.items()}
+
+        self.service = RbacClosureServiceAlchemy()
+        for name in 'ABCDE': self.service.mergeRole(self.ids[name])
+
+    def tearDown(self):
+        endCurrent(rollback)
+
+    def closure(self):
+        sql = self.session.query(RoleClosure.parent, RoleClosure.child, RoleClosure.paths, RoleClosure.direct)
+        return sorted((self.names[parent], self.names[child], paths, direct) for parent, child, paths, direct in sql)
+
+    def assign(self, *pairs):
+        return [self.service.assignRole(self.ids[role], self.ids[toRole]) for role, toRole in pairs]
+
+    def nodes(self, *nodes):
+        for role, left, right in nodes:
+            self.session.add(RoleNode(role=self.ids[role] if role else None, left=left, right=right))
+        self.session.flush()
+
+    def testAssign(self):
+        self.assertEqual([True] * 5, self.assign(('B', 'A'), ('C', 'A'), ('D', 'B'), ('D', 'C'), ('E', 'D')))
+        # The cycles and the duplicated assignments are rejected.
+        self.assertEqual([False, False], self.assign(('A', 'E'), ('D', 'B')))
+        self.assertEqual(DIAMOND, self.closure())
+        self.assertEqual(['B', 'D', 'E'],
+                         sorted(self.names[role.Id] for role in self.service.rolesForRbacSQL(self.ids['B'])))
+
+        self.assertTrue(self.service.unassignRole(self.ids['D'], self.ids['B']))
+        self.assertFalse(self.service.unassignRole(self.ids['D'], self.ids['B']))
+        self.assertEqual([('A', 'A', 1, False), ('A', 'B', 1, True), ('A', 'C', 1, True), ('A', 'D', 1, False),
+                          ('A', 'E', 1, False), ('B', 'B', 1, False), ('C', 'C', 1, False), ('C', 'D', 1, True),
+                          ('C', 'E', 1, False), ('D', 'D', 1, False), ('D', 'E', 1, True), ('E', 'E', 1, False)],
+                         self.closure())
+
+        self.assign(('D', 'B'))
+        self.assertEqual(DIAMOND, self.closure())
+
+        self.service.deleteRole(self.ids['D'])
+        self.assertEqual([('A', 'A', 1, False), ('A', 'B', 1, True), ('A', 'C', 1, True), ('B', 'B', 1, False),
+                          ('C', 'C', 1, False), ('E', 'E', 1, False)], self.closure())
+
+    def testMigrate(self):
+        self.session.query(RoleClosure).delete()
+        # The nested sets for the diamond hierarchy with the role E also assigned directly to C.
+        self.nodes((None, 1, 20), ('A', 2, 19), ('B', 3, 8), ('D', 4, 7), ('E', 5, 6), ('C', 9, 18), ('D', 10, 13),
+                   ('E', 11, 12), ('E', 14, 15))
+
+        self.assertTrue(migrateNestedSets(self.session))
+        # The closure table is migrated only once.
+        self.assertFalse(migrateNestedSets(self.session))
+        expected = [row for row in DIAMOND if row[:2] not in (('A', 'E'), ('C', 'E'))]
+        expected.extend((('A', 'E', 3, False), ('C', 'E', 2, True)))
+        self.assertEqual(sorted(expected), self.closure())
+
+    def testMigrateOverlapping(self):
+        self.session.query(RoleClosure).delete()
+        self.nodes((None, 1, 10), ('A', 2, 6), ('B', 4, 8))
+
+        self.assertRaisesRegex(ValueError, 'overlaps', migrateNestedSets, self.session)
+        self.assertEqual([], self.closure())
+
+    def testMigrateUneven(self):
+        self.session.query(RoleClosure).delete()
+        # The second node of role A does not contain the role B.
+        self.nodes((None, 1, 12), ('A', 2, 5), ('B', 3, 4), ('C', 6, 11), ('A', 7, 10), ('D', 8, 9))
+
+        self.assertRaisesRegex(ValueError, 'contain', migrateNestedSets, self.session)
+        self.assertEqual([], self.closure())
+
+    def testMigrateInvalidNode(self):
+        self.session.query(RoleClosure).delete()
+        self.nodes((None, 1, 6), ('A', 3, 2))
+
+        self.assertRaisesRegex(ValueError, 'not before', migrateNestedSets, self.session)
+
+# --------------------------------------------------------------------
+
+if __name__ == '__main__': unittest.main()
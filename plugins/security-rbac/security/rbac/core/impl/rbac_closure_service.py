@@ -0,0 +1,243 @@
+'''
+Created on Apr 16, 2013
+
+@package: security - role based access control
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+SQL Alchemy based implementation for the rbac API that keeps the roles hierarchy in a closure table.
+'''
+
+from ..spec import IRbacService
+from ally.container.ioc import injected
+from ally.support.sqlalchemy.mapper import tableFor
+from ally.support.sqlalchemy.session import SessionSupport
+from security.meta.right import RightMapped
+from security.rbac.meta.rbac import RbacMapped, RoleMapped
+from security.rbac.meta.rbac_intern import RoleClosure, RoleNode, RbacRight, \
+    RbacRole
+from sqlalchemy.sql.expression import and_, or_, bindparam
+
+# --------------------------------------------------------------------
+
+@injected
+class RbacClosureServiceAlchemy(SessionSupport, IRbacService):
+    '''
+    Implementation for @see: IRbacService that uses a closure table for the roles hierarchy, the role assignments change
+    only the rows of the affected ancestors and descendants.
+    '''
+
+    bulkSize = 500
+    # The maximum number of roles used in a single statement.
+
+    def __init__(self):
+        '''
+        Construct the rbac closure service implementation.
+        '''
+        assert isinstance(self.bulkSize, int), 'Invalid bulk size %s' % self.bulkSize
+
+    def rightsForRbacSQL(self, rbacId, sql=None):
+        '''
+        @see: IRbacService.rightsForRbacSQL
+        '''
+        subq = sql or self.session().query(RightMapped)
+        subq = subq.join(RbacRight, RbacRight.right == RightMapped.Id)
+        subq = subq.join(RoleClosure, RoleClosure.child == RbacRight.rbac)
+        subq = subq.join(RbacRole, and_(RbacRole.role == RoleClosure.parent, RbacRole.rbac == rbacId))
+
+        sql = sql or self.session().query(RightMapped)
+        sql = sql.join(RbacRight, and_(RbacRight.right == RightMapped.Id, RbacRight.rbac == rbacId))
+
+        sql = sql.union(subq).distinct(RightMapped.Id).order_by(RightMapped.Id)
+
+        return sql
+
+    def rolesForRbacSQL(self, rbacId, sql=None):
+        '''
+        @see: IRbacService.rolesForRbacSQL
+        '''
+        sql = sql or self.session().query(RoleMapped)
+        sql = sql.join(RoleClosure, RoleClosure.child == RoleMapped.Id)
+        sql = sql.join(RbacRole, and_(RbacRole.role == RoleClosure.parent, RbacRole.rbac == rbacId))
+
+        return sql.distinct()
+
+    def rbacsForRightSQL(self, rightId, sql=None):
+        '''
+        @see: IRbacService.rbacsForRightSQL
+        '''
+        subq = sql or self.session().query(RbacMapped)
+        subq = subq.join(RbacRole, RbacRole.rbac == RbacMapped.Id)
+        subq = subq.join(RoleClosure, RoleClosure.parent == RbacRole.role)
+        subq = subq.join(RbacRight, and_(RbacRight.rbac == RoleClosure.child, RbacRight.right == rightId))
+
+        sql = sql or self.session().query(RbacMapped)
+        sql = sql.join(RbacRight, and_(RbacRight.rbac == RbacMapped.Id, RbacRight.right == rightId))
+
+        sql = sql.union(subq).distinct(RbacMapped.Id).order_by(RbacMapped.Id)
+
+        return sql
+
+    def rbacsForRoleSQL(self, roleId, sql=None):
+        '''
+        @see: IRbacService.rbacsForRoleSQL
+        '''
+        subq = sql or self.session().query(RbacMapped)
+        subq = subq.join(RbacRole, RbacRole.rbac == RbacMapped.Id)
+        subq = subq.join(RoleClosure, and_(RoleClosure.parent == RbacRole.role, RoleClosure.child == roleId))
+
+        sql = sql or self.session().query(RbacMapped)
+        sql = sql.join(RbacRole, and_(RbacRole.rbac == RbacMapped.Id, RbacRole.role == roleId))
+
+        sql = sql.union(subq).distinct(RbacMapped.Id).order_by(RbacMapped.Id)
+
+        return sql
+
+    def mergeRole(self, roleId):
+        '''
+        @see: IRbacService.mergeRole
+        '''
+        sql = self.session().query(RoleClosure).filter(and_(RoleClosure.parent == roleId, RoleClosure.child == roleId))
+        if sql.count() > 0: return None
+
+        # on rbac roles add a row in order to identify from rbac the correspondent role
+        # this will help to have the same query for both user&role rbac
+        self.session().add(RbacRole(rbac=roleId, role=roleId))
+        self.session().add(RoleClosure(parent=roleId, child=roleId, paths=1, direct=False))
+
+    def assignRole(self, roleId, toRoleId):
+        '''
+        @see: IRbacService.assignRole
+        '''
+        # check if the parent is in the child subtree or if the role is already assigned
+        sql = self.session().query(RoleClosure)
+        sql = sql.filter(or_(and_(RoleClosure.parent == roleId, RoleClosure.child == toRoleId),
+                             and_(RoleClosure.parent == toRoleId, RoleClosure.child == roleId, RoleClosure.direct == True)))
+        if sql.count() > 0: return False
+
+        self._changePaths(toRoleId, roleId, 1)
+        self._changeDirect(toRoleId, roleId, True)
+        return True
+
+    def unassignRole(self, roleId, toRoleId):
+        '''
+        @see: IRbacService.unassignRole
+        '''
+        sql = self.session().query(RoleClosure)
+        sql = sql.filter(and_(RoleClosure.parent == toRoleId, RoleClosure.child == roleId, RoleClosure.direct == True))
+        if sql.count() == 0: return False
+
+        # the row is kept if there are other paths from the parent to the child
+        self._changeDirect(toRoleId, roleId, False)
+        self._changePaths(toRoleId, roleId, -1)
+        return True
+
+    def deleteRole(self, roleId):
+        '''
+        @see: IRbacService.deleteRole
+        '''
+        sql = self.session().query(RoleClosure.parent)
+        sql = sql.filter(and_(RoleClosure.child == roleId, RoleClosure.direct == True))
+        for parentId, in sql.all(): self.unassignRole(roleId, parentId)
+
+        sql = self.session().query(RoleClosure)
+        sql = sql.filter(or_(RoleClosure.parent == roleId, RoleClosure.child == roleId))
+        sql.delete(False)
+
+    # ----------------------------------------------------------------
+
+    def _changePaths(self, parentId, childId, sign):
+        '''
+        Adds or removes the paths of the edge from the parent to the child, only the rows for the ancestors of the parent
+        and the descendants of the child are changed.
+        '''
+        sql = self.session().query(RoleClosure.parent, RoleClosure.paths).filter(RoleClosure.child == parentId)
+        ancestors = dict(sql.all())
+        sql = self.session().query(RoleClosure.child, RoleClosure.paths).filter(RoleClosure.parent == childId)
+        descendants = dict(sql.all())
+
+        changes = {(ancestor, descendant): ancestorPaths * descendantPaths
+                   for ancestor, ancestorPaths in ancestors.items()
+                   for descendant, descendantPaths in descendants.items()}
+
+        updates, deletes = [], []
+        for ancestorsChunk in self._chunksOf(ancestors):
+            for descendantsChunk in self._chunksOf(descendants):
+                sql = self.session().query(RoleClosure.parent, RoleClosure.child, RoleClosure.paths)
+                sql = sql.filter(and_(RoleClosure.parent.in_(ancestorsChunk), RoleClosure.child.in_(descendantsChunk)))
+                for ancestor, descendant, paths in sql.all():
+                    paths += sign * changes.pop((ancestor, descendant))
+                    if paths > 0: updates.append({'_parent': ancestor, '_child': descendant, '_paths': paths})
+                    else: deletes.append({'_parent': ancestor, '_child': descendant})
+
+        table = tableFor(RoleClosure)
+        where = and_(table.c.fk_parent_id == bindparam('_parent'), table.c.fk_child_id == bindparam('_child'))
+        if updates: self.session().execute(table.update().where(where).values(paths=bindparam('_paths')), updates)
+        if deletes: self.session().execute(table.delete().where(where), deletes)
+        if sign > 0 and changes:
+            inserts = [{'fk_parent_id': ancestor, 'fk_child_id': descendant, 'paths': paths, 'direct': False}
+                       for (ancestor, descendant), paths in changes.items()]
+            self.session().execute(table.insert(), inserts)
+
+    def _changeDirect(self, parentId, childId, direct):
+        '''
+        Changes the direct flag for the row of the parent and child.
+        '''
+        sql = self.session().query(RoleClosure)
+        sql = sql.filter(and_(RoleClosure.parent == parentId, RoleClosure.child == childId))
+        sql.update({RoleClosure.direct: direct}, False)
+
+    def _chunksOf(self, ids):
+        '''
+        Provides the ids in chunks of at most the bulk size.
+        '''
+        ids = list(ids)
+        return (ids[k:k + self.bulkSize] for k in range(0, len(ids), self.bulkSize))
+
+# --------------------------------------------------------------------
+
+def migrateNestedSets(session):
+    '''
+    Migrates the roles hierarchy from the nested set nodes into the closure table, the migration is performed only if
+    the closure table is empty. Since in the nested sets a role subtree is duplicated for each parent occurrence the
+    number of paths from a parent to a child is the number of child nodes contained in the parent nodes divided by the
+    number of parent nodes.
+
+    @param session: Session
+        The session to use for the migration.
+    @return: boolean
+        True if the nested sets have been migrated, False otherwise.
+    @raise ValueError: If the nested sets are not consistent, nothing is migrated in this case.
+    '''
+    if session.query(RoleClosure).count() > 0: return False
+
+    occurrences, contained, direct, stack = {}, {}, set(), []
+    for role, left, right in session.query(RoleNode.role, RoleNode.left, RoleNode.right).order_by(RoleNode.left):
+        if left >= right:
+            raise ValueError('Invalid nested set node of role %s, the left %s is not before the right %s' %
+                             (role, left, right))
+        while stack and stack[-1][2] < left: stack.pop()
+        if stack and stack[-1][2] <= right:
+            raise ValueError('Invalid nested set node of role %s, the interval (%s, %s) overlaps the interval (%s, %s) '
+                             'of role %s' % ((role, left, right) + stack[-1][1:] + stack[-1][:1]))
+        if role is not None:
+            occurrences[role] = occurrences.get(role, 0) + 1
+            for parent, _left, _right in stack:
+                if parent is not None: contained[(parent, role)] = contained.get((parent, role), 0) + 1
+            if stack and stack[-1][0] is not None: direct.add((stack[-1][0], role))
+        stack.append((role, left, right))
+
+    for (parent, child), count in contained.items():
+        # Each node of the parent role needs to contain the same number of child role nodes.
+        if count % occurrences[parent]:
+            raise ValueError('Invalid nested sets, the %s nodes of role %s contain %s nodes of role %s' %
+                             (occurrences[parent], parent, count, child))
+
+    rows = [{'fk_parent_id': role, 'fk_child_id': role, 'paths': 1, 'direct': False} for role in occurrences]
+    rows.extend({'fk_parent_id': parent, 'fk_child_id': child, 'paths': count // occurrences[parent],
+                 'direct': (parent, child) in direct} for (parent, child), count in contained.items())
+    if not rows: return False
+
+    session.execute(tableFor(RoleClosure).insert(), rows)
+    return True
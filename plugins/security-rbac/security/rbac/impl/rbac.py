@@ -53,10 +53,8 @@ class RoleServiceAlchemy(EntityServiceAlchemy, IRoleService):
         @see: IRoleService.getRoles
         '''
         sql = self.rbacService.rolesForRbacSQL(roleId, self.session().query(RoleMapped))
-        if detailed:
-            entities, total = self._getAllWithCount(None, q, offset, limit, sql)
-            return IterPart(entities, total, offset, limit)
-        return self._getAll(filter, q, offset, limit, sql)
+        if detailed: return self._getPart(None, q, offset, limit, sql)
+        return self._getAll(None, q, offset, limit, sql)
     
     def getRights(self, roleId, offset=None, limit=None, detailed=False, q=None):
         '''
@@ -14,6 +14,7 @@ from security.meta.metadata_security import Base
 from security.meta.right import RightMapped
 from sqlalchemy.dialects.mysql.base import INTEGER
 from sqlalchemy.schema import Column, ForeignKey
+from sqlalchemy.types import Boolean
 
 # --------------------------------------------------------------------
 
@@ -29,6 +30,20 @@ class RoleNode(Base):
     left = Column('lft', INTEGER, nullable=False)
     right = Column('rgt', INTEGER, nullable=False)
 
+class RoleClosure(Base):
+    '''
+    Provides the mapping for roles hierarchy as a closure table, there is a row for each role with each of its ancestors
+    including the role itself. A role can have several parents so the number of paths from the parent to the child is
+    kept in order to know when a row is no longer required.
+    '''
+    __tablename__ = 'rbac_role_closure'
+    __table_args__ = dict(mysql_engine='InnoDB')
+
+    parent = Column('fk_parent_id', ForeignKey(RoleMapped.Id, ondelete='CASCADE'), primary_key=True)
+    child = Column('fk_child_id', ForeignKey(RoleMapped.Id, ondelete='CASCADE'), primary_key=True, index=True)
+    paths = Column('paths', INTEGER(unsigned=True), nullable=False)
+    direct = Column('direct', Boolean, nullable=False, default=False)
+
 class RbacRight(Base):
     '''
     Provides the mapping for role right Rbac.
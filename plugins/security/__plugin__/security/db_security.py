@@ -15,7 +15,8 @@ from ally.support.sqlalchemy.mapper import mappingsOf
 from ally.support.sqlalchemy.session import bindSession
 from security.meta.metadata_security import meta
 from sql_alchemy import database_config
-from sql_alchemy.database_config import alchemySessionCreator, metas
+from sql_alchemy.database_config import alchemySessionCreator, metas, \
+    alchemy_session_policy, alchemy_session_read_policy
 
 # --------------------------------------------------------------------
 
@@ -35,5 +36,6 @@ def updateMetasForSecurity(): metas().append(meta)
 
 # --------------------------------------------------------------------
 
-def bindSecuritySession(proxy): bindSession(proxy, alchemySessionCreator())
+def bindSecuritySession(proxy):
+    bindSession(proxy, alchemySessionCreator(), alchemy_session_policy(), alchemy_session_read_policy())
 def bindSecurityValidations(proxy): bindValidations(proxy, mappingsOf(meta))
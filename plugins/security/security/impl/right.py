@@ -11,7 +11,6 @@ Provides the implementation for right type.
 
 from ..api.right import IRightService, QRight
 from ..meta.right import RightMapped
-from ally.api.extension import IterPart
 from ally.container.ioc import injected
 from ally.container.support import setup
 from ally.exception import InputError, Ref
@@ -53,7 +52,5 @@ class RightServiceAlchemy(EntityGetServiceAlchemy, EntityCRUDServiceAlchemy, IRi
         '''
         if typeId: filter = RightMapped.Type == typeId
         else: filter = None
-        if detailed:
-            entities, total = self._getAllWithCount(filter, q, offset, limit)
-            return IterPart(entities, total, offset, limit)
+        if detailed: return self._getPart(filter, q, offset, limit)
         return self._getAll(filter, q, offset, limit)
@@ -0,0 +1,25 @@
+'''
+Created on Mar 12, 2013
+
+@package: support sqlalchemy
+@copyright: 2012 Sourcefabric o.p.s.
+@license: http://www.gnu.org/licenses/gpl-3.0.txt
+@author: Gabriel Nistor
+
+Wraps the database connection pools so they can be used by the pre fork server worker processes.
+'''
+
+from sql_alchemy.multiprocess_config import enableMultiProcessPool
+import logging
+
+# --------------------------------------------------------------------
+
+log = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------
+
+try: from __setup__ import ally_http
+except ImportError: log.info('No ally http available, thus no need to wrap the connection pools for multiple processes')
+else:
+    from __setup__.ally_http import server_type, SERVER_PREFORK
+    enableMultiProcessPool(lambda: server_type() == SERVER_PREFORK)
@@ -11,6 +11,8 @@ Contains sql alchemy database setup.
 
 from ally.container import ioc, app
 from ally.container.error import ConfigError
+from ally.support.sqlalchemy.session import SessionRouting, POLICY_EXPUNGE, \
+    ReplicaEngines
 from sqlalchemy.engine import create_engine
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.orm.session import sessionmaker
@@ -31,18 +33,52 @@ def database_url():
     '''
     raise ConfigError('A database URL is required')
 
+@ioc.config
+def database_read_urls():
+    '''
+    The database URLs of the read replicas, the service GET calls are routed to one of the replicas as long as the
+    transaction has not written anything, if empty then all calls use the database URL.
+    '''
+    return []
+
+@ioc.config
+def alchemy_session_policy():
+    '''
+    The policy applied to the session after each service call, one of:
+        "expunge" - flushes the session and removes all the loaded objects from it.
+        "flush" - only flushes the session, the loaded objects are kept for the entire request.
+        "read" - rolls back the session transaction, the calls are not allowed to change the loaded objects, to be used
+        when the services only read.
+    '''
+    return POLICY_EXPUNGE
+
+@ioc.config
+def alchemy_session_read_policy() -> str:
+    '''
+    The policy applied to the session after each service GET call, one of the "alchemy_session_policy" values, if not
+    provided the "alchemy_session_policy" is used.
+    '''
+    return None
+
 @ioc.config
 def alchemy_pool_recycle():
     '''The time to recycle pooled connection'''
     return 3600
 
 @ioc.entity
-def alchemySessionCreator(): return sessionmaker(bind=alchemyEngine())
+def alchemySessionCreator():
+    if alchemyReadEngines():
+        return sessionmaker(bind=alchemyEngine(), class_=SessionRouting, replicas=alchemyReadEngines())
+    return sessionmaker(bind=alchemyEngine())
 
 @ioc.entity
 def alchemyEngine() -> Engine:
     return create_engine(database_url(), pool_recycle=alchemy_pool_recycle())
 
+@ioc.entity
+def alchemyReadEngines() -> list:
+    return ReplicaEngines(create_engine(url, pool_recycle=alchemy_pool_recycle()) for url in database_read_urls())
+
 @ioc.entity
 def metas(): return []
 
@@ -16,7 +16,9 @@ from ally.internationalization import _
 from ally.support.api import entity as api
 from ally.support.api.util_service import copy
 from ally.support.sqlalchemy.session import SessionSupport
-from ally.support.sqlalchemy.util_service import buildQuery, buildLimits, handle
+from ally.support.sqlalchemy.util_service import buildQuery, buildLimits, handle, \
+    orderingFor, afterFor, continuationFor, countOf, COUNT_EXACT, COUNT_CAPPED, \
+    COUNT_SKIPPED, COUNT_STRATEGIES, updateAll, valuesIn, deleteIn, insertAll
 from inspect import isclass
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
 import logging
@@ -34,6 +36,16 @@ class EntitySupportAlchemy(SessionSupport):
     Provides support generic entity handling.
     '''
 
+    keyset = False
+    # Flag indicating that the entities collections are paged by seeking after the ordering keys of the last provided
+    # entity instead of skipping the offset entities, the detailed collections provide the continuation for this.
+    countStrategy = COUNT_EXACT
+    # The strategy used for the total of the detailed collections, one of the util service count strategies.
+    countCap = 1000
+    # The number of entities after which the counting is stopped for the capped count strategy.
+    bulkSize = 500
+    # The maximum number of entities ids used in a single statement condition by the bulk operations.
+
     def __init__(self, Entity, QEntity=None):
         '''
         Construct the entity support for the provided model class and query class.
@@ -62,7 +74,7 @@ class EntitySupportAlchemy(SessionSupport):
             self.query = self.queryType = None
         self.QEntity = QEntity
 
-    def _getAll(self, filter=None, query=None, offset=None, limit=None, sql=None):
+    def _getAll(self, filter=None, query=None, offset=None, limit=None, sql=None, continuation=None):
         '''
         Provides all the entities for the provided filter, with offset and limit. Also if query is known to the
         service then also a query can be provided.
@@ -77,6 +89,8 @@ class EntitySupportAlchemy(SessionSupport):
             The limit of elements to get.
         @param sql: SQL alchemy|None
             The sql alchemy query to use.
+        @param continuation: string|None
+            The continuation to fetch the elements after, used only if the service is paging by keys.
         @return: list
             The list of all filtered and limited elements.
         '''
@@ -87,6 +101,7 @@ class EntitySupportAlchemy(SessionSupport):
             assert self.QEntity, 'No query provided for the entity service'
             assert self.queryType.isValid(query), 'Invalid query %s, expected %s' % (query, self.QEntity)
             sql = buildQuery(sql, query, self.Entity)
+        if self.keyset: return self._getPage(sql, query, offset, limit, continuation)[0]
         sql = buildLimits(sql, offset, limit)
         return sql.all()
 
@@ -115,8 +130,103 @@ class EntitySupportAlchemy(SessionSupport):
             assert self.queryType.isValid(query), 'Invalid query %s, expected %s' % (query, self.QEntity)
             sql = buildQuery(sql, query, self.Entity)
         sqlLimit = buildLimits(sql, offset, limit)
-        if limit == 0: return (), sql.count()
-        return sqlLimit.all(), sql.count()
+        if limit == 0: return (), countOf(sql)
+        return sqlLimit.all(), countOf(sql)
+
+    def _getPart(self, filter=None, query=None, offset=None, limit=None, sql=None, continuation=None, count=None):
+        '''
+        Provides the part of entities for the provided filter, with offset and limit and the total count. If the service
+        is paging by keys the part also contains the continuation for the following entities. Also if query is known
+        to the service then also a query can be provided.
+        
+        @param filter: SQL alchemy filtering|None
+            The sql alchemy conditions to filter by.
+        @param query: query
+            The REST query object to provide filtering on.
+        @param offset: integer|None
+            The offset to fetch elements from.
+        @param limit: integer|None
+            The limit of elements to get.
+        @param sql: SQL alchemy|None
+            The sql alchemy query to use.
+        @param continuation: string|None
+            The continuation to fetch the elements after, used only if the service is paging by keys.
+        @param count: string|None
+            The count strategy to use for the total, if None the service count strategy is used.
+        @return: IterPart
+            The part containing the filtered and limited elements.
+        '''
+        count = count or self.countStrategy
+        assert count in COUNT_STRATEGIES, 'Invalid count strategy %s' % count
+
+        sql = sql or self.session().query(self.Entity)
+        if filter is not None: sql = sql.filter(filter)
+        if query:
+            assert self.QEntity, 'No query provided for the entity service'
+            assert self.queryType.isValid(query), 'Invalid query %s, expected %s' % (query, self.QEntity)
+            sql = buildQuery(sql, query, self.Entity)
+
+        following = None
+        if limit == 0: entities, more = (), None
+        elif self.keyset:
+            entities, offset, following = self._getPage(sql, query, offset, limit, continuation)
+            more = following is not None
+        elif count == COUNT_EXACT: entities, more = buildLimits(sql, offset, limit).all(), None
+        elif limit is None: entities, more = buildLimits(sql, offset).all(), False
+        else:
+            # An extra entity is fetched in order to know if there are more entities.
+            entities = buildLimits(sql, offset, limit + 1).all()
+            more = len(entities) > limit
+            if more: del entities[limit:]
+
+        if count == COUNT_SKIPPED: return IterPart(entities, None, offset, limit, following, hasMore=more)
+        if count == COUNT_CAPPED:
+            total = countOf(sql, self.countCap)
+            if total > self.countCap:
+                # The total is exact if the last entities have been fetched, otherwise at least the fetched entities.
+                total = (offset or 0) + len(entities)
+                if more is not False or not entities:
+                    total = max(total, self.countCap)
+                    return IterPart(entities, total, offset, limit, following, approximate=True, hasMore=more)
+        else: total = countOf(sql)
+        return IterPart(entities, total, offset, limit, following)
+
+    def _getPage(self, sql, query=None, offset=None, limit=None, continuation=None):
+        '''
+        Provides the page of entities by seeking after the ordering keys of the last entity from the continuation, the
+        entities are ordered by the query ordering and then by id.
+        
+        @param sql: SQL alchemy
+            The sql alchemy query to use, with the filtering and ordering already applied.
+        @param query: query|None
+            The REST query object that provides the ordering.
+        @param offset: integer|None
+            The offset to fetch elements from if there is no continuation.
+        @param limit: integer|None
+            The limit of elements to get.
+        @param continuation: string|None
+            The continuation to fetch the elements after.
+        @return: tuple(list, integer|None, string|None)
+            The list of the limited elements, the offset of the elements and the continuation for the following elements,
+            None if there are no following elements.
+        '''
+        keys = orderingFor(query, self.Entity) if query else []
+        if all(name != 'Id' for name, _column, _asc in keys):
+            keys.append(('Id', self.Entity.Id, True))
+            sql = sql.order_by(self.Entity.Id)
+
+        after = None
+        if continuation:
+            seek = afterFor(keys, continuation)
+            if seek is None: raise InputError(Ref(_('Invalid continuation'), model=self.model))
+            offset, after = seek
+
+        # An extra entity is fetched in order to provide the continuation only if there are more entities.
+        entities = buildLimits(sql, offset, None if limit is None else limit + 1,
+                               [(column, asc) for _name, column, asc in keys], after).all()
+        if limit is None or len(entities) <= limit: return entities, offset, None
+        del entities[limit:]
+        return entities, offset, continuationFor(keys, entities[-1], (offset or 0) + limit)
 
 # --------------------------------------------------------------------
 
@@ -138,28 +248,24 @@ class EntityFindServiceAlchemy(EntitySupportAlchemy):
     Generic implementation for @see: IEntityFindService
     '''
 
-    def getAll(self, offset=None, limit=None, detailed=False):
+    def getAll(self, offset=None, limit=None, detailed=False, continuation=None):
         '''
-        @see: IEntityQueryService.getAll
+        @see: IEntityFindService.getAll
         '''
-        if detailed:
-            entities, total = self._getAllWithCount(None, None, offset, limit)
-            return IterPart(entities, total, offset, limit)
-        return self._getAll(None, None, offset, limit)
+        if detailed: return self._getPart(None, None, offset, limit, None, continuation)
+        return self._getAll(None, None, offset, limit, None, continuation)
 
 class EntityQueryServiceAlchemy(EntitySupportAlchemy):
     '''
     Generic implementation for @see: IEntityQueryService
     '''
 
-    def getAll(self, offset=None, limit=None, detailed=False, q=None):
+    def getAll(self, offset=None, limit=None, detailed=False, q=None, continuation=None):
         '''
         @see: IEntityQueryService.getAll
         '''
-        if detailed:
-            entities, total = self._getAllWithCount(None, q, offset, limit)
-            return IterPart(entities, total, offset, limit)
-        return self._getAll(None, q, offset, limit)
+        if detailed: return self._getPart(None, q, offset, limit, None, continuation)
+        return self._getAll(None, q, offset, limit, None, continuation)
 
 class EntityCRUDServiceAlchemy(EntitySupportAlchemy):
     '''
@@ -200,6 +306,44 @@ class EntityCRUDServiceAlchemy(EntitySupportAlchemy):
             assert log.debug('Could not delete entity %s with id \'%s\'', self.Entity, id, exc_info=True) or True
             raise InputError(Ref(_('Cannot delete because is in use'), model=self.model))
 
+    def insertAll(self, entities):
+        '''
+        @see: IEntityBulkService.insertAll
+        '''
+        assert isinstance(entities, list), 'Invalid entities %s' % entities
+        assert all(self.modelType.isValid(entity) for entity in entities), \
+        'Invalid entities %s, expected %s' % (entities, self.Entity)
+        entitiesDb = insertAll(self.session(), self.Entity, entities)
+        for entity, entityDb in zip(entities, entitiesDb): entity.Id = entityDb.Id
+        return [entityDb.Id for entityDb in entitiesDb]
+
+    def updateAll(self, entities):
+        '''
+        @see: IEntityBulkService.updateAll
+        '''
+        assert isinstance(entities, list), 'Invalid entities %s' % entities
+        assert all(self.modelType.isValid(entity) for entity in entities), \
+        'Invalid entities %s, expected %s' % (entities, self.Entity)
+        assert all(isinstance(entity.Id, int) for entity in entities), 'Invalid entities %s, with ids' % entities
+
+        found = valuesIn(self.session(), self.Entity.Id, (entity.Id for entity in entities), self.bulkSize)
+        unknown = [Ref(_('Unknown id'), ref=self.Entity.Id, index=index)
+                   for index, entity in enumerate(entities) if entity.Id not in found]
+        if unknown: raise InputError(*unknown)
+        try: updateAll(self.session(), self.Entity, entities)
+        except SQLAlchemyError as e: handle(e, self.Entity)
+
+    def deleteAll(self, ids=None):
+        '''
+        @see: IEntityBulkService.deleteAll
+        '''
+        if not ids: return False
+        try:
+            return deleteIn(self.session(), self.Entity, self.Entity.Id, ids, self.bulkSize) == len(set(ids))
+        except OperationalError:
+            assert log.debug('Could not delete entities %s with ids %s', self.Entity, ids, exc_info=True) or True
+            raise InputError(Ref(_('Cannot delete because is in use'), model=self.model))
+
 class EntityGetCRUDServiceAlchemy(EntityGetServiceAlchemy, EntityCRUDServiceAlchemy):
     '''
     Generic implementation for @see: IEntityGetCRUDService
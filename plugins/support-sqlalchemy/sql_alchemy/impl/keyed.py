@@ -16,7 +16,8 @@ from ally.internationalization import _
 from ally.support.api import keyed as api
 from ally.support.api.util_service import copy
 from ally.support.sqlalchemy.session import SessionSupport
-from ally.support.sqlalchemy.util_service import buildQuery, buildLimits, handle
+from ally.support.sqlalchemy.util_service import buildQuery, buildLimits, handle, \
+    updateAll, valuesIn, deleteIn, insertAll
 from inspect import isclass
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
 from sqlalchemy.orm.exc import NoResultFound
@@ -34,6 +35,9 @@ class EntitySupportAlchemy(SessionSupport):
     Provides support generic entity handling.
     '''
 
+    bulkSize = 500
+    # The maximum number of entities keys used in a single statement condition by the bulk operations.
+
     def __init__(self, Entity, QEntity=None):
         '''
         Construct the entity support for the provided model class and query class.
@@ -216,6 +220,43 @@ class EntityCRUDServiceAlchemy(EntitySupportAlchemy):
             assert log.debug('Could not delete entity %s with key \'%s\'', self.Entity, key, exc_info=True) or True
             raise InputError(Ref(_('Cannot delete because is in use'), model=self.model))
 
+    def insertAll(self, entities):
+        '''
+        @see: IEntityBulkService.insertAll
+        '''
+        assert isinstance(entities, list), 'Invalid entities %s' % entities
+        assert all(self.modelType.isValid(entity) for entity in entities), \
+        'Invalid entities %s, expected %s' % (entities, self.Entity)
+        insertAll(self.session(), self.Entity, entities)
+        return [entity.Key for entity in entities]
+
+    def updateAll(self, entities):
+        '''
+        @see: IEntityBulkService.updateAll
+        '''
+        assert isinstance(entities, list), 'Invalid entities %s' % entities
+        assert all(self.modelType.isValid(entity) for entity in entities), \
+        'Invalid entities %s, expected %s' % (entities, self.Entity)
+        assert all(isinstance(entity.Key, str) for entity in entities), 'Invalid entities %s, with keys' % entities
+
+        found = valuesIn(self.session(), self.Entity.Key, (entity.Key for entity in entities), self.bulkSize)
+        unknown = [Ref(_('Unknown key'), ref=self.Entity.Key, index=index)
+                   for index, entity in enumerate(entities) if entity.Key not in found]
+        if unknown: raise InputError(*unknown)
+        try: updateAll(self.session(), self.Entity, entities)
+        except SQLAlchemyError as e: handle(e, self.Entity)
+
+    def deleteAll(self, keys=None):
+        '''
+        @see: IEntityBulkService.deleteAll
+        '''
+        if not keys: return False
+        try:
+            return deleteIn(self.session(), self.Entity, self.Entity.Key, keys, self.bulkSize) == len(set(keys))
+        except OperationalError:
+            assert log.debug('Could not delete entities %s with keys %s', self.Entity, keys, exc_info=True) or True
+            raise InputError(Ref(_('Cannot delete because is in use'), model=self.model))
+
 class EntityGetCRUDServiceAlchemy(EntityGetServiceAlchemy, EntityCRUDServiceAlchemy):
     '''
     Generic implementation for @see: IEntityGetCRUDService
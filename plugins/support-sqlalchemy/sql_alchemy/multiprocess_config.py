@@ -11,21 +11,40 @@ Provides the configuration used for wraping the connection pool to properly supp
 
 from ally.container import support
 from ally.support.sqlalchemy.pool import SingletonProcessWrapper
+from ally.support.sqlalchemy.session import ReplicaEngines
 from sqlalchemy.engine.base import Engine
 from ally.support.util_sys import callerLocals
     
 # --------------------------------------------------------------------
 
-def enableMultiProcessPool():
+def enableMultiProcessPool(condition=None):
     '''
-    Wraps all the engines in the current assembly with a pool that allows for working on multiple processes.
+    Wraps all the engines in the current assembly, including the read replica engines, with a pool that allows for
+    working on multiple processes.
+    
+    @param condition: callable|None
+        The callable without arguments that is called whenever an engine is created and decides if the engine pool is
+        wrapped, if None the engines pools are always wrapped.
     '''
+    assert condition is None or callable(condition), 'Invalid condition %s' % condition
+    
     def present(engine):
         '''
         Used for listening to all sql alchemy engines that are created in order to wrap the engine pool with a pool that can
         handle multiple processors.
         '''
+        assert isinstance(engine, Engine), 'Invalid engine %s' % engine
+        if condition is not None and not condition(): return
         if not isinstance(engine.pool, SingletonProcessWrapper):
             engine.pool = SingletonProcessWrapper(engine.pool)
+            
+    def presentReplicas(engines):
+        '''
+        Used for listening to the read replica engines in order to wrap their pools.
+        '''
+        assert isinstance(engines, ReplicaEngines), 'Invalid engines %s' % engines
+        for engine in engines: present(engine)
     
-    support.listenToEntities(Engine, listeners=present, module=callerLocals(), all=True)
+    module = callerLocals()
+    support.listenToEntities(Engine, listeners=present, module=module, all=True)
+    support.listenToEntities(ReplicaEngines, listeners=presentReplicas, module=module, all=True)